@@ -0,0 +1,46 @@
+"""generated sql cache
+
+Revision ID: 20261019_000002
+Revises: 20260110_000001
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019_000002'
+down_revision: str | None = '20260110_000001'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # 创建 generated_sql_cache 表
+    op.create_table(
+        'generated_sql_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('connection_id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('version_hash', sa.String(length=64), nullable=False),
+        sa.Column('dialect', sa.String(length=50), nullable=False),
+        sa.Column('prompt', sa.Text(), nullable=False),
+        sa.Column('generated_sql', sa.Text(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_used_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['connection_id'], ['database_connections.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('cache_key')
+    )
+    op.create_index('idx_generated_sql_connection', 'generated_sql_cache', ['connection_id'], unique=False)
+    op.create_index('idx_generated_sql_last_used', 'generated_sql_cache', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_generated_sql_last_used', table_name='generated_sql_cache')
+    op.drop_index('idx_generated_sql_connection', table_name='generated_sql_cache')
+    op.drop_table('generated_sql_cache')
@@ -2,8 +2,9 @@
 
 from fastapi import APIRouter
 
-from app.api.v1 import dbs, query
+from app.api.v1 import dbs, export, query
 
 api_router = APIRouter(prefix="/api/v1")
 api_router.include_router(dbs.router)
 api_router.include_router(query.router)
+api_router.include_router(export.router)
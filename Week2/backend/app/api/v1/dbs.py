@@ -86,7 +86,7 @@ async def delete_database(
     db: Session = Depends(get_db),
 ) -> None:
     """删除数据库连接"""
-    DatabaseService.delete_connection(db, name)
+    await DatabaseService.delete_connection(db, name)
 
 
 @router.get("/{name}/metadata", response_model=DatabaseMetadata)
@@ -0,0 +1,99 @@
+"""查询结果导出 API 路由"""
+
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+
+from app.models.export import ExportJobInfo, ExportRequest
+from app.services.export_service import (
+    GZIP_MEDIA_TYPE,
+    MEDIA_TYPES,
+    ExportJob,
+    ExportService,
+    export_jobs,
+)
+from app.storage.local_db import LocalStorage, get_db
+from app.storage.models import DatabaseConnection
+from app.utils.error_handler import ErrorCode, create_error_response
+
+router = APIRouter(prefix="/dbs/{name}/query/export", tags=["export"])
+
+
+def _get_connection(db: Session, name: str) -> DatabaseConnection:
+    connection = LocalStorage.get_connection_by_name(db, name)
+    if not connection:
+        raise create_error_response(
+            ErrorCode.NOT_FOUND,
+            f"数据库连接 '{name}' 不存在",
+        )
+    return connection
+
+
+def _get_job(name: str, export_id: str) -> ExportJob:
+    job = export_jobs.get(name, export_id)
+    if not job:
+        raise create_error_response(
+            ErrorCode.NOT_FOUND,
+            f"导出任务 '{export_id}' 不存在或已过期",
+        )
+    return job
+
+
+@router.post("", response_model=ExportJobInfo, status_code=status.HTTP_201_CREATED)
+async def create_export(
+    name: str,
+    request: ExportRequest,
+    db: Session = Depends(get_db),
+) -> ExportJobInfo:
+    """创建导出任务（验证 SQL, 返回下载地址与取消令牌）"""
+    connection = _get_connection(db, name)
+    return ExportService.create_job(connection, request).info()
+
+
+@router.get("/{export_id}/download")
+async def download_export(
+    name: str,
+    export_id: str,
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """
+    下载导出文件
+
+    重新执行查询并边读边写, 浏览器可直接以附件方式保存到磁盘。
+    """
+    connection = _get_connection(db, name)
+    job = _get_job(name, export_id)
+    stream = await ExportService.open_download(connection, job)
+
+    ascii_name = job.filename.encode("ascii", "replace").decode().replace("?", "_")
+    return StreamingResponse(
+        ExportService.chunks(job, stream),
+        media_type=GZIP_MEDIA_TYPE if job.gzip else MEDIA_TYPES[job.format],
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(job.filename)}"
+            ),
+            "Cache-Control": "no-store",
+            "X-Accel-Buffering": "no",
+            "X-Export-Id": job.export_id,
+        },
+        # 客户端在开始读取前断开时编码器不会运行, 由这里释放连接
+        background=BackgroundTask(ExportService.release, job, stream),
+    )
+
+
+@router.get("/{export_id}", response_model=ExportJobInfo)
+async def get_export(name: str, export_id: str) -> ExportJobInfo:
+    """查询导出进度"""
+    return _get_job(name, export_id).info()
+
+
+@router.delete("/{export_id}", response_model=ExportJobInfo)
+async def cancel_export(name: str, export_id: str) -> ExportJobInfo:
+    """取消导出（进行中的下载在下一批处中断）"""
+    job = _get_job(name, export_id)
+    job.cancel()
+    return job.info()
@@ -3,17 +3,29 @@
 import time
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
 
 from app.models.query import (
     NaturalLanguageQueryRequest,
     NaturalLanguageQueryResult,
+    NaturalQueryCacheStats,
     QueryRequest,
     QueryResult,
+    QueryStreamRequest,
 )
 from app.services.ai_service import generate_sql
 from app.services.metadata_service import MetadataService
 from app.services.query_service import QueryService
+from app.services.result_stream import (
+    ARROW_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    arrow_available,
+    arrow_chunks,
+    ndjson_chunks,
+)
+from app.services.sql_generation_cache import sql_generation_cache
 from app.storage.local_db import LocalStorage, get_db
 from app.utils.error_handler import ErrorCode, create_error_response
 
@@ -37,6 +49,51 @@ async def execute_query(
     return await QueryService.execute_query(db, connection, request)
 
 
+@router.post("/stream")
+async def stream_query(
+    name: str,
+    request: QueryStreamRequest,
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """
+    流式执行 SQL 查询
+
+    服务端游标分批读取, 每批编码后立即发送（NDJSON 或 Arrow IPC）,
+    客户端读取的速度决定取数速度; 未写 LIMIT 时默认使用请求的 limit,
+    不指定时上限为 stream_max_rows。
+    """
+    connection = LocalStorage.get_connection_by_name(db, name)
+    if not connection:
+        raise create_error_response(
+            ErrorCode.NOT_FOUND,
+            f"数据库连接 '{name}' 不存在",
+        )
+    if request.format == "arrow" and not arrow_available():
+        raise create_error_response(
+            ErrorCode.VALIDATION_ERROR,
+            "Arrow 格式需要安装 pyarrow（pip install \".[arrow]\"）",
+        )
+
+    stream = await QueryService.open_stream(connection, request, limit=request.limit)
+    if request.format == "arrow":
+        chunks, media_type = arrow_chunks(stream), ARROW_MEDIA_TYPE
+    else:
+        chunks, media_type = ndjson_chunks(stream), NDJSON_MEDIA_TYPE
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Cache-Control": "no-store",
+            # 关闭反向代理缓冲, 首批结果立即到达客户端
+            "X-Accel-Buffering": "no",
+            "X-Query-Truncated": "true" if stream.truncated else "false",
+        },
+        # 客户端在开始读取前断开时编码器不会运行, 由这里释放连接
+        background=BackgroundTask(stream.aclose),
+    )
+
+
 @router.post("/natural", response_model=NaturalLanguageQueryResult)
 async def natural_language_query(
     name: str,
@@ -54,13 +111,15 @@ async def natural_language_query(
     # 获取元数据
     metadata = await MetadataService.extract_metadata(db, connection)
 
-    # 生成 SQL
+    # 生成 SQL（相同连接、元数据版本与提示词复用缓存, 并发的相同请求只调用一次 AI）
     start_time = time.time()
     try:
-        generated_sql = await generate_sql(
-            request.prompt,
+        generated_sql, cached = await sql_generation_cache.get_or_generate(
+            db,
+            connection,
             metadata,
-            dialect=connection.db_type,
+            request.prompt,
+            lambda: generate_sql(request.prompt, metadata, dialect=connection.db_type),
         )
         generation_time_ms = int((time.time() - start_time) * 1000)
 
@@ -68,7 +127,24 @@ async def natural_language_query(
             generated_sql=generated_sql,
             result=None,
             generation_time_ms=generation_time_ms,
+            cached=cached,
         )
     except Exception as e:
         # 错误已在 generate_sql 中处理
         raise
+
+
+@router.get("/natural/stats", response_model=NaturalQueryCacheStats)
+async def natural_language_cache_stats(
+    name: str,
+    db: Session = Depends(get_db),
+) -> NaturalQueryCacheStats:
+    """自然语言生成 SQL 的缓存统计"""
+    connection = LocalStorage.get_connection_by_name(db, name)
+    if not connection:
+        raise create_error_response(
+            ErrorCode.NOT_FOUND,
+            f"数据库连接 '{name}' 不存在",
+        )
+
+    return sql_generation_cache.stats(db, connection)
@@ -19,6 +19,32 @@ class Settings(BaseSettings):
     # OpenAI API 配置
     openai_api_key: str | None = None
     openai_model: str = "gpt-3.5-turbo"  # 默认使用 gpt-3.5-turbo
+    ai_context_max_tokens: int = 2000  # 数据库结构上下文的 token 预算
+    ai_context_index_cache_size: int = 32  # 按元数据版本缓存的结构索引数
+    ai_sql_cache_ttl_seconds: float = 86400.0  # 生成 SQL 缓存有效期（0 关闭）
+    ai_sql_cache_max_entries: int = 1000  # 生成 SQL 缓存条目上限（按最近使用淘汰）
+
+    # 查询并发配置（按连接）
+    query_max_concurrency: int = 8  # 每个连接同时执行的查询数
+    query_max_queue: int = 64  # 每个连接排队等待的查询数
+    query_queue_timeout_seconds: float = 30.0  # 排队等待超时
+    query_concurrency_overrides: dict[str, int] = {}  # 连接名 -> 并发上限
+
+    # 流式查询配置
+    stream_batch_size: int = 1000  # 服务端游标每批读取的行数
+    stream_max_rows: int = 1_000_000  # 流式查询与导出的 LIMIT 上限
+    export_job_ttl_seconds: float = 600.0  # 导出任务（进度与取消令牌）保留时间
+
+    # 连接池注册表配置（每个连接的池大小与其查询并发上限一致）
+    adapter_idle_timeout_seconds: float = 300.0  # 空闲连接池关闭时间
+    adapter_probe_interval_seconds: float = 30.0  # 借出前健康探测间隔
+
+    # 元数据缓存配置
+    metadata_memory_cache_size: int = 64  # 进程内保留已解码元数据的连接数
+    metadata_refresh_interval_seconds: float = 60.0  # 后台结构变更探测间隔（0 关闭）
+
+    # SQL 解析缓存配置
+    sql_parse_cache_size: int = 1024  # 按 (SQL, 方言) 缓存的解析结果数
 
     # 日志配置
     log_level: str = "info"
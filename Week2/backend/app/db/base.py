@@ -1,6 +1,7 @@
 """数据库适配器基类"""
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from typing import Any
 
 
@@ -30,16 +31,55 @@ class DatabaseAdapter(ABC):
         """
         pass
 
+    async def stream(
+        self,
+        sql: str,
+        batch_size: int = 1000,
+        timeout: float = 30.0,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        分批读取查询结果
+
+        默认实现一次性执行后切分; 各适配器用服务端游标覆盖, 内存中只保留
+        一个批次。迭代期间独占一个连接, 提前关闭迭代器会释放游标与连接。
+
+        Args:
+            sql: SQL 查询语句（必须是 SELECT）
+            batch_size: 每批行数
+            timeout: 单次取数的超时时间（秒）
+
+        Yields:
+            一批结果（每行是一个字典）
+        """
+        rows = await self.execute(sql, timeout=timeout)
+        for start in range(0, len(rows), batch_size):
+            yield rows[start : start + batch_size]
+
     @abstractmethod
-    async def get_metadata(self) -> dict[str, Any]:
+    async def get_metadata(self, tables: list[str] | None = None) -> dict[str, Any]:
         """
         获取数据库元数据
 
+        Args:
+            tables: 只提取这些表/视图（None 表示全部）
+
         Returns:
             包含 tables 和 views 的字典
         """
         pass
 
+    @abstractmethod
+    async def get_schema_versions(self) -> dict[str, str]:
+        """
+        获取各表/视图的结构版本标记（廉价的变更探测）
+
+        标记只用于相等比较: 表结构变化后标记随之变化。
+
+        Returns:
+            {表名: 版本标记}
+        """
+        pass
+
     @abstractmethod
     async def close(self) -> None:
         """关闭数据库连接"""
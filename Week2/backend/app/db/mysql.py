@@ -1,6 +1,7 @@
 """MySQL 数据库适配器"""
 
 import asyncio
+from collections.abc import AsyncIterator
 from typing import Any
 
 import aiomysql
@@ -11,8 +12,9 @@ from app.db.base import DatabaseAdapter
 class MySQLAdapter(DatabaseAdapter):
     """MySQL 适配器"""
 
-    def __init__(self) -> None:
+    def __init__(self, pool_size: int = 1) -> None:
         self.pool: aiomysql.Pool | None = None
+        self.pool_size = max(1, pool_size)
         self.url: str = ""
 
     async def connect(self, url: str) -> None:
@@ -30,6 +32,10 @@ class MySQLAdapter(DatabaseAdapter):
             password=parsed.password,
             db=parsed.path.lstrip("/") if parsed.path else None,
             charset="utf8mb4",
+            minsize=1,
+            maxsize=self.pool_size,
+            # 早于 MySQL wait_timeout 回收空闲连接
+            pool_recycle=3600,
         )
 
     async def _get_conn(self) -> aiomysql.Connection:
@@ -54,76 +60,143 @@ class MySQLAdapter(DatabaseAdapter):
                 rows = await cursor.fetchall()
                 return list(rows)
         except TimeoutError:
+            # 被取消的查询使连接状态不确定, 关闭后再归还, 连接池会丢弃它
+            conn.close()
             raise TimeoutError(f"查询超时（{timeout}秒）")
         finally:
             if self.pool:
                 self.pool.release(conn)
 
-    async def get_metadata(self) -> dict[str, Any]:
-        """获取 MySQL 元数据"""
+    async def stream(
+        self,
+        sql: str,
+        batch_size: int = 1000,
+        timeout: float = 30.0,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """非缓冲游标分批读取（结果集留在服务端, 按批从网络读取）"""
         conn = await self._get_conn()
+        exhausted = False
         try:
-            # 从 URL 中获取数据库名（更可靠）
-            from urllib.parse import urlparse
+            cursor = await conn.cursor(aiomysql.SSDictCursor)
+            await asyncio.wait_for(cursor.execute(sql), timeout=timeout)
+            while True:
+                rows = await asyncio.wait_for(cursor.fetchmany(batch_size), timeout=timeout)
+                if not rows:
+                    break
+                yield list(rows)
+            exhausted = True
+            await cursor.close()
+        except TimeoutError:
+            raise TimeoutError(f"查询超时（{timeout}秒）")
+        finally:
+            if not exhausted:
+                # 未读完的非缓冲结果集必须读完才能复用连接; 直接关闭, 连接池会丢弃它
+                conn.close()
+            if self.pool:
+                self.pool.release(conn)
 
-            parsed = urlparse(self.url)
-            db_name = parsed.path.lstrip("/") if parsed.path else None
+    async def _database_name(self, conn: aiomysql.Connection) -> str:
+        """当前数据库名（优先取 URL 中的库名）"""
+        # 从 URL 中获取数据库名（更可靠）
+        from urllib.parse import urlparse
+
+        parsed = urlparse(self.url)
+        db_name = parsed.path.lstrip("/") if parsed.path else None
 
-            # 如果 URL 中没有数据库名，尝试从连接获取
-            if not db_name:
-                async with conn.cursor() as cursor:
-                    await cursor.execute("SELECT DATABASE()")
-                    result = await cursor.fetchone()
-                    db_name = result[0] if result and result[0] else ""
+        # 如果 URL 中没有数据库名，尝试从连接获取
+        if not db_name:
+            async with conn.cursor() as cursor:
+                await cursor.execute("SELECT DATABASE()")
+                result = await cursor.fetchone()
+                db_name = result[0] if result and result[0] else ""
 
-            if not db_name:
-                raise ValueError("无法确定数据库名称")
+        if not db_name:
+            raise ValueError("无法确定数据库名称")
+        return db_name
 
-            # 获取所有表和视图
+    async def get_metadata(self, tables: list[str] | None = None) -> dict[str, Any]:
+        """获取 MySQL 元数据"""
+        conn = await self._get_conn()
+        try:
+            db_name = await self._database_name(conn)
+
+            # 只提取指定的表
+            table_filter = ""
+            params: tuple[Any, ...] = (db_name,)
+            if tables is not None:
+                if not tables:
+                    return {"tables": [], "views": []}
+                table_filter = f" AND table_name IN ({', '.join(['%s'] * len(tables))})"
+                params += tuple(tables)
+
+            # 获取所有表和视图（含注释与估算行数）
             # 使用 AS 别名确保字段名为小写（aiomysql.DictCursor 使用别名）
             tables_query = """
                 SELECT
                     table_name as table_name,
                     table_type as table_type,
-                    table_comment as table_comment
+                    table_comment as table_comment,
+                    table_rows as table_rows
                 FROM information_schema.tables
-                WHERE table_schema = %s
+                WHERE table_schema = %s{table_filter}
                 ORDER BY table_name
             """
 
             async with conn.cursor(aiomysql.DictCursor) as cursor:
-                await cursor.execute(tables_query, (db_name,))
+                await cursor.execute(tables_query.format(table_filter=table_filter), params)
                 tables_rows = await cursor.fetchall()
 
-            # 获取主键信息（一次性查询所有表的主键）
-            # MySQL 8.0+ 需要指定约束名和表名匹配
-            pk_query = """
+            # 一次性获取所有表的列信息（column_key = 'PRI' 即主键列）
+            columns_query = """
                 SELECT
-                    kcu.TABLE_NAME as table_name,
-                    kcu.COLUMN_NAME as column_name
-                FROM information_schema.TABLE_CONSTRAINTS tc
-                JOIN information_schema.KEY_COLUMN_USAGE kcu
-                    ON tc.CONSTRAINT_NAME = kcu.CONSTRAINT_NAME
-                    AND tc.TABLE_SCHEMA = kcu.TABLE_SCHEMA
-                    AND tc.TABLE_NAME = kcu.TABLE_NAME
-                WHERE tc.CONSTRAINT_TYPE = 'PRIMARY KEY'
-                    AND tc.TABLE_SCHEMA = %s
+                    table_name as table_name,
+                    column_name as column_name,
+                    data_type as data_type,
+                    is_nullable as is_nullable,
+                    column_default as column_default,
+                    column_comment as column_comment,
+                    column_key as column_key,
+                    character_maximum_length as character_maximum_length,
+                    numeric_precision as numeric_precision,
+                    numeric_scale as numeric_scale
+                FROM information_schema.columns
+                WHERE table_schema = %s{table_filter}
+                ORDER BY table_name, ordinal_position
             """
 
             async with conn.cursor(aiomysql.DictCursor) as cursor:
-                await cursor.execute(pk_query, (db_name,))
-                pk_rows = await cursor.fetchall()
-
-            # 构建主键映射 {table_name: {column_name: True}}
-            pk_map: dict[str, set[str]] = {}
-            for pk_row in pk_rows:
-                # aiomysql.DictCursor 使用小写字段名（通过 AS 别名）
-                table = pk_row.get("table_name")
-                column = pk_row.get("column_name")
-                if table and column:
-                    if table not in pk_map:
-                        pk_map[table] = set()
-                    pk_map[table].add(column)
+                await cursor.execute(columns_query.format(table_filter=table_filter), params)
+                columns_rows = await cursor.fetchall()
+
+            # 按表分组 {table_name: [column, ...]}
+            columns_map: dict[str, list[dict[str, Any]]] = {}
+            for col_row in columns_rows:
+                table = col_row.get("table_name")
+                col_name = col_row.get("column_name")
+                data_type = col_row.get("data_type")
+
+                if not table or not col_name or not data_type:
+                    continue  # 跳过无效列
+
+                # 规范化数据类型（添加长度信息）
+                if col_row.get("character_maximum_length"):
+                    data_type = f"{data_type}({col_row['character_maximum_length']})"
+                elif col_row.get("numeric_precision") and col_row.get("numeric_scale"):
+                    precision, scale = col_row["numeric_precision"], col_row["numeric_scale"]
+                    data_type = f"{data_type}({precision},{scale})"
+                elif col_row.get("numeric_precision"):
+                    data_type = f"{data_type}({col_row['numeric_precision']})"
+
+                columns_map.setdefault(table, []).append(
+                    {
+                        "name": col_name,
+                        "dataType": data_type,
+                        "isNullable": col_row["is_nullable"] == "YES",
+                        "isPrimaryKey": col_row.get("column_key") == "PRI",
+                        "defaultValue": col_row["column_default"],
+                        "comment": col_row.get("column_comment") or None,
+                    }
+                )
 
             tables: list[dict[str, Any]] = []
             views: list[dict[str, Any]] = []
@@ -137,64 +210,16 @@ class MySQLAdapter(DatabaseAdapter):
                 if not table_name or not table_type:
                     continue  # 跳过无效行
 
-                # 获取列信息
-                # 使用 AS 别名确保字段名为小写
-                columns_query = """
-                    SELECT
-                        column_name as column_name,
-                        data_type as data_type,
-                        is_nullable as is_nullable,
-                        column_default as column_default,
-                        column_comment as column_comment,
-                        character_maximum_length as character_maximum_length,
-                        numeric_precision as numeric_precision,
-                        numeric_scale as numeric_scale
-                    FROM information_schema.columns
-                    WHERE table_schema = %s AND table_name = %s
-                    ORDER BY ordinal_position
-                """
-
-                async with conn.cursor(aiomysql.DictCursor) as cursor:
-                    await cursor.execute(columns_query, (db_name, table_name))
-                    columns_rows = await cursor.fetchall()
-
-                columns = []
-                table_pks = pk_map.get(table_name, set())
-
-                for col_row in columns_rows:
-                    col_name = col_row.get("column_name")
-                    data_type = col_row.get("data_type")
-
-                    if not col_name or not data_type:
-                        continue  # 跳过无效列
-
-                    # 规范化数据类型（添加长度信息）
-                    if col_row.get("character_maximum_length"):
-                        data_type = f"{data_type}({col_row['character_maximum_length']})"
-                    elif col_row.get("numeric_precision") and col_row.get("numeric_scale"):
-                        data_type = f"{data_type}({col_row['numeric_precision']},{col_row['numeric_scale']})"
-                    elif col_row.get("numeric_precision"):
-                        data_type = f"{data_type}({col_row['numeric_precision']})"
-
-                    columns.append(
-                        {
-                            "name": col_name,
-                            "dataType": data_type,
-                            "isNullable": col_row["is_nullable"] == "YES",
-                            "isPrimaryKey": col_name in table_pks,
-                            "defaultValue": col_row["column_default"],
-                            "comment": col_row.get("column_comment") or None,
-                        }
-                    )
-
                 table_info = {
                     "name": table_name,
                     "tableType": table_type.lower(),
-                    "columns": columns,
+                    "columns": columns_map.get(table_name, []),
                     "comment": table_comment,
                 }
 
                 if table_type == "BASE TABLE":
+                    # InnoDB 的 table_rows 是统计估算值
+                    table_info["rowCount"] = row.get("table_rows")
                     tables.append(table_info)
                 elif table_type == "VIEW":
                     views.append(table_info)
@@ -207,6 +232,38 @@ class MySQLAdapter(DatabaseAdapter):
             if self.pool:
                 self.pool.release(conn)
 
+    async def get_schema_versions(self) -> dict[str, str]:
+        """
+        各表/视图的结构版本标记
+
+        表使用 CREATE_TIME（ALTER TABLE 重建表时变化）与 UPDATE_TIME,
+        视图使用定义的 MD5。
+        """
+        versions_query = """
+            SELECT
+                t.table_name as table_name,
+                CONCAT_WS(
+                    '/',
+                    t.create_time,
+                    t.update_time,
+                    MD5(v.view_definition)
+                ) as version
+            FROM information_schema.tables t
+            LEFT JOIN information_schema.views v
+                ON v.table_schema = t.table_schema AND v.table_name = t.table_name
+            WHERE t.table_schema = %s
+        """
+        conn = await self._get_conn()
+        try:
+            db_name = await self._database_name(conn)
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(versions_query, (db_name,))
+                rows = await cursor.fetchall()
+        finally:
+            if self.pool:
+                self.pool.release(conn)
+        return {row["table_name"]: row["version"] or "" for row in rows}
+
     async def close(self) -> None:
         """关闭连接池"""
         if self.pool:
@@ -218,10 +275,14 @@ class MySQLAdapter(DatabaseAdapter):
         """测试连接"""
         try:
             conn = await self._get_conn()
+        except Exception:
+            return False
+        try:
             async with conn.cursor() as cursor:
                 await cursor.execute("SELECT 1")
-            if self.pool:
-                self.pool.release(conn)
             return True
         except Exception:
             return False
+        finally:
+            if self.pool:
+                self.pool.release(conn)
@@ -1,6 +1,6 @@
 """PostgreSQL 数据库适配器"""
 
-import asyncio
+from collections.abc import AsyncIterator
 from typing import Any
 
 import asyncpg
@@ -11,14 +11,21 @@ from app.db.base import DatabaseAdapter
 class PostgresAdapter(DatabaseAdapter):
     """PostgreSQL 适配器"""
 
-    def __init__(self) -> None:
-        self.conn: asyncpg.Connection | None = None
+    def __init__(self, pool_size: int = 1) -> None:
+        self.pool: asyncpg.Pool | None = None
+        self.pool_size = max(1, pool_size)
         self.url: str = ""
 
     async def connect(self, url: str) -> None:
-        """建立 PostgreSQL 连接"""
+        """建立 PostgreSQL 连接池"""
         self.url = url
-        self.conn = await asyncpg.connect(url)
+        self.pool = await asyncpg.create_pool(url, min_size=1, max_size=self.pool_size)
+
+    def _acquire(self) -> Any:
+        """从连接池获取连接（async with 使用）"""
+        if not self.pool:
+            raise RuntimeError("数据库未连接")
+        return self.pool.acquire()
 
     async def execute(
         self,
@@ -26,119 +33,186 @@ class PostgresAdapter(DatabaseAdapter):
         timeout: float = 30.0,
     ) -> list[dict[str, Any]]:
         """执行 SQL 查询"""
-        if not self.conn:
-            raise RuntimeError("数据库未连接")
-
-        try:
-            rows = await asyncio.wait_for(
-                self.conn.fetch(sql),
-                timeout=timeout,
-            )
-            # asyncpg Record 转换为字典列表
-            return [dict(row) for row in rows]
-        except TimeoutError:
-            raise TimeoutError(f"查询超时（{timeout}秒）")
-
-    async def get_metadata(self) -> dict[str, Any]:
+        async with self._acquire() as conn:
+            try:
+                # asyncpg 原生超时会取消服务端查询, 连接可安全归还连接池
+                rows = await conn.fetch(sql, timeout=timeout)
+            except TimeoutError:
+                raise TimeoutError(f"查询超时（{timeout}秒）")
+        # asyncpg Record 转换为字典列表
+        return [dict(row) for row in rows]
+
+    async def stream(
+        self,
+        sql: str,
+        batch_size: int = 1000,
+        timeout: float = 30.0,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """服务端游标分批读取（游标只能在事务内使用, 这里用只读事务）"""
+        async with self._acquire() as conn:
+            async with conn.transaction(readonly=True):
+                try:
+                    cursor = await conn.cursor(sql, timeout=timeout)
+                    while True:
+                        records = await cursor.fetch(batch_size, timeout=timeout)
+                        if not records:
+                            break
+                        yield [dict(record) for record in records]
+                except TimeoutError:
+                    raise TimeoutError(f"查询超时（{timeout}秒）")
+
+    async def get_metadata(self, tables: list[str] | None = None) -> dict[str, Any]:
         """获取 PostgreSQL 元数据"""
-        if not self.conn:
-            raise RuntimeError("数据库未连接")
+        async with self._acquire() as conn:
+            return await self._get_metadata(conn, tables)
+
+    async def _get_metadata(
+        self,
+        conn: asyncpg.Connection,
+        tables_filter: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        在指定连接上提取元数据
 
-        # 获取所有表和视图
-        tables_query = """
-            SELECT table_name, table_type
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            ORDER BY table_name
+        直接读取系统目录, 两次查询取回 public 模式下所有表/视图及其列,
+        往返次数与表数量无关, 结果在内存中按表组装。
         """
-        tables_rows = await self.conn.fetch(tables_query)
 
-        # 获取主键信息（一次性查询所有表的主键）
-        pk_query = """
+        # 表和视图（含注释与估算行数）
+        relations_query = """
             SELECT
-                kcu.table_name,
-                kcu.column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu
-                ON tc.constraint_name = kcu.constraint_name
-                AND tc.table_schema = kcu.table_schema
-            WHERE tc.constraint_type = 'PRIMARY KEY'
-                AND tc.table_schema = 'public'
+                c.oid,
+                c.relname,
+                c.relkind,
+                obj_description(c.oid, 'pg_class') AS comment,
+                c.reltuples::bigint AS row_estimate
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public'
+                AND c.relkind IN ('r', 'p', 'v')
+                AND ($1::text[] IS NULL OR c.relname = ANY($1::text[]))
+            ORDER BY c.relname
         """
-        pk_rows = await self.conn.fetch(pk_query)
+        relations_rows = await conn.fetch(relations_query, tables_filter)
 
-        # 构建主键映射 {table_name: {column_name: True}}
-        pk_map: dict[str, set[str]] = {}
-        for pk_row in pk_rows:
-            table = pk_row["table_name"]
-            column = pk_row["column_name"]
-            if table not in pk_map:
-                pk_map[table] = set()
-            pk_map[table].add(column)
+        # 所有列（含主键标记、默认值与注释）
+        columns_query = """
+            SELECT
+                a.attrelid,
+                a.attname,
+                format_type(a.atttypid, a.atttypmod) AS data_type,
+                NOT a.attnotnull AS is_nullable,
+                pg_get_expr(d.adbin, d.adrelid) AS column_default,
+                col_description(a.attrelid, a.attnum) AS comment,
+                COALESCE(a.attnum = ANY(i.indkey), false) AS is_primary_key
+            FROM pg_attribute a
+            JOIN pg_class c ON c.oid = a.attrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_attrdef d
+                ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+            LEFT JOIN pg_index i
+                ON i.indrelid = a.attrelid AND i.indisprimary
+            WHERE n.nspname = 'public'
+                AND c.relkind IN ('r', 'p', 'v')
+                AND a.attnum > 0
+                AND NOT a.attisdropped
+                AND ($1::text[] IS NULL OR c.relname = ANY($1::text[]))
+            ORDER BY a.attrelid, a.attnum
+        """
+        columns_rows = await conn.fetch(columns_query, tables_filter)
+
+        # 按表分组 {oid: [column, ...]}
+        columns_map: dict[int, list[dict[str, Any]]] = {}
+        for col_row in columns_rows:
+            columns_map.setdefault(col_row["attrelid"], []).append(
+                {
+                    "name": col_row["attname"],
+                    "dataType": col_row["data_type"],
+                    "isNullable": col_row["is_nullable"],
+                    "isPrimaryKey": col_row["is_primary_key"],
+                    "defaultValue": col_row["column_default"],
+                    "comment": col_row["comment"],
+                }
+            )
 
         tables: list[dict[str, Any]] = []
         views: list[dict[str, Any]] = []
 
-        for row in tables_rows:
-            table_name = row["table_name"]
-            table_type = row["table_type"]
-
-            # 获取列信息
-            columns_query = """
-                SELECT
-                    column_name,
-                    data_type,
-                    is_nullable,
-                    column_default,
-                    character_maximum_length
-                FROM information_schema.columns
-                WHERE table_schema = 'public' AND table_name = $1
-                ORDER BY ordinal_position
-            """
-            columns_rows = await self.conn.fetch(columns_query, table_name)
-
-            columns = []
-            table_pks = pk_map.get(table_name, set())
-
-            for col_row in columns_rows:
-                columns.append(
-                    {
-                        "name": col_row["column_name"],
-                        "dataType": col_row["data_type"],
-                        "isNullable": col_row["is_nullable"] == "YES",
-                        "isPrimaryKey": col_row["column_name"] in table_pks,
-                        "defaultValue": col_row["column_default"],
-                    }
-                )
-
+        for row in relations_rows:
+            is_view = row["relkind"] == "v"
+            # reltuples 为 -1 表示从未 ANALYZE
+            row_estimate = row["row_estimate"]
             table_info = {
-                "name": table_name,
-                "tableType": table_type.lower(),
-                "columns": columns,
+                "name": row["relname"],
+                "tableType": "view" if is_view else "base table",
+                "columns": columns_map.get(row["oid"], []),
+                "rowCount": row_estimate if not is_view and row_estimate >= 0 else None,
+                "comment": row["comment"],
             }
 
-            if table_type == "BASE TABLE":
-                tables.append(table_info)
-            elif table_type == "VIEW":
+            if is_view:
                 views.append(table_info)
+            else:
+                tables.append(table_info)
 
         return {
             "tables": tables,
             "views": views,
         }
 
+    async def get_schema_versions(self) -> dict[str, str]:
+        """
+        各表/视图的结构版本标记
+
+        系统目录行的 xmin 在 DDL 修改该行时变化: pg_class 行（重命名等
+        表级属性）、pg_attribute 行（增删改列, 删除的列会标记 attisdropped
+        而更新行）、pg_attrdef 行（列默认值）与 pg_description 行（表和列
+        注释, 附带行数以识别删除注释）共同构成标记。
+        """
+        versions_query = """
+            SELECT
+                c.relname,
+                c.xmin::text
+                    || '/' || COALESCE(att.max_xmin, '0')
+                    || '/' || COALESCE(def.max_xmin, '0')
+                    || '/' || COALESCE(dsc.max_xmin, '0') || ':' || dsc.comments AS version
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN LATERAL (
+                SELECT max(a.xmin::text::bigint)::text AS max_xmin
+                FROM pg_attribute a
+                WHERE a.attrelid = c.oid AND a.attnum > 0
+            ) att ON true
+            LEFT JOIN LATERAL (
+                SELECT max(ad.xmin::text::bigint)::text AS max_xmin
+                FROM pg_attrdef ad
+                WHERE ad.adrelid = c.oid
+            ) def ON true
+            LEFT JOIN LATERAL (
+                SELECT max(d.xmin::text::bigint)::text AS max_xmin, count(*) AS comments
+                FROM pg_description d
+                WHERE d.objoid = c.oid AND d.classoid = 'pg_class'::regclass
+            ) dsc ON true
+            WHERE n.nspname = 'public'
+                AND c.relkind IN ('r', 'p', 'v')
+        """
+        async with self._acquire() as conn:
+            rows = await conn.fetch(versions_query)
+        return {row["relname"]: row["version"] for row in rows}
+
     async def close(self) -> None:
-        """关闭连接"""
-        if self.conn:
-            await self.conn.close()
-            self.conn = None
+        """关闭连接池（等待已借出的连接归还）"""
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
 
     async def test_connection(self) -> bool:
         """测试连接"""
         try:
-            if not self.conn:
+            if not self.pool:
                 return False
-            await self.conn.fetchval("SELECT 1")
+            async with self.pool.acquire() as conn:
+                await conn.fetchval("SELECT 1")
             return True
         except Exception:
             return False
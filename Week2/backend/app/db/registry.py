@@ -0,0 +1,203 @@
+"""适配器连接池注册表 - 按连接名称复用长期存活的连接池"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.db.base import DatabaseAdapter
+
+# (连接名称, 数据库类型) -> 未连接的适配器
+AdapterFactory = Callable[[str, str], DatabaseAdapter]
+
+
+class NoLivePoolError(LookupError):
+    """acquire(create=False) 时连接名称没有可用的连接池"""
+
+
+@dataclass
+class _Entry:
+    """一个连接名称对应的已连接适配器"""
+
+    adapter: DatabaseAdapter
+    url: str
+    in_use: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    checked_at: float = field(default_factory=time.monotonic)
+    retired: bool = False
+    loop: asyncio.AbstractEventLoop = field(default_factory=asyncio.get_running_loop)
+
+
+class AdapterRegistry:
+    """
+    按连接名称缓存已连接的适配器（asyncpg / aiomysql 连接池, aiosqlite 连接集合）
+
+    - 首次使用时建立连接池, 之后的请求直接复用, 省去 TLS/认证开销
+    - 空闲超过 idle_timeout 的连接池由后台任务关闭
+    - 距上次检查超过 probe_interval 时, 借出前先做健康探测, 失败则重建
+    - 连接 URL 变化或连接被删除时 invalidate(), 旧连接池在最后一个使用者
+      归还后关闭
+
+    Args:
+        factory: 根据 (连接名称, 数据库类型) 创建适配器
+        idle_timeout: 空闲关闭时间（秒）
+        probe_interval: 健康探测间隔（秒）
+    """
+
+    def __init__(
+        self,
+        factory: AdapterFactory,
+        idle_timeout: float = 300.0,
+        probe_interval: float = 30.0,
+    ) -> None:
+        self._factory = factory
+        self.idle_timeout = idle_timeout
+        self.probe_interval = probe_interval
+        self._entries: dict[str, _Entry] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._sweeper: asyncio.Task[None] | None = None
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        name: str,
+        db_type: str,
+        url: str,
+        touch: bool = True,
+        create: bool = True,
+    ) -> AsyncIterator[DatabaseAdapter]:
+        """
+        借出连接名称对应的已连接适配器
+
+        适配器内部是连接池, 可被多个请求并发使用。
+
+        Args:
+            name: 连接名称
+            db_type: 数据库类型
+            url: 连接 URL（与缓存的不一致时重建）
+            touch: 是否更新最近使用时间（后台探测传 False, 不阻止空闲回收）
+            create: 没有可用连接池时是否新建（后台探测传 False, 不重建已回收的连接池）
+
+        Yields:
+            已连接的适配器
+
+        Raises:
+            NoLivePoolError: create=False 且没有可用的连接池
+        """
+        self._ensure_sweeper()
+        entry = await self._get_entry(name, db_type, url, create)
+        entry.in_use += 1
+        try:
+            yield entry.adapter
+        finally:
+            entry.in_use -= 1
+            if touch:
+                entry.last_used = time.monotonic()
+            if entry.retired and entry.in_use == 0:
+                await self._close_entry(entry)
+
+    async def _get_entry(self, name: str, db_type: str, url: str, create: bool) -> _Entry:
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry.loop is not asyncio.get_running_loop():
+                # 连接池绑定创建它的事件循环（如测试客户端每次请求新建循环）
+                del self._entries[name]
+                entry = None
+            if entry is not None and entry.url != url:
+                await self._retire(name)
+                entry = None
+            if entry is not None and time.monotonic() - entry.checked_at > self.probe_interval:
+                if await entry.adapter.test_connection():
+                    entry.checked_at = time.monotonic()
+                else:
+                    await self._retire(name)
+                    entry = None
+            if entry is None:
+                if not create:
+                    raise NoLivePoolError(name)
+                adapter = self._factory(name, db_type)
+                await adapter.connect(url)
+                entry = _Entry(adapter=adapter, url=url)
+                self._entries[name] = entry
+                self.created += 1
+            else:
+                self.reused += 1
+            return entry
+
+    async def _retire(self, name: str) -> None:
+        """从注册表移除; 没有使用者时立即关闭, 否则由最后一个使用者关闭"""
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return
+        entry.retired = True
+        if entry.in_use == 0:
+            await self._close_entry(entry)
+
+    async def _close_entry(self, entry: _Entry) -> None:
+        try:
+            await entry.adapter.close()
+        except Exception:
+            pass
+
+    async def invalidate(self, name: str) -> None:
+        """连接配置变更或删除后丢弃其连接池"""
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            await self._retire(name)
+        self._locks.pop(name, None)
+
+    async def evict_idle(self) -> int:
+        """关闭空闲超时的连接池, 返回关闭数量"""
+        now = time.monotonic()
+        idle = [
+            name
+            for name, entry in self._entries.items()
+            if entry.in_use == 0 and now - entry.last_used > self.idle_timeout
+        ]
+        for name in idle:
+            entry = self._entries.pop(name)
+            entry.retired = True
+            await self._close_entry(entry)
+        self.evicted += len(idle)
+        return len(idle)
+
+    def _ensure_sweeper(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._sweeper is None or self._sweeper.done() or self._sweeper.get_loop() is not loop:
+            self._sweeper = loop.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self) -> None:
+        interval = max(1.0, min(self.idle_timeout / 2, 60.0))
+        while True:
+            await asyncio.sleep(interval)
+            await self.evict_idle()
+
+    async def close_all(self) -> None:
+        """关闭所有连接池（应用关闭时调用）"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            if self._sweeper.get_loop() is asyncio.get_running_loop():
+                await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        entries = list(self._entries.values())
+        self._entries.clear()
+        self._locks.clear()
+        for entry in entries:
+            entry.retired = True
+            await self._close_entry(entry)
+
+    def stats(self) -> dict[str, Any]:
+        """注册表统计"""
+        return {
+            "pools": len(self._entries),
+            "inUse": sum(entry.in_use for entry in self._entries.values()),
+            "created": self.created,
+            "reused": self.reused,
+            "evicted": self.evicted,
+        }
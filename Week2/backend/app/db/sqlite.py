@@ -1,6 +1,9 @@
 """SQLite 数据库适配器"""
 
 import asyncio
+import hashlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
@@ -10,15 +13,78 @@ import aiosqlite
 from app.db.base import DatabaseAdapter
 
 
+class SQLiteConnectionSet:
+    """
+    SQLite 连接集合
+
+    aiosqlite 每个连接独占一个线程, 查询在连接内串行执行; 多个连接
+    让同一文件上的读查询可以并行。连接按需创建, 最多 size 个。
+
+    Args:
+        db_path: 数据库文件路径
+        size: 最大连接数
+    """
+
+    def __init__(self, db_path: str, size: int = 1) -> None:
+        self.db_path = db_path
+        self.size = max(1, size)
+        self._idle: list[aiosqlite.Connection] = []
+        self._all: list[aiosqlite.Connection] = []
+        self._available = asyncio.Semaphore(self.size)
+
+    async def _open(self) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.db_path)
+        # 设置行工厂以返回字典
+        conn.row_factory = aiosqlite.Row
+        self._all.append(conn)
+        return conn
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        """借出一个连接, 用完归还"""
+        async with self._available:
+            conn = self._idle.pop() if self._idle else await self._open()
+            cancelled = False
+            try:
+                yield conn
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                if cancelled:
+                    # 线程中可能仍有语句在执行, 丢弃该连接
+                    await self._discard(conn)
+                else:
+                    self._idle.append(conn)
+
+    async def _discard(self, conn: aiosqlite.Connection) -> None:
+        self._all.remove(conn)
+        try:
+            await conn.interrupt()
+            await conn.close()
+        except Exception:
+            pass
+
+    async def close(self) -> None:
+        """关闭所有连接"""
+        connections, self._all, self._idle = self._all, [], []
+        for conn in connections:
+            await conn.close()
+
+
 class SQLiteAdapter(DatabaseAdapter):
     """SQLite 适配器"""
 
-    def __init__(self) -> None:
-        self.conn: aiosqlite.Connection | None = None
+    def __init__(self, pool_size: int = 1) -> None:
+        self.pool: SQLiteConnectionSet | None = None
+        self.pool_size = max(1, pool_size)
         self.url: str = ""
+        # 上次探测时的 schema_version 与各表标记
+        self._schema_version: int | None = None
+        self._schema_versions: dict[str, str] = {}
 
     async def connect(self, url: str) -> None:
-        """建立 SQLite 连接"""
+        """建立 SQLite 连接集合（首个连接立即打开以校验路径）"""
         self.url = url
         # 解析 URL: sqlite:///path/to/db.db
         parsed = urlparse(url)
@@ -27,9 +93,15 @@ class SQLiteAdapter(DatabaseAdapter):
         # 确保目录存在
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        self.conn = await aiosqlite.connect(db_path)
-        # 设置行工厂以返回字典
-        self.conn.row_factory = aiosqlite.Row
+        self.pool = SQLiteConnectionSet(db_path, self.pool_size)
+        async with self.pool.acquire():
+            pass
+
+    def _acquire(self) -> Any:
+        """从连接集合获取连接（async with 使用）"""
+        if not self.pool:
+            raise RuntimeError("数据库未连接")
+        return self.pool.acquire()
 
     async def execute(
         self,
@@ -37,91 +109,154 @@ class SQLiteAdapter(DatabaseAdapter):
         timeout: float = 30.0,
     ) -> list[dict[str, Any]]:
         """执行 SQL 查询"""
-        if not self.conn:
-            raise RuntimeError("数据库未连接")
+        async with self._acquire() as conn:
+            try:
+                cursor = await asyncio.wait_for(
+                    conn.execute(sql),
+                    timeout=timeout,
+                )
+                rows = await asyncio.wait_for(
+                    cursor.fetchall(),
+                    timeout=timeout,
+                )
+            except TimeoutError:
+                # 中断仍在线程中执行的语句, 连接可继续使用
+                await conn.interrupt()
+                raise TimeoutError(f"查询超时（{timeout}秒）")
+        # 转换为字典列表
+        return [dict(row) for row in rows]
 
-        try:
-            cursor = await asyncio.wait_for(
-                self.conn.execute(sql),
-                timeout=timeout,
-            )
-            rows = await asyncio.wait_for(
-                cursor.fetchall(),
-                timeout=timeout,
-            )
-            # 转换为字典列表
-            return [dict(row) for row in rows]
-        except TimeoutError:
-            raise TimeoutError(f"查询超时（{timeout}秒）")
+    async def stream(
+        self,
+        sql: str,
+        batch_size: int = 1000,
+        timeout: float = 30.0,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """游标分批读取（SQLite 按步计算结果, 未取的行不会物化）"""
+        async with self._acquire() as conn:
+            cursor: aiosqlite.Cursor | None = None
+            try:
+                cursor = await asyncio.wait_for(conn.execute(sql), timeout=timeout)
+                while True:
+                    rows = await asyncio.wait_for(cursor.fetchmany(batch_size), timeout=timeout)
+                    if not rows:
+                        break
+                    yield [dict(row) for row in rows]
+            except TimeoutError:
+                # 先中断线程中的语句, 之后关闭游标才不会排在它后面等待
+                await conn.interrupt()
+                raise TimeoutError(f"查询超时（{timeout}秒）")
+            finally:
+                if cursor is not None:
+                    await cursor.close()
 
-    async def get_metadata(self) -> dict[str, Any]:
+    async def get_metadata(self, tables: list[str] | None = None) -> dict[str, Any]:
         """获取 SQLite 元数据"""
-        if not self.conn:
-            raise RuntimeError("数据库未连接")
+        async with self._acquire() as conn:
+            return await self._get_metadata(conn, tables)
 
-        # 获取所有表和视图
-        tables_query = """
-            SELECT name, type
-            FROM sqlite_master
-            WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%'
-            ORDER BY name
+    async def _get_metadata(
+        self,
+        conn: aiosqlite.Connection,
+        tables_filter: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """在指定连接上提取元数据（一次查询取回所有表/视图的列）"""
+        # pragma_table_info 表值函数与 sqlite_master 连接, 替代逐表 PRAGMA
+        metadata_query = """
+            SELECT
+                m.name AS table_name,
+                m.type AS table_type,
+                p.name AS column_name,
+                p.type AS data_type,
+                p."notnull" AS not_null,
+                p.dflt_value AS default_value,
+                p.pk AS pk
+            FROM sqlite_master m
+            JOIN pragma_table_info(m.name) p
+            WHERE m.type IN ('table', 'view') AND m.name NOT LIKE 'sqlite_%'{table_filter}
+            ORDER BY m.name, p.cid
         """
 
-        cursor = await self.conn.execute(tables_query)
-        tables_rows = await cursor.fetchall()
-
-        tables: list[dict[str, Any]] = []
-        views: list[dict[str, Any]] = []
-
-        for row in tables_rows:
-            table_name = row["name"]
-            table_type = row["type"]
-
-            # 使用 PRAGMA 获取列信息
-            pragma_query = f"PRAGMA table_info({table_name})"
-            cursor = await self.conn.execute(pragma_query)
-            columns_rows = await cursor.fetchall()
-
-            columns = []
-            for col_row in columns_rows:
-                columns.append(
-                    {
-                        "name": col_row["name"],
-                        "dataType": col_row["type"] or "TEXT",
-                        "isNullable": not col_row["notnull"],
-                        "defaultValue": col_row["dflt_value"],
-                    }
-                )
+        table_filter = ""
+        if tables_filter is not None:
+            if not tables_filter:
+                return {"tables": [], "views": []}
+            table_filter = f" AND m.name IN ({', '.join('?' * len(tables_filter))})"
 
-            table_info = {
-                "name": table_name,
-                "tableType": table_type.lower(),
-                "columns": columns,
-            }
+        cursor = await conn.execute(
+            metadata_query.format(table_filter=table_filter), tables_filter or ()
+        )
+        rows = await cursor.fetchall()
 
-            if table_type == "table":
-                tables.append(table_info)
-            elif table_type == "view":
-                views.append(table_info)
+        # 按表分组, 保持 ORDER BY 的表顺序
+        relations: dict[str, dict[str, Any]] = {}
+        for row in rows:
+            table_name = row["table_name"]
+            table_info = relations.get(table_name)
+            if table_info is None:
+                table_info = relations[table_name] = {
+                    "name": table_name,
+                    "tableType": row["table_type"].lower(),
+                    "columns": [],
+                }
+            table_info["columns"].append(
+                {
+                    "name": row["column_name"],
+                    "dataType": row["data_type"] or "TEXT",
+                    "isNullable": not row["not_null"],
+                    "isPrimaryKey": row["pk"] > 0,
+                    "defaultValue": row["default_value"],
+                }
+            )
 
         return {
-            "tables": tables,
-            "views": views,
+            "tables": [t for t in relations.values() if t["tableType"] == "table"],
+            "views": [t for t in relations.values() if t["tableType"] == "view"],
+        }
+
+    async def get_schema_versions(self) -> dict[str, str]:
+        """
+        各表/视图的结构版本标记
+
+        PRAGMA schema_version 在任何结构变化时递增; 未变化时直接复用上次的
+        结果, 变化时再用 sqlite_master 中的建表语句哈希区分具体的表。
+        """
+        async with self._acquire() as conn:
+            cursor = await conn.execute("PRAGMA schema_version")
+            row = await cursor.fetchone()
+            schema_version = row[0]
+            if schema_version == self._schema_version:
+                return dict(self._schema_versions)
+
+            cursor = await conn.execute(
+                """
+                SELECT name, sql
+                FROM sqlite_master
+                WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%'
+                """
+            )
+            rows = await cursor.fetchall()
+
+        self._schema_versions = {
+            row["name"]: hashlib.sha1((row["sql"] or "").encode()).hexdigest() for row in rows
         }
+        self._schema_version = schema_version
+        return dict(self._schema_versions)
 
     async def close(self) -> None:
-        """关闭连接"""
-        if self.conn:
-            await self.conn.close()
-            self.conn = None
+        """关闭连接集合"""
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
 
     async def test_connection(self) -> bool:
         """测试连接"""
         try:
-            if not self.conn:
+            if not self.pool:
                 return False
-            cursor = await self.conn.execute("SELECT 1")
-            await cursor.fetchone()
+            async with self.pool.acquire() as conn:
+                cursor = await conn.execute("SELECT 1")
+                await cursor.fetchone()
             return True
         except Exception:
             return False
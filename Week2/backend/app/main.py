@@ -1,19 +1,36 @@
 """FastAPI 应用入口"""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1 import api_router
 from app.config import settings
+from app.services.db_service import adapter_registry
+from app.services.metadata_refresher import MetadataRefresher
 from app.storage.local_db import init_db
 
 # 初始化数据库
 init_db()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """应用生命周期: 启动后台元数据刷新, 关闭时释放所有数据库连接池"""
+    refresher = MetadataRefresher(settings.metadata_refresh_interval_seconds)
+    refresher.start()
+    yield
+    await refresher.close()
+    await adapter_registry.close_all()
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
 # 配置 CORS - 允许所有来源
@@ -0,0 +1,56 @@
+"""查询结果导出 Pydantic 模型"""
+
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
+
+ExportFormat = Literal["csv", "json", "xlsx"]
+ExportStatus = Literal["pending", "running", "completed", "failed", "cancelled"]
+
+
+class ExportRequest(BaseModel):
+    """导出请求模型"""
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True,
+    )
+
+    sql: str = Field(
+        ...,
+        description="SQL 查询语句（导出时重新执行）",
+        min_length=1,
+        max_length=10000,
+    )
+    format: ExportFormat = Field("csv", description="导出格式: csv / json / xlsx")
+    gzip: bool = Field(False, description="是否 gzip 压缩（文件名追加 .gz）")
+    delimiter: Literal[",", ";", "\t", "|"] | None = Field(
+        None,
+        description="CSV 分隔符（不指定时根据数据内容自动选择）",
+    )
+    filename: str | None = Field(
+        None,
+        description="文件名（不含扩展名, 默认取单表查询的表名或 query_results）",
+        max_length=200,
+    )
+
+
+class ExportJobInfo(BaseModel):
+    """导出任务状态模型"""
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True,
+    )
+
+    export_id: str = Field(..., description="导出任务 ID（同时用作取消令牌）")
+    status: ExportStatus = Field(..., description="任务状态")
+    format: ExportFormat = Field(..., description="导出格式")
+    filename: str = Field(..., description="下载文件名")
+    download_url: str = Field(..., description="下载地址（仅可下载一次）")
+    row_count: int = Field(0, description="已写出的行数")
+    bytes_written: int = Field(0, description="已发送的字节数")
+    elapsed_ms: int = Field(0, description="开始下载至今（或至结束）的耗时（毫秒）")
+    delimiter: str | None = Field(None, description="CSV 实际使用的分隔符")
+    error: str | None = Field(None, description="失败原因")
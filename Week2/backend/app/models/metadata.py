@@ -51,3 +51,6 @@ class DatabaseMetadata(BaseModel):
     cached_at: str | None = Field(None, description="缓存时间")
     needs_refresh: bool = Field(False, description="是否需要刷新")
     warnings: list[str] = Field(default_factory=list, description="提取时的警告信息")
+    schema_versions: dict[str, str] = Field(
+        default_factory=dict, description="各表结构版本标记（变更检测用）"
+    )
@@ -1,6 +1,6 @@
 """查询 Pydantic 模型"""
 
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
@@ -22,6 +22,21 @@ class QueryRequest(BaseModel):
     )
 
 
+class QueryStreamRequest(QueryRequest):
+    """流式查询请求模型"""
+
+    format: Literal["ndjson", "arrow"] = Field(
+        "ndjson",
+        description="传输格式: ndjson（每批一行 JSON）或 arrow（Arrow IPC 流）",
+    )
+    limit: int | None = Field(
+        None,
+        description="交互式结果的默认 LIMIT（与普通查询相同的上限; 不指定时为 stream_max_rows）",
+        ge=1,
+        le=10000,
+    )
+
+
 class QueryResultColumn(BaseModel):
     """查询结果列信息模型"""
 
@@ -77,3 +92,21 @@ class NaturalLanguageQueryResult(BaseModel):
     generated_sql: str = Field(..., description="生成的 SQL")
     result: QueryResult | None = Field(None, description="查询结果（如果执行）")
     generation_time_ms: int = Field(..., description="SQL 生成时间（毫秒）")
+    cached: bool = Field(False, description="是否复用了缓存或并发请求的生成结果")
+
+
+class NaturalQueryCacheStats(BaseModel):
+    """自然语言生成 SQL 缓存统计模型"""
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True,
+    )
+
+    entries: int = Field(0, description="该连接已缓存的条目数")
+    hits: int = Field(0, description="本进程启动以来的缓存命中次数")
+    coalesced: int = Field(0, description="本进程启动以来合并到进行中请求的次数")
+    misses: int = Field(0, description="本进程启动以来调用 AI 生成的次数")
+    hit_rate: float = Field(0.0, description="命中率（命中与合并 / 总请求）")
+    total_hits: int = Field(0, description="缓存条目的累计命中次数（重启后保留）")
+    ttl_seconds: float = Field(0.0, description="缓存有效期（秒）")
@@ -4,12 +4,13 @@ import logging
 import re
 from datetime import UTC, datetime
 
-import sqlglot
 from openai import AsyncOpenAI
 
 from app.config import settings
 from app.models.metadata import DatabaseMetadata
+from app.services.schema_context import build_schema_context
 from app.utils.error_handler import ErrorCode, create_error_response
+from app.utils.sql_validator import analyze_sql, to_sqlglot_dialect
 
 logger = logging.getLogger(__name__)
 
@@ -69,51 +70,23 @@ FORBIDDEN_FUNCTIONS = [
     "DUMPFILE",
 ]
 
-# 系统表前缀
-SYSTEM_TABLE_PREFIXES = [
-    "information_schema",
-    "pg_catalog",
-    "pg_",
-    "mysql.",
-    "sys.",
-    "performance_schema",
-]
-
-
-def format_metadata_context(metadata: DatabaseMetadata, max_tokens: int = 4000) -> str:
+def format_metadata_context(
+    metadata: DatabaseMetadata,
+    prompt: str = "",
+    max_tokens: int | None = None,
+) -> str:
     """
     格式化元数据为 AI 上下文
 
     Args:
         metadata: 数据库元数据
-        max_tokens: 最大 token 数（约 16000 字符）
+        prompt: 自然语言查询描述（用于按相关度挑选表和列）
+        max_tokens: token 预算（默认 settings.ai_context_max_tokens）
 
     Returns:
         格式化的元数据字符串
     """
-    context_parts = []
-
-    # 添加表信息
-    if metadata.tables:
-        context_parts.append("表 (Tables):")
-        for table in metadata.tables[:20]:  # 限制表数量
-            columns = ", ".join([col.name for col in table.columns[:10]])  # 限制列数量
-            context_parts.append(f"  - {table.name}: {columns}")
-
-    # 添加视图信息
-    if metadata.views:
-        context_parts.append("\n视图 (Views):")
-        for view in metadata.views[:10]:  # 限制视图数量
-            columns = ", ".join([col.name for col in view.columns[:10]])
-            context_parts.append(f"  - {view.name}: {columns}")
-
-    context = "\n".join(context_parts)
-
-    # 简单检查长度（实际应该使用 tiktoken 计算 tokens）
-    if len(context) > max_tokens * 4:  # 粗略估算：1 token ≈ 4 字符
-        context = context[: max_tokens * 4] + "\n... (部分表未包含在上下文中)"
-
-    return context
+    return build_schema_context(metadata, prompt, max_tokens)
 
 
 def _clean_ai_output(sql: str) -> str:
@@ -145,99 +118,78 @@ def _clean_ai_output(sql: str) -> str:
     return sql.strip()
 
 
-def _validate_whitelist(sql: str) -> tuple[bool, str | None]:
+def _validate_whitelist(sql: str, dialect: str = "postgres") -> tuple[bool, str | None]:
     """
-    白名单验证
+    白名单验证（复用 sql_validator 的单次解析结果）
 
     Args:
         sql: SQL 语句
+        dialect: sqlglot 方言
 
     Returns:
         (is_valid, error_message)
     """
-    try:
-        # 解析 SQL
-        parsed = sqlglot.parse_one(sql)
-        sql_upper = sql.upper()
-
-        # 提取所有 SQL 关键字（简化版）
-        keywords = set()
-        for token in sql_upper.split():
-            # 清理标点符号
-            cleaned = re.sub(r"[^\w]", "", token)
-            if cleaned and cleaned.isupper():
-                keywords.add(cleaned)
-
-        # 检测非法关键字
-        illegal = (
-            keywords
-            - ALLOWED_KEYWORDS
-            - {
-                "TABLE",
-                "COLUMN",
-                "VALUE",
-            }
-        )  # 允许一些常见词
-        if illegal:
-            # 过滤掉表名和列名（通常不是全大写）
-            real_illegal = {kw for kw in illegal if len(kw) > 2}
-            if real_illegal:
-                return False, f"包含非法关键字: {', '.join(list(real_illegal)[:3])}"
-
-        # 检测子查询
-        if "(" in sql and sql.count("SELECT") > 1:
-            return False, "不允许子查询"
-
-        # 检测系统函数
-        for func in FORBIDDEN_FUNCTIONS:
-            if func + "(" in sql_upper or func + " " in sql_upper:
-                return False, f"不允许系统函数: {func}"
-
-        return True, None
-
-    except Exception as e:
-        return False, f"验证失败: {str(e)}"
-
-
-def _validate_table_names(sql: str, metadata: DatabaseMetadata) -> tuple[bool, str | None]:
+    analysis = analyze_sql(sql, dialect)
+    if not analysis.is_valid:
+        return False, analysis.error
+
+    # 检测非法关键字（标识符与字面量已在词法分析时排除）
+    illegal = (
+        analysis.keywords
+        - ALLOWED_KEYWORDS
+        - {
+            "TABLE",
+            "COLUMN",
+            "VALUE",
+        }
+    )  # 允许一些常见词
+    real_illegal = {kw for kw in illegal if len(kw) > 2}
+    if real_illegal:
+        return False, f"包含非法关键字: {', '.join(sorted(real_illegal)[:3])}"
+
+    # 检测子查询
+    if analysis.has_subquery:
+        return False, "不允许子查询"
+
+    # 检测系统函数
+    for func in FORBIDDEN_FUNCTIONS:
+        if func in analysis.functions:
+            return False, f"不允许系统函数: {func}"
+
+    return True, None
+
+
+def _validate_table_names(
+    sql: str,
+    metadata: DatabaseMetadata,
+    dialect: str = "postgres",
+) -> tuple[bool, str | None]:
     """
     验证表名存在性
 
     Args:
         sql: SQL 语句
         metadata: 数据库元数据
+        dialect: sqlglot 方言
 
     Returns:
         (is_valid, error_message)
     """
-    try:
-        # 获取所有有效的表名
-        valid_tables = {table.name.lower() for table in metadata.tables}
-        valid_tables.update({view.name.lower() for view in metadata.views})
-
-        # 解析 SQL 获取引用的表
-        parsed = sqlglot.parse_one(sql)
-        referenced_tables = set()
-
-        for table_node in parsed.find_all(sqlglot.exp.Table):
-            table_name = table_node.name.lower()
-            referenced_tables.add(table_name)
+    # 获取所有有效的表名
+    valid_tables = {table.name.lower() for table in metadata.tables}
+    valid_tables.update({view.name.lower() for view in metadata.views})
 
-        # 检查系统表
-        sql_lower = sql.lower()
-        for prefix in SYSTEM_TABLE_PREFIXES:
-            if prefix in sql_lower:
-                return False, f"不允许访问系统表: {prefix}"
+    # 解析结果中的表引用（系统表已在 analyze_sql 中拒绝）
+    analysis = analyze_sql(sql, dialect)
+    if not analysis.is_valid:
+        return False, f"表名验证失败: {analysis.error}"
 
-        # 检查表名是否存在
-        for table in referenced_tables:
-            if table not in valid_tables:
-                return False, f"表 '{table}' 不存在于当前数据库"
+    # 检查表名是否存在
+    for table in sorted(analysis.tables):
+        if table not in valid_tables:
+            return False, f"表 '{table}' 不存在于当前数据库"
 
-        return True, None
-
-    except Exception as e:
-        return False, f"表名验证失败: {str(e)}"
+    return True, None
 
 
 async def _log_rejected_sql(prompt: str, sql: str, reason: str):
@@ -284,8 +236,8 @@ async def generate_sql(
 
     client = AsyncOpenAI(api_key=settings.openai_api_key)
 
-    # 格式化元数据上下文
-    metadata_context = format_metadata_context(metadata)
+    # 格式化元数据上下文（按提示词相关度挑选, 不超过 token 预算）
+    metadata_context = format_metadata_context(metadata, prompt)
 
     system_prompt = f"""你是一个 SQL 专家。根据用户的自然语言描述生成 {dialect} SQL 查询。
 
@@ -320,8 +272,9 @@ async def generate_sql(
         # === 第 1 步: 清洗输出 ===
         cleaned_sql = _clean_ai_output(content)
 
-        # === 第 2 步: 白名单验证 ===
-        is_safe, whitelist_error = _validate_whitelist(cleaned_sql)
+        # === 第 2 步: 白名单验证（与第 3 步及执行时的验证共用同一次解析）===
+        sql_dialect = to_sqlglot_dialect(dialect)
+        is_safe, whitelist_error = _validate_whitelist(cleaned_sql, sql_dialect)
         if not is_safe:
             await _log_rejected_sql(prompt, cleaned_sql, f"白名单验证失败: {whitelist_error}")
             raise create_error_response(
@@ -330,7 +283,7 @@ async def generate_sql(
             )
 
         # === 第 3 步: 表名验证 ===
-        is_valid_tables, table_error = _validate_table_names(cleaned_sql, metadata)
+        is_valid_tables, table_error = _validate_table_names(cleaned_sql, metadata, sql_dialect)
         if not is_valid_tables:
             await _log_rejected_sql(prompt, cleaned_sql, f"表名验证失败: {table_error}")
             raise create_error_response(
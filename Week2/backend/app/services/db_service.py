@@ -5,13 +5,16 @@ from urllib.parse import urlparse
 
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.db.base import DatabaseAdapter
 from app.db.mysql import MySQLAdapter
 from app.db.postgres import PostgresAdapter
+from app.db.registry import AdapterRegistry
 from app.db.sqlite import SQLiteAdapter
 from app.models.database import DatabaseConnectionResponse, DatabaseType
 from app.storage.local_db import LocalStorage
 from app.utils.error_handler import ErrorCode, create_error_response
+from app.utils.locks import discard_connection_gate
 
 
 def parse_database_url(url: str) -> tuple[str, str, str | None, int | None, str]:
@@ -54,18 +57,32 @@ def validate_connection_name(name: str) -> None:
         raise ValueError("连接名称长度必须在 1-100 字符之间")
 
 
-def get_adapter(db_type: str) -> DatabaseAdapter:
-    """根据数据库类型获取适配器"""
+def get_adapter(db_type: str, pool_size: int = 1) -> DatabaseAdapter:
+    """根据数据库类型获取适配器（pool_size 为连接池最大连接数）"""
     if db_type == DatabaseType.POSTGRESQL.value or db_type == "postgresql":
-        return PostgresAdapter()
+        return PostgresAdapter(pool_size)
     elif db_type == DatabaseType.MYSQL.value or db_type == "mysql":
-        return MySQLAdapter()
+        return MySQLAdapter(pool_size)
     elif db_type == DatabaseType.SQLITE.value or db_type == "sqlite":
-        return SQLiteAdapter()
+        return SQLiteAdapter(pool_size)
     else:
         raise ValueError(f"不支持的数据库类型: {db_type}")
 
 
+def _pooled_adapter(name: str, db_type: str) -> DatabaseAdapter:
+    """注册表使用的适配器: 连接池大小与该连接的查询并发上限一致"""
+    pool_size = settings.query_concurrency_overrides.get(name, settings.query_max_concurrency)
+    return get_adapter(db_type, pool_size)
+
+
+# 进程级适配器连接池注册表（按连接名称）
+adapter_registry = AdapterRegistry(
+    _pooled_adapter,
+    idle_timeout=settings.adapter_idle_timeout_seconds,
+    probe_interval=settings.adapter_probe_interval_seconds,
+)
+
+
 async def validate_connection(url: str) -> tuple[bool, str | None]:
     """
     验证数据库连接
@@ -180,6 +197,9 @@ class DatabaseService:
         # 解析 URL
         db_type, _, host, port, database = parse_database_url(url)
 
+        # URL 变化后旧连接池不再可用
+        await adapter_registry.invalidate(name)
+
         # 更新连接
         updated_conn = LocalStorage.update_connection(
             db,
@@ -242,7 +262,7 @@ class DatabaseService:
         ]
 
     @staticmethod
-    def delete_connection(db: Session, name: str) -> None:
+    async def delete_connection(db: Session, name: str) -> None:
         """删除数据库连接"""
         conn = LocalStorage.get_connection_by_name(db, name)
         if not conn:
@@ -252,3 +272,5 @@ class DatabaseService:
             )
 
         LocalStorage.delete_connection(db, conn)
+        discard_connection_gate(name)
+        await adapter_registry.invalidate(name)
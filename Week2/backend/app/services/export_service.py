@@ -0,0 +1,469 @@
+"""查询结果导出服务 - 服务端游标重新执行, 流式编码为 CSV / JSON / XLSX"""
+
+import base64
+import csv
+import datetime
+import decimal
+import io
+import json
+import math
+import re
+import time
+import uuid
+import zipfile
+import zlib
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+from xml.sax.saxutils import escape
+
+from fastapi import HTTPException
+
+from app.config import settings
+from app.models.export import ExportJobInfo, ExportRequest
+from app.models.query import QueryRequest
+from app.services.query_service import QueryService, QueryStream
+from app.services.result_stream import json_default
+from app.storage.models import DatabaseConnection
+from app.utils.error_handler import ERROR_STATUS_MAP, ErrorCode, create_error_response
+from app.utils.sql_validator import analyze_sql, to_sqlglot_dialect
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "json": "application/json",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+GZIP_MEDIA_TYPE = "application/gzip"
+
+# 自动选择时的候选分隔符（按优先级）
+CSV_DELIMITERS = (",", ";", "\t", "|")
+
+# 以这些字符开头的表头会被电子表格当作公式
+_FORMULA_PREFIXES = ("=", "+", "-", "@")
+
+
+class ExportCancelledError(Exception):
+    """导出被取消（中断响应, 客户端得到不完整的下载）"""
+
+
+@dataclass
+class ExportJob:
+    """一次导出: 创建时验证 SQL, 下载时重新执行并流式写出"""
+
+    export_id: str
+    connection_name: str
+    sql: str
+    format: str
+    gzip: bool
+    delimiter: str | None
+    filename: str
+    status: str = "pending"
+    row_count: int = 0
+    bytes_written: int = 0
+    error: str | None = None
+    created_at: float = field(default_factory=time.monotonic)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    def cancel(self) -> None:
+        """取消: 未开始的任务不能再下载, 进行中的任务在下一批处中断"""
+        if not self.finished:
+            self.finish("cancelled")
+
+    def finish(self, status: str, error: str | None = None) -> None:
+        self.status = status
+        self.error = error
+        self.finished_at = time.monotonic()
+
+    def info(self) -> ExportJobInfo:
+        """任务状态（进度轮询）"""
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return ExportJobInfo(
+            export_id=self.export_id,
+            status=self.status,
+            format=self.format,
+            filename=self.filename,
+            download_url=(
+                f"/api/v1/dbs/{self.connection_name}/query/export/{self.export_id}/download"
+            ),
+            row_count=self.row_count,
+            bytes_written=self.bytes_written,
+            elapsed_ms=int(elapsed * 1000),
+            delimiter=self.delimiter,
+            error=self.error,
+        )
+
+
+class ExportJobRegistry:
+    """
+    进程内导出任务表
+
+    导出 ID 同时是取消令牌; 已结束或一直未下载的任务 ttl 秒后清理。
+
+    Args:
+        ttl: 任务保留时间（秒）
+    """
+
+    def __init__(self, ttl: float = 600.0) -> None:
+        self.ttl = ttl
+        self._jobs: dict[str, ExportJob] = {}
+
+    def add(self, job: ExportJob) -> None:
+        self._prune()
+        self._jobs[job.export_id] = job
+
+    def get(self, connection_name: str, export_id: str) -> ExportJob | None:
+        self._prune()
+        job = self._jobs.get(export_id)
+        if job is None or job.connection_name != connection_name:
+            return None
+        return job
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        expired = [
+            export_id
+            for export_id, job in self._jobs.items()
+            if job.status != "running"
+            and now - (job.finished_at or job.created_at) > self.ttl
+        ]
+        for export_id in expired:
+            del self._jobs[export_id]
+
+
+export_jobs = ExportJobRegistry(settings.export_job_ttl_seconds)
+
+
+class ExportService:
+    """导出服务类"""
+
+    @staticmethod
+    def create_job(connection: DatabaseConnection, request: ExportRequest) -> ExportJob:
+        """验证 SQL 并登记导出任务（此时不执行查询）"""
+        sql = request.sql.strip()
+        max_rows = settings.stream_max_rows
+        QueryService.prepare_sql(connection, sql, limit=max_rows, max_limit=max_rows)
+
+        extension = request.format + (".gz" if request.gzip else "")
+        job = ExportJob(
+            export_id=uuid.uuid4().hex,
+            connection_name=connection.name,
+            sql=sql,
+            format=request.format,
+            gzip=request.gzip,
+            delimiter=request.delimiter,
+            filename=f"{_base_filename(connection, sql, request.filename)}.{extension}",
+        )
+        export_jobs.add(job)
+        return job
+
+    @staticmethod
+    async def open_download(connection: DatabaseConnection, job: ExportJob) -> QueryStream:
+        """
+        开始下载: 用服务端游标重新执行查询
+
+        首批结果取回前的错误以 HTTP 错误响应。每个任务只能下载一次。
+
+        Returns:
+            已取回首批结果的 QueryStream（交给 chunks() 编码, release() 释放）
+        """
+        if job.status != "pending":
+            raise create_error_response(
+                ErrorCode.CONFLICT,
+                f"导出任务状态为 {job.status}, 不能下载",
+                status_code=ERROR_STATUS_MAP[ErrorCode.CONFLICT],
+            )
+        job.status = "running"
+        job.started_at = time.monotonic()
+        try:
+            stream = await QueryService.open_stream(connection, QueryRequest(sql=job.sql))
+        except HTTPException as e:
+            job.finish("failed", e.detail["message"])
+            raise
+        return stream
+
+    @staticmethod
+    async def chunks(job: ExportJob, stream: QueryStream) -> AsyncIterator[bytes]:
+        """
+        编码为导出格式, 可选 gzip 压缩, 并记录进度
+
+        每批检查一次取消标记, 内存中只保留一个批次; 结束时释放连接。
+        """
+        encoder = _ENCODERS[job.format]
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if job.gzip else None
+        try:
+            async for chunk in encoder(job, _batches(job, stream)):
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                if chunk:
+                    job.bytes_written += len(chunk)
+                    yield chunk
+            if compressor is not None:
+                tail = compressor.flush()
+                job.bytes_written += len(tail)
+                yield tail
+            job.finish("completed")
+        except HTTPException as e:
+            job.finish("failed", e.detail["message"])
+            raise
+        except ExportCancelledError:
+            raise
+        except Exception as e:
+            job.finish("failed", str(e))
+            raise
+        finally:
+            await ExportService.release(job, stream)
+
+    @staticmethod
+    async def release(job: ExportJob, stream: QueryStream) -> None:
+        """释放连接; 未正常结束的任务（客户端中途断开）记为已取消"""
+        if not job.finished:
+            job.finish("cancelled")
+        await stream.aclose()
+
+
+async def _batches(job: ExportJob, stream: QueryStream) -> AsyncIterator[list[dict[str, Any]]]:
+    async for batch in stream:
+        if job.status == "cancelled":
+            raise ExportCancelledError(f"导出 {job.export_id} 已取消")
+        job.row_count += len(batch)
+        yield batch
+
+
+# === CSV ===
+
+
+def detect_delimiter(rows: list[dict[str, Any]]) -> str:
+    """
+    根据数据内容选择 CSV 分隔符
+
+    默认使用逗号, 含逗号的字段按 RFC 4180 加引号。只有超过一半的文本
+    字段含逗号（如小数逗号、逗号分隔的列表）时, 才改用数据中出现最少的
+    其他分隔符, 避免几乎每个字段都要加引号。
+    """
+    texts = [value for row in rows for value in row.values() if isinstance(value, str) and value]
+    if not texts or sum("," in text for text in texts) * 2 <= len(texts):
+        return ","
+    return min(CSV_DELIMITERS[1:], key=lambda d: sum(text.count(d) for text in texts))
+
+
+def _csv_header(name: str) -> str:
+    """防止公式注入: 以 = + - @ 开头的列名加单引号前缀"""
+    return f"'{name}" if name.startswith(_FORMULA_PREFIXES) else name
+
+
+def _csv_value(value: Any) -> Any:
+    """CSV 单元格值（文本同样防止公式注入, 数值保持原样）"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime.date | datetime.time):
+        return value.isoformat()
+    if isinstance(value, bytes | bytearray | memoryview):
+        return base64.b64encode(bytes(value)).decode()
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+async def _csv_chunks(
+    job: ExportJob, batches: AsyncIterator[list[dict[str, Any]]]
+) -> AsyncIterator[bytes]:
+    """UTF-8 BOM + CRLF 行尾, 按需加引号（RFC 4180）, NULL 为空字段"""
+    buffer = io.StringIO()
+    buffer.write("\ufeff")
+    writer = None
+    names: list[str] = []
+    async for batch in batches:
+        if writer is None:
+            job.delimiter = job.delimiter or detect_delimiter(batch)
+            writer = csv.writer(buffer, delimiter=job.delimiter, lineterminator="\r\n")
+            names = list(batch[0])
+            writer.writerow([_csv_header(name) for name in names])
+        writer.writerows([_csv_value(row[name]) for name in names] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if writer is None:
+        # 空结果: 列未知, 只有 BOM
+        job.delimiter = job.delimiter or ","
+        yield buffer.getvalue().encode()
+
+
+# === JSON ===
+
+
+def _export_json_default(value: Any) -> Any:
+    """二进制数据按 base64 导出, 其余与查询接口一致"""
+    if isinstance(value, bytes | bytearray | memoryview):
+        return base64.b64encode(bytes(value)).decode()
+    return json_default(value)
+
+
+def _json_dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=_export_json_default)
+
+
+async def _json_chunks(
+    job: ExportJob, batches: AsyncIterator[list[dict[str, Any]]]
+) -> AsyncIterator[bytes]:
+    """{"data": [行对象...], "metadata": {列信息, 导出时间, 行数, SQL}}（UTF-8, 无 BOM）"""
+    exported_at = datetime.datetime.now(datetime.UTC).isoformat()
+    columns: list[dict[str, str]] = []
+    separator = "\n"
+    yield b'{"data": ['
+    async for batch in batches:
+        if not columns:
+            columns = [
+                {"name": name, "dataType": type(value).__name__} for name, value in batch[0].items()
+            ]
+        parts = []
+        for row in batch:
+            parts.append(separator + _json_dumps(row))
+            separator = ",\n"
+        yield "".join(parts).encode()
+    # 行数在写完数据后才知道, 元数据放在末尾
+    metadata = {
+        "columns": columns,
+        "exportedAt": exported_at,
+        "rowCount": job.row_count,
+        "sql": job.sql,
+    }
+    yield f'\n], "metadata": {_json_dumps(metadata)}}}\n'.encode()
+
+
+# === XLSX ===
+
+_XLSX_STATIC_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="query_results" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+
+# XML 1.0 不允许的控制字符
+_XML_ILLEGAL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+class _DrainableSink(io.RawIOBase):
+    """只追加的输出缓冲: zipfile 写入, 生成器取走（不可 seek, zipfile 改用数据描述符）"""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _xlsx_cell(value: Any) -> str:
+    if value is None:
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, int) or (isinstance(value, float) and math.isfinite(value)):
+        return f"<c><v>{value!r}</v></c>"
+    if isinstance(value, decimal.Decimal) and value.is_finite():
+        return f"<c><v>{value}</v></c>"
+    if not isinstance(value, str):
+        value = str(_csv_value(value))
+    text = escape(_XML_ILLEGAL.sub("", value))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values: list[Any]) -> str:
+    return "<row>" + "".join(_xlsx_cell(value) for value in values) + "</row>"
+
+
+async def _xlsx_chunks(
+    job: ExportJob, batches: AsyncIterator[list[dict[str, Any]]]
+) -> AsyncIterator[bytes]:
+    """单工作表 XLSX: 行以内联字符串写入 ZIP 条目, 每批压缩后立即发送"""
+    sink = _DrainableSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                b"<sheetData>"
+            )
+            names: list[str] = []
+            async for batch in batches:
+                if not names:
+                    names = list(batch[0])
+                    sheet.write(_xlsx_row(names).encode())
+                sheet.write(
+                    "".join(_xlsx_row([row[name] for name in names]) for row in batch).encode()
+                )
+                yield sink.drain()
+            sheet.write(b"</sheetData></worksheet>")
+    yield sink.drain()
+
+
+_ENCODERS = {
+    "csv": _csv_chunks,
+    "json": _json_chunks,
+    "xlsx": _xlsx_chunks,
+}
+
+
+def _base_filename(connection: DatabaseConnection, sql: str, requested: str | None) -> str:
+    """文件名: 指定的名称, 或单表查询的表名, 否则 query_results（去除不安全字符）"""
+    name = requested
+    if not name:
+        analysis = analyze_sql(sql, to_sqlglot_dialect(connection.db_type))
+        name = next(iter(analysis.tables)) if len(analysis.tables) == 1 else "query_results"
+    return re.sub(r"[^\w.-]+", "_", name).strip("._") or "query_results"
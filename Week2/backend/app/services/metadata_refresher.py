@@ -0,0 +1,84 @@
+"""后台元数据刷新 - 定期探测结构变更并增量更新缓存"""
+
+import asyncio
+import logging
+from typing import Any
+
+from app.services.metadata_service import MetadataService
+from app.storage.local_db import LocalStorage, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataRefresher:
+    """
+    后台元数据刷新器
+
+    每隔 interval 秒对所有已缓存元数据的连接做一次结构版本探测, 只重新
+    提取发生变化的表, 让缓存保持新鲜而无需用户手动刷新。
+
+    Args:
+        interval: 探测间隔（秒）, 小于等于 0 时不启动
+    """
+
+    def __init__(self, interval: float = 60.0) -> None:
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+        self.runs = 0
+        self.refreshed_tables = 0
+        self.failures = 0
+
+    def start(self) -> None:
+        """启动后台任务"""
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def close(self) -> None:
+        """停止后台任务"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+    async def run_once(self) -> dict[str, list[str]]:
+        """
+        对所有连接执行一次探测与增量刷新
+
+        Returns:
+            {连接名称: 重新提取或删除的表名}（只包含有变化的连接）
+        """
+        results: dict[str, list[str]] = {}
+        db = SessionLocal()
+        try:
+            for connection in LocalStorage.get_all_connections(db):
+                if LocalStorage.get_metadata_version(db, connection.id) is None:
+                    continue
+                try:
+                    changed = await MetadataService.refresh_changed(db, connection)
+                except Exception as e:
+                    # 单个连接不可用不影响其他连接
+                    self.failures += 1
+                    logger.warning("元数据增量刷新失败: %s: %s", connection.name, e)
+                    continue
+                if changed:
+                    results[connection.name] = changed
+                    self.refreshed_tables += len(changed)
+                    logger.info("元数据已增量刷新: %s: %s", connection.name, ", ".join(changed))
+        finally:
+            db.close()
+        self.runs += 1
+        return results
+
+    def stats(self) -> dict[str, Any]:
+        """刷新统计"""
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "refreshedTables": self.refreshed_tables,
+            "failures": self.failures,
+        }
@@ -1,16 +1,19 @@
-"""元数据提取服务 - 增强版包含并发互斥锁"""
+"""元数据提取服务 - 按连接与查询读写协调"""
 
 import hashlib
 import json
+from typing import Any
 
 from sqlalchemy.orm import Session
 
+from app.db.registry import NoLivePoolError
 from app.models.metadata import ColumnInfo, DatabaseMetadata, TableInfo
-from app.services.db_service import get_adapter
+from app.services.db_service import adapter_registry
 from app.storage.local_db import LocalStorage
+from app.storage.metadata_memory import decoded_metadata_cache
 from app.storage.models import DatabaseConnection
-from app.utils.error_handler import ErrorCode, create_error_response
-from app.utils.locks import get_metadata_lock, is_query_executing
+from app.utils.error_handler import ERROR_STATUS_MAP, ErrorCode, create_error_response
+from app.utils.locks import GateBusyError, get_connection_gate
 
 
 class MetadataService:
@@ -22,115 +25,226 @@ class MetadataService:
         connection: DatabaseConnection,
         force_refresh: bool = False,
     ) -> DatabaseMetadata:
-        """提取数据库元数据 (带并发互斥锁)"""
-
-        # === 并发控制: 检查是否有查询正在执行 ===
-        if force_refresh and is_query_executing():
-            raise create_error_response(ErrorCode.CONFLICT, "查询执行中,无法刷新元数据")
+        """提取数据库元数据 (刷新时独占该连接, 等待其上的查询结束)"""
 
         # 检查缓存
         if not force_refresh:
-            cache = LocalStorage.get_metadata_cache(db, connection.id)
-            if cache:
-                # 返回缓存的元数据
-                metadata_dict = json.loads(cache.metadata_json)
-                return DatabaseMetadata(**metadata_dict)
-
-        # === 获取元数据刷新锁 ===
-        metadata_lock = get_metadata_lock()
-        async with metadata_lock:
-            # 提取元数据
-            adapter = get_adapter(connection.db_type)
-            await adapter.connect(connection.url)
-
-            try:
-                raw_metadata = await adapter.get_metadata()
-
-                # 转换为 Pydantic 模型
-                tables = [
-                    TableInfo(
-                        name=table["name"],
-                        table_type=table.get("tableType", "table"),
-                        columns=[
-                            ColumnInfo(
-                                name=col["name"],
-                                data_type=col.get("dataType", ""),
-                                is_nullable=col.get("isNullable", True),
-                                is_primary_key=col.get("isPrimaryKey", False),
-                                default_value=col.get("defaultValue"),
-                                comment=col.get("comment"),
-                            )
-                            for col in table.get("columns", [])
-                        ],
-                        row_count=table.get("rowCount"),
-                        comment=table.get("comment"),
-                    )
-                    for table in raw_metadata.get("tables", [])
-                ]
-
-                views = [
-                    TableInfo(
-                        name=view["name"],
-                        table_type="view",
-                        columns=[
-                            ColumnInfo(
-                                name=col["name"],
-                                data_type=col.get("dataType", ""),
-                                is_nullable=col.get("isNullable", True),
-                                is_primary_key=col.get("isPrimaryKey", False),
-                                default_value=col.get("defaultValue"),
-                                comment=col.get("comment"),
-                            )
-                            for col in view.get("columns", [])
-                        ],
-                        row_count=view.get("rowCount"),
-                        comment=view.get("comment"),
-                    )
-                    for view in raw_metadata.get("views", [])
-                ]
-
-                metadata = DatabaseMetadata(
-                    name=connection.name,
-                    db_type=connection.db_type,
-                    tables=tables,
-                    views=views,
-                    version_hash=None,  # 将在下面设置
-                    cached_at=None,
-                    needs_refresh=False,
-                )
-
-                # 计算版本哈希 (使用表名列表的 SHA-256)
-                table_names = sorted([t.name for t in tables] + [v.name for v in views])
-                version_content = json.dumps(
-                    {"table_count": len(table_names), "table_names": table_names}
-                )
-                version_hash = hashlib.sha256(version_content.encode()).hexdigest()
-                metadata.version_hash = version_hash
-
-                # 保存到缓存
-                LocalStorage.save_metadata_cache(
-                    db,
-                    connection.id,
-                    metadata.model_dump_json(),
-                    version_hash,
-                )
+            cached = MetadataService._get_cached(db, connection.id)
+            if cached:
+                return cached
+
+        # === 按连接刷新: 只与同一连接上的查询互斥 ===
+        try:
+            async with get_connection_gate(connection.name).refresh():
+                return await MetadataService._refresh(db, connection)
+        except GateBusyError as e:
+            raise create_error_response(
+                ErrorCode.CONFLICT,
+                str(e),
+                status_code=ERROR_STATUS_MAP[ErrorCode.CONFLICT],
+            )
 
+    @staticmethod
+    def _get_cached(db: Session, connection_id: int) -> DatabaseMetadata | None:
+        """
+        读取缓存的元数据
+
+        先只查版本哈希, 与进程内已解码的版本一致时直接返回共享对象;
+        否则从 SQLite 加载 JSON 解码后放入进程内缓存。
+        """
+        version_hash = LocalStorage.get_metadata_version(db, connection_id)
+        if version_hash is not None:
+            metadata = decoded_metadata_cache.get(connection_id, version_hash)
+            if metadata is not None:
                 return metadata
 
-            finally:
-                await adapter.close()
+        cache = LocalStorage.get_metadata_cache(db, connection_id)
+        if not cache:
+            return None
+        metadata = DatabaseMetadata.model_validate_json(cache.metadata_json)
+        decoded_metadata_cache.put(connection_id, cache.version_hash, metadata)
+        return metadata
+
+    @staticmethod
+    async def _refresh(
+        db: Session,
+        connection: DatabaseConnection,
+    ) -> DatabaseMetadata:
+        """从数据库提取元数据并写入缓存"""
+        # 提取元数据（复用该连接名称的长期连接池）
+        async with adapter_registry.acquire(
+            connection.name, connection.db_type, connection.url
+        ) as adapter:
+            # 先探测版本: 提取期间发生的变更会在下次探测时发现
+            schema_versions = await adapter.get_schema_versions()
+            raw_metadata = await adapter.get_metadata()
+
+        # 转换为 Pydantic 模型
+        tables = [_table_info(table) for table in raw_metadata.get("tables", [])]
+        views = [_table_info(view, "view") for view in raw_metadata.get("views", [])]
+
+        return MetadataService._save(db, connection, tables, views, schema_versions)
+
+    @staticmethod
+    def _save(
+        db: Session,
+        connection: DatabaseConnection,
+        tables: list[TableInfo],
+        views: list[TableInfo],
+        schema_versions: dict[str, str],
+    ) -> DatabaseMetadata:
+        """计算版本哈希并写入缓存"""
+        version_hash = _version_hash(tables, views)
+        metadata = DatabaseMetadata(
+            name=connection.name,
+            db_type=connection.db_type,
+            tables=tables,
+            views=views,
+            version_hash=version_hash,
+            cached_at=None,
+            needs_refresh=False,
+            schema_versions=schema_versions,
+        )
+
+        # 保存到缓存（SQLite 冷存储 + 进程内已解码对象）
+        LocalStorage.save_metadata_cache(
+            db,
+            connection.id,
+            metadata.model_dump_json(),
+            version_hash,
+        )
+        decoded_metadata_cache.put(connection.id, version_hash, metadata)
+
+        return metadata
+
+    @staticmethod
+    async def _probe(connection: DatabaseConnection, background: bool = False) -> dict[str, str]:
+        """
+        读取数据库当前的各表结构版本标记
+
+        background=True 时只使用已有的连接池且不延长其空闲时间, 没有连接池时
+        抛出 NoLivePoolError。
+        """
+        async with adapter_registry.acquire(
+            connection.name,
+            connection.db_type,
+            connection.url,
+            touch=not background,
+            create=not background,
+        ) as adapter:
+            return await adapter.get_schema_versions()
 
     @staticmethod
-    def detect_changes(
+    async def detect_changes(
         db: Session,
         connection: DatabaseConnection,
     ) -> bool:
-        """检测元数据是否已变化 (基于版本哈希)"""
-        cache = LocalStorage.get_metadata_cache(db, connection.id)
-        if not cache:
+        """检测元数据是否已变化（比较缓存与数据库当前的结构版本标记）"""
+        cached = MetadataService._get_cached(db, connection.id)
+        if not cached:
             return True  # 没有缓存，需要刷新
 
-        # 这里可以添加更复杂的检测逻辑
-        # 例如：定期重新计算哈希并比较
-        # 当前实现：总是返回 False（不自动检测，用户手动刷新）
-        return False
+        return await MetadataService._probe(connection) != cached.schema_versions
+
+    @staticmethod
+    async def refresh_changed(
+        db: Session,
+        connection: DatabaseConnection,
+    ) -> list[str]:
+        """
+        增量刷新: 只重新提取结构版本变化的表, 删除已不存在的表
+
+        没有缓存的连接不做处理（首次提取仍在请求时按需进行）; 连接池已被空闲
+        回收的连接也跳过, 下次有请求使用该连接时再探测。
+
+        Returns:
+            重新提取或删除的表名
+        """
+        cached = MetadataService._get_cached(db, connection.id)
+        if not cached:
+            return []
+
+        # 后台探测不算使用, 也不重建已回收的连接池, 否则定期探测会让空闲
+        # 连接池永远不被回收
+        try:
+            versions = await MetadataService._probe(connection, background=True)
+        except NoLivePoolError:
+            return []
+        previous = cached.schema_versions
+        if versions == previous:
+            return []
+
+        changed = sorted(
+            name for name, version in versions.items() if previous.get(name) != version
+        )
+        removed = sorted(set(previous) - set(versions))
+
+        try:
+            async with get_connection_gate(connection.name).refresh():
+                if not previous:
+                    # 旧版本缓存没有结构标记, 整体提取一次
+                    await MetadataService._refresh(db, connection)
+                    return sorted(versions)
+
+                async with adapter_registry.acquire(
+                    connection.name, connection.db_type, connection.url
+                ) as adapter:
+                    raw_metadata = await adapter.get_metadata(tables=changed)
+        except GateBusyError as e:
+            raise create_error_response(
+                ErrorCode.CONFLICT,
+                str(e),
+                status_code=ERROR_STATUS_MAP[ErrorCode.CONFLICT],
+            )
+
+        # 未变化的表沿用缓存, 变化的表替换为新提取的结果
+        relations = {
+            info.name: info
+            for info in cached.tables + cached.views
+            if info.name not in changed and info.name not in removed
+        }
+        for table in raw_metadata.get("tables", []):
+            relations[table["name"]] = _table_info(table)
+        for view in raw_metadata.get("views", []):
+            relations[view["name"]] = _table_info(view, "view")
+
+        ordered = [relations[name] for name in sorted(relations)]
+        MetadataService._save(
+            db,
+            connection,
+            [info for info in ordered if info.table_type != "view"],
+            [info for info in ordered if info.table_type == "view"],
+            versions,
+        )
+        return changed + removed
+
+
+def _table_info(raw: dict[str, Any], table_type: str | None = None) -> TableInfo:
+    """适配器返回的表/视图字典转换为 TableInfo"""
+    return TableInfo(
+        name=raw["name"],
+        table_type=table_type or raw.get("tableType", "table"),
+        columns=[
+            ColumnInfo(
+                name=col["name"],
+                data_type=col.get("dataType", ""),
+                is_nullable=col.get("isNullable", True),
+                is_primary_key=col.get("isPrimaryKey", False),
+                default_value=col.get("defaultValue"),
+                comment=col.get("comment"),
+            )
+            for col in raw.get("columns", [])
+        ],
+        row_count=raw.get("rowCount"),
+        comment=raw.get("comment"),
+    )
+
+
+def _version_hash(tables: list[TableInfo], views: list[TableInfo]) -> str:
+    """元数据版本哈希: 表/视图及其列定义的 SHA-256（不含估算行数）"""
+    relations = sorted(tables + views, key=lambda info: info.name)
+    version_content = json.dumps(
+        [info.model_dump(exclude={"row_count"}) for info in relations],
+        sort_keys=True,
+    )
+    return hashlib.sha256(version_content.encode()).hexdigest()
@@ -1,15 +1,20 @@
-"""查询执行服务 - 增强版包含并发互斥锁和智能限制"""
+"""查询执行服务 - 按连接并发限制和智能限制"""
 
 import time
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, aclosing
+from typing import Any
 
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.models.query import QueryRequest, QueryResult, QueryResultColumn
-from app.services.db_service import get_adapter
+from app.services.db_service import adapter_registry
 from app.storage.models import DatabaseConnection
-from app.utils.error_handler import ErrorCode, create_error_response
-from app.utils.locks import get_query_lock, is_metadata_refreshing
-from app.utils.sql_validator import add_limit_if_missing, validate_sql
+from app.utils.error_handler import ERROR_STATUS_MAP, ErrorCode, create_error_response
+from app.utils.locks import GateBusyError, get_connection_gate
+from app.utils.sql_validator import MAX_LIMIT, analyze_sql, to_sqlglot_dialect
 
 
 class QueryService:
@@ -21,23 +26,33 @@ class QueryService:
         connection: DatabaseConnection,
         request: QueryRequest,
     ) -> QueryResult:
-        """执行 SQL 查询 (带并发互斥锁和元数据快照)"""
-
-        # === 并发控制: 检查是否正在刷新元数据 ===
-        if is_metadata_refreshing():
-            raise create_error_response(ErrorCode.CONFLICT, "元数据刷新中,请稍候...")
-
+        """执行 SQL 查询 (按连接并发限制, 超出上限排队)"""
         sql = request.sql.strip()
+        final_sql = QueryService.prepare_sql(connection, sql, limit=1000)
+        truncated = final_sql != sql
 
-        # 验证 SQL - 映射数据库类型到 sqlglot 方言
-        dialect_map = {
-            "postgresql": "postgres",
-            "mysql": "mysql",
-            "sqlite": "sqlite",
-        }
-        dialect = dialect_map.get(connection.db_type, "postgres")
-        is_valid, error_msg = validate_sql(sql, dialect)
-        if not is_valid:
+        # === 按连接并发控制: 占用执行槽位, 满额时排队 ===
+        try:
+            async with get_connection_gate(connection.name).query():
+                return await QueryService._run(connection, final_sql, truncated)
+        except GateBusyError as e:
+            raise create_error_response(
+                ErrorCode.QUERY_QUEUE_FULL,
+                str(e),
+                status_code=ERROR_STATUS_MAP[ErrorCode.QUERY_QUEUE_FULL],
+            )
+
+    @staticmethod
+    def prepare_sql(
+        connection: DatabaseConnection,
+        sql: str,
+        limit: int,
+        max_limit: int = MAX_LIMIT,
+    ) -> str:
+        """验证 SQL 并添加 LIMIT（同一次解析, 结果按 SQL 与方言缓存）, 返回最终 SQL"""
+        analysis = analyze_sql(sql, to_sqlglot_dialect(connection.db_type), limit, max_limit)
+        if not analysis.is_valid:
+            error_msg = analysis.error
             raise create_error_response(
                 (
                     ErrorCode.SYNTAX_ERROR
@@ -46,53 +61,185 @@ class QueryService:
                 ),
                 error_msg or "SQL 验证失败",
             )
+        return analysis.sql
 
-        # 添加 LIMIT（如果需要）
-        final_sql = add_limit_if_missing(sql, limit=1000)
-        truncated = final_sql != sql
+    @staticmethod
+    async def open_stream(
+        connection: DatabaseConnection,
+        request: QueryRequest,
+        limit: int | None = None,
+    ) -> "QueryStream":
+        """
+        开始流式查询
+
+        占用执行槽位和一个数据库连接, 用服务端游标取回首批结果后返回,
+        验证失败、排队已满和执行错误仍以 HTTP 错误响应; 其余批次在响应
+        发送过程中按需读取, 客户端读得慢时游标随之暂停。
+
+        Args:
+            connection: 数据库连接
+            request: 查询请求
+            limit: 交互式结果的默认 LIMIT（显式 LIMIT 按普通查询的上限收紧）;
+                不指定时默认与上限都为 stream_max_rows
+
+        Returns:
+            已取回首批结果的 QueryStream（调用方负责 aclose）
+        """
+        sql = request.sql.strip()
+        if limit is not None:
+            final_sql = QueryService.prepare_sql(connection, sql, limit=limit)
+        else:
+            max_rows = settings.stream_max_rows
+            final_sql = QueryService.prepare_sql(
+                connection, sql, limit=max_rows, max_limit=max_rows
+            )
+
+        resources = AsyncExitStack()
+        try:
+            await resources.enter_async_context(get_connection_gate(connection.name).query())
+            adapter = await resources.enter_async_context(
+                adapter_registry.acquire(connection.name, connection.db_type, connection.url)
+            )
+            start_time = time.time()
+            batches = await resources.enter_async_context(
+                aclosing(
+                    adapter.stream(final_sql, batch_size=settings.stream_batch_size, timeout=30.0)
+                )
+            )
+            first_batch = await anext(batches, [])
+        except GateBusyError as e:
+            await resources.aclose()
+            raise create_error_response(
+                ErrorCode.QUERY_QUEUE_FULL,
+                str(e),
+                status_code=ERROR_STATUS_MAP[ErrorCode.QUERY_QUEUE_FULL],
+            )
+        except Exception as e:
+            await resources.aclose()
+            raise _execution_error(e)
+        except BaseException:
+            await resources.aclose()
+            raise
 
-        # === 获取查询执行锁 ===
-        query_lock = get_query_lock()
-        async with query_lock:
-            # 执行查询
-            adapter = get_adapter(connection.db_type)
-            await adapter.connect(connection.url)
+        return QueryStream(
+            sql=final_sql,
+            truncated=final_sql != sql,
+            first_batch=first_batch,
+            batches=batches,
+            resources=resources,
+            start_time=start_time,
+        )
 
-            try:
+    @staticmethod
+    async def _run(
+        connection: DatabaseConnection,
+        final_sql: str,
+        truncated: bool,
+    ) -> QueryResult:
+        """在连接上执行已验证的 SQL"""
+        # 执行查询（复用该连接名称的长期连接池）
+        try:
+            async with adapter_registry.acquire(
+                connection.name, connection.db_type, connection.url
+            ) as adapter:
                 start_time = time.time()
                 rows = await adapter.execute(final_sql, timeout=30.0)
                 execution_time_ms = int((time.time() - start_time) * 1000)
 
-                # 提取列信息
-                columns: list[QueryResultColumn] = []
-                if rows:
-                    first_row = rows[0]
-                    columns = [
-                        QueryResultColumn(
-                            name=key,
-                            data_type=str(type(value).__name__),
-                        )
-                        for key, value in first_row.items()
-                    ]
-
-                return QueryResult(
-                    columns=columns,
-                    rows=rows,
-                    row_count=len(rows),
-                    execution_time_ms=execution_time_ms,
-                    truncated=truncated,
-                    sql=final_sql,
-                )
+            return QueryResult(
+                columns=_columns(rows),
+                rows=rows,
+                row_count=len(rows),
+                execution_time_ms=execution_time_ms,
+                truncated=truncated,
+                sql=final_sql,
+            )
 
-            except TimeoutError:
-                raise create_error_response(
-                    ErrorCode.QUERY_TIMEOUT,
-                    "查询超时（30秒）。建议：优化查询条件、减少返回行数或添加索引",
-                )
-            except Exception as e:
-                raise create_error_response(
-                    ErrorCode.INTERNAL_ERROR,
-                    f"查询执行失败: {str(e)}",
-                )
-            finally:
-                await adapter.close()
+        except Exception as e:
+            raise _execution_error(e)
+
+
+class QueryStream:
+    """
+    进行中的流式查询
+
+    持有执行槽位、连接池借出与服务端游标; 迭代结束、出错或 aclose()
+    时按相反顺序释放。
+
+    Args:
+        sql: 实际执行的 SQL
+        truncated: 是否添加或收紧了 LIMIT
+        first_batch: 已取回的首批结果
+        batches: 其余批次
+        resources: 需要释放的上下文
+        start_time: 开始执行的时间戳
+    """
+
+    def __init__(
+        self,
+        sql: str,
+        truncated: bool,
+        first_batch: list[dict[str, Any]],
+        batches: AsyncIterator[list[dict[str, Any]]],
+        resources: AsyncExitStack,
+        start_time: float,
+    ) -> None:
+        self.sql = sql
+        self.truncated = truncated
+        self.columns = _columns(first_batch)
+        self.row_count = 0
+        self._first_batch = first_batch
+        self._batches = batches
+        self._resources = resources
+        self._start_time = start_time
+
+    @property
+    def elapsed_ms(self) -> int:
+        """开始执行至今的耗时（毫秒）"""
+        return int((time.time() - self._start_time) * 1000)
+
+    async def __aiter__(self) -> AsyncIterator[list[dict[str, Any]]]:
+        try:
+            if self._first_batch:
+                batch, self._first_batch = self._first_batch, []
+                self.row_count += len(batch)
+                yield batch
+            async for batch in self._batches:
+                self.row_count += len(batch)
+                yield batch
+        except Exception as e:
+            raise _execution_error(e)
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """释放游标、连接与执行槽位（可重复调用）"""
+        await self._resources.aclose()
+
+
+def _columns(rows: list[dict[str, Any]]) -> list[QueryResultColumn]:
+    """从首行推断列信息"""
+    if not rows:
+        return []
+    return [
+        QueryResultColumn(
+            name=key,
+            data_type=str(type(value).__name__),
+        )
+        for key, value in rows[0].items()
+    ]
+
+
+def _execution_error(e: Exception) -> HTTPException:
+    """执行阶段的异常转换为错误响应"""
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, TimeoutError):
+        return create_error_response(
+            ErrorCode.QUERY_TIMEOUT,
+            "查询超时（30秒）。建议：优化查询条件、减少返回行数或添加索引",
+        )
+    return create_error_response(
+        ErrorCode.INTERNAL_ERROR,
+        f"查询执行失败: {str(e)}",
+    )
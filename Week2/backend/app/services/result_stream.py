@@ -0,0 +1,130 @@
+"""流式查询结果编码 - NDJSON 与 Arrow IPC"""
+
+import datetime
+import decimal
+import json
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import HTTPException
+
+from app.services.query_service import QueryStream
+
+try:
+    import pyarrow as pa
+except ImportError:  # 可选依赖: pip install ".[arrow]"
+    pa = None
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Arrow IPC 流结束标记: continuation + 长度 0
+_ARROW_EOS = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+
+def arrow_available() -> bool:
+    """是否安装了 pyarrow"""
+    return pa is not None
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps 无法直接编码的数据库类型（与 FastAPI 默认 JSON 响应一致）"""
+    if isinstance(value, datetime.date | datetime.time):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, decimal.Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, bytes | bytearray | memoryview):
+        return bytes(value).decode(errors="replace")
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return str(value)
+
+
+def _ndjson_line(message: dict[str, Any]) -> bytes:
+    return (
+        json.dumps(message, ensure_ascii=False, separators=(",", ":"), default=json_default) + "\n"
+    ).encode()
+
+
+async def ndjson_chunks(stream: QueryStream) -> AsyncIterator[bytes]:
+    """
+    NDJSON 编码: 每行一条消息
+
+    - {"type": "meta", "columns": [...], "sql": ..., "truncated": ...}
+    - {"type": "rows", "rows": [...]}（每批一行）
+    - {"type": "end", "rowCount": ..., "executionTimeMs": ...}
+    - 中途失败时以 {"type": "error", "code": ..., "message": ...} 结束
+    """
+    yield _ndjson_line(
+        {
+            "type": "meta",
+            "columns": [column.model_dump(by_alias=True) for column in stream.columns],
+            "sql": stream.sql,
+            "truncated": stream.truncated,
+        }
+    )
+    try:
+        async for batch in stream:
+            yield _ndjson_line({"type": "rows", "rows": batch})
+    except HTTPException as e:
+        yield _ndjson_line({"type": "error", **e.detail})
+        return
+    yield _ndjson_line(
+        {"type": "end", "rowCount": stream.row_count, "executionTimeMs": stream.elapsed_ms}
+    )
+
+
+async def arrow_chunks(stream: QueryStream) -> AsyncIterator[bytes]:
+    """
+    Arrow IPC 流编码: schema 消息 + 每批一个 RecordBatch 消息 + 结束标记
+
+    列类型由首批结果推断（全为 NULL 或类型混杂的列按字符串传输）, SQL 与
+    截断标记写在 schema 元数据中。中途失败时不写结束标记, 客户端据此
+    识别不完整的流。
+    """
+    encoder: _ArrowBatchEncoder | None = None
+    metadata = {"sql": stream.sql, "truncated": "true" if stream.truncated else "false"}
+    async for batch in stream:
+        if encoder is None:
+            encoder = _ArrowBatchEncoder(batch, metadata)
+            yield encoder.schema.serialize().to_pybytes()
+        yield encoder.encode(batch)
+    if encoder is None:
+        # 空结果: 只有 schema（列未知）与结束标记
+        yield pa.schema([], metadata=metadata).serialize().to_pybytes()
+    yield _ARROW_EOS
+
+
+class _ArrowBatchEncoder:
+    """以固定 schema 把字典行批次编码为 IPC 消息"""
+
+    def __init__(self, first_batch: list[dict[str, Any]], metadata: dict[str, str]) -> None:
+        fields = []
+        self._stringify: list[str] = []
+        for name in first_batch[0]:
+            try:
+                arrow_type = pa.array([row[name] for row in first_batch]).type
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                arrow_type = pa.null()
+            if pa.types.is_null(arrow_type):
+                arrow_type = pa.string()
+                self._stringify.append(name)
+            fields.append(pa.field(name, arrow_type))
+        self.schema = pa.schema(fields, metadata=metadata)
+
+    def encode(self, rows: list[dict[str, Any]]) -> bytes:
+        if self._stringify:
+            rows = [
+                {
+                    **row,
+                    **{
+                        name: None if row[name] is None else str(row[name])
+                        for name in self._stringify
+                    },
+                }
+                for row in rows
+            ]
+        return pa.RecordBatch.from_pylist(rows, schema=self.schema).serialize().to_pybytes()
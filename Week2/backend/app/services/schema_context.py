@@ -0,0 +1,350 @@
+"""AI 数据库结构上下文 - 按提示词相关度排序并按 token 预算裁剪"""
+
+import math
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from app.config import settings
+from app.models.metadata import DatabaseMetadata, TableInfo
+
+try:
+    import tiktoken
+except ImportError:  # 可选依赖: pip install ".[ai]"
+    tiktoken = None
+
+TABLES_HEADING = "表 (Tables):"
+VIEWS_HEADING = "视图 (Views):"
+
+# 表名、列名、注释命中的权重
+_NAME_WEIGHT = 3.0
+_COLUMN_WEIGHT = 1.0
+_COMMENT_WEIGHT = 0.5
+# 与命中表通过 xxx_id 关联的表按对方得分的比例加分（JOIN 需要）
+_NEIGHBOR_WEIGHT = 0.3
+_COMMENT_MAX_CHARS = 60
+
+_CJK_RE = re.compile(r"[\u3400-\u9fff\uf900-\ufaff]+")
+_WORD_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+_ESTIMATE_RE = re.compile(r"[\u3400-\u9fff\uf900-\ufaff]|[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+_STOP_WORDS = frozenset(
+    "all and are by each for from get how in is list me many of per show the to what which".split()
+)
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str) -> Any | None:
+    """模型对应的 tiktoken 编码（未安装或词表不可用时返回 None）"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception:  # 词表文件下载失败等
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    """
+    计算文本的 token 数
+
+    安装 tiktoken 时使用模型的本地分词器; 否则按字符类别估算
+    （汉字 1 个, 英文单词每 4 个字母 1 个, 数字每 3 位 1 个, 标点 1 个）。
+
+    Args:
+        text: 文本
+        model: OpenAI 模型名（默认 settings.openai_model）
+
+    Returns:
+        token 数
+    """
+    encoding = _encoding(model or settings.openai_model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    total = 0
+    for match in _ESTIMATE_RE.finditer(text):
+        piece = match.group()
+        total += (len(piece) + 3) // 4 if piece[0].isascii() and piece[0].isalpha() else 1
+    return total
+
+
+def _stem(word: str) -> str:
+    """简单的英文复数还原（users -> user, categories -> category）"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("ses", "xes", "ches", "shes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def terms(text: str) -> set[str]:
+    """
+    提取检索词
+
+    标识符按下划线、驼峰拆分并还原复数, 多段标识符同时保留整体;
+    中文按相邻两字切分。
+
+    Args:
+        text: 表名、列名、注释或提示词
+
+    Returns:
+        检索词集合
+    """
+    result: set[str] = set()
+    for part in re.split(r"[^A-Za-z0-9_]+", text):
+        words = [word.lower() for word in _WORD_RE.findall(part)]
+        result.update(
+            _stem(word) for word in words if len(word) > 1 and word not in _STOP_WORDS
+        )
+        if len(words) > 1:
+            result.add(_stem("".join(words)))
+    for run in _CJK_RE.findall(text):
+        if len(run) == 1:
+            result.add(run)
+        result.update(run[i : i + 2] for i in range(len(run) - 1))
+    return result
+
+
+def _reference_base(column: str) -> str | None:
+    """外键风格列名指向的表（user_id / userId -> user）"""
+    words = [word.lower() for word in _WORD_RE.findall(column)]
+    if len(words) > 1 and words[-1] == "id":
+        return _stem("".join(words[:-1]))
+    return None
+
+
+@dataclass
+class _Entry:
+    """索引中的一张表或视图"""
+
+    table: TableInfo
+    is_view: bool
+    fragment: str
+    tokens: int
+    neighbors: set[int] = field(default_factory=set)
+
+
+class SchemaIndex:
+    """
+    一个元数据版本的倒排索引与表片段缓存
+
+    构建时渲染每张表的上下文片段并计算 token 数, 之后每次生成只需
+    查倒排表打分, 再按预算挑选片段。
+
+    Args:
+        metadata: 数据库元数据
+        model: 计算 token 使用的模型
+    """
+
+    def __init__(self, metadata: DatabaseMetadata, model: str) -> None:
+        self.model = model
+        self.entries: list[_Entry] = []
+        # 检索词 -> {表序号: [(列序号, 权重)]}, 列序号 -1 表示表名或表注释
+        self._postings: dict[str, dict[int, list[tuple[int, float]]]] = {}
+
+        by_name: dict[str, int] = {}
+        for table, is_view in [(t, False) for t in metadata.tables] + [
+            (v, True) for v in metadata.views
+        ]:
+            index = len(self.entries)
+            fragment = _render(table, range(len(table.columns)))
+            self.entries.append(_Entry(table, is_view, fragment, self._count(fragment)))
+            by_name.setdefault(_stem(table.name.lower()), index)
+
+            self._add(terms(table.name), index, -1, _NAME_WEIGHT)
+            if table.comment:
+                self._add(terms(table.comment), index, -1, _COMMENT_WEIGHT)
+            for position, column in enumerate(table.columns):
+                self._add(terms(column.name), index, position, _COLUMN_WEIGHT)
+                if column.comment:
+                    self._add(terms(column.comment), index, position, _COMMENT_WEIGHT)
+
+        for index, entry in enumerate(self.entries):
+            for column in entry.table.columns:
+                target = by_name.get(_reference_base(column.name) or "")
+                if target is not None and target != index:
+                    entry.neighbors.add(target)
+                    self.entries[target].neighbors.add(index)
+
+        self._idf = {
+            term: math.log(1 + len(self.entries) / len(postings))
+            for term, postings in self._postings.items()
+        }
+
+    def _add(self, words: set[str], index: int, position: int, weight: float) -> None:
+        for word in words:
+            self._postings.setdefault(word, {}).setdefault(index, []).append((position, weight))
+
+    def _count(self, fragment: str) -> int:
+        return count_tokens(fragment + "\n", self.model)
+
+    def rank(self, prompt: str) -> list[tuple[int, float, set[int]]]:
+        """
+        按提示词相关度排序
+
+        Args:
+            prompt: 自然语言提示词
+
+        Returns:
+            [(表序号, 得分, 命中的列序号)], 得分相同时保持元数据中的顺序
+        """
+        scores = [0.0] * len(self.entries)
+        matched: list[set[int]] = [set() for _ in self.entries]
+        for word in terms(prompt):
+            postings = self._postings.get(word)
+            if not postings:
+                continue
+            idf = self._idf[word]
+            for index, hits in postings.items():
+                scores[index] += idf * max(weight for _, weight in hits)
+                matched[index].update(position for position, _ in hits if position >= 0)
+
+        boosted = list(scores)
+        for index, score in enumerate(scores):
+            if score > 0:
+                for neighbor in self.entries[index].neighbors:
+                    boosted[neighbor] += _NEIGHBOR_WEIGHT * score
+
+        order = sorted(range(len(self.entries)), key=lambda i: -boosted[i])
+        return [(index, boosted[index], matched[index]) for index in order]
+
+    def build(self, prompt: str, max_tokens: int) -> str:
+        """
+        生成不超过 max_tokens 的结构上下文
+
+        按相关度依次放入完整的表片段; 放不下的相关表退化为主键、命中列
+        与关联列, 无关的表只用剩余预算填充。
+
+        Args:
+            prompt: 自然语言提示词
+            max_tokens: token 预算
+
+        Returns:
+            格式化的结构上下文
+        """
+        budget = max_tokens - self._count(TABLES_HEADING) - self._count(VIEWS_HEADING)
+        budget -= self._count(_omitted_note(len(self.entries)))
+
+        chosen: list[tuple[int, str]] = []
+        for index, score, matched in self.rank(prompt):
+            entry = self.entries[index]
+            fragment, cost = entry.fragment, entry.tokens
+            if cost > budget and score > 0:
+                fragment = _render(entry.table, _key_columns(entry.table, matched))
+                cost = self._count(fragment)
+            if cost <= budget:
+                chosen.append((index, fragment))
+                budget -= cost
+
+        tables = [fragment for index, fragment in chosen if not self.entries[index].is_view]
+        views = [fragment for index, fragment in chosen if self.entries[index].is_view]
+        parts = []
+        if tables:
+            parts += [TABLES_HEADING, *tables]
+        if views:
+            parts += [VIEWS_HEADING, *views]
+        omitted = len(self.entries) - len(chosen)
+        if omitted:
+            parts.append(_omitted_note(omitted))
+        return "\n".join(parts)
+
+
+def _render(table: TableInfo, positions: Any) -> str:
+    """渲染表片段: - name(col type PK, ...) -- 注释"""
+    shown = list(positions)
+    columns = []
+    for position in shown:
+        column = table.columns[position]
+        pk = " PK" if column.is_primary_key else ""
+        columns.append(f"{column.name} {column.data_type.lower()}{pk}")
+    hidden = len(table.columns) - len(shown)
+    if hidden:
+        columns.append(f"...+{hidden}")
+    fragment = f"  - {table.name}({', '.join(columns)})"
+    if table.comment:
+        fragment += f" -- {table.comment[:_COMMENT_MAX_CHARS]}"
+    return fragment
+
+
+def _key_columns(table: TableInfo, matched: set[int]) -> list[int]:
+    """精简片段保留的列: 主键、命中列与关联列"""
+    return [
+        position
+        for position, column in enumerate(table.columns)
+        if column.is_primary_key or position in matched or _reference_base(column.name)
+    ]
+
+
+def _omitted_note(count: int) -> str:
+    return f"... (另有 {count} 个表/视图未包含在上下文中)"
+
+
+class SchemaIndexCache:
+    """
+    结构索引缓存（按连接名、元数据版本哈希与模型命中）
+
+    元数据刷新后版本哈希变化, 旧索引在 LRU 中自然淘汰。
+
+    Args:
+        max_entries: 最多缓存的索引数
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[tuple[str, str, str, str], SchemaIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, metadata: DatabaseMetadata, model: str) -> SchemaIndex:
+        """获取元数据版本的索引, 不存在时构建（无版本哈希的元数据不缓存）"""
+        if metadata.version_hash is None:
+            return SchemaIndex(metadata, model)
+        key = (metadata.db_type, metadata.name, metadata.version_hash, model)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                return index
+        index = SchemaIndex(metadata, model)
+        with self._lock:
+            self._entries[key] = index
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+
+schema_index_cache = SchemaIndexCache(settings.ai_context_index_cache_size)
+
+
+def build_schema_context(
+    metadata: DatabaseMetadata,
+    prompt: str = "",
+    max_tokens: int | None = None,
+) -> str:
+    """
+    生成与提示词相关、不超过 token 预算的数据库结构上下文
+
+    Args:
+        metadata: 数据库元数据
+        prompt: 自然语言提示词（为空时按元数据顺序填充）
+        max_tokens: token 预算（默认 settings.ai_context_max_tokens）
+
+    Returns:
+        格式化的结构上下文
+    """
+    index = schema_index_cache.get(metadata, settings.openai_model)
+    return index.build(prompt, max_tokens or settings.ai_context_max_tokens)
@@ -0,0 +1,182 @@
+"""AI 生成 SQL 缓存 - 本地 SQLite 持久化的 LRU + TTL 缓存与并发请求合并"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import unicodedata
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.metadata import DatabaseMetadata
+from app.models.query import NaturalQueryCacheStats
+from app.storage.local_db import LocalStorage
+from app.storage.models import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+
+# 引号内的字面量（值的大小写与空白有意义, 归一化时保留原样）
+_QUOTED_RE = re.compile(r"('[^']*'|\"[^\"]*\"|`[^`]*`|“[^”]*”|‘[^’]*’)")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    归一化提示词（全角转半角、小写、合并空白、去掉结尾标点）
+
+    引号内的字面量不做小写与空白合并, 避免 'Alice' 与 'alice' 共用缓存条目。
+
+    Args:
+        prompt: 自然语言查询描述
+
+    Returns:
+        归一化后的提示词
+    """
+    parts = _QUOTED_RE.split(unicodedata.normalize("NFKC", prompt))
+    # split 的奇数位是引号内的字面量
+    text = "".join(
+        part if i % 2 else re.sub(r"\s+", " ", part.lower()) for i, part in enumerate(parts)
+    )
+    return text.strip().rstrip("?!.。 ")
+
+
+def cache_key(connection_id: int, version_hash: str, prompt: str, dialect: str) -> str:
+    """缓存键: (连接, 元数据版本, 归一化提示词, 方言) 的 SHA-256"""
+    raw = "\x1f".join([str(connection_id), version_hash, dialect.lower(), prompt])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _Counters:
+    """单个连接的缓存计数"""
+
+    hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+
+
+class SqlGenerationCache:
+    """
+    AI 生成 SQL 缓存
+
+    条目保存在本地 SQLite（重启后保留）, 元数据版本变化后旧条目不再命中,
+    过期与超出上限的条目在写入时清理。同一键的并发请求只调用一次 AI,
+    其余请求等待并共享结果（包括失败）。
+
+    Args:
+        ttl_seconds: 条目有效期（0 关闭缓存）
+        max_entries: 条目上限（按最近使用时间淘汰）
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._inflight: dict[str, asyncio.Future[str]] = {}
+        self._counters: dict[str, _Counters] = {}
+
+    async def get_or_generate(
+        self,
+        db: Session,
+        connection: DatabaseConnection,
+        metadata: DatabaseMetadata,
+        prompt: str,
+        generate: Callable[[], Awaitable[str]],
+    ) -> tuple[str, bool]:
+        """
+        获取缓存的 SQL, 未命中时生成并缓存
+
+        Args:
+            db: 本地存储会话
+            connection: 数据库连接
+            metadata: 生成时使用的元数据（取版本哈希）
+            prompt: 自然语言查询描述
+            generate: 调用 AI 生成 SQL 的协程函数
+
+        Returns:
+            (SQL, 是否复用了缓存或进行中请求的结果)
+        """
+        counters = self._counters.setdefault(connection.name, _Counters())
+        if self.ttl_seconds <= 0 or metadata.version_hash is None:
+            counters.misses += 1
+            return await generate(), False
+
+        normalized = normalize_prompt(prompt)
+        key = cache_key(connection.id, metadata.version_hash, normalized, connection.db_type)
+
+        while True:
+            generated_sql = LocalStorage.get_generated_sql(db, key, self.ttl_seconds)
+            if generated_sql is not None:
+                counters.hits += 1
+                return generated_sql, True
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                generated_sql = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 发起请求被取消（客户端断开）时重新检查, 由本请求接手生成
+                if inflight.cancelled():
+                    continue
+                raise
+            counters.coalesced += 1
+            return generated_sql, True
+
+        counters.misses += 1
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            generated_sql = await generate()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # 没有等待者时避免 "exception was never retrieved"
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(generated_sql)
+        try:
+            LocalStorage.save_generated_sql(
+                db,
+                connection.id,
+                key,
+                metadata.version_hash,
+                connection.db_type,
+                normalized,
+                generated_sql,
+                self.ttl_seconds,
+                self.max_entries,
+            )
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning("Failed to cache generated SQL: %s", e)
+        return generated_sql, False
+
+    def stats(self, db: Session, connection: DatabaseConnection) -> NaturalQueryCacheStats:
+        """连接的缓存统计"""
+        counters = self._counters.get(connection.name, _Counters())
+        entries, total_hits = LocalStorage.get_generated_sql_usage(db, connection.id)
+        reused = counters.hits + counters.coalesced
+        requests = reused + counters.misses
+        return NaturalQueryCacheStats(
+            entries=entries,
+            hits=counters.hits,
+            coalesced=counters.coalesced,
+            misses=counters.misses,
+            hit_rate=reused / requests if requests else 0.0,
+            total_hits=total_hits,
+            ttl_seconds=self.ttl_seconds,
+        )
+
+
+sql_generation_cache = SqlGenerationCache(
+    settings.ai_sql_cache_ttl_seconds,
+    settings.ai_sql_cache_max_entries,
+)
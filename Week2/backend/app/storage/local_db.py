@@ -1,14 +1,15 @@
 """本地 SQLite 存储操作层 - 使用 UTC 时间"""
 
 from collections.abc import Generator
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, delete, func, select
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.config import settings
-from app.storage.models import Base, DatabaseConnection, MetadataCache
+from app.storage.metadata_memory import decoded_metadata_cache
+from app.storage.models import Base, DatabaseConnection, GeneratedSqlCache, MetadataCache
 
 
 def utc_now() -> datetime:
@@ -133,8 +134,10 @@ class LocalStorage:
     @staticmethod
     def delete_connection(db: Session, connection: DatabaseConnection) -> None:
         """删除连接（级联删除元数据缓存）"""
+        connection_id = connection.id
         db.delete(connection)
         db.commit()
+        decoded_metadata_cache.invalidate(connection_id)
 
     @staticmethod
     def get_metadata_cache(
@@ -145,6 +148,14 @@ class LocalStorage:
         stmt = select(MetadataCache).where(MetadataCache.connection_id == connection_id)
         return db.scalar(stmt)
 
+    @staticmethod
+    def get_metadata_version(db: Session, connection_id: int) -> str | None:
+        """只读取元数据缓存的版本哈希（不加载 JSON）"""
+        stmt = select(MetadataCache.version_hash).where(
+            MetadataCache.connection_id == connection_id
+        )
+        return db.scalar(stmt)
+
     @staticmethod
     def save_metadata_cache(
         db: Session,
@@ -173,6 +184,7 @@ class LocalStorage:
 
         db.commit()
         db.refresh(cache)
+        decoded_metadata_cache.invalidate(connection_id)
         return cache
 
     @staticmethod
@@ -182,3 +194,74 @@ class LocalStorage:
         if cache:
             db.delete(cache)
             db.commit()
+        decoded_metadata_cache.invalidate(connection_id)
+
+    @staticmethod
+    def get_generated_sql(db: Session, cache_key: str, ttl_seconds: float) -> str | None:
+        """获取未过期的 AI 生成 SQL, 命中时更新使用时间与命中次数"""
+        cutoff = utc_now() - timedelta(seconds=ttl_seconds)
+        stmt = select(GeneratedSqlCache).where(
+            GeneratedSqlCache.cache_key == cache_key,
+            GeneratedSqlCache.created_at >= cutoff,
+        )
+        entry = db.scalar(stmt)
+        if not entry:
+            return None
+        generated_sql = entry.generated_sql
+        entry.hit_count += 1
+        entry.last_used_at = utc_now()
+        db.commit()
+        return generated_sql
+
+    @staticmethod
+    def save_generated_sql(
+        db: Session,
+        connection_id: int,
+        cache_key: str,
+        version_hash: str,
+        dialect: str,
+        prompt: str,
+        generated_sql: str,
+        ttl_seconds: float,
+        max_entries: int,
+    ) -> None:
+        """保存 AI 生成 SQL, 同时清理过期条目并按最近使用时间淘汰超出上限的条目"""
+        cutoff = utc_now() - timedelta(seconds=ttl_seconds)
+        db.execute(delete(GeneratedSqlCache).where(GeneratedSqlCache.created_at < cutoff))
+
+        entry = db.scalar(select(GeneratedSqlCache).where(GeneratedSqlCache.cache_key == cache_key))
+        if entry:
+            entry.generated_sql = generated_sql
+            entry.created_at = entry.last_used_at = utc_now()
+        else:
+            db.add(
+                GeneratedSqlCache(
+                    connection_id=connection_id,
+                    cache_key=cache_key,
+                    version_hash=version_hash,
+                    dialect=dialect,
+                    prompt=prompt,
+                    generated_sql=generated_sql,
+                )
+            )
+        db.flush()
+
+        overflow = db.scalar(select(func.count()).select_from(GeneratedSqlCache)) - max_entries
+        if overflow > 0:
+            oldest = (
+                select(GeneratedSqlCache.id)
+                .order_by(GeneratedSqlCache.last_used_at, GeneratedSqlCache.id)
+                .limit(overflow)
+            )
+            db.execute(delete(GeneratedSqlCache).where(GeneratedSqlCache.id.in_(oldest)))
+        db.commit()
+
+    @staticmethod
+    def get_generated_sql_usage(db: Session, connection_id: int) -> tuple[int, int]:
+        """AI 生成 SQL 缓存的条目数与累计命中次数"""
+        stmt = select(
+            func.count(GeneratedSqlCache.id),
+            func.coalesce(func.sum(GeneratedSqlCache.hit_count), 0),
+        ).where(GeneratedSqlCache.connection_id == connection_id)
+        entries, hits = db.execute(stmt).one()
+        return entries, hits
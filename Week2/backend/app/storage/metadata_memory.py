@@ -0,0 +1,69 @@
+"""进程内已解码元数据缓存 - 本地 SQLite 元数据缓存之上的热层"""
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from app.config import settings
+
+
+class DecodedMetadataCache:
+    """
+    已解码元数据缓存（按 (连接 ID, 版本哈希) 命中）
+
+    SQLite 中的 JSON 仍是冷存储; 这里保存解码后的对象, 省去每次请求的
+    json.loads 与 Pydantic 校验。版本哈希与 SQLite 中的不一致时视为未命中,
+    因此其他进程写入的新版本也不会读到旧对象。缓存的对象由多个请求共享,
+    调用方不得修改。
+
+    Args:
+        max_entries: 最多缓存的连接数（LRU 淘汰）
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[int, tuple[str | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, connection_id: int, version_hash: str | None) -> Any | None:
+        """获取指定版本的已解码元数据, 未命中返回 None"""
+        with self._lock:
+            entry = self._entries.get(connection_id)
+            if entry is None or entry[0] != version_hash:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(connection_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, connection_id: int, version_hash: str | None, value: Any) -> None:
+        """缓存已解码元数据"""
+        with self._lock:
+            self._entries[connection_id] = (version_hash, value)
+            self._entries.move_to_end(connection_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, connection_id: int) -> None:
+        """丢弃连接的已解码元数据"""
+        with self._lock:
+            self._entries.pop(connection_id, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """缓存统计"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+decoded_metadata_cache = DecodedMetadataCache(settings.metadata_memory_cache_size)
@@ -44,6 +44,13 @@ class DatabaseConnection(Base):
         uselist=False,
     )
 
+    # 关联 AI 生成 SQL 缓存
+    generated_sql: Mapped[list["GeneratedSqlCache"]] = relationship(
+        "GeneratedSqlCache",
+        back_populates="connection",
+        cascade="all, delete-orphan",
+    )
+
 
 class MetadataCache(Base):
     """元数据缓存存储模型"""
@@ -68,3 +75,34 @@ class MetadataCache(Base):
     )
 
     __table_args__ = (Index("idx_metadata_connection", "connection_id"),)
+
+
+class GeneratedSqlCache(Base):
+    """AI 生成 SQL 缓存存储模型（按连接、元数据版本、提示词与方言）"""
+
+    __tablename__ = "generated_sql_cache"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    connection_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("database_connections.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    cache_key: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)  # SHA-256
+    version_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    dialect: Mapped[str] = mapped_column(String(50), nullable=False)
+    prompt: Mapped[str] = mapped_column(Text, nullable=False)  # 归一化后的提示词
+    generated_sql: Mapped[str] = mapped_column(Text, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utc_now)
+    last_used_at: Mapped[datetime] = mapped_column(DateTime, default=utc_now)
+
+    # 关联数据库连接
+    connection: Mapped["DatabaseConnection"] = relationship(
+        "DatabaseConnection", back_populates="generated_sql"
+    )
+
+    __table_args__ = (
+        Index("idx_generated_sql_connection", "connection_id"),
+        Index("idx_generated_sql_last_used", "last_used_at"),
+    )
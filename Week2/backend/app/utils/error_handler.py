@@ -24,6 +24,7 @@ class ErrorCode(str, Enum):
     SYNTAX_ERROR = "SYNTAX_ERROR"
     INVALID_STATEMENT = "INVALID_STATEMENT"
     CONFLICT = "CONFLICT"  # 并发冲突
+    QUERY_QUEUE_FULL = "QUERY_QUEUE_FULL"  # 连接查询队列已满
 
     # AI 服务错误
     AI_SERVICE_UNAVAILABLE = "AI_SERVICE_UNAVAILABLE"
@@ -92,6 +93,7 @@ ERROR_STATUS_MAP: dict[ErrorCode, int] = {
     ErrorCode.QUERY_TIMEOUT: status.HTTP_408_REQUEST_TIMEOUT,
     ErrorCode.QUERY_CANCELLED: status.HTTP_400_BAD_REQUEST,  # 使用 400 代替 499
     ErrorCode.CONFLICT: status.HTTP_409_CONFLICT,  # 并发冲突
+    ErrorCode.QUERY_QUEUE_FULL: status.HTTP_429_TOO_MANY_REQUESTS,
     ErrorCode.AI_SERVICE_UNAVAILABLE: status.HTTP_503_SERVICE_UNAVAILABLE,
     ErrorCode.AI_QUOTA_EXCEEDED: status.HTTP_503_SERVICE_UNAVAILABLE,
     ErrorCode.INTERNAL_ERROR: status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,35 +1,169 @@
-"""并发控制 - 互斥锁管理"""
+"""并发控制 - 按连接的查询并发限制与元数据刷新读写协调"""
 
 import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
 
-# 模块级别的互斥锁
-_metadata_refresh_lock: asyncio.Lock | None = None
-_query_execution_lock: asyncio.Lock | None = None
+from app.config import settings
 
 
-def get_metadata_lock() -> asyncio.Lock:
-    """获取元数据刷新锁"""
-    global _metadata_refresh_lock
-    if _metadata_refresh_lock is None:
-        _metadata_refresh_lock = asyncio.Lock()
-    return _metadata_refresh_lock
+class GateBusyError(Exception):
+    """排队已满或等待超时"""
 
+    pass
 
-def get_query_lock() -> asyncio.Lock:
-    """获取查询执行锁"""
-    global _query_execution_lock
-    if _query_execution_lock is None:
-        _query_execution_lock = asyncio.Lock()
-    return _query_execution_lock
 
+class ConnectionGate:
+    """
+    单个数据库连接的并发闸门
 
-def is_metadata_refreshing() -> bool:
-    """检查元数据是否正在刷新"""
-    lock = get_metadata_lock()
-    return lock.locked()
+    查询是"读者": 最多 max_concurrency 个同时执行, 超出的在队列中等待
+    (队列长度上限 max_queue, 等待超时 queue_timeout)。元数据刷新是"写者":
+    等待该连接上正在执行的查询结束后独占执行, 刷新排队期间新查询在其后
+    排队 (写者优先, 避免刷新饿死)。不同连接之间互不影响。
 
+    Args:
+        name: 连接名称
+        max_concurrency: 同时执行的查询数上限
+        max_queue: 排队等待的查询数上限
+        queue_timeout: 排队等待超时（秒）
+    """
 
-def is_query_executing() -> bool:
-    """检查查询是否正在执行"""
-    lock = get_query_lock()
-    return lock.locked()
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = 8,
+        max_queue: int = 64,
+        queue_timeout: float = 30.0,
+    ) -> None:
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self._refreshing = False
+        self._refresh_waiting = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def is_refreshing(self) -> bool:
+        """元数据是否正在刷新"""
+        return self._refreshing
+
+    def _can_query(self) -> bool:
+        return (
+            not self._refreshing
+            and self._refresh_waiting == 0
+            and self.active < self.max_concurrency
+        )
+
+    def _can_refresh(self) -> bool:
+        return not self._refreshing and self.active == 0
+
+    @asynccontextmanager
+    async def query(self) -> AsyncIterator[None]:
+        """
+        占用一个查询执行槽位
+
+        Raises:
+            GateBusyError: 队列已满或排队超时
+        """
+        async with self._cond:
+            if not self._can_query():
+                if self.waiting >= self.max_queue:
+                    self.rejected += 1
+                    raise GateBusyError(
+                        f"连接 '{self.name}' 查询队列已满（{self.max_queue}），请稍后重试"
+                    )
+                self.waiting += 1
+                try:
+                    async with asyncio.timeout(self.queue_timeout):
+                        await self._cond.wait_for(self._can_query)
+                except TimeoutError:
+                    self.rejected += 1
+                    raise GateBusyError(
+                        f"连接 '{self.name}' 查询排队超时（{self.queue_timeout:g}秒）"
+                    )
+                finally:
+                    self.waiting -= 1
+            self.active += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.active -= 1
+                self.completed += 1
+                self._cond.notify_all()
+
+    @asynccontextmanager
+    async def refresh(self) -> AsyncIterator[None]:
+        """
+        独占刷新该连接的元数据
+
+        Raises:
+            GateBusyError: 等待正在执行的查询超时
+        """
+        async with self._cond:
+            self._refresh_waiting += 1
+            try:
+                async with asyncio.timeout(self.queue_timeout):
+                    await self._cond.wait_for(self._can_refresh)
+            except TimeoutError:
+                raise GateBusyError(f"连接 '{self.name}' 查询执行中，元数据刷新等待超时")
+            finally:
+                self._refresh_waiting -= 1
+                # 放弃刷新时唤醒被写者优先挡住的查询
+                self._cond.notify_all()
+            self._refreshing = True
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._refreshing = False
+                self._cond.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        """当前并发状态"""
+        return {
+            "name": self.name,
+            "maxConcurrency": self.max_concurrency,
+            "active": self.active,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "refreshing": self._refreshing,
+        }
+
+
+# 连接名称 -> 并发闸门
+_gates: dict[str, ConnectionGate] = {}
+
+
+def get_connection_gate(name: str) -> ConnectionGate:
+    """获取（或创建）连接的并发闸门, 并发上限可按连接名在配置中覆盖"""
+    gate = _gates.get(name)
+    if gate is None:
+        gate = ConnectionGate(
+            name,
+            max_concurrency=settings.query_concurrency_overrides.get(
+                name, settings.query_max_concurrency
+            ),
+            max_queue=settings.query_max_queue,
+            queue_timeout=settings.query_queue_timeout_seconds,
+        )
+        _gates[name] = gate
+    return gate
+
+
+def discard_connection_gate(name: str) -> None:
+    """连接删除后移除其闸门（正在执行的查询仍持有旧闸门直至结束）"""
+    _gates.pop(name, None)
+
+
+def get_all_gate_stats() -> list[dict[str, Any]]:
+    """所有连接的并发状态"""
+    return [gate.stats() for gate in _gates.values()]
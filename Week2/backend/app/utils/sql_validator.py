@@ -1,7 +1,15 @@
-"""SQL 验证工具（使用 sqlglot）- 增强版包含多层注入防护"""
+"""SQL 验证工具（使用 sqlglot）- 增强版包含多层注入防护, 单次解析 + LRU 缓存"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 import sqlglot
+from sqlglot.dialects.dialect import Dialect
 from sqlglot.errors import ParseError
+from sqlglot.tokens import Token, TokenType
+
+from app.config import settings
 
 # 禁止的 SQL 语句类型
 FORBIDDEN_STATEMENTS = {
@@ -31,175 +39,360 @@ DANGEROUS_KEYWORDS = {
     "sp_executesql",  # SQL Server
 }
 
-# 系统表前缀
-SYSTEM_TABLE_PREFIXES = [
+# 系统模式（库）名
+SYSTEM_SCHEMAS = {
     "information_schema",
     "pg_catalog",
-    "pg_",
-    "mysql.",
-    "sys.",
+    "mysql",
+    "sys",
     "performance_schema",
-]
+}
 
+# 系统表/系统函数名前缀
+SYSTEM_NAME_PREFIXES = ("pg_",)
 
-def validate_sql(sql: str, dialect: str = "postgres") -> tuple[bool, str | None]:
-    """
-    验证 SQL 语法并检查是否为 SELECT 语句 (多层注入防护)
+# LIMIT 上限
+MAX_LIMIT = 10000
 
-    Args:
-        sql: SQL 查询语句
-        dialect: 数据库方言 (postgres, mysql, sqlite)
+# 数据库类型 -> sqlglot 方言
+DIALECT_MAP = {
+    "postgresql": "postgres",
+    "mysql": "mysql",
+    "sqlite": "sqlite",
+}
 
-    Returns:
-        (is_valid, error_message)
-    """
-    # === 第 1 层: 注释检测 ===
-    if "--" in sql or "/*" in sql or "*/" in sql or "#" in sql:
-        return False, "检测到不安全的 SQL 模式: 注释。仅允许安全的 SELECT 查询。"
+# 聚合函数名
+AGG_FUNCTIONS = {"COUNT", "SUM", "AVG", "MAX", "MIN"}
+
+_KEYWORD_PATTERN = re.compile(r"[A-Z_]+")
+
+# 语法树中任意位置出现即拒绝的写操作节点（如 CTE 中的 DELETE ... RETURNING）
+_WRITE_EXPRESSIONS = (
+    sqlglot.exp.Insert,
+    sqlglot.exp.Update,
+    sqlglot.exp.Delete,
+    sqlglot.exp.Merge,
+    sqlglot.exp.Create,
+    sqlglot.exp.Drop,
+    sqlglot.exp.Alter,
+    sqlglot.exp.Command,
+)
+
+# 不是关键字的词法单元（标识符、字面量、参数）
+_NON_KEYWORD_TOKENS = {
+    TokenType.VAR,
+    TokenType.IDENTIFIER,
+    TokenType.STRING,
+    TokenType.NUMBER,
+    TokenType.NATIONAL_STRING,
+    TokenType.BIT_STRING,
+    TokenType.HEX_STRING,
+    TokenType.BYTE_STRING,
+    TokenType.RAW_STRING,
+    TokenType.HEREDOC_STRING,
+    TokenType.PARAMETER,
+    TokenType.PLACEHOLDER,
+}
 
-    # === 第 2 层: 多语句检测 ===
-    # 移除末尾的分号后检查是否还有分号
-    sql_stripped = sql.strip().rstrip(";").strip()
-    if ";" in sql_stripped:
-        return False, "检测到不安全的 SQL 模式: 多语句。仅允许单条 SELECT 查询。"
 
-    # === 第 3 层: 危险关键字检测 ===
-    sql_upper = sql.upper()
-    for keyword in DANGEROUS_KEYWORDS:
-        if keyword in sql_upper:
-            return False, f"检测到不安全的 SQL 模式: {keyword}。仅允许安全的 SELECT 查询。"
+def to_sqlglot_dialect(db_type: str) -> str:
+    """数据库类型映射到 sqlglot 方言（未知类型按 PostgreSQL 处理）"""
+    return DIALECT_MAP.get(db_type, db_type if db_type in DIALECT_MAP.values() else "postgres")
 
-    # === 第 4 层: 系统表检测 ===
-    sql_lower = sql.lower()
-    for prefix in SYSTEM_TABLE_PREFIXES:
-        # 检测完整的表名引用 (避免误判,如 my_information 表)
-        if f" {prefix}" in sql_lower or f"\t{prefix}" in sql_lower or sql_lower.startswith(prefix):
-            return False, f"检测到不安全的 SQL 模式: 访问系统表 {prefix}。"
 
-    # === 第 5 层: sqlglot 语法验证 ===
-    try:
-        # 解析 SQL (使用 read 参数指定方言)
-        parsed = sqlglot.parse(sql, read=dialect)
-        if not parsed:
-            return False, "无法解析 SQL"
+@dataclass(frozen=True)
+class SQLAnalysis:
+    """
+    一条 SQL 的单次解析结果
 
-        # 检查每个语句
-        for statement in parsed:
-            if statement is None:
-                continue
-            statement_type = statement.key.lower()
+    安全检查、LIMIT 改写和 AI 输出校验需要的信息都从同一棵语法树取得,
+    结果按 (SQL, 方言, limit, max_limit) 缓存, 调用方不得修改。
+    """
 
-            # 检查是否为禁止的语句类型
-            if statement_type in FORBIDDEN_STATEMENTS:
-                return False, f"仅允许 SELECT 查询，{statement_type.upper()} 操作已被阻止"
+    is_valid: bool
+    error: str | None
+    # 添加或收紧 LIMIT 后的 SQL（无需改写时为原 SQL）
+    sql: str
+    # 引用的表名（小写, 不含模式名）
+    tables: frozenset[str] = frozenset()
+    # 调用的函数名（大写）
+    functions: frozenset[str] = frozenset()
+    # 出现的 SQL 关键字（大写, 不含标识符与字面量）
+    keywords: frozenset[str] = frozenset()
+    # 是否包含子查询
+    has_subquery: bool = False
 
-            # 检查是否为 SELECT 或 UNION 语句
-            if statement_type not in ("select", "union"):
-                return False, f"仅允许 SELECT 查询，检测到 {statement_type.upper()} 语句"
 
-        return True, None
+def validate_sql(sql: str, dialect: str = "postgres") -> tuple[bool, str | None]:
+    """
+    验证 SQL 语法并检查是否为 SELECT 语句 (多层注入防护)
 
-    except ParseError as e:
-        # 提取错误位置信息
-        error_msg = str(e)
-        if hasattr(e, "errors") and e.errors:
-            first_error = e.errors[0]
-            if "line" in first_error and "col" in first_error:
-                line = first_error.get("line", 1)
-                col = first_error.get("col", 1)
-                return False, f"语法错误：{error_msg}。位置：第 {line} 行，第 {col} 列"
-        return False, f"语法错误：{error_msg}"
+    Args:
+        sql: SQL 查询语句
+        dialect: 数据库方言 (postgres, mysql, sqlite)
 
-    except Exception as e:
-        return False, f"SQL 验证失败：{str(e)}"
+    Returns:
+        (is_valid, error_message)
+    """
+    analysis = analyze_sql(sql, dialect)
+    return analysis.is_valid, analysis.error
 
 
-def add_limit_if_missing(sql: str, limit: int = 1000) -> str:
+def add_limit_if_missing(sql: str, limit: int = 1000, dialect: str = "postgres") -> str:
     """
     智能添加 LIMIT - 聚合查询豁免
 
     Args:
         sql: SQL 查询语句
         limit: 默认限制行数 (最大 10000)
+        dialect: 数据库方言 (postgres, mysql, sqlite)
 
     Returns:
         修改后的 SQL
     """
-    try:
-        # 限制最大值
-        if limit > 10000:
-            limit = 10000
-
-        # 解析 SQL
-        parsed = sqlglot.parse_one(sql)
-        if not parsed or parsed.key.lower() != "select":
-            return sql
-
-        # 检查是否已有 LIMIT
-        existing_limit = parsed.args.get("limit")
-        if existing_limit:
-            # 检查是否超过最大值
-            try:
-                limit_value = int(str(existing_limit.expression))
-                if limit_value > 10000:
-                    # 替换为最大值
-                    parsed = parsed.limit(10000, copy=False)
-                    return parsed.sql()
-            except (AttributeError, ValueError):
-                pass
-            return sql
-
-        # === 检测聚合查询豁免 ===
-        has_aggregation = _detect_aggregation(parsed)
-        has_group_by = parsed.args.get("group") is not None
-
-        # 聚合查询且无 GROUP BY 则豁免 LIMIT
-        if has_aggregation and not has_group_by:
-            return sql
-
-        # 添加 LIMIT (使用 limit() 方法)
-        parsed = parsed.limit(limit)
-        return parsed.sql()
-
-    except Exception:
-        # 如果解析失败，简单地在末尾添加 LIMIT
-        sql_upper = sql.upper().strip()
-
-        # 检查是否有 LIMIT
-        if "LIMIT" in sql_upper:
-            return sql
-
-        # 简单的聚合检测
-        if _simple_aggregation_check(sql_upper):
-            return sql
-
-        # 移除末尾的分号（如果有）
-        sql_clean = sql.rstrip().rstrip(";")
-        return f"{sql_clean} LIMIT {limit}"
-
-
-def _detect_aggregation(statement: sqlglot.exp.Expression) -> bool:
+    return analyze_sql(sql, dialect, limit).sql
+
+
+def analyze_sql(
+    sql: str,
+    dialect: str = "postgres",
+    limit: int = 1000,
+    max_limit: int = MAX_LIMIT,
+) -> SQLAnalysis:
     """
-    检测是否包含聚合函数
+    单次解析 SQL: 词法层检查、语法树安全检查与 LIMIT 改写
 
     Args:
-        statement: sqlglot 解析的 SQL 语句
+        sql: SQL 查询语句
+        dialect: 数据库方言 (postgres, mysql, sqlite)
+        limit: 默认限制行数 (不超过 max_limit)
+        max_limit: 显式 LIMIT 的上限（流式查询使用更大的上限）
 
     Returns:
-        是否包含聚合函数
+        SQLAnalysis（按 (SQL, 方言, limit, max_limit) LRU 缓存）
     """
-    AGG_FUNCTIONS = {"COUNT", "SUM", "AVG", "MAX", "MIN"}
+    # 统一按位置传参, 使不同调用写法命中同一缓存项
+    return _analyze(sql, dialect, min(limit, max_limit), max_limit)
+
+
+def sql_cache_info() -> dict[str, int]:
+    """解析缓存统计"""
+    info = _analyze.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxSize": info.maxsize or 0,
+    }
+
+
+@lru_cache(maxsize=settings.sql_parse_cache_size)
+def _analyze(sql: str, dialect: str, limit: int, max_limit: int) -> SQLAnalysis:
+    # === 第 1 层: 注释检测（注释不进入语法树, 在原文上检查）===
+    if "--" in sql or "/*" in sql or "*/" in sql or "#" in sql:
+        return _rejected(sql, limit, "检测到不安全的 SQL 模式: 注释。仅允许安全的 SELECT 查询。")
 
-    # 遍历所有节点查找聚合函数
+    # === 第 2 层: 危险关键字检测（INTO OUTFILE 等并非所有方言都能解析）===
+    sql_upper = sql.upper()
+    for keyword in DANGEROUS_KEYWORDS:
+        if keyword.upper() in sql_upper:
+            return _rejected(
+                sql, limit, f"检测到不安全的 SQL 模式: {keyword}。仅允许安全的 SELECT 查询。"
+            )
+
+    # === 第 3 层: 词法分析 + 语法解析（只做一次）===
+    try:
+        parser_dialect = Dialect.get_or_raise(dialect)
+        tokens = parser_dialect.tokenize(sql)
+        statements = [s for s in parser_dialect.parser().parse(tokens, sql) if s is not None]
+    except ParseError as e:
+        return _rejected(sql, limit, _parse_error_message(e))
+    except Exception as e:
+        return _rejected(sql, limit, f"SQL 验证失败：{str(e)}")
+
+    if not statements:
+        return SQLAnalysis(is_valid=False, error="无法解析 SQL", sql=sql)
+
+    # === 第 4 层: 多语句检测 ===
+    if len(statements) > 1:
+        return SQLAnalysis(
+            is_valid=False,
+            error="检测到不安全的 SQL 模式: 多语句。仅允许单条 SELECT 查询。",
+            sql=sql,
+        )
+
+    statement = statements[0]
+    facts = _walk(statement)
+    # LIMIT 改写放在最后: 语法树本身不缓存, 可以原地修改
+    analysis = SQLAnalysis(
+        is_valid=True,
+        error=None,
+        sql=_apply_limit(statement, sql, limit, max_limit, dialect, facts.has_aggregation),
+        tables=frozenset(table.name.lower() for table in facts.tables),
+        functions=frozenset(facts.functions),
+        keywords=frozenset(_keywords(tokens, facts.identifiers)),
+        has_subquery=facts.has_subquery,
+    )
+
+    # === 第 5 层: 语句类型检查 ===
+    statement_type = statement.key.lower()
+    if statement_type in FORBIDDEN_STATEMENTS:
+        error = f"仅允许 SELECT 查询，{statement_type.upper()} 操作已被阻止"
+    elif statement_type not in ("select", "union"):
+        error = f"仅允许 SELECT 查询，检测到 {statement_type.upper()} 语句"
+    elif facts.write_operation:
+        error = f"仅允许 SELECT 查询，{facts.write_operation} 操作已被阻止"
+    else:
+        # === 第 6 层: 系统表与系统函数检测 ===
+        error = _system_object_error(facts)
+
+    if error:
+        return SQLAnalysis(is_valid=False, error=error, sql=analysis.sql)
+    return analysis
+
+
+def _rejected(sql: str, limit: int, error: str) -> SQLAnalysis:
+    """未能解析或在解析前被拒绝的 SQL（LIMIT 使用文本兜底改写）"""
+    return SQLAnalysis(is_valid=False, error=error, sql=_append_limit(sql, limit))
+
+
+def _parse_error_message(e: ParseError) -> str:
+    """提取错误位置信息"""
+    error_msg = str(e)
+    if hasattr(e, "errors") and e.errors:
+        first_error = e.errors[0]
+        if "line" in first_error and "col" in first_error:
+            line = first_error.get("line", 1)
+            col = first_error.get("col", 1)
+            return f"语法错误：{error_msg}。位置：第 {line} 行，第 {col} 列"
+    return f"语法错误：{error_msg}"
+
+
+@dataclass
+class _TreeFacts:
+    """一次遍历语法树收集的信息"""
+
+    tables: list[sqlglot.exp.Table] = field(default_factory=list)
+    functions: set[str] = field(default_factory=set)
+    identifiers: set[str] = field(default_factory=set)
+    has_subquery: bool = False
+    has_aggregation: bool = False
+    write_operation: str | None = None
+
+
+def _walk(statement: sqlglot.exp.Expression) -> _TreeFacts:
+    """遍历一次语法树, 收集表、函数、标识符、子查询、聚合与写操作信息"""
+    facts = _TreeFacts()
     for node in statement.walk():
-        if isinstance(node, sqlglot.exp.AggFunc):
-            return True
-        # 检查函数名
-        if isinstance(node, sqlglot.exp.Func):
-            if node.name and node.name.upper() in AGG_FUNCTIONS:
-                return True
-
-    return False
+        if isinstance(node, sqlglot.exp.Table):
+            facts.tables.append(node)
+        elif isinstance(node, sqlglot.exp.Identifier):
+            facts.identifiers.add(node.name.upper())
+        elif isinstance(node, sqlglot.exp.Func):
+            if isinstance(node, sqlglot.exp.Anonymous):
+                name = node.name.upper()
+            else:
+                name = node.sql_name().upper()
+            facts.functions.add(name)
+            if isinstance(node, sqlglot.exp.AggFunc) or name in AGG_FUNCTIONS:
+                facts.has_aggregation = True
+        elif isinstance(node, _WRITE_EXPRESSIONS):
+            facts.write_operation = facts.write_operation or node.key.upper()
+        elif isinstance(node, sqlglot.exp.Select) and node.args.get("into"):
+            facts.write_operation = facts.write_operation or "SELECT INTO"
+        elif (
+            isinstance(node, sqlglot.exp.Select)
+            and node is not statement
+            and node.find_ancestor(sqlglot.exp.Select) is not None
+        ):
+            facts.has_subquery = True
+    return facts
+
+
+def _system_object_error(facts: _TreeFacts) -> str | None:
+    """检查系统模式/系统表引用与系统函数调用"""
+    for table in facts.tables:
+        schema = (table.db or "").lower()
+        name = table.name.lower()
+        if schema in SYSTEM_SCHEMAS or name in SYSTEM_SCHEMAS:
+            return f"检测到不安全的 SQL 模式: 访问系统表 {schema or name}。"
+        if name.startswith(SYSTEM_NAME_PREFIXES):
+            return f"检测到不安全的 SQL 模式: 访问系统表 {name}。"
+    for function in facts.functions:
+        if function.lower().startswith(SYSTEM_NAME_PREFIXES):
+            return f"检测到不安全的 SQL 模式: 调用系统函数 {function.lower()}。"
+    return None
+
+
+def _keywords(tokens: list[Token], identifiers: set[str]) -> set[str]:
+    """SQL 关键字: 排除标识符、字面量, 以及被用作表名/列名的非保留字"""
+    keywords = set()
+    for token in tokens:
+        if token.token_type in _NON_KEYWORD_TOKENS:
+            continue
+        for word in token.text.upper().split():
+            if word not in identifiers and _KEYWORD_PATTERN.fullmatch(word):
+                keywords.add(word)
+    return keywords
+
+
+def _apply_limit(
+    statement: sqlglot.exp.Expression,
+    sql: str,
+    limit: int,
+    max_limit: int,
+    dialect: str,
+    has_aggregation: bool,
+) -> str:
+    """在已解析的语法树上添加或收紧 LIMIT（聚合查询豁免, 原地修改语法树）"""
+    if statement.key.lower() != "select":
+        return sql
+
+    # 检查是否已有 LIMIT
+    existing_limit = statement.args.get("limit")
+    if existing_limit:
+        # 检查是否超过最大值
+        try:
+            limit_value = int(str(existing_limit.expression))
+            if limit_value > max_limit:
+                # 替换为最大值
+                return _set_limit(statement, max_limit).sql(dialect=dialect)
+        except (AttributeError, ValueError):
+            pass
+        return sql
+
+    # === 检测聚合查询豁免 ===
+    has_group_by = statement.args.get("group") is not None
+
+    # 聚合查询且无 GROUP BY 则豁免 LIMIT
+    if has_aggregation and not has_group_by:
+        return sql
+
+    # 添加 LIMIT
+    return _set_limit(statement, limit).sql(dialect=dialect)
+
+
+def _set_limit(statement: sqlglot.exp.Expression, limit: int) -> sqlglot.exp.Expression:
+    """直接设置 LIMIT 节点（Select.limit() 会复制整棵树并解析参数）"""
+    statement.set("limit", sqlglot.exp.Limit(expression=sqlglot.exp.Literal.number(limit)))
+    return statement
+
+
+def _append_limit(sql: str, limit: int) -> str:
+    """解析失败时的文本兜底: 在末尾添加 LIMIT"""
+    sql_upper = sql.upper().strip()
+
+    # 检查是否有 LIMIT
+    if "LIMIT" in sql_upper:
+        return sql
+
+    # 简单的聚合检测
+    if _simple_aggregation_check(sql_upper):
+        return sql
+
+    # 移除末尾的分号（如果有）
+    sql_clean = sql.rstrip().rstrip(";")
+    return f"{sql_clean} LIMIT {limit}"
 
 
 def _simple_aggregation_check(sql_upper: str) -> bool:
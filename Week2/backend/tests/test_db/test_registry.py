@@ -0,0 +1,162 @@
+"""适配器连接池注册表测试 - 复用、失效、健康探测与空闲回收"""
+
+import asyncio
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.db.registry import AdapterRegistry, NoLivePoolError
+from app.db.sqlite import SQLiteAdapter
+
+
+class FakeAdapter:
+    """记录连接与关闭次数的适配器"""
+
+    def __init__(self) -> None:
+        self.url: str | None = None
+        self.closed = False
+        self.healthy = True
+
+    async def connect(self, url: str) -> None:
+        self.url = url
+
+    async def execute(self, sql: str, timeout: float = 30.0) -> list[dict[str, Any]]:
+        return []
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def test_connection(self) -> bool:
+        return self.healthy
+
+
+@pytest.fixture
+def created() -> list[FakeAdapter]:
+    return []
+
+
+@pytest.fixture
+def registry(created: list[FakeAdapter]) -> AdapterRegistry:
+    def factory(name: str, db_type: str) -> FakeAdapter:
+        adapter = FakeAdapter()
+        created.append(adapter)
+        return adapter
+
+    return AdapterRegistry(factory, idle_timeout=60.0, probe_interval=60.0)
+
+
+async def test_adapter_is_reused(registry: AdapterRegistry, created: list[FakeAdapter]) -> None:
+    for _ in range(3):
+        async with registry.acquire("crm", "postgres", "postgresql://a") as adapter:
+            assert adapter is created[0]
+    assert len(created) == 1
+    assert registry.stats()["created"] == 1
+    assert registry.stats()["reused"] == 2
+    await registry.close_all()
+    assert created[0].closed
+
+
+async def test_url_change_rebuilds(registry: AdapterRegistry, created: list[FakeAdapter]) -> None:
+    async with registry.acquire("crm", "postgres", "postgresql://a"):
+        pass
+    async with registry.acquire("crm", "postgres", "postgresql://b") as adapter:
+        assert adapter.url == "postgresql://b"
+    assert created[0].closed
+    assert len(created) == 2
+    await registry.close_all()
+
+
+async def test_invalidate_while_in_use_closes_on_release(
+    registry: AdapterRegistry, created: list[FakeAdapter]
+) -> None:
+    async with registry.acquire("crm", "postgres", "postgresql://a") as adapter:
+        await registry.invalidate("crm")
+        assert not adapter.closed
+    assert adapter.closed
+    assert registry.stats()["pools"] == 0
+
+
+async def test_failed_probe_rebuilds(
+    registry: AdapterRegistry, created: list[FakeAdapter]
+) -> None:
+    registry.probe_interval = 0.0
+    async with registry.acquire("crm", "postgres", "postgresql://a"):
+        pass
+    created[0].healthy = False
+    async with registry.acquire("crm", "postgres", "postgresql://a") as adapter:
+        assert adapter is created[1]
+    assert created[0].closed
+    await registry.close_all()
+
+
+async def test_idle_pools_are_evicted(
+    registry: AdapterRegistry, created: list[FakeAdapter]
+) -> None:
+    async with registry.acquire("idle", "mysql", "mysql://a"):
+        pass
+    async with registry.acquire("busy", "mysql", "mysql://b"):
+        registry.idle_timeout = 0.0
+        await asyncio.sleep(0.001)
+        assert await registry.evict_idle() == 1
+    assert created[0].closed
+    assert not created[1].closed
+    await registry.close_all()
+
+
+async def test_untouched_acquire_does_not_delay_eviction(
+    registry: AdapterRegistry, created: list[FakeAdapter]
+) -> None:
+    async with registry.acquire("crm", "postgres", "postgresql://a"):
+        pass
+    await asyncio.sleep(0.02)
+    registry.idle_timeout = 0.01
+    async with registry.acquire("crm", "postgres", "postgresql://a", touch=False):
+        pass
+    assert await registry.evict_idle() == 1
+    assert created[0].closed
+    await registry.close_all()
+
+
+async def test_acquire_without_create_skips_evicted_pools(
+    registry: AdapterRegistry, created: list[FakeAdapter]
+) -> None:
+    with pytest.raises(NoLivePoolError):
+        async with registry.acquire("crm", "postgres", "postgresql://a", create=False):
+            pass
+    async with registry.acquire("crm", "postgres", "postgresql://a"):
+        pass
+    async with registry.acquire("crm", "postgres", "postgresql://a", create=False) as adapter:
+        assert adapter is created[0]
+
+    registry.idle_timeout = 0.0
+    await asyncio.sleep(0.001)
+    assert await registry.evict_idle() == 1
+    with pytest.raises(NoLivePoolError):
+        async with registry.acquire("crm", "postgres", "postgresql://a", create=False):
+            pass
+    assert len(created) == 1
+    await registry.close_all()
+
+
+async def test_sqlite_adapter_pool_is_shared(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    with sqlite3.connect("shop.db") as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        conn.execute("INSERT INTO items VALUES (1), (2)")
+    registry = AdapterRegistry(lambda name, db_type: SQLiteAdapter(pool_size=4))
+
+    async def count() -> int:
+        async with registry.acquire("shop", "sqlite", "sqlite:///shop.db") as adapter:
+            rows = await adapter.execute("SELECT COUNT(*) AS n FROM items")
+            return rows[0]["n"]
+
+    try:
+        assert await asyncio.gather(*(count() for _ in range(8))) == [2] * 8
+        assert registry.stats()["created"] == 1
+        assert registry.stats()["reused"] == 7
+    finally:
+        await registry.close_all()
@@ -0,0 +1,74 @@
+"""SQLite 适配器元数据提取测试"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.db.sqlite import SQLiteAdapter
+
+
+async def test_get_metadata_reads_all_tables_in_one_pass(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    with sqlite3.connect("shop.db") as conn:
+        conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, customer TEXT NOT NULL)")
+        conn.execute(
+            'CREATE TABLE "order items" (order_id INTEGER, line INTEGER, qty DEFAULT 1, '
+            "PRIMARY KEY (order_id, line))"
+        )
+        conn.execute("CREATE VIEW big_orders AS SELECT id FROM orders WHERE id > 10")
+
+    adapter = SQLiteAdapter()
+    await adapter.connect("sqlite:///shop.db")
+    try:
+        metadata = await adapter.get_metadata()
+    finally:
+        await adapter.close()
+
+    assert [t["name"] for t in metadata["tables"]] == ["order items", "orders"]
+    assert [v["name"] for v in metadata["views"]] == ["big_orders"]
+    assert metadata["views"][0]["tableType"] == "view"
+
+    items, orders = metadata["tables"]
+    assert [(c["name"], c["isPrimaryKey"]) for c in items["columns"]] == [
+        ("order_id", True),
+        ("line", True),
+        ("qty", False),
+    ]
+    assert items["columns"][2]["dataType"] == "TEXT"
+    assert items["columns"][2]["defaultValue"] == "1"
+    assert orders["columns"][1] == {
+        "name": "customer",
+        "dataType": "TEXT",
+        "isNullable": False,
+        "isPrimaryKey": False,
+        "defaultValue": None,
+    }
+
+
+async def test_schema_versions_track_ddl(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    with sqlite3.connect("shop.db") as conn:
+        conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+
+    adapter = SQLiteAdapter()
+    await adapter.connect("sqlite:///shop.db")
+    try:
+        before = await adapter.get_schema_versions()
+        assert await adapter.get_schema_versions() == before
+
+        with sqlite3.connect("shop.db") as conn:
+            conn.execute("ALTER TABLE items ADD COLUMN qty INTEGER")
+        after = await adapter.get_schema_versions()
+        assert after["orders"] == before["orders"]
+        assert after["items"] != before["items"]
+
+        metadata = await adapter.get_metadata(tables=["items"])
+        assert [t["name"] for t in metadata["tables"]] == ["items"]
+        assert [c["name"] for c in metadata["tables"][0]["columns"]] == ["id", "qty"]
+        assert await adapter.get_metadata(tables=[]) == {"tables": [], "views": []}
+    finally:
+        await adapter.close()
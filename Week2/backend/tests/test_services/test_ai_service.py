@@ -0,0 +1,43 @@
+"""AI 服务 SQL 校验测试 - 白名单与表名验证"""
+
+from app.models.metadata import DatabaseMetadata, TableInfo
+from app.services.ai_service import _validate_table_names, _validate_whitelist
+
+METADATA = DatabaseMetadata(
+    name="shop",
+    db_type="postgresql",
+    tables=[TableInfo(name="users"), TableInfo(name="orders")],
+)
+
+
+def test_whitelist_accepts_plain_select():
+    sql = (
+        "SELECT u.name, SUM(o.total) FROM users u "
+        "JOIN orders o ON u.id = o.user_id GROUP BY u.name"
+    )
+    assert _validate_whitelist(sql) == (True, None)
+    assert _validate_table_names(sql, METADATA) == (True, None)
+
+
+def test_whitelist_rejects_subquery_and_system_functions():
+    is_valid, error = _validate_whitelist(
+        "SELECT name FROM users WHERE id IN (SELECT user_id FROM orders)"
+    )
+    assert is_valid is False
+    assert error == "不允许子查询"
+
+    is_valid, error = _validate_whitelist("SELECT VERSION()")
+    assert is_valid is False
+    assert "VERSION" in error
+
+
+def test_whitelist_rejects_unlisted_keywords():
+    is_valid, error = _validate_whitelist("SELECT name FROM users UNION SELECT name FROM orders")
+    assert is_valid is False
+    assert "UNION" in error
+
+
+def test_unknown_table_rejected():
+    is_valid, error = _validate_table_names("SELECT * FROM invoices", METADATA)
+    assert is_valid is False
+    assert "invoices" in error
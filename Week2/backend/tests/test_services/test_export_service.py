@@ -0,0 +1,153 @@
+"""导出服务测试 - CSV / JSON / XLSX 流式编码、gzip、进度与取消"""
+
+import csv
+import gzip
+import io
+import json
+import sqlite3
+import zipfile
+from collections.abc import AsyncIterator
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+from app.config import settings
+from app.db.registry import AdapterRegistry
+from app.db.sqlite import SQLiteAdapter
+from app.models.export import ExportRequest
+from app.services import query_service
+from app.services.export_service import ExportCancelledError, ExportService, detect_delimiter
+from app.storage.models import DatabaseConnection
+from app.utils import locks
+
+XLSX_NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+@pytest.fixture
+async def sqlite_registry(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> AsyncIterator[AdapterRegistry]:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(locks, "_gates", {})
+    monkeypatch.setattr(settings, "stream_batch_size", 2)
+    with sqlite3.connect("shop.db") as conn:
+        conn.execute('CREATE TABLE customers (id INTEGER, name TEXT, "=total" REAL, note TEXT)')
+        conn.executemany(
+            "INSERT INTO customers VALUES (?, ?, ?, ?)",
+            [
+                (1, "Smith, Jr.", 10.5, None),
+                (2, 'say "hi"', 0.25, "line 1\nline 2"),
+                (3, "张三", None, "tab\there"),
+            ],
+        )
+    registry = AdapterRegistry(lambda name, db_type: SQLiteAdapter())
+    monkeypatch.setattr(query_service, "adapter_registry", registry)
+    yield registry
+    await registry.close_all()
+
+
+def _connection() -> DatabaseConnection:
+    return DatabaseConnection(name="shop", db_type="sqlite", url="sqlite:///shop.db", database="shop")
+
+
+async def _export(**request: object) -> tuple[bytes, object]:
+    connection = _connection()
+    job = ExportService.create_job(connection, ExportRequest(**request))
+    stream = await ExportService.open_download(connection, job)
+    body = b"".join([chunk async for chunk in ExportService.chunks(job, stream)])
+    return body, job
+
+
+async def test_csv_export(sqlite_registry: AdapterRegistry) -> None:
+    body, job = await _export(sql="SELECT * FROM customers ORDER BY id")
+
+    assert body.startswith(b"\xef\xbb\xbf")
+    assert b"\r\n" in body
+    rows = list(csv.reader(io.StringIO(body.decode("utf-8-sig"), newline="")))
+    # 以 = 开头的列名加单引号防止公式注入
+    assert rows[0] == ["id", "name", "'=total", "note"]
+    assert rows[1] == ["1", "Smith, Jr.", "10.5", ""]
+    assert rows[2] == ["2", 'say "hi"', "0.25", "line 1\nline 2"]
+    assert rows[3] == ["3", "张三", "", "tab\there"]
+
+    assert job.filename == "customers.csv"
+    assert job.delimiter == ","
+    assert job.status == "completed"
+    assert job.row_count == 3
+    assert job.bytes_written == len(body)
+    assert locks._gates["shop"].active == 0
+
+
+async def test_csv_export_escapes_formula_values(sqlite_registry: AdapterRegistry) -> None:
+    body, _ = await _export(
+        sql="SELECT '=SUM(A1:A10)' AS formula UNION ALL SELECT '+1+1' UNION ALL SELECT '-1' "
+        "UNION ALL SELECT '@SUM(A1)' UNION ALL SELECT -1"
+    )
+
+    rows = list(csv.reader(io.StringIO(body.decode("utf-8-sig"), newline="")))
+    assert rows == [["formula"], ["'=SUM(A1:A10)"], ["'+1+1"], ["'-1"], ["'@SUM(A1)"], ["-1"]]
+
+
+def test_detect_delimiter() -> None:
+    assert detect_delimiter([{"a": "x", "b": "1,5"}]) == ","
+    assert detect_delimiter([{"a": "1,5", "b": "2,5; 3"}, {"a": "4,0", "b": "x"}]) == "\t"
+    assert detect_delimiter([{"a": 1, "b": None}]) == ","
+
+
+async def test_json_export_gzip(sqlite_registry: AdapterRegistry) -> None:
+    body, job = await _export(
+        sql="SELECT id, name, note FROM customers ORDER BY id", format="json", gzip=True
+    )
+
+    assert job.filename == "customers.json.gz"
+    document = json.loads(gzip.decompress(body))
+    assert document["data"][0] == {"id": 1, "name": "Smith, Jr.", "note": None}
+    assert document["data"][2]["name"] == "张三"
+    assert document["metadata"]["rowCount"] == 3
+    assert document["metadata"]["columns"][0] == {"name": "id", "dataType": "int"}
+
+
+async def test_xlsx_export(sqlite_registry: AdapterRegistry) -> None:
+    body, job = await _export(
+        sql="SELECT c.id, c.name, c.note FROM customers c JOIN customers d ON d.id = c.id "
+        "ORDER BY c.id",
+        format="xlsx",
+        filename="报表",
+    )
+
+    assert job.filename == "报表.xlsx"
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert "[Content_Types].xml" in archive.namelist()
+        sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+    rows = sheet.findall(".//x:row", XLSX_NS)
+    assert len(rows) == 4
+
+    def cell_text(cell: ElementTree.Element) -> str | None:
+        text = cell.find(".//x:t", XLSX_NS)
+        value = cell.find("x:v", XLSX_NS)
+        return text.text if text is not None else value.text if value is not None else None
+
+    assert [cell_text(cell) for cell in rows[0]] == ["id", "name", "note"]
+    assert [cell_text(cell) for cell in rows[2]] == ["2", 'say "hi"', "line 1\nline 2"]
+    assert rows[1][2].attrib == {}
+
+
+async def test_cancel_stops_download_and_releases_connection(
+    sqlite_registry: AdapterRegistry,
+) -> None:
+    connection = _connection()
+    job = ExportService.create_job(connection, ExportRequest(sql="SELECT * FROM customers"))
+    stream = await ExportService.open_download(connection, job)
+    chunks = ExportService.chunks(job, stream)
+
+    await anext(chunks)
+    job.cancel()
+    with pytest.raises(ExportCancelledError):
+        async for _ in chunks:
+            pass
+
+    assert job.info().status == "cancelled"
+    assert job.row_count == 2
+    assert locks._gates["shop"].active == 0
+    assert sqlite_registry.stats()["inUse"] == 0
@@ -0,0 +1,181 @@
+"""元数据服务测试 - 进程内已解码元数据缓存与结构变更增量刷新"""
+
+import sqlite3
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.registry import AdapterRegistry
+from app.db.sqlite import SQLiteAdapter
+from app.models.metadata import ColumnInfo, DatabaseMetadata, TableInfo
+from app.services import metadata_service
+from app.services.metadata_service import MetadataService
+from app.storage.local_db import LocalStorage
+from app.storage.metadata_memory import decoded_metadata_cache
+from app.storage.models import DatabaseConnection
+from app.utils import locks
+
+
+@pytest.fixture(autouse=True)
+def clear_decoded_cache() -> None:
+    decoded_metadata_cache.clear()
+
+
+def _metadata(*table_names: str) -> DatabaseMetadata:
+    return DatabaseMetadata(
+        name="shop",
+        db_type="sqlite",
+        tables=[
+            TableInfo(name=name, columns=[ColumnInfo(name="id", data_type="INTEGER")])
+            for name in table_names
+        ],
+    )
+
+
+def _connection(db: Session) -> DatabaseConnection:
+    return LocalStorage.create_connection(db, "shop", "sqlite", "sqlite:///shop.db")
+
+
+async def test_cached_metadata_is_decoded_once(
+    db_session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    connection = _connection(db_session)
+    LocalStorage.save_metadata_cache(
+        db_session, connection.id, _metadata("orders").model_dump_json(), "v1"
+    )
+    decoded: list[str] = []
+    validate = DatabaseMetadata.model_validate_json
+    monkeypatch.setattr(
+        DatabaseMetadata,
+        "model_validate_json",
+        lambda data: decoded.append(data) or validate(data),
+    )
+
+    first = await MetadataService.extract_metadata(db_session, connection)
+    second = await MetadataService.extract_metadata(db_session, connection)
+
+    assert first is second
+    assert first.tables[0].columns[0].data_type == "INTEGER"
+    assert len(decoded) == 1
+    assert decoded_metadata_cache.stats()["hits"] == 1
+
+
+async def test_save_and_delete_invalidate(db_session: Session) -> None:
+    connection = _connection(db_session)
+    LocalStorage.save_metadata_cache(
+        db_session, connection.id, _metadata("orders").model_dump_json(), "v1"
+    )
+    old = await MetadataService.extract_metadata(db_session, connection)
+
+    LocalStorage.save_metadata_cache(
+        db_session, connection.id, _metadata("orders", "items").model_dump_json(), "v2"
+    )
+    assert decoded_metadata_cache.get(connection.id, "v1") is None
+    new = await MetadataService.extract_metadata(db_session, connection)
+    assert new is not old
+    assert [t.name for t in new.tables] == ["orders", "items"]
+
+    LocalStorage.delete_metadata_cache(db_session, connection.id)
+    assert decoded_metadata_cache.get(connection.id, "v2") is None
+    assert LocalStorage.get_metadata_version(db_session, connection.id) is None
+
+
+async def test_version_written_elsewhere_is_not_served_stale(db_session: Session) -> None:
+    """另一个进程写入新版本时, 版本哈希不一致, 进程内对象不会被返回"""
+    connection = _connection(db_session)
+    LocalStorage.save_metadata_cache(
+        db_session, connection.id, _metadata("fresh").model_dump_json(), "v2"
+    )
+    decoded_metadata_cache.put(connection.id, "v1", _metadata("stale"))
+
+    metadata = await MetadataService.extract_metadata(db_session, connection)
+    assert [t.name for t in metadata.tables] == ["fresh"]
+
+
+@pytest.fixture
+async def sqlite_registry(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> AsyncIterator[AdapterRegistry]:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(locks, "_gates", {})
+    registry = AdapterRegistry(lambda name, db_type: SQLiteAdapter())
+    monkeypatch.setattr(metadata_service, "adapter_registry", registry)
+    yield registry
+    await registry.close_all()
+
+
+def _ddl(*statements: str) -> None:
+    with sqlite3.connect("shop.db") as conn:
+        for statement in statements:
+            conn.execute(statement)
+
+
+async def test_refresh_changed_reextracts_only_changed_tables(
+    db_session: Session, sqlite_registry: AdapterRegistry, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _ddl(
+        "CREATE TABLE orders (id INTEGER PRIMARY KEY)",
+        "CREATE TABLE items (id INTEGER PRIMARY KEY)",
+        "CREATE VIEW recent AS SELECT id FROM orders",
+    )
+    connection = _connection(db_session)
+    original = await MetadataService.extract_metadata(db_session, connection)
+    assert set(original.schema_versions) == {"orders", "items", "recent"}
+    assert await MetadataService.detect_changes(db_session, connection) is False
+    assert await MetadataService.refresh_changed(db_session, connection) == []
+
+    extracted: list[list[str] | None] = []
+    get_metadata = SQLiteAdapter.get_metadata
+
+    async def spy(self: SQLiteAdapter, tables: list[str] | None = None) -> dict[str, Any]:
+        extracted.append(tables)
+        return await get_metadata(self, tables)
+
+    monkeypatch.setattr(SQLiteAdapter, "get_metadata", spy)
+
+    # 只改列: 版本哈希随之变化
+    _ddl("ALTER TABLE items ADD COLUMN qty INTEGER")
+    assert await MetadataService.detect_changes(db_session, connection) is True
+    assert await MetadataService.refresh_changed(db_session, connection) == ["items"]
+    assert extracted == [["items"]]
+
+    altered = await MetadataService.extract_metadata(db_session, connection)
+    assert altered.version_hash != original.version_hash
+    assert [t.name for t in altered.tables] == ["items", "orders"]
+    assert [c.name for c in altered.tables[0].columns] == ["id", "qty"]
+    # 未变化的表直接沿用缓存对象
+    assert altered.tables[1] is original.tables[1]
+    assert [v.name for v in altered.views] == ["recent"]
+
+    _ddl("DROP VIEW recent", "CREATE TABLE customers (id INTEGER PRIMARY KEY)")
+    assert await MetadataService.refresh_changed(db_session, connection) == [
+        "customers",
+        "recent",
+    ]
+    final = await MetadataService.extract_metadata(db_session, connection)
+    assert [t.name for t in final.tables] == ["customers", "items", "orders"]
+    assert final.views == []
+    assert await MetadataService.detect_changes(db_session, connection) is False
+
+
+async def test_refresh_changed_skips_evicted_pools(
+    db_session: Session, sqlite_registry: AdapterRegistry
+) -> None:
+    _ddl("CREATE TABLE orders (id INTEGER PRIMARY KEY)")
+    connection = _connection(db_session)
+    await MetadataService.extract_metadata(db_session, connection)
+    await sqlite_registry.invalidate(connection.name)
+    created = sqlite_registry.stats()["created"]
+
+    # 连接池已回收时后台刷新跳过该连接, 不重建连接池
+    _ddl("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+    assert await MetadataService.refresh_changed(db_session, connection) == []
+    assert sqlite_registry.stats()["created"] == created
+    assert sqlite_registry.stats()["pools"] == 0
+
+    # 请求重新使用该连接后恢复探测
+    assert await MetadataService.detect_changes(db_session, connection) is True
+    assert await MetadataService.refresh_changed(db_session, connection) == ["items"]
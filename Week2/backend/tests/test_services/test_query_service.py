@@ -0,0 +1,167 @@
+"""查询服务并发测试 - 按连接并发限制、排队与刷新协调"""
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.db.registry import AdapterRegistry
+from app.models.query import QueryRequest
+from app.services import query_service
+from app.services.query_service import QueryService
+from app.storage.models import DatabaseConnection
+from app.utils import locks
+from app.utils.locks import ConnectionGate, GateBusyError
+
+QUERY_LATENCY = 0.02
+
+
+class SlowAdapter:
+    """模拟固定延迟的数据库适配器"""
+
+    async def connect(self, url: str) -> None:
+        pass
+
+    async def execute(self, sql: str, timeout: float = 30.0) -> list[dict[str, Any]]:
+        await asyncio.sleep(QUERY_LATENCY)
+        return [{"id": 1}]
+
+    async def close(self) -> None:
+        pass
+
+    async def test_connection(self) -> bool:
+        return True
+
+
+@pytest.fixture(autouse=True)
+def fresh_gates(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(locks, "_gates", {})
+    monkeypatch.setattr(
+        query_service, "adapter_registry", AdapterRegistry(lambda name, db_type: SlowAdapter())
+    )
+
+
+def _connection(name: str) -> DatabaseConnection:
+    return DatabaseConnection(name=name, db_type="sqlite", url="sqlite:///x.db", database="x")
+
+
+class GatedAdapter(SlowAdapter):
+    """阻塞到 release() 的适配器, 记录同时执行的查询数及其峰值"""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+        self._released = asyncio.Event()
+
+    def release(self) -> None:
+        self._released.set()
+
+    async def execute(self, sql: str, timeout: float = 30.0) -> list[dict[str, Any]]:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await self._released.wait()
+        finally:
+            self.in_flight -= 1
+        return [{"id": 1}]
+
+
+async def test_concurrency_reaches_limit_without_exceeding_it(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """负载测试: 并发用户多于上限时, 同时执行的查询数达到且不超过连接并发上限"""
+    adapter = GatedAdapter()
+    monkeypatch.setattr(
+        query_service, "adapter_registry", AdapterRegistry(lambda name, db_type: adapter)
+    )
+    limit = settings.query_max_concurrency
+    users = limit * 2
+    request = QueryRequest(sql="SELECT id FROM items")
+
+    tasks = [
+        asyncio.create_task(QueryService.execute_query(None, _connection("load"), request))
+        for _ in range(users)
+    ]
+    for _ in range(100):
+        await asyncio.sleep(0)
+    gate = locks._gates["load"]
+    assert adapter.peak == limit
+    assert (gate.active, gate.waiting) == (limit, users - limit)
+
+    adapter.release()
+    await asyncio.gather(*tasks)
+    assert adapter.peak == limit
+    assert gate.stats()["completed"] == users
+
+
+async def test_connections_do_not_share_limits() -> None:
+    """一个连接排满时, 另一个连接的查询不受影响"""
+    locks._gates["busy"] = ConnectionGate("busy", max_concurrency=1)
+    locks._gates["idle"] = ConnectionGate("idle", max_concurrency=1)
+    request = QueryRequest(sql="SELECT 1")
+
+    busy = [
+        asyncio.create_task(QueryService.execute_query(None, _connection("busy"), request))
+        for _ in range(10)
+    ]
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await QueryService.execute_query(None, _connection("idle"), request)
+    assert time.perf_counter() - start < QUERY_LATENCY * 3
+    await asyncio.gather(*busy)
+
+
+async def test_queue_full_is_rejected() -> None:
+    locks._gates["small"] = ConnectionGate("small", max_concurrency=1, max_queue=1)
+    request = QueryRequest(sql="SELECT 1")
+    tasks = [
+        asyncio.create_task(QueryService.execute_query(None, _connection("small"), request))
+        for _ in range(3)
+    ]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    errors = [r for r in results if isinstance(r, HTTPException)]
+    assert len(errors) == 1
+    assert errors[0].status_code == 429
+    assert errors[0].detail["code"] == "QUERY_QUEUE_FULL"
+
+
+async def test_refresh_waits_for_queries_and_blocks_new_ones() -> None:
+    gate = ConnectionGate("rw", max_concurrency=4, queue_timeout=1.0)
+    order: list[str] = []
+
+    async def query(label: str) -> None:
+        async with gate.query():
+            order.append(f"{label}:start")
+            await asyncio.sleep(QUERY_LATENCY)
+            order.append(f"{label}:end")
+
+    async def refresh() -> None:
+        async with gate.refresh():
+            order.append("refresh:start")
+            assert gate.active == 0
+            await asyncio.sleep(QUERY_LATENCY)
+            order.append("refresh:end")
+
+    first = asyncio.create_task(query("q1"))
+    await asyncio.sleep(0)
+    refreshing = asyncio.create_task(refresh())
+    await asyncio.sleep(0)
+    # 刷新排队时到达的查询在刷新之后执行
+    second = asyncio.create_task(query("q2"))
+    await asyncio.gather(first, refreshing, second)
+
+    assert order == ["q1:start", "q1:end", "refresh:start", "refresh:end", "q2:start", "q2:end"]
+
+
+async def test_queue_timeout() -> None:
+    gate = ConnectionGate("slow", max_concurrency=1, queue_timeout=0.01)
+    async with gate.query():
+        with pytest.raises(GateBusyError, match="排队超时"):
+            async with gate.query():
+                pass
+    assert gate.waiting == 0
+    assert gate.rejected == 1
@@ -0,0 +1,131 @@
+"""流式查询测试 - 服务端游标分批读取、NDJSON / Arrow 编码与资源释放"""
+
+import json
+import sqlite3
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.db.registry import AdapterRegistry
+from app.db.sqlite import SQLiteAdapter
+from app.models.query import QueryRequest
+from app.services import query_service
+from app.services.query_service import QueryService
+from app.services.result_stream import arrow_chunks, ndjson_chunks
+from app.storage.models import DatabaseConnection
+from app.utils import locks
+from app.utils.locks import ConnectionGate
+
+
+@pytest.fixture
+async def sqlite_registry(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> AsyncIterator[AdapterRegistry]:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(locks, "_gates", {})
+    monkeypatch.setattr(settings, "stream_batch_size", 100)
+    with sqlite3.connect("shop.db") as conn:
+        conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, customer TEXT, note TEXT)")
+        conn.executemany(
+            "INSERT INTO orders VALUES (?, ?, NULL)",
+            [(i, f"customer {i}") for i in range(1, 251)],
+        )
+    registry = AdapterRegistry(lambda name, db_type: SQLiteAdapter())
+    monkeypatch.setattr(query_service, "adapter_registry", registry)
+    yield registry
+    await registry.close_all()
+
+
+def _connection() -> DatabaseConnection:
+    return DatabaseConnection(name="shop", db_type="sqlite", url="sqlite:///shop.db", database="shop")
+
+
+async def _collect(chunks: AsyncIterator[bytes]) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+async def test_sqlite_stream_reads_in_batches(sqlite_registry: AdapterRegistry) -> None:
+    async with sqlite_registry.acquire("shop", "sqlite", "sqlite:///shop.db") as adapter:
+        sizes = [
+            len(batch) async for batch in adapter.stream("SELECT id FROM orders", batch_size=100)
+        ]
+    assert sizes == [100, 100, 50]
+
+
+async def test_ndjson_stream(sqlite_registry: AdapterRegistry) -> None:
+    stream = await QueryService.open_stream(
+        _connection(), QueryRequest(sql="SELECT id, customer FROM orders ORDER BY id")
+    )
+    lines = [json.loads(line) for line in (await _collect(ndjson_chunks(stream))).splitlines()]
+
+    meta, *batches, end = lines
+    assert meta["type"] == "meta"
+    assert meta["columns"] == [
+        {"name": "id", "dataType": "int"},
+        {"name": "customer", "dataType": "str"},
+    ]
+    # 未写 LIMIT 时按流式上限添加
+    assert meta["truncated"] is True
+    assert f"LIMIT {settings.stream_max_rows}" in meta["sql"]
+    assert [len(batch["rows"]) for batch in batches] == [100, 100, 50]
+    assert batches[-1]["rows"][-1] == {"id": 250, "customer": "customer 250"}
+    assert end["type"] == "end"
+    assert end["rowCount"] == 250
+    assert locks._gates["shop"].active == 0
+
+
+async def test_interactive_limit(sqlite_registry: AdapterRegistry) -> None:
+    stream = await QueryService.open_stream(
+        _connection(), QueryRequest(sql="SELECT id FROM orders"), limit=120
+    )
+    lines = [json.loads(line) for line in (await _collect(ndjson_chunks(stream))).splitlines()]
+
+    assert "LIMIT 120" in lines[0]["sql"]
+    assert lines[-1]["rowCount"] == 120
+
+
+async def test_arrow_stream(sqlite_registry: AdapterRegistry) -> None:
+    pa = pytest.importorskip("pyarrow")
+    stream = await QueryService.open_stream(
+        _connection(), QueryRequest(sql="SELECT id, customer, note FROM orders LIMIT 150")
+    )
+    table = pa.ipc.open_stream(await _collect(arrow_chunks(stream))).read_all()
+
+    assert table.num_rows == 150
+    assert table.column_names == ["id", "customer", "note"]
+    assert table.schema.field("id").type == pa.int64()
+    # 首批全为 NULL 的列按字符串传输
+    assert table.schema.field("note").type == pa.string()
+    assert table.schema.metadata[b"truncated"] == b"false"
+
+
+async def test_abandoned_stream_releases_connection(sqlite_registry: AdapterRegistry) -> None:
+    locks._gates["shop"] = ConnectionGate("shop", max_concurrency=1)
+    stream = await QueryService.open_stream(_connection(), QueryRequest(sql="SELECT id FROM orders"))
+    assert locks._gates["shop"].active == 1
+
+    # 客户端读完首批后断开
+    chunks = ndjson_chunks(stream)
+    await anext(chunks)
+    await anext(chunks)
+    await chunks.aclose()
+    await stream.aclose()
+
+    assert locks._gates["shop"].active == 0
+    assert sqlite_registry.stats()["inUse"] == 0
+    # 执行槽位已归还, 下一次查询不必排队
+    again = await QueryService.open_stream(_connection(), QueryRequest(sql="SELECT 1 AS one"))
+    assert [batch async for batch in again] == [[{"one": 1}]]
+
+
+async def test_stream_errors_before_first_batch_are_http_errors(
+    sqlite_registry: AdapterRegistry,
+) -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        await QueryService.open_stream(_connection(), QueryRequest(sql="SELECT * FROM missing"))
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail["code"] == "INTERNAL_ERROR"
+    assert locks._gates["shop"].active == 0
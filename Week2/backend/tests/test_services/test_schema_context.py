@@ -0,0 +1,92 @@
+"""AI 结构上下文测试 - 相关度排序、token 预算与按版本缓存索引"""
+
+import pytest
+
+from app.models.metadata import ColumnInfo, DatabaseMetadata, TableInfo
+from app.services.schema_context import (
+    SchemaIndexCache,
+    build_schema_context,
+    count_tokens,
+    schema_index_cache,
+    terms,
+)
+
+
+def _table(name: str, *columns: str, comment: str | None = None) -> TableInfo:
+    return TableInfo(
+        name=name,
+        comment=comment,
+        columns=[
+            ColumnInfo(name=column, data_type="INTEGER", is_primary_key=column == "id")
+            for column in columns
+        ],
+    )
+
+
+def _metadata(version_hash: str | None = "v1") -> DatabaseMetadata:
+    # 相关的表排在大量无关表之后, 旧实现只取前 20 张表
+    filler = [
+        _table(f"audit_log_{i:03d}", "id", "event_code", "payload", "created_at")
+        for i in range(200)
+    ]
+    return DatabaseMetadata(
+        name="shop",
+        db_type="postgresql",
+        version_hash=version_hash,
+        tables=[
+            *filler,
+            _table("customers", "id", "full_name", "email", comment="客户信息"),
+            _table("orders", "id", "customer_id", "total_amount", "ordered_at"),
+            _table("order_items", "id", "order_id", "sku", "quantity"),
+        ],
+        views=[_table("monthly_revenue", "month", "revenue")],
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_index_cache() -> None:
+    schema_index_cache.clear()
+
+
+def test_terms_split_identifiers() -> None:
+    assert {"order", "item", "orderitem"} <= terms("order_items")
+    assert {"customer", "name", "customername"} <= terms("customerName")
+    assert {"客户", "户信", "信息"} <= terms("客户信息")
+    assert "the" not in terms("show the orders")
+
+
+def test_relevant_tables_ranked_first_within_budget() -> None:
+    context = build_schema_context(
+        _metadata(), "total amount of orders per customer email", max_tokens=300
+    )
+
+    assert count_tokens(context) <= 300
+    lines = context.splitlines()
+    assert lines[0] == "表 (Tables):"
+    assert lines[1].startswith("  - orders(")
+    assert lines[2].startswith("  - customers(") and "email integer" in lines[2]
+    # order_items 通过 order_id 关联到 orders
+    assert lines[3].startswith("  - order_items(")
+    assert lines[-1].startswith("... (另有")
+
+
+def test_large_table_falls_back_to_key_columns() -> None:
+    wide = _table("events", "id", "user_id", *[f"attr_{i}" for i in range(300)], "status_code")
+    metadata = DatabaseMetadata(name="big", db_type="sqlite", tables=[wide])
+
+    context = build_schema_context(metadata, "events by status code", max_tokens=200)
+
+    assert count_tokens(context) <= 200
+    assert "events(id integer PK, user_id integer, status_code integer, ...+300)" in context
+
+
+def test_index_cached_per_metadata_version() -> None:
+    cache = SchemaIndexCache(max_entries=2)
+    metadata = _metadata()
+
+    index = cache.get(metadata, "gpt-3.5-turbo")
+    assert cache.get(metadata.model_copy(), "gpt-3.5-turbo") is index
+    assert cache.get(_metadata("v2"), "gpt-3.5-turbo") is not index
+    assert cache.get(_metadata(None), "gpt-3.5-turbo") is not cache.get(
+        _metadata(None), "gpt-3.5-turbo"
+    )
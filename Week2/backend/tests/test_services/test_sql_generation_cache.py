@@ -0,0 +1,179 @@
+"""AI 生成 SQL 缓存测试 - 持久化命中、版本失效、TTL/LRU 与并发请求合并"""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.metadata import DatabaseMetadata
+from app.services.sql_generation_cache import SqlGenerationCache, normalize_prompt
+from app.storage.local_db import LocalStorage, utc_now
+from app.storage.models import DatabaseConnection, GeneratedSqlCache
+
+
+class FakeGenerator:
+    """记录调用次数的 generate_sql 替身, 可阻塞到 release()"""
+
+    def __init__(self, sql: str = "SELECT * FROM users", blocked: bool = False) -> None:
+        self.sql = sql
+        self.calls = 0
+        self._released = asyncio.Event()
+        if not blocked:
+            self._released.set()
+
+    def release(self) -> None:
+        self._released.set()
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await self._released.wait()
+        return self.sql
+
+
+@pytest.fixture
+def connection(db_session: Session) -> DatabaseConnection:
+    return LocalStorage.create_connection(
+        db_session, name="shop", db_type="postgresql", url="postgresql://localhost/shop"
+    )
+
+
+def _metadata(version_hash: str | None = "v1") -> DatabaseMetadata:
+    return DatabaseMetadata(name="shop", db_type="postgresql", version_hash=version_hash)
+
+
+def test_normalize_prompt() -> None:
+    assert normalize_prompt("  List   ALL users？ ") == "list all users"
+    assert normalize_prompt("查询所有用户。") == "查询所有用户"
+    # 引号内的字面量保留大小写与空白
+    assert normalize_prompt("Orders for  customer 'Alice'?") == "orders for customer 'Alice'"
+    assert normalize_prompt('city "New  York"') == 'city "New  York"'
+
+
+async def test_quoted_values_differing_in_case_do_not_share_entry(
+    db_session: Session, connection: DatabaseConnection
+) -> None:
+    cache = SqlGenerationCache(ttl_seconds=60, max_entries=10)
+    upper = FakeGenerator("SELECT * FROM orders WHERE customer = 'Alice'")
+    lower = FakeGenerator("SELECT * FROM orders WHERE customer = 'alice'")
+
+    await cache.get_or_generate(
+        db_session, connection, _metadata(), "orders for customer 'Alice'", upper
+    )
+    assert await cache.get_or_generate(
+        db_session, connection, _metadata(), "orders for customer 'alice'", lower
+    ) == ("SELECT * FROM orders WHERE customer = 'alice'", False)
+    assert (upper.calls, lower.calls) == (1, 1)
+    assert cache.stats(db_session, connection).entries == 2
+
+
+async def test_cache_hit_persists_across_instances(
+    db_session: Session, connection: DatabaseConnection
+) -> None:
+    cache = SqlGenerationCache(ttl_seconds=60, max_entries=10)
+    generate = FakeGenerator()
+
+    assert await cache.get_or_generate(
+        db_session, connection, _metadata(), "List all users", generate
+    ) == ("SELECT * FROM users", False)
+    assert await cache.get_or_generate(
+        db_session, connection, _metadata(), "list  all users?", generate
+    ) == ("SELECT * FROM users", True)
+    assert generate.calls == 1
+
+    # 新实例（模拟重启）仍从本地 SQLite 命中
+    restarted = SqlGenerationCache(ttl_seconds=60, max_entries=10)
+    _, cached = await restarted.get_or_generate(
+        db_session, connection, _metadata(), "list all users", generate
+    )
+    assert cached is True
+    assert generate.calls == 1
+
+    stats = cache.stats(db_session, connection)
+    assert (stats.entries, stats.hits, stats.misses, stats.total_hits) == (1, 1, 1, 2)
+    assert stats.hit_rate == 0.5
+
+
+async def test_metadata_version_and_ttl_invalidate(
+    db_session: Session, connection: DatabaseConnection
+) -> None:
+    cache = SqlGenerationCache(ttl_seconds=60, max_entries=10)
+    generate = FakeGenerator()
+
+    await cache.get_or_generate(db_session, connection, _metadata("v1"), "users", generate)
+    await cache.get_or_generate(db_session, connection, _metadata("v2"), "users", generate)
+    assert generate.calls == 2
+
+    db_session.execute(
+        update(GeneratedSqlCache).values(created_at=utc_now() - timedelta(seconds=120))
+    )
+    db_session.commit()
+    _, cached = await cache.get_or_generate(
+        db_session, connection, _metadata("v2"), "users", generate
+    )
+    assert cached is False
+    assert generate.calls == 3
+    # 写入时清理过期条目
+    assert cache.stats(db_session, connection).entries == 1
+
+
+async def test_lru_eviction(db_session: Session, connection: DatabaseConnection) -> None:
+    cache = SqlGenerationCache(ttl_seconds=60, max_entries=2)
+    generate = FakeGenerator()
+
+    for prompt in ["a", "b", "a", "c"]:
+        await cache.get_or_generate(db_session, connection, _metadata(), prompt, generate)
+
+    prompts = set(db_session.scalars(select(GeneratedSqlCache.prompt)))
+    assert prompts == {"a", "c"}
+
+
+async def test_concurrent_identical_prompts_coalesced(
+    db_session: Session, connection: DatabaseConnection
+) -> None:
+    cache = SqlGenerationCache(ttl_seconds=60, max_entries=10)
+    generate = FakeGenerator(blocked=True)
+
+    tasks = [
+        asyncio.create_task(
+            cache.get_or_generate(db_session, connection, _metadata(), "top users", generate)
+        )
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    generate.release()
+    results = await asyncio.gather(*tasks)
+
+    assert generate.calls == 1
+    assert sorted(cached for _, cached in results) == [False, True, True]
+    stats = cache.stats(db_session, connection)
+    assert (stats.misses, stats.coalesced) == (1, 2)
+
+
+async def test_failure_shared_and_not_cached(
+    db_session: Session, connection: DatabaseConnection
+) -> None:
+    cache = SqlGenerationCache(ttl_seconds=60, max_entries=10)
+    released = asyncio.Event()
+    calls = 0
+
+    async def failing() -> str:
+        nonlocal calls
+        calls += 1
+        await released.wait()
+        raise ValueError("quota")
+
+    tasks = [
+        asyncio.create_task(
+            cache.get_or_generate(db_session, connection, _metadata(), "users", failing)
+        )
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    released.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert cache.stats(db_session, connection).entries == 0
@@ -1,6 +1,11 @@
 """SQL 验证工具测试 - 包含注入防护测试"""
 
-from app.utils.sql_validator import add_limit_if_missing, validate_sql
+from app.utils.sql_validator import (
+    add_limit_if_missing,
+    analyze_sql,
+    sql_cache_info,
+    validate_sql,
+)
 
 
 def test_validate_select():
@@ -157,3 +162,67 @@ def test_normal_select_adds_limit():
     result = add_limit_if_missing(sql, limit=500)
     assert "LIMIT" in result.upper()
     assert "500" in result or "LIMIT 500" in result
+
+
+# ========== 单次解析管线测试 ==========
+
+
+def test_validate_and_limit_share_one_parse():
+    """验证与 LIMIT 改写共用同一次解析"""
+    sql = "SELECT id, name FROM customers WHERE region = 'east'"
+    before = sql_cache_info()
+    assert validate_sql(sql, "mysql") == (True, None)
+    result = add_limit_if_missing(sql, limit=100, dialect="mysql")
+    analysis = analyze_sql(sql, "mysql", 100)
+    after = sql_cache_info()
+
+    assert result == analysis.sql
+    assert "LIMIT 100" in result
+    # validate_sql 使用默认 limit, 与 limit=100 是两个缓存项
+    assert after["misses"] - before["misses"] == 2
+    assert after["hits"] - before["hits"] == 1
+    assert analysis.tables == frozenset({"customers"})
+
+
+def test_semicolon_inside_literal_is_not_multi_statement():
+    """字符串中的分号不是多语句"""
+    is_valid, error = validate_sql("SELECT * FROM notes WHERE body = 'a;b'", "postgres")
+    assert is_valid is True
+    assert error is None
+
+
+def test_system_function_blocked():
+    """系统函数调用被拒绝"""
+    is_valid, error = validate_sql("SELECT pg_read_file('/etc/passwd')", "postgres")
+    assert is_valid is False
+    assert "pg_read_file" in error
+
+
+def test_analysis_facts():
+    """语法树信息: 函数、关键字、子查询"""
+    analysis = analyze_sql(
+        "SELECT name, COUNT(*) FROM users WHERE id IN (SELECT user_id FROM orders) GROUP BY name",
+        "postgres",
+    )
+    assert analysis.is_valid
+    assert analysis.tables == frozenset({"users", "orders"})
+    assert "COUNT" in analysis.functions
+    assert analysis.has_subquery is True
+    # 被用作列名的非保留字 (name) 不算关键字
+    assert analysis.keywords == frozenset({"SELECT", "FROM", "WHERE", "IN", "GROUP", "BY"})
+
+
+def test_data_modifying_cte_blocked():
+    """CTE 中的 DELETE ... RETURNING 被拒绝"""
+    is_valid, error = validate_sql(
+        "WITH d AS (DELETE FROM users RETURNING *) SELECT * FROM d", "postgres"
+    )
+    assert is_valid is False
+    assert "DELETE" in error
+
+
+def test_select_into_blocked():
+    """SELECT ... INTO 建表被拒绝"""
+    is_valid, error = validate_sql("SELECT * INTO newt FROM users", "postgres")
+    assert is_valid is False
+    assert "SELECT INTO" in error
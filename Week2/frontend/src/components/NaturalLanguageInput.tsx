@@ -1,7 +1,8 @@
 /** 自然语言输入组件 */
 import React, { useState } from "react";
-import { Input, Button, Space, message } from "antd";
+import { Input, Button, Space, Typography, message } from "antd";
 import { ThunderboltOutlined } from "@ant-design/icons";
+import { NaturalQueryCacheStats } from "../types/query";
 
 const { TextArea } = Input;
 
@@ -9,12 +10,14 @@ interface NaturalLanguageInputProps {
   onGenerate: (prompt: string) => Promise<string>;
   onSqlGenerated: (sql: string) => void;
   loading?: boolean;
+  cacheStats?: NaturalQueryCacheStats | null;
 }
 
 const NaturalLanguageInput: React.FC<NaturalLanguageInputProps> = ({
   onGenerate,
   onSqlGenerated,
   loading = false,
+  cacheStats = null,
 }) => {
   const [prompt, setPrompt] = useState("");
 
@@ -51,6 +54,13 @@ const NaturalLanguageInput: React.FC<NaturalLanguageInputProps> = ({
       >
         生成 SQL
       </Button>
+      {cacheStats && (
+        <Typography.Text type="secondary" style={{ fontSize: "12px" }}>
+          缓存命中率 {(cacheStats.hitRate * 100).toFixed(0)}%（命中{" "}
+          {cacheStats.hits + cacheStats.coalesced} / 生成 {cacheStats.misses}
+          ），已缓存 {cacheStats.entries} 条
+        </Typography.Text>
+      )}
     </Space>
   );
 };
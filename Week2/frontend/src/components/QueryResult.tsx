@@ -8,9 +8,17 @@ const { Text } = Typography;
 
 interface QueryResultProps {
   result: QueryResultType;
+  /** 数据库名称（用于服务端导出完整结果） */
+  dbName?: string;
+  /** 用户执行的原始 SQL（服务端导出时重新执行） */
+  sourceSql?: string;
 }
 
-const QueryResult: React.FC<QueryResultProps> = ({ result }) => {
+const QueryResult: React.FC<QueryResultProps> = ({
+  result,
+  dbName,
+  sourceSql,
+}) => {
   // 处理 NULL 值显示
   const renderCell = (value: unknown) => {
     if (value === null || value === undefined) {
@@ -68,6 +76,8 @@ const QueryResult: React.FC<QueryResultProps> = ({ result }) => {
         <ExportButton
           queryResult={result}
           size="small"
+          dbName={dbName}
+          sourceSql={sourceSql}
         />
       </div>
 
@@ -8,6 +8,7 @@ import { useState } from 'react';
 import { Button } from 'antd';
 import { DownloadOutlined } from '@ant-design/icons';
 import { ExportFormatDialog } from './ExportFormatDialog';
+import { formatFileSize } from '@/services/export/fileDownload';
 import { useExport } from '@/hooks/useExport';
 import type { QueryResult } from '@/types/query';
 import type { ExportFormat } from '@/types/export';
@@ -24,6 +25,12 @@ interface ExportButtonProps {
 
   /** Button size */
   size?: 'small' | 'middle' | 'large';
+
+  /** Database name; with sourceSql, exports the full result on the server */
+  dbName?: string;
+
+  /** SQL as entered by the user (re-executed by the server export) */
+  sourceSql?: string;
 }
 
 export function ExportButton({
@@ -31,15 +38,18 @@ export function ExportButton({
   disabled = false,
   buttonText = 'Export',
   size = 'middle',
+  dbName,
+  sourceSql,
 }: ExportButtonProps) {
   const [isDialogOpen, setIsDialogOpen] = useState(false);
-  const { handleExport, isExporting } = useExport();
+  const { handleExport, cancelExport, isExporting, serverProgress } = useExport();
 
   const handleFormatSelected = async (format: ExportFormat): Promise<void> => {
     if (!queryResult) return;
 
-    await handleExport(queryResult, format);
+    const source = dbName && sourceSql ? { dbName, sql: sourceSql } : undefined;
     setIsDialogOpen(false);
+    await handleExport(queryResult, format, source);
   };
 
   // Button is disabled if:
@@ -63,9 +73,17 @@ export function ExportButton({
         loading={isExporting}
         size={size}
       >
-        {buttonText}
+        {serverProgress
+          ? `${serverProgress.rowCount} rows (${formatFileSize(serverProgress.bytesWritten)})`
+          : buttonText}
       </Button>
 
+      {serverProgress && (
+        <Button size={size} onClick={cancelExport} style={{ marginLeft: 8 }}>
+          Cancel
+        </Button>
+      )}
+
       <ExportFormatDialog
         open={isDialogOpen}
         onClose={() => setIsDialogOpen(false)}
@@ -4,25 +4,84 @@
  * React hook for handling query result exports
  */
 
-import { useState } from 'react';
+import { useRef, useState } from 'react';
 import { notification } from 'antd';
 import { exportToCSV } from '@/services/export/csvExporter';
 import { exportToJSON } from '@/services/export/jsonExporter';
 import { downloadFileWithSize, formatFileSize } from '@/services/export/fileDownload';
+import {
+  cancelServerExport,
+  createServerExport,
+  startServerDownload,
+  waitForServerExport,
+} from '@/services/export/serverExport';
 import { generateSafeFilename } from '@/utils/export/filenameGenerator';
 import type { QueryResult } from '@/types/query';
-import type { ExportFormat } from '@/types/export';
+import type { ExportFormat, ServerExportJob } from '@/types/export';
+
+/** Source query for server-side export (full result, not just loaded rows) */
+export interface ServerExportSource {
+  dbName: string;
+  sql: string;
+}
 
 export function useExport() {
   const [isExporting, setIsExporting] = useState(false);
+  const [serverProgress, setServerProgress] = useState<ServerExportJob | null>(null);
+  const serverJobRef = useRef<{ dbName: string; exportId: string } | null>(null);
+
+  const handleServerExport = async (
+    source: ServerExportSource,
+    format: ExportFormat
+  ): Promise<void> => {
+    const job = await createServerExport(source.dbName, {
+      sql: source.sql,
+      format: format.type,
+    });
+    serverJobRef.current = { dbName: source.dbName, exportId: job.exportId };
+    setServerProgress(job);
+    startServerDownload(job);
+
+    const finished = await waitForServerExport(
+      source.dbName,
+      job.exportId,
+      setServerProgress
+    );
+    if (finished.status === 'failed') {
+      throw new Error(finished.error || 'Export failed');
+    }
+    if (finished.status === 'cancelled') {
+      notification.info({ message: 'Export Cancelled', duration: 3 });
+      return;
+    }
+    notification.success({
+      message: 'Export Successful',
+      description: `${finished.rowCount} rows exported to ${finished.filename} (${formatFileSize(finished.bytesWritten)})`,
+      duration: 4,
+    });
+  };
+
+  const cancelExport = async (): Promise<void> => {
+    const current = serverJobRef.current;
+    if (current) {
+      await cancelServerExport(current.dbName, current.exportId);
+    }
+  };
 
   const handleExport = async (
     queryResult: QueryResult,
-    format: ExportFormat
+    format: ExportFormat,
+    source?: ServerExportSource
   ): Promise<void> => {
     setIsExporting(true);
 
     try {
+      if (source) {
+        await handleServerExport(source, format);
+        return;
+      }
+
+
       // Generate export content
       let content: string;
 
@@ -74,12 +133,16 @@ export function useExport() {
       console.error('Export error:', error);
 
     } finally {
+      serverJobRef.current = null;
+      setServerProgress(null);
       setIsExporting(false);
     }
   };
 
   return {
     handleExport,
+    cancelExport,
     isExporting,
+    serverProgress,
   };
 }
@@ -1,5 +1,5 @@
 /** 查询执行 Hook */
-import { useState, useCallback } from "react";
+import { useState, useCallback, useEffect, useRef } from "react";
 import { message } from "antd";
 import { queryService } from "../services/queryService";
 import { QueryResult } from "../types/query";
@@ -11,11 +11,20 @@ interface QueryHistoryItem {
   timestamp: number;
 }
 
+// 未写 LIMIT 时结果表格显示的行数（与普通查询接口一致）
+const RESULT_ROW_LIMIT = 1000;
+
 export const useQuery = (dbName: string | undefined) => {
   const [result, setResult] = useState<QueryResult | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [history, setHistory] = useState<QueryHistoryItem[]>([]);
+  // 产生当前结果的原始 SQL（服务端导出时重新执行）
+  const [executedSql, setExecutedSql] = useState<string | null>(null);
+  // 进行中的流式查询（新查询、清除结果或离开页面时取消）
+  const abortRef = useRef<AbortController | null>(null);
+
+  useEffect(() => () => abortRef.current?.abort(), []);
 
   const executeQuery = useCallback(
     async (sql: string) => {
@@ -24,13 +33,58 @@ export const useQuery = (dbName: string | undefined) => {
         return;
       }
 
+      abortRef.current?.abort();
+      const controller = new AbortController();
+      abortRef.current = controller;
+
       setLoading(true);
       setError(null);
       const timestamp = Date.now();
+      let current: QueryResult | null = null;
 
       try {
-        const queryResult = await queryService.execute(dbName, sql);
-        setResult(queryResult);
+        // 流式读取: 首批行到达即渲染, 后续批次追加到结果中
+        await queryService.executeStream(
+          dbName,
+          sql,
+          (streamMessage) => {
+            switch (streamMessage.type) {
+              case "meta":
+                current = {
+                  columns: streamMessage.columns,
+                  rows: [],
+                  rowCount: 0,
+                  executionTimeMs: 0,
+                  truncated: streamMessage.truncated,
+                  sql: streamMessage.sql,
+                };
+                setExecutedSql(sql);
+                break;
+              case "rows":
+                if (!current) return;
+                current = {
+                  ...current,
+                  rows: current.rows.concat(streamMessage.rows),
+                  rowCount: current.rowCount + streamMessage.rows.length,
+                };
+                break;
+              case "end":
+                if (!current) return;
+                current = {
+                  ...current,
+                  rowCount: streamMessage.rowCount,
+                  executionTimeMs: streamMessage.executionTimeMs,
+                };
+                break;
+              case "error":
+                throw new Error(streamMessage.message);
+            }
+            setResult(current);
+          },
+          controller.signal,
+          RESULT_ROW_LIMIT,
+        );
+        const queryResult = current;
 
         // 添加到历史记录（最多 50 条）
         setHistory((prev) => {
@@ -41,6 +95,11 @@ export const useQuery = (dbName: string | undefined) => {
           return newHistory.slice(0, 50);
         });
       } catch (err) {
+        if (controller.signal.aborted) {
+          return;
+        }
+        // 中途失败时停止读取, 服务端随之关闭游标
+        controller.abort();
         const errorMessage = err instanceof Error ? err.message : "查询失败";
         setError(errorMessage);
         message.error(`查询失败: ${errorMessage}`);
@@ -54,23 +113,36 @@ export const useQuery = (dbName: string | undefined) => {
           return newHistory.slice(0, 50);
         });
       } finally {
-        setLoading(false);
+        if (abortRef.current === controller) {
+          abortRef.current = null;
+          setLoading(false);
+        }
       }
     },
     [dbName],
   );
 
+  const cancelQuery = useCallback(() => {
+    abortRef.current?.abort();
+    abortRef.current = null;
+    setLoading(false);
+  }, []);
+
   const clearResult = useCallback(() => {
+    cancelQuery();
     setResult(null);
+    setExecutedSql(null);
     setError(null);
-  }, []);
+  }, [cancelQuery]);
 
   return {
     result,
     loading,
     error,
     history,
+    executedSql,
     executeQuery,
+    cancelQuery,
     clearResult,
   };
 };
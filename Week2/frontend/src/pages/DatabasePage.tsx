@@ -35,6 +35,7 @@ import QueryHistory from "../components/QueryHistory";
 import NaturalLanguageInput from "../components/NaturalLanguageInput";
 import { useQuery } from "../hooks/useQuery";
 import { queryService } from "../services/queryService";
+import { NaturalQueryCacheStats } from "../types/query";
 
 const { Header, Content, Sider } = Layout;
 const { Title, Text } = Typography;
@@ -51,6 +52,8 @@ const DatabasePage: React.FC = () => {
   const [showHistory, setShowHistory] = useState(false);
   const [activeTab, setActiveTab] = useState<"result" | "history">("result");
   const [nlLoading, setNlLoading] = useState(false);
+  const [nlCacheStats, setNlCacheStats] =
+    useState<NaturalQueryCacheStats | null>(null);
   const [activeEditorTab, setActiveEditorTab] = useState<"editor" | "ai">(
     "editor",
   );
@@ -60,7 +63,9 @@ const DatabasePage: React.FC = () => {
     loading: queryLoading,
     error: queryError,
     history,
+    executedSql,
     executeQuery,
+    cancelQuery,
     clearResult,
   } = useQuery(name);
 
@@ -99,13 +104,30 @@ const DatabasePage: React.FC = () => {
     }
   };
 
+  const loadNlCacheStats = async () => {
+    if (!name) return;
+    try {
+      setNlCacheStats(await queryService.getNaturalQueryStats(name));
+    } catch {
+      // 统计仅用于展示，失败时忽略
+    }
+  };
+
   // 监听 name 变化，重新加载元数据
   useEffect(() => {
     loadMetadata();
+    setNlCacheStats(null);
     // 切换数据库时重置结果行数
     setResultRowCount(0);
   }, [name]);
 
+  // 切换到 AI 标签时加载缓存统计
+  useEffect(() => {
+    if (activeEditorTab === "ai") {
+      loadNlCacheStats();
+    }
+  }, [activeEditorTab, name]);
+
   // 监听查询结果变化，更新行数
   useEffect(() => {
     if (result) {
@@ -171,6 +193,9 @@ const DatabasePage: React.FC = () => {
         name,
         prompt,
       );
+      if (nlResult.cached) {
+        message.info("已复用相同描述的生成结果");
+      }
       return nlResult.generatedSql;
     } catch (err: any) {
       console.error("AI 生成 SQL 失败 - 完整错误对象:", err);
@@ -289,6 +314,7 @@ const DatabasePage: React.FC = () => {
       throw err;
     } finally {
       setNlLoading(false);
+      loadNlCacheStats();
     }
   };
 
@@ -701,6 +727,9 @@ const DatabasePage: React.FC = () => {
                           >
                             执行
                           </Button>
+                          {queryLoading && (
+                            <Button onClick={cancelQuery}>取消</Button>
+                          )}
                           <Button onClick={handleClearResult}>清除结果</Button>
                         </div>
                       </div>
@@ -710,6 +739,7 @@ const DatabasePage: React.FC = () => {
                           onGenerate={handleGenerateSql}
                           onSqlGenerated={handleSqlGenerated}
                           loading={nlLoading}
+                          cacheStats={nlCacheStats}
                         />
                       </div>
                     )}
@@ -792,7 +822,11 @@ const DatabasePage: React.FC = () => {
                     <>
                       {/* 只有结果时 */}
                       {result && !showHistory && (
-                        <QueryResult result={result} />
+                        <QueryResult
+                          result={result}
+                          dbName={name}
+                          sourceSql={executedSql ?? undefined}
+                        />
                       )}
 
                       {/* 只有历史时 */}
@@ -807,7 +841,11 @@ const DatabasePage: React.FC = () => {
                       {result && showHistory && (
                         <>
                           {activeTab === "result" && (
-                            <QueryResult result={result} />
+                            <QueryResult
+                              result={result}
+                              dbName={name}
+                              sourceSql={executedSql ?? undefined}
+                            />
                           )}
                           {activeTab === "history" && (
                             <QueryHistory
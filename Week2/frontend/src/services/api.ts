@@ -1,7 +1,7 @@
 /** API 客户端基础配置 */
 import axios, { AxiosInstance, AxiosError } from "axios";
 
-const API_BASE_URL =
+export const API_BASE_URL =
   import.meta.env.VITE_API_BASE_URL || "http://localhost:8000";
 
 export const apiClient: AxiosInstance = axios.create({
@@ -0,0 +1,87 @@
+/**
+ * Server Export Service
+ *
+ * Streams exports from the backend: the query is re-executed with a
+ * server-side cursor and the browser saves the response straight to disk,
+ * so large result sets never have to be held in memory.
+ */
+
+import apiClient, { API_BASE_URL } from '@/services/api';
+import type {
+  ServerExportJob,
+  ServerExportRequest,
+} from '@/types/export';
+
+const exportPath = (dbName: string) =>
+  `/api/v1/dbs/${encodeURIComponent(dbName)}/query/export`;
+
+/**
+ * Create an export job (validates the SQL, nothing is executed yet)
+ */
+export async function createServerExport(
+  dbName: string,
+  request: ServerExportRequest
+): Promise<ServerExportJob> {
+  const response = await apiClient.post<ServerExportJob>(
+    exportPath(dbName),
+    request
+  );
+  return response.data;
+}
+
+/**
+ * Start the browser download (handled by the browser's download manager)
+ */
+export function startServerDownload(job: ServerExportJob): void {
+  const link = document.createElement('a');
+  link.href = `${API_BASE_URL}${job.downloadUrl}`;
+  link.download = job.filename;
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+}
+
+/**
+ * Get export progress
+ */
+export async function getServerExport(
+  dbName: string,
+  exportId: string
+): Promise<ServerExportJob> {
+  const response = await apiClient.get<ServerExportJob>(
+    `${exportPath(dbName)}/${exportId}`
+  );
+  return response.data;
+}
+
+/**
+ * Cancel an export (a running download is aborted at the next batch)
+ */
+export async function cancelServerExport(
+  dbName: string,
+  exportId: string
+): Promise<ServerExportJob> {
+  const response = await apiClient.delete<ServerExportJob>(
+    `${exportPath(dbName)}/${exportId}`
+  );
+  return response.data;
+}
+
+/**
+ * Poll progress until the export completes, fails or is cancelled
+ */
+export async function waitForServerExport(
+  dbName: string,
+  exportId: string,
+  onProgress: (job: ServerExportJob) => void,
+  intervalMs: number = 1000
+): Promise<ServerExportJob> {
+  for (;;) {
+    const job = await getServerExport(dbName, exportId);
+    onProgress(job);
+    if (job.status !== 'pending' && job.status !== 'running') {
+      return job;
+    }
+    await new Promise(resolve => setTimeout(resolve, intervalMs));
+  }
+}
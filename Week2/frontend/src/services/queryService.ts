@@ -1,10 +1,12 @@
 /** 查询 API 服务 */
-import apiClient from "./api";
+import apiClient, { API_BASE_URL } from "./api";
 import {
   QueryRequest,
   QueryResult,
+  QueryStreamMessage,
   NaturalLanguageQueryRequest,
   NaturalLanguageQueryResult,
+  NaturalQueryCacheStats,
 } from "../types/query";
 
 export const queryService = {
@@ -19,6 +21,55 @@ export const queryService = {
     return response.data;
   },
 
+  /**
+   * 流式执行 SQL 查询（NDJSON）
+   *
+   * 每收到一条消息回调一次, 首批行到达即可渲染; 通过 signal 取消时
+   * 服务端随之关闭游标。limit 为未写 LIMIT 时的默认行数（不指定时为
+   * 服务端的流式上限）。
+   */
+  async executeStream(
+    dbName: string,
+    sql: string,
+    onMessage: (message: QueryStreamMessage) => void,
+    signal?: AbortSignal,
+    limit?: number,
+  ): Promise<void> {
+    const response = await fetch(
+      `${API_BASE_URL}/api/v1/dbs/${dbName}/query/stream`,
+      {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ sql, format: "ndjson", limit }),
+        signal,
+      },
+    );
+    if (!response.ok || !response.body) {
+      const errorData = await response.json().catch(() => null);
+      throw new Error(
+        errorData?.detail?.message || `查询失败 (${response.status})`,
+      );
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    for (;;) {
+      const { done, value } = await reader.read();
+      buffer += decoder.decode(value, { stream: !done });
+      const lines = buffer.split("\n");
+      buffer = done ? "" : (lines.pop() ?? "");
+      for (const line of lines) {
+        if (line.trim()) {
+          onMessage(JSON.parse(line) as QueryStreamMessage);
+        }
+      }
+      if (done) {
+        return;
+      }
+    }
+  },
+
   /**
    * 自然语言生成 SQL
    */
@@ -32,4 +83,14 @@ export const queryService = {
     );
     return response.data;
   },
+
+  /**
+   * 获取自然语言生成 SQL 的缓存统计
+   */
+  async getNaturalQueryStats(dbName: string): Promise<NaturalQueryCacheStats> {
+    const response = await apiClient.get<NaturalQueryCacheStats>(
+      `/api/v1/dbs/${dbName}/query/natural/stats`,
+    );
+    return response.data;
+  },
 };
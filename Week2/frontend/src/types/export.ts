@@ -307,6 +307,41 @@ export const ERROR_MESSAGES: Record<ExportErrorCode, string> = {
   [ExportErrorCode.NETWORK_ERROR]: 'Network error occurred during export.',
 };
 
+// ============================================================================
+// Server-side Export
+// ============================================================================
+
+/** Server export job status */
+export type ServerExportStatus =
+  | 'pending'
+  | 'running'
+  | 'completed'
+  | 'failed'
+  | 'cancelled';
+
+/** Server export request (query is re-executed with a server-side cursor) */
+export interface ServerExportRequest {
+  sql: string;
+  format: 'csv' | 'json' | 'xlsx';
+  gzip?: boolean;
+  delimiter?: ',' | ';' | '\t' | '|';
+  filename?: string;
+}
+
+/** Server export job (exportId doubles as the cancellation token) */
+export interface ServerExportJob {
+  exportId: string;
+  status: ServerExportStatus;
+  format: 'csv' | 'json' | 'xlsx';
+  filename: string;
+  downloadUrl: string;
+  rowCount: number;
+  bytesWritten: number;
+  elapsedMs: number;
+  delimiter: string | null;
+  error: string | null;
+}
+
 // ============================================================================
 // Filename Generation
 // ============================================================================
@@ -18,6 +18,18 @@ export interface QueryResult {
   sql: string;
 }
 
+/** 流式查询 NDJSON 消息（每行一条） */
+export type QueryStreamMessage =
+  | {
+      type: "meta";
+      columns: QueryResultColumn[];
+      sql: string;
+      truncated: boolean;
+    }
+  | { type: "rows"; rows: Record<string, unknown>[] }
+  | { type: "end"; rowCount: number; executionTimeMs: number }
+  | { type: "error"; code: string; message: string };
+
 export interface NaturalLanguageQueryRequest {
   prompt: string;
 }
@@ -26,4 +38,17 @@ export interface NaturalLanguageQueryResult {
   generatedSql: string;
   result: QueryResult | null;
   generationTimeMs: number;
+  /** 是否复用了缓存或并发请求的生成结果 */
+  cached: boolean;
+}
+
+/** 自然语言生成 SQL 缓存统计 */
+export interface NaturalQueryCacheStats {
+  entries: number;
+  hits: number;
+  coalesced: number;
+  misses: number;
+  hitRate: number;
+  totalHits: number;
+  ttlSeconds: number;
 }
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL MCP Server - CPU Offload Benchmark
+测量 CPUOffloader 在不同 worker 数下 CPU 密集阶段的吞吐 (ops/s)
+
+三个阶段各自并发提交 --tasks 个任务:
+    validate  - SQLValidator 解析约 --sql-kb KB 的 SELECT
+    csv       - encode_csv_rows 编码 --rows 行 x 8 列
+    preview   - render_preview 渲染 1000 行 Markdown 预览
+
+workers=0 表示全部在事件循环线程内联执行 (基线)。默认测 0 与 1..CPU 核数:
+    python scripts/benchmark_offload.py
+    python scripts/benchmark_offload.py --workers 0 1 2 4 8 --tasks 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from postgres_mcp.config import OffloadConfig  # noqa: E402
+from postgres_mcp.core.sql_validator import validate_sql  # noqa: E402
+from postgres_mcp.db.result_exporter import encode_csv_rows  # noqa: E402
+from postgres_mcp.models.result import ColumnInfo, QueryResult  # noqa: E402
+from postgres_mcp.utils.cpu_offload import CPUOffloader  # noqa: E402
+from postgres_mcp.utils.result_renderer import RenderOptions, render_preview  # noqa: E402
+
+
+def build_sql(kb: int) -> str:
+    """生成约 kb KB 的合法 SELECT (大量 CASE 分支)"""
+    branches = []
+    i = 0
+    while sum(len(b) for b in branches) < kb * 1024:
+        branches.append(f"WHEN o.status = 'status_{i}' THEN o.amount * {i % 7 + 1}")
+        i += 1
+    return (
+        "SELECT o.id, CASE " + " ".join(branches) + " ELSE 0 END AS weighted "
+        "FROM orders o JOIN customers c ON c.id = o.customer_id WHERE o.amount > 10 LIMIT 100"
+    )
+
+
+def build_rows(count: int) -> list[tuple]:
+    return [
+        (i, f"customer {i}", i * 1.5, "2025-01-01", i % 2 == 0, "note, with comma", i, "x" * 20)
+        for i in range(count)
+    ]
+
+
+def build_result(count: int) -> QueryResult:
+    columns = [ColumnInfo(name=f"c{i}", type="text") for i in range(8)]
+    rows = [{f"c{i}": f"value {r}-{i}" for i in range(8)} for r in range(count)]
+    return QueryResult(columns=columns, rows=rows, row_count=count, execution_time_ms=1.0)
+
+
+async def run_stage(offloader: CPUOffloader, func, args: tuple, tasks: int) -> float:
+    """并发提交 tasks 个任务, 返回 ops/s"""
+    start = time.perf_counter()
+    await asyncio.gather(*(offloader.run(func, *args, size=1, threshold=0) for _ in range(tasks)))
+    return tasks / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="CPUOffloader scaling benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, *range(1, cpu_count + 1)])
+    parser.add_argument("--tasks", type=int, default=32)
+    parser.add_argument("--sql-kb", type=int, default=32)
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    stages = {
+        "validate": (validate_sql, (build_sql(args.sql_kb),)),
+        "csv": (encode_csv_rows, (build_rows(args.rows),)),
+        "preview": (render_preview, (build_result(1000), RenderOptions(preview_rows=1000))),
+    }
+
+    print(f"CPU cores: {cpu_count}, tasks per stage: {args.tasks}")
+    print(f"{'workers':>8} " + " ".join(f"{name:>12}" for name in stages))
+
+    baseline: dict[str, float] = {}
+    for workers in args.workers:
+        offloader = CPUOffloader(OffloadConfig(enabled=workers > 0, max_workers=max(workers, 1)))
+        try:
+            # Warm the pool so worker start-up is not measured.
+            if workers > 0:
+                await asyncio.gather(
+                    *(
+                        offloader.run(validate_sql, "SELECT 1", size=1, threshold=0)
+                        for _ in range(workers)
+                    )
+                )
+            row = []
+            for name, (func, stage_args) in stages.items():
+                ops = await run_stage(offloader, func, stage_args, args.tasks)
+                baseline.setdefault(name, ops)
+                row.append(f"{ops:8.1f} ({ops / baseline[name]:.1f}x)")
+            label = "inline" if workers == 0 else str(workers)
+            print(f"{label:>8} " + " ".join(f"{cell:>12}" for cell in row))
+        finally:
+            offloader.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,11 @@
+"""
+PostgreSQL MCP Server - 负载测试子系统
+
+组成:
+    fixtures  - 参数化数据生成 (行数 x 表数 x 倾斜度), asyncpg COPY 导入
+    mock_llm  - OpenAI 兼容的 mock 端点, 可配置延迟, 按问题返回固定 SQL
+    runner    - 启动 HTTP 模式的 MCP server, 通过 MCP 协议并发调用工具
+    report    - 吞吐 / 延迟分位数 / 内存报告, 与基线比较发现回归
+
+入口: python scripts/run_loadtest.py --help
+"""
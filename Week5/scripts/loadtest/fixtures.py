@@ -0,0 +1,278 @@
+"""
+参数化负载测试数据 (rows x tables x skew)
+
+生成一个维表 lt_customers 和 N 个事实表 lt_events_{i}。事实表的
+customer_id 与 category 服从 Zipf 分布 (skew=0 为均匀分布), 用同一个
+seed 生成的数据逐行一致, 所以不同机器/不同提交之间的结果可比。
+
+数据按块流式生成并通过 asyncpg copy_records_to_table 导入, 内存占用与
+总行数无关。同时生成与数据匹配的问题 -> SQL 工作负载, 供 mock LLM 应答。
+"""
+
+from __future__ import annotations
+
+import bisect
+import random
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+CUSTOMER_TABLE = "lt_customers"
+EVENT_TABLE_PREFIX = "lt_events_"
+CATEGORIES = [f"category_{i:02d}" for i in range(50)]
+REGIONS = ["north", "south", "east", "west", "central"]
+BASE_TIME = datetime(2025, 1, 1, tzinfo=UTC)
+DAYS = 365
+
+
+@dataclass(frozen=True)
+class FixtureSpec:
+    """
+    数据规模参数
+
+    Args:
+    ----------
+        tables: 事实表数量
+        rows: 每个事实表的行数
+        skew: Zipf 指数 (0 = 均匀, 1 ≈ 典型热点, 越大越倾斜)
+        seed: 随机种子
+        chunk_size: 每次 COPY 的行数
+    """
+
+    tables: int = 4
+    rows: int = 100_000
+    skew: float = 1.0
+    seed: int = 42
+    chunk_size: int = 10_000
+
+    @property
+    def customers(self) -> int:
+        """维表行数: 事实表行数的 1/10, 至少 100"""
+        return max(100, self.rows // 10)
+
+    def event_tables(self) -> list[str]:
+        return [f"{EVENT_TABLE_PREFIX}{i}" for i in range(self.tables)]
+
+    def label(self) -> str:
+        return f"t{self.tables}_r{self.rows}_s{self.skew:g}_seed{self.seed}"
+
+
+class ZipfSampler:
+    """
+    有限集合上的 Zipf 采样 (预计算 CDF, 每次采样 O(log n))
+
+    Args:
+    ----------
+        n: 元素数量, 采样结果为 1..n
+        skew: Zipf 指数, 0 表示均匀分布
+        rng: 随机数生成器
+    """
+
+    def __init__(self, n: int, skew: float, rng: random.Random) -> None:
+        self._rng = rng
+        self._n = n
+        self._cdf: list[float] = []
+        if skew > 0:
+            total = 0.0
+            for k in range(1, n + 1):
+                total += 1.0 / k**skew
+                self._cdf.append(total)
+            self._cdf = [c / total for c in self._cdf]
+
+    def sample(self) -> int:
+        if not self._cdf:
+            return self._rng.randint(1, self._n)
+        return min(bisect.bisect_left(self._cdf, self._rng.random()), self._n - 1) + 1
+
+
+def schema_sql(spec: FixtureSpec) -> list[str]:
+    """建表语句 (会先删除同名表)"""
+    statements = [f"DROP TABLE IF EXISTS {table}" for table in spec.event_tables()]
+    statements.append(f"DROP TABLE IF EXISTS {CUSTOMER_TABLE}")
+    statements.append(
+        f"""CREATE TABLE {CUSTOMER_TABLE} (
+    customer_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    region TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL
+)"""
+    )
+    for table in spec.event_tables():
+        statements.append(
+            f"""CREATE TABLE {table} (
+    event_id BIGINT PRIMARY KEY,
+    customer_id INTEGER NOT NULL REFERENCES {CUSTOMER_TABLE}(customer_id),
+    category TEXT NOT NULL,
+    amount NUMERIC(12, 2) NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL
+)"""
+        )
+        statements.append(f"CREATE INDEX {table}_customer_idx ON {table}(customer_id)")
+        statements.append(f"CREATE INDEX {table}_created_idx ON {table}(created_at)")
+    return statements
+
+
+def customer_chunks(spec: FixtureSpec) -> Iterator[list[tuple]]:
+    """按块生成维表行"""
+    rng = random.Random(spec.seed)
+    chunk: list[tuple] = []
+    for customer_id in range(1, spec.customers + 1):
+        chunk.append(
+            (
+                customer_id,
+                f"Customer {customer_id}",
+                rng.choice(REGIONS),
+                BASE_TIME - timedelta(days=rng.randint(0, DAYS)),
+            )
+        )
+        if len(chunk) >= spec.chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def event_chunks(spec: FixtureSpec, table_index: int) -> Iterator[list[tuple]]:
+    """按块生成一个事实表的行 (customer_id / category 服从 Zipf)"""
+    rng = random.Random(spec.seed * 1_000 + table_index + 1)
+    customers = ZipfSampler(spec.customers, spec.skew, rng)
+    categories = ZipfSampler(len(CATEGORIES), spec.skew, rng)
+    chunk: list[tuple] = []
+    for event_id in range(1, spec.rows + 1):
+        chunk.append(
+            (
+                event_id,
+                customers.sample(),
+                CATEGORIES[categories.sample() - 1],
+                Decimal(rng.randint(100, 100_000)) / 100,
+                BASE_TIME + timedelta(seconds=rng.randint(0, DAYS * 86_400 - 1)),
+            )
+        )
+        if len(chunk) >= spec.chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def ensure_database(dsn: str) -> None:
+    """目标数据库不存在时通过 postgres 库创建它"""
+    import asyncpg
+
+    try:
+        connection = await asyncpg.connect(dsn)
+    except asyncpg.InvalidCatalogNameError:
+        base, _, name = dsn.rpartition("/")
+        name = name.split("?")[0]
+        admin = await asyncpg.connect(f"{base}/postgres")
+        try:
+            await admin.execute(f'CREATE DATABASE "{name}"')
+        finally:
+            await admin.close()
+    else:
+        await connection.close()
+
+
+async def load_fixtures(dsn: str, spec: FixtureSpec) -> dict[str, float]:
+    """
+    建表并通过 COPY 导入数据, 最后 ANALYZE
+
+    Args:
+    ----------
+        dsn: PostgreSQL DSN
+        spec: 数据规模参数
+
+    Returns:
+    ----------
+        统计信息 (rows, seconds, rows_per_second)
+    """
+    import asyncpg
+
+    await ensure_database(dsn)
+    start = time.perf_counter()
+    total_rows = 0
+    connection = await asyncpg.connect(dsn)
+    try:
+        for statement in schema_sql(spec):
+            await connection.execute(statement)
+
+        columns = ("customer_id", "name", "region", "created_at")
+        for chunk in customer_chunks(spec):
+            await connection.copy_records_to_table(CUSTOMER_TABLE, records=chunk, columns=columns)
+            total_rows += len(chunk)
+
+        columns = ("event_id", "customer_id", "category", "amount", "created_at")
+        for index, table in enumerate(spec.event_tables()):
+            for chunk in event_chunks(spec, index):
+                await connection.copy_records_to_table(table, records=chunk, columns=columns)
+                total_rows += len(chunk)
+            print(f"   loaded {table}: {spec.rows:,} rows")
+
+        await connection.execute("ANALYZE")
+    finally:
+        await connection.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": total_rows,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(total_rows / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+@dataclass(frozen=True)
+class WorkloadQuery:
+    """一条工作负载: 自然语言问题与 mock LLM 应返回的 SQL"""
+
+    question: str
+    sql: str
+
+
+def build_workload(spec: FixtureSpec) -> list[WorkloadQuery]:
+    """
+    为每个事实表生成一组问题 (聚合、Top-N、时间范围、点查、关联)
+
+    Args:
+    ----------
+        spec: 数据规模参数
+
+    Returns:
+    ----------
+        WorkloadQuery 列表
+    """
+    queries = []
+    for table in spec.event_tables():
+        queries.extend(
+            [
+                WorkloadQuery(
+                    f"How many {table} events are there per category?",
+                    f"SELECT category, count(*) AS events FROM {table} "
+                    "GROUP BY category ORDER BY events DESC",
+                ),
+                WorkloadQuery(
+                    f"Who are the top 10 customers by total amount in {table}?",
+                    f"SELECT customer_id, sum(amount) AS total FROM {table} "
+                    "GROUP BY customer_id ORDER BY total DESC LIMIT 10",
+                ),
+                WorkloadQuery(
+                    f"What is the daily amount in {table} for January 2025?",
+                    f"SELECT date_trunc('day', created_at) AS day, sum(amount) AS total "
+                    f"FROM {table} WHERE created_at >= '2025-01-01' "
+                    "AND created_at < '2025-02-01' GROUP BY 1 ORDER BY 1",
+                ),
+                WorkloadQuery(
+                    f"Show the latest 20 {table} events of customer 1",
+                    f"SELECT * FROM {table} WHERE customer_id = 1 "
+                    "ORDER BY created_at DESC LIMIT 20",
+                ),
+                WorkloadQuery(
+                    f"What is the total {table} amount per customer region?",
+                    f"SELECT c.region, sum(e.amount) AS total FROM {table} e "
+                    f"JOIN {CUSTOMER_TABLE} c ON c.customer_id = e.customer_id "
+                    "GROUP BY c.region ORDER BY total DESC",
+                ),
+            ]
+        )
+    return queries
@@ -0,0 +1,149 @@
+"""
+OpenAI 兼容的 mock LLM 端点
+
+实现 POST /v1/chat/completions: 在 prompt 中查找已知问题并返回对应 SQL
+({"sql": ..., "explanation": ..., "assumptions": []}), 未知问题返回
+SELECT 1。结果校验请求 (response_format=json_object 且无 SQL 问题)
+返回 is_relevant=true。
+
+每次响应前等待 latency_ms ± jitter_ms (均匀分布), 用来模拟真实 LLM 的
+网络与推理延迟; 请求计数与并发峰值通过 GET /stats 查看。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+FALLBACK_SQL = "SELECT 1 AS ok"
+
+
+@dataclass
+class MockLLMStats:
+    requests: int = 0
+    unmatched: int = 0
+    active: int = 0
+    max_active: int = 0
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "requests": self.requests,
+            "unmatched": self.unmatched,
+            "max_concurrency": self.max_active,
+        }
+
+
+class MockLLM:
+    """
+    mock OpenAI chat completions 服务
+
+    Args:
+    ----------
+        answers: 问题 -> SQL 映射
+        latency_ms: 平均响应延迟
+        jitter_ms: 延迟抖动 (均匀分布 ±jitter_ms)
+        seed: 延迟抖动随机种子
+    """
+
+    def __init__(
+        self,
+        answers: dict[str, str],
+        latency_ms: float = 300.0,
+        jitter_ms: float = 100.0,
+        seed: int = 0,
+    ) -> None:
+        self._answers = answers
+        self._latency_ms = latency_ms
+        self._jitter_ms = jitter_ms
+        self._rng = random.Random(seed)
+        self.stats = MockLLMStats()
+        self.app = Starlette(
+            routes=[
+                Route("/v1/chat/completions", self._completions, methods=["POST"]),
+                Route("/chat/completions", self._completions, methods=["POST"]),
+                Route("/stats", self._stats, methods=["GET"]),
+            ]
+        )
+
+    def answer(self, prompt: str) -> str | None:
+        """在 prompt 中查找已知问题, 返回对应 SQL"""
+        for question, sql in self._answers.items():
+            if f'"{question}"' in prompt:
+                return sql
+        return None
+
+    async def _completions(self, request: Request) -> JSONResponse:
+        body = await request.json()
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+
+        self.stats.requests += 1
+        self.stats.active += 1
+        self.stats.max_active = max(self.stats.max_active, self.stats.active)
+        try:
+            delay = self._latency_ms + self._rng.uniform(-self._jitter_ms, self._jitter_ms)
+            await asyncio.sleep(max(0.0, delay) / 1000)
+        finally:
+            self.stats.active -= 1
+
+        sql = self.answer(prompt)
+        if body.get("response_format", {}).get("type") == "json_object" and sql is None:
+            content = {"is_relevant": True, "match_score": 1.0, "reason": "mock"}
+        else:
+            if sql is None:
+                self.stats.unmatched += 1
+                sql = FALLBACK_SQL
+            content = {"sql": sql, "explanation": "mock response", "assumptions": []}
+
+        text = json.dumps(content)
+        return JSONResponse(
+            {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": len(prompt) // 4,
+                    "completion_tokens": len(text) // 4,
+                    "total_tokens": (len(prompt) + len(text)) // 4,
+                },
+            }
+        )
+
+    async def _stats(self, request: Request) -> JSONResponse:
+        return JSONResponse(self.stats.to_dict())
+
+    async def serve(self, host: str, port: int, started: asyncio.Event | None = None) -> None:
+        """在当前事件循环中运行, 直到任务被取消"""
+        server = uvicorn.Server(
+            uvicorn.Config(self.app, host=host, port=port, log_level="warning", lifespan="off")
+        )
+        task = asyncio.create_task(server.serve())
+        try:
+            while not server.started:
+                if task.done():
+                    await task
+                    raise RuntimeError("mock LLM server exited during startup")
+                await asyncio.sleep(0.05)
+            if started is not None:
+                started.set()
+            await task
+        finally:
+            server.should_exit = True
+            await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,186 @@
+"""
+负载测试报告与基线比较
+
+报告为 JSON: 运行参数、总吞吐、每个工具的延迟分位数与错误数、server
+进程内存 (峰值/结束时 RSS)。与基线比较时, 吞吐下降或 p95/p99/内存上升
+超过容忍度即视为回归。
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# 指标方向: 吞吐越大越好, 延迟/错误率/内存越小越好
+HIGHER_IS_BETTER = "higher"
+LOWER_IS_BETTER = "lower"
+
+
+def percentile(sorted_values: list[float], quantile: float) -> float:
+    """最近秩分位数 (sorted_values 需已排序)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(quantile * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class ToolSamples:
+    """一个工具的调用样本"""
+
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self) -> dict[str, float | int]:
+        values = sorted(self.latencies_ms)
+        return {
+            "calls": len(values),
+            "errors": self.errors,
+            "mean_ms": round(sum(values) / len(values), 2) if values else 0.0,
+            "p50_ms": round(percentile(values, 0.50), 2),
+            "p95_ms": round(percentile(values, 0.95), 2),
+            "p99_ms": round(percentile(values, 0.99), 2),
+            "max_ms": round(values[-1], 2) if values else 0.0,
+        }
+
+
+def build_report(
+    parameters: dict[str, Any],
+    samples: dict[str, ToolSamples],
+    elapsed_seconds: float,
+    memory: dict[str, float | None],
+    extra: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    汇总一次运行
+
+    Args:
+    ----------
+        parameters: 运行参数 (规模、并发、LLM 延迟等)
+        samples: 工具名 -> 样本
+        elapsed_seconds: 压测阶段耗时
+        memory: server 进程内存 (MB)
+        extra: 其他信息 (数据导入耗时、mock LLM 统计等)
+
+    Returns:
+    ----------
+        报告字典
+    """
+    calls = sum(len(s.latencies_ms) for s in samples.values())
+    errors = sum(s.errors for s in samples.values())
+    return {
+        "parameters": parameters,
+        "elapsed_seconds": round(elapsed_seconds, 2),
+        "throughput_rps": round(calls / elapsed_seconds, 2) if elapsed_seconds else 0.0,
+        "calls": calls,
+        "errors": errors,
+        "tools": {name: s.summary() for name, s in sorted(samples.items())},
+        "memory_mb": memory,
+        **(extra or {}),
+    }
+
+
+def comparable_metrics(report: dict[str, Any]) -> dict[str, tuple[float, str]]:
+    """抽取参与回归比较的指标"""
+    metrics: dict[str, tuple[float, str]] = {
+        "throughput_rps": (report["throughput_rps"], HIGHER_IS_BETTER),
+    }
+    for tool, summary in report["tools"].items():
+        for key in ("p95_ms", "p99_ms"):
+            metrics[f"{tool}.{key}"] = (summary[key], LOWER_IS_BETTER)
+        calls = summary["calls"] or 1
+        metrics[f"{tool}.error_rate"] = (summary["errors"] / calls, LOWER_IS_BETTER)
+    peak = (report.get("memory_mb") or {}).get("peak_rss")
+    if peak is not None:
+        metrics["memory_mb.peak_rss"] = (peak, LOWER_IS_BETTER)
+    return metrics
+
+
+def compare(
+    report: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[dict[str, Any]]:
+    """
+    与基线逐项比较
+
+    Args:
+    ----------
+        report: 本次报告
+        baseline: 基线报告
+        tolerance: 相对容忍度 (0.15 = 允许 15% 变差)
+
+    Returns:
+    ----------
+        每个指标一行: metric, baseline, current, change, regression
+    """
+    current = comparable_metrics(report)
+    previous = comparable_metrics(baseline)
+    rows = []
+    for metric, (value, direction) in current.items():
+        if metric not in previous:
+            continue
+        base_value = previous[metric][0]
+        if metric.endswith("error_rate"):
+            # 错误率用绝对差, 基线为 0 时相对变化没有意义
+            change = value - base_value
+            regression = change > tolerance / 10
+        else:
+            change = (value - base_value) / base_value if base_value else 0.0
+            worse = -change if direction == HIGHER_IS_BETTER else change
+            regression = worse > tolerance
+        rows.append(
+            {
+                "metric": metric,
+                "baseline": base_value,
+                "current": value,
+                "change": round(change, 4),
+                "regression": regression,
+            }
+        )
+    return rows
+
+
+def parameter_mismatches(report: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """列出与基线不一致的运行参数 (参数不同的结果不可比)"""
+    current = report["parameters"]
+    previous = baseline.get("parameters", {})
+    return sorted(key for key in current if previous.get(key) != current[key])
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("📊 Load test report")
+    print(f"   calls:        {report['calls']:,} ({report['errors']} errors)")
+    print(f"   elapsed:      {report['elapsed_seconds']:.2f} s")
+    print(f"   throughput:   {report['throughput_rps']:.2f} calls/s")
+    for tool, s in report["tools"].items():
+        print(
+            f"   {tool:<16} n={s['calls']:<6} p50={s['p50_ms']:>8.1f}ms "
+            f"p95={s['p95_ms']:>8.1f}ms p99={s['p99_ms']:>8.1f}ms errors={s['errors']}"
+        )
+    memory = report.get("memory_mb") or {}
+    if memory.get("peak_rss") is not None:
+        print(
+            f"   server RSS:   peak {memory['peak_rss']:.1f} MB, "
+            f"end {memory.get('end_rss') or 0:.1f} MB"
+        )
+
+
+def print_comparison(rows: list[dict[str, Any]], tolerance: float) -> None:
+    print(f"🔍 Baseline comparison (tolerance {tolerance:.0%})")
+    for row in rows:
+        mark = "❌" if row["regression"] else "✅"
+        print(
+            f"   {mark} {row['metric']:<32} {row['baseline']:>10.2f} -> "
+            f"{row['current']:>10.2f} ({row['change']:+.1%})"
+        )
+
+
+def load_json(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_json(path: Path, data: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
@@ -0,0 +1,321 @@
+"""
+负载测试执行: 启动 mock LLM 与 MCP server, 并发驱动工具调用
+
+流程:
+    1. (可选) 按 FixtureSpec 生成并导入数据
+    2. 在本进程内启动 mock LLM (OpenAI 兼容, 可配置延迟)
+    3. 写入临时 config/config.yaml, 以 HTTP transport 启动 server 子进程
+    4. N 个 MCP 客户端会话并发调用 generate_sql / execute_query
+    5. 采样 server 进程 RSS, 生成报告并与基线比较
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+import yaml
+
+from loadtest.fixtures import FixtureSpec, WorkloadQuery, build_workload, load_fixtures
+from loadtest.mock_llm import MockLLM
+from loadtest.report import ToolSamples, build_report
+
+WEEK5_DIR = Path(__file__).resolve().parents[2]
+PASSWORD_ENV_VAR = "LOADTEST_DB_PASSWORD"
+DATABASE_NAME = "loadtest"
+
+
+@dataclass(frozen=True)
+class LoadSpec:
+    """
+    压测参数
+
+    Args:
+    ----------
+        clients: 并发 MCP 客户端会话数
+        requests: 总调用次数
+        execute_ratio: execute_query 占比 (其余为 generate_sql)
+        llm_latency_ms: mock LLM 平均延迟
+        llm_jitter_ms: mock LLM 延迟抖动
+        result_cache: 是否启用 server 端结果缓存
+        seed: 请求序列随机种子
+    """
+
+    clients: int = 8
+    requests: int = 200
+    execute_ratio: float = 0.5
+    llm_latency_ms: float = 300.0
+    llm_jitter_ms: float = 100.0
+    result_cache: bool = False
+    seed: int = 7
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def read_rss_mb(pid: int) -> tuple[float | None, float | None]:
+    """读取 /proc/<pid>/status 中的 VmRSS / VmHWM (非 Linux 返回 None)"""
+    try:
+        text = Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return None, None
+    values: dict[str, float] = {}
+    for line in text.splitlines():
+        key, _, rest = line.partition(":")
+        if key in ("VmRSS", "VmHWM"):
+            values[key] = int(rest.split()[0]) / 1024
+    return values.get("VmRSS"), values.get("VmHWM")
+
+
+def write_server_config(workdir: Path, dsn: str, llm_url: str, port: int, spec: LoadSpec) -> None:
+    """为 server 子进程写入 config/config.yaml"""
+    url = urlparse(dsn)
+    config = {
+        "server": {
+            "name": "postgres-mcp-loadtest",
+            "version": "0.1.0",
+            "transport": "http",
+            "host": "127.0.0.1",
+            "port": port,
+            "http_path": "/mcp",
+        },
+        "databases": [
+            {
+                "name": DATABASE_NAME,
+                "host": url.hostname or "localhost",
+                "port": url.port or 5432,
+                "database": url.path.lstrip("/") or "postgres",
+                "user": url.username or "postgres",
+                "password_env_var": PASSWORD_ENV_VAR,
+                "ssl_mode": "disable",
+                "min_pool_size": 2,
+                "max_pool_size": max(4, spec.clients),
+            }
+        ],
+        "default_database": DATABASE_NAME,
+        "openai": {"api_key": "mock", "model": "mock", "base_url": llm_url, "timeout": 60},
+        "query": {"enable_result_validation": False},
+        "result_cache": {"enabled": spec.result_cache},
+        "templates": {"enabled": False},
+        "logging": {"directory": str(workdir / "logs")},
+    }
+    (workdir / "config").mkdir(parents=True, exist_ok=True)
+    (workdir / "config" / "config.yaml").write_text(yaml.safe_dump(config), encoding="utf-8")
+
+
+def build_requests(workload: list[WorkloadQuery], spec: LoadSpec) -> list[tuple[str, dict]]:
+    """按种子生成固定的请求序列"""
+    rng = random.Random(spec.seed)
+    requests = []
+    for _ in range(spec.requests):
+        query = rng.choice(workload)
+        tool = "execute_query" if rng.random() < spec.execute_ratio else "generate_sql"
+        arguments: dict[str, Any] = {"natural_language": query.question, "database": DATABASE_NAME}
+        if tool == "execute_query":
+            arguments["limit"] = 100
+        requests.append((tool, arguments))
+    return requests
+
+
+async def wait_for_port(port: int, process: asyncio.subprocess.Process, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.returncode is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.1)
+            continue
+        writer.close()
+        await writer.wait_closed()
+        return
+    raise TimeoutError(f"server did not listen on port {port} within {timeout}s")
+
+
+@contextlib.asynccontextmanager
+async def mcp_session(url: str):
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamable_http_client
+
+    async with streamable_http_client(url) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            yield session
+
+
+def _failed(result: Any) -> bool:
+    if result.isError:
+        return True
+    text = result.content[0].text if result.content else ""
+    return text.startswith("❌")
+
+
+async def drive(url: str, requests: list[tuple[str, dict]], clients: int) -> dict[str, ToolSamples]:
+    """clients 个会话从共享队列取请求并发执行"""
+    queue: asyncio.Queue[tuple[str, dict]] = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+    samples: dict[str, ToolSamples] = {}
+
+    async def client() -> None:
+        async with mcp_session(url) as session:
+            while True:
+                try:
+                    tool, arguments = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                tool_samples = samples.setdefault(tool, ToolSamples())
+                start = time.perf_counter()
+                try:
+                    result = await session.call_tool(tool, arguments)
+                    failed = _failed(result)
+                except Exception:
+                    failed = True
+                tool_samples.latencies_ms.append((time.perf_counter() - start) * 1000)
+                tool_samples.errors += failed
+
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return samples
+
+
+async def run_load_test(
+    dsn: str,
+    fixture_spec: FixtureSpec,
+    load_spec: LoadSpec,
+    load_data: bool = True,
+    workdir: Path | None = None,
+    startup_timeout: float = 60.0,
+) -> dict[str, Any]:
+    """
+    执行一次完整压测并返回报告
+
+    Args:
+    ----------
+        dsn: PostgreSQL DSN (库不存在时自动创建)
+        fixture_spec: 数据规模参数
+        load_spec: 压测参数
+        load_data: 是否重新生成并导入数据
+        workdir: server 工作目录 (默认临时目录)
+        startup_timeout: 等待 server 监听端口的超时
+
+    Returns:
+    ----------
+        报告字典 (见 report.build_report)
+    """
+    extra: dict[str, Any] = {}
+    if load_data:
+        print(f"🧱 Loading fixtures {fixture_spec.label()} ...")
+        extra["fixtures"] = await load_fixtures(dsn, fixture_spec)
+
+    workload = build_workload(fixture_spec)
+    llm = MockLLM(
+        {q.question: q.sql for q in workload},
+        latency_ms=load_spec.llm_latency_ms,
+        jitter_ms=load_spec.llm_jitter_ms,
+        seed=load_spec.seed,
+    )
+    llm_port, server_port = free_port(), free_port()
+    llm_started = asyncio.Event()
+    llm_task = asyncio.create_task(llm.serve("127.0.0.1", llm_port, llm_started))
+
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="mcp-load-")))
+        write_server_config(workdir, dsn, f"http://127.0.0.1:{llm_port}/v1", server_port, load_spec)
+        env = {
+            **os.environ,
+            "PYTHONPATH": str(WEEK5_DIR / "src"),
+            PASSWORD_ENV_VAR: urlparse(dsn).password or "",
+        }
+        log_file = stack.enter_context((workdir / "server.log").open("wb"))
+
+        await llm_started.wait()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "postgres_mcp",
+            cwd=workdir,
+            env=env,
+            stdout=log_file,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        rss_samples: list[float] = []
+
+        async def sample_memory() -> None:
+            while True:
+                rss, _ = read_rss_mb(process.pid)
+                if rss is not None:
+                    rss_samples.append(rss)
+                await asyncio.sleep(0.2)
+
+        sampler = asyncio.create_task(sample_memory())
+        try:
+            await wait_for_port(server_port, process, startup_timeout)
+            url = f"http://127.0.0.1:{server_port}/mcp"
+
+            # 预热: 首次调用会初始化连接池、schema 缓存和 AI 服务
+            async with mcp_session(url) as session:
+                for tool, arguments in (
+                    ("list_databases", {}),
+                    (
+                        "generate_sql",
+                        {"natural_language": workload[0].question, "database": DATABASE_NAME},
+                    ),
+                ):
+                    result = await session.call_tool(tool, arguments)
+                    if _failed(result):
+                        raise RuntimeError(f"warm-up {tool} failed: {result.content[0].text}")
+            warm_rss, _ = read_rss_mb(process.pid)
+            llm_requests_before = llm.stats.requests
+
+            print(f"🚀 {load_spec.requests} calls from {load_spec.clients} clients ...")
+            start = time.perf_counter()
+            samples = await drive(url, build_requests(workload, load_spec), load_spec.clients)
+            elapsed = time.perf_counter() - start
+
+            end_rss, peak_rss = read_rss_mb(process.pid)
+        finally:
+            sampler.cancel()
+            await asyncio.gather(sampler, return_exceptions=True)
+            if process.returncode is None:
+                process.terminate()
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=10)
+                except TimeoutError:
+                    process.kill()
+                    await process.wait()
+            llm_task.cancel()
+            await asyncio.gather(llm_task, return_exceptions=True)
+
+    extra["mock_llm"] = {
+        **llm.stats.to_dict(),
+        "requests": llm.stats.requests - llm_requests_before,
+    }
+    memory = {
+        "warm_rss": _round(warm_rss),
+        "peak_rss": _round(peak_rss if peak_rss is not None else max(rss_samples, default=None)),
+        "end_rss": _round(end_rss),
+    }
+    parameters = {
+        **{f"fixture_{k}": v for k, v in asdict(fixture_spec).items() if k != "chunk_size"},
+        **asdict(load_spec),
+    }
+    return build_report(parameters, samples, elapsed, memory, extra)
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 1)
@@ -5,7 +5,7 @@ Builds system and user prompts for SQL generation.
 
 import structlog
 
-from postgres_mcp.models.schema import DatabaseSchema
+from postgres_mcp.models.schema import ColumnSchema, DatabaseSchema
 
 logger = structlog.get_logger(__name__)
 
@@ -48,6 +48,15 @@ class PromptBuilder:
 - 如果请求的表/列不存在，提示用户正确的名称
 """
 
+    def __init__(self, max_sample_values: int = 3) -> None:
+        """Initialize prompt builder.
+
+        Args:
+            max_sample_values: Common values listed per column from cached
+                statistics (0 disables value hints)
+        """
+        self._max_sample_values = max_sample_values
+
     def build_system_prompt(self) -> str:
         """Build system prompt.
 
@@ -139,19 +148,61 @@ class PromptBuilder:
             table = schema.tables[table_name]
             columns = []
 
-            for col in table.columns:
+            for i, col in enumerate(table.columns):
                 col_def = f"  {col.name} {col.data_type}"
                 if not col.nullable:
                     col_def += " NOT NULL"
                 if col.primary_key:
                     col_def += " PRIMARY KEY"
+                if i < len(table.columns) - 1:
+                    col_def += ","
+                hint = self._column_hint(col, table.row_count_estimate)
+                if hint:
+                    col_def += f" -- {hint}"
                 columns.append(col_def)
 
-            ddl = f"CREATE TABLE {table_name} (\n" + ",\n".join(columns) + "\n);"
+            ddl = f"CREATE TABLE {table_name} (\n" + "\n".join(columns) + "\n);"
+            if table.row_count_estimate is not None:
+                ddl = f"-- ~{table.row_count_estimate:,} rows\n{ddl}"
             ddl_parts.append(ddl)
 
         return "\n\n".join(ddl_parts)
 
+    def _column_hint(self, column: ColumnSchema, row_count: int | None) -> str:
+        """Summarize cached column statistics for a DDL comment.
+
+        Args:
+            column: Column schema (hints need column.stats)
+            row_count: Estimated table row count
+
+        Returns:
+            str: Hint such as "values: 'paid', 'pending'; 3% NULL" or ""
+        """
+        stats = column.stats
+        if stats is None:
+            return ""
+
+        hints = []
+        values = stats.most_common_vals[: self._max_sample_values]
+        if values:
+            quoted = ", ".join(f"'{value}'" for value in values)
+            if not stats.values_complete:
+                hints.append(f"e.g. {quoted}")
+            elif len(values) == len(stats.most_common_vals):
+                hints.append(f"values: {quoted}")
+            else:
+                hints.append(f"{len(stats.most_common_vals)} values, e.g. {quoted}")
+        if not (values and stats.values_complete):
+            if stats.n_distinct == -1:
+                hints.append("unique")
+            else:
+                distinct = stats.distinct_estimate(row_count)
+                if distinct is not None:
+                    hints.append(f"~{distinct:,} distinct")
+        if stats.null_frac >= 0.01:
+            hints.append(f"{stats.null_frac:.0%} NULL")
+        return "; ".join(hints)
+
     def _select_relevant_tables(
         self, natural_language: str, schema: DatabaseSchema, max_count: int = 10
     ) -> list[str]:
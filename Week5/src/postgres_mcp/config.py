@@ -29,12 +29,19 @@ from postgres_mcp.models.connection import DatabaseConnection
 
 class ServerConfig(BaseModel):
     """
-    Server metadata configuration.
+    Server metadata and transport configuration.
 
     Args:
     ----------
         name: Server name.
         version: Server version string.
+        transport: "stdio" (one client per process) or "http" (streamable
+            HTTP, many clients sharing pools and caches).
+        host: Bind address for the HTTP transport.
+        port: Bind port for the HTTP transport.
+        http_path: Endpoint path for the HTTP transport.
+        auth_token: Bearer token HTTP clients must send (takes priority).
+        auth_token_env_var: Environment variable containing the bearer token.
 
     Returns:
     ----------
@@ -47,6 +54,27 @@ class ServerConfig(BaseModel):
 
     name: str = Field(..., min_length=1)
     version: str = Field(..., min_length=1)
+    transport: str = Field("stdio", pattern="^(stdio|http)$")
+    host: str = Field("127.0.0.1", min_length=1)
+    port: int = Field(8000, ge=1, le=65535)
+    http_path: str = Field("/mcp", pattern="^/")
+    auth_token: str | None = Field(None)
+    auth_token_env_var: str | None = Field("MCP_AUTH_TOKEN")
+
+    @property
+    def resolved_auth_token(self) -> str | None:
+        """
+        Get the HTTP bearer token: direct auth_token > environment variable.
+
+        Returns:
+        ----------
+            Token value, or None if none is configured
+        """
+        if self.auth_token:
+            return self.auth_token
+        if self.auth_token_env_var:
+            return os.environ.get(self.auth_token_env_var) or None
+        return None
 
 
 class OpenAIConfig(BaseModel):
@@ -115,8 +143,9 @@ class SchemaCacheConfig(BaseModel):
     Args:
     ----------
         poll_interval_minutes: Refresh interval in minutes.
-        load_sample_data: Whether to include sample data.
-        max_sample_rows: Maximum sample rows per table.
+        load_sample_data: Whether to load column statistics and common
+            values (pg_stats) and row estimates with the schema.
+        max_sample_rows: Maximum common values shown per column in prompts.
 
     Returns:
     ----------
@@ -141,6 +170,22 @@ class QueryConfig(BaseModel):
         default_limit: Default row limit for queries.
         max_timeout_seconds: Maximum query timeout.
         enable_result_validation: Whether to validate results.
+        preview_rows: Rows shown in execute_query response previews.
+        max_cell_width: Characters per preview cell before truncation.
+        cost_guard_enabled: Run an EXPLAIN pre-flight before execution.
+        max_plan_cost: Default planner cost budget (None disables).
+        max_plan_rows: Default estimated result rows budget (None disables).
+        cost_guard_action: "limit" pushes down a LIMIT, "reject" refuses.
+        approximate_target_rows: Rows sampled by approximate execute_query
+            calls (sets the TABLESAMPLE percentage).
+        approximate_min_table_rows: Tables with fewer estimated rows are
+            always aggregated exactly.
+        approximate_refine: Compute the exact answer in the background
+            after an approximate one.
+        batch_max_queries: Maximum queries per execute_queries call.
+        batch_llm_concurrency: Concurrent SQL generations per batch.
+        export_directory: Directory export_query writes into; export paths
+            are resolved inside it and may not escape it.
 
     Returns:
     ----------
@@ -154,6 +199,78 @@ class QueryConfig(BaseModel):
     default_limit: int = Field(1000, ge=1)
     max_timeout_seconds: int = Field(30, ge=1)
     enable_result_validation: bool = False
+    preview_rows: int = Field(10, ge=0, le=1000)
+    max_cell_width: int = Field(80, ge=4)
+    cost_guard_enabled: bool = False
+    max_plan_cost: float | None = Field(None, gt=0)
+    max_plan_rows: int | None = Field(None, ge=1)
+    cost_guard_action: str = Field("limit", pattern="^(limit|reject)$")
+    approximate_target_rows: int = Field(100_000, ge=1000)
+    approximate_min_table_rows: int = Field(1_000_000, ge=0)
+    approximate_refine: bool = True
+    batch_max_queries: int = Field(20, ge=1, le=200)
+    batch_llm_concurrency: int = Field(4, ge=1, le=64)
+    export_directory: str = Field("exports", min_length=1)
+
+
+class ResultCacheConfig(BaseModel):
+    """
+    Query result cache configuration.
+
+    Args:
+    ----------
+        enabled: Whether execute_query results are cached.
+        max_memory_mb: Memory budget for cached results.
+        ttl_seconds: Maximum age of a cached result.
+        poll_interval_seconds: How often pg_stat_user_tables write counters
+            are polled to invalidate results of changed tables.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    enabled: bool = False
+    max_memory_mb: int = Field(64, ge=1)
+    ttl_seconds: float = Field(300.0, gt=0)
+    poll_interval_seconds: float = Field(5.0, ge=0.5)
+
+
+class OffloadConfig(BaseModel):
+    """
+    Process-pool offload configuration for CPU-bound stages.
+
+    Payloads below a stage's threshold run inline on the event loop, since
+    pickling them to a worker costs more than the work itself.
+
+    Args:
+    ----------
+        enabled: Whether to offload large payloads to worker processes.
+        max_workers: Worker process count (None uses the CPU count).
+        min_sql_chars: SQL length from which validation is offloaded.
+        min_cells: Result cells (rows x columns) from which preview
+            rendering and CSV/NDJSON chunk encoding are offloaded.
+        min_tables: Table count from which schema resource rendering is
+            offloaded.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    enabled: bool = False
+    max_workers: int | None = Field(None, ge=1)
+    min_sql_chars: int = Field(8_000, ge=0)
+    min_cells: int = Field(20_000, ge=0)
+    min_tables: int = Field(50, ge=0)
 
 
 class DatabaseConfig(BaseModel):
@@ -218,6 +335,8 @@ class TemplateConfig(BaseModel):
     ----------
         enabled: Whether template fallback is enabled.
         directory: Directory containing template definitions.
+        hot_reload: Whether to watch the directory and reload changed templates.
+        poll_interval_seconds: Interval between template directory scans.
 
     Returns:
     ----------
@@ -230,6 +349,8 @@ class TemplateConfig(BaseModel):
 
     enabled: bool = True
     directory: str = "src/postgres_mcp/templates/queries"
+    hot_reload: bool = True
+    poll_interval_seconds: float = Field(2.0, ge=0.1)
 
 
 class LoggingConfig(BaseModel):
@@ -244,6 +365,8 @@ class LoggingConfig(BaseModel):
         max_file_size_mb: Maximum file size before rotation.
         buffer_size: Buffer size for JSONL logging.
         flush_interval_seconds: Flush interval in seconds.
+        feed_size: Recent entries kept in memory for the history://tail resource.
+        metrics_window_seconds: Rolling window of the stats://queries resource.
 
     Returns:
     ----------
@@ -260,6 +383,8 @@ class LoggingConfig(BaseModel):
     max_file_size_mb: int = Field(100, ge=1)
     buffer_size: int = Field(100, ge=1)
     flush_interval_seconds: float = Field(5.0, ge=0.1)
+    feed_size: int = Field(1000, ge=1)
+    metrics_window_seconds: int = Field(60, ge=1, le=3600)
 
 
 class Config(BaseSettings):
@@ -274,6 +399,8 @@ class Config(BaseSettings):
         openai: OpenAI settings.
         schema_cache: Schema cache settings.
         query: Query execution settings.
+        offload: Process-pool offload settings.
+        result_cache: Query result cache settings.
         templates: Template settings.
         logging: Logging settings.
 
@@ -298,6 +425,8 @@ class Config(BaseSettings):
     openai: OpenAIConfig
     schema_cache: SchemaCacheConfig = Field(default_factory=SchemaCacheConfig)
     query: QueryConfig = Field(default_factory=QueryConfig)
+    offload: OffloadConfig = Field(default_factory=OffloadConfig)
+    result_cache: ResultCacheConfig = Field(default_factory=ResultCacheConfig)
     templates: TemplateConfig = Field(default_factory=TemplateConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
 
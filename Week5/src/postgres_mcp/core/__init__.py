@@ -6,24 +6,44 @@ This module contains core business logic implementations:
 - Schema Cache
 - Query Executor
 - Template Matcher
+
+Exports are resolved lazily so that importing one submodule (for example
+the schema cache) does not pull in openai or sqlglot.
 """
 
-from postgres_mcp.core.schema_cache import (
-    SchemaCache,
-    SchemaCacheError,
-)
-from postgres_mcp.core.sql_generator import (
-    GenerationMethod,
-    SQLGenerationError,
-    SQLGenerator,
-)
-from postgres_mcp.core.sql_validator import (
-    SQLValidator,
-    ValidationError,
-    ValidationResult,
-)
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = [
+if TYPE_CHECKING:
+    from postgres_mcp.core.schema_cache import (
+        SchemaCache,
+        SchemaCacheError,
+    )
+    from postgres_mcp.core.sql_generator import (
+        GenerationMethod,
+        SQLGenerationError,
+        SQLGenerator,
+    )
+    from postgres_mcp.core.sql_validator import (
+        SQLValidator,
+        ValidationError,
+        ValidationResult,
+    )
+
+_EXPORTS = {
+    "SQLGenerator": "postgres_mcp.core.sql_generator",
+    "GenerationMethod": "postgres_mcp.core.sql_generator",
+    "SQLGenerationError": "postgres_mcp.core.sql_generator",
+    "SQLValidator": "postgres_mcp.core.sql_validator",
+    "ValidationResult": "postgres_mcp.core.sql_validator",
+    "ValidationError": "postgres_mcp.core.sql_validator",
+    "SchemaCache": "postgres_mcp.core.schema_cache",
+    "SchemaCacheError": "postgres_mcp.core.schema_cache",
+}
+
+__all__ = (
     "SQLGenerator",
     "GenerationMethod",
     "SQLGenerationError",
@@ -32,4 +52,13 @@ __all__ = [
     "ValidationError",
     "SchemaCache",
     "SchemaCacheError",
-]
+)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,438 @@
+"""
+Approximate execution of exploratory aggregates with TABLESAMPLE.
+
+Eligible queries (a single-table SELECT whose outputs are grouping columns
+and plain COUNT/SUM/AVG aggregates) are rewritten to read a
+``TABLESAMPLE SYSTEM (p)`` block sample. Counts and sums are scaled by
+100/p, and every estimate gets a 95% margin of error computed from helper
+aggregates added to the sampled query. The exact answer (optionally via
+larger samples first) is then computed in the background, and later calls
+for the same query are served the best answer available.
+
+Margins assume rows are sampled independently. SYSTEM samples whole pages,
+so on tables physically clustered by the grouping column the real error
+can be larger than reported.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+import sqlglot
+import structlog
+from sqlglot import exp
+
+from postgres_mcp.core.cost_guard import fingerprint
+from postgres_mcp.models.result import ApproximationInfo, ColumnInfo, QueryResult
+
+if TYPE_CHECKING:
+    import asyncpg
+
+logger = structlog.get_logger(__name__)
+
+Z_95 = 1.96
+MIN_SAMPLE_PERCENT = 0.01
+# Above this the sample reads most pages anyway; run the exact query.
+MAX_SAMPLE_PERCENT = 25.0
+MARGIN_SUFFIX = "_margin"
+_HELPER_PREFIX = "__approx_"
+
+RELTUPLES_SQL = "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass($1)"
+
+ApproximateKey = tuple[str, str, int]
+
+
+@dataclass(frozen=True)
+class _Estimate:
+    """One scaled aggregate output column and its helper columns."""
+
+    name: str
+    kind: str  # "count", "sum" or "avg"
+    helpers: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ApproximatePlan:
+    """
+    A sampled rewrite of an aggregate query.
+
+    Args:
+    ----------
+        sql: Rewritten SQL reading a TABLESAMPLE of the table.
+        table: Sampled table ("schema.table" as written in the query).
+        sample_percent: TABLESAMPLE SYSTEM percentage.
+        estimates: Aggregate outputs to scale, with their helper columns.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    sql: str
+    table: str
+    sample_percent: float
+    estimates: tuple[_Estimate, ...]
+
+    def finalize(self, result: QueryResult, refining: bool = False) -> QueryResult:
+        """
+        Scale sampled aggregates, add margin columns and drop helper columns.
+
+        Args:
+        ----------
+            result: Result of running ``self.sql``
+            refining: Whether a background refinement is in progress
+
+        Returns:
+        ----------
+            The same result object, rewritten in place
+        """
+        q = self.sample_percent / 100.0
+        fpc = math.sqrt(max(0.0, 1.0 - q))
+        by_name = {estimate.name: estimate for estimate in self.estimates}
+
+        rows = []
+        for row in result.rows:
+            out: dict[str, Any] = {}
+            for name, value in row.items():
+                if name.startswith(_HELPER_PREFIX):
+                    continue
+                estimate = by_name.get(name)
+                if estimate is None:
+                    out[name] = value
+                    continue
+                scaled, margin = _scale(estimate, value, row, q, fpc)
+                out[name] = scaled
+                out[name + MARGIN_SUFFIX] = margin
+            rows.append(out)
+        result.rows = rows
+
+        columns: list[ColumnInfo] = []
+        for column in result.columns:
+            if column.name.startswith(_HELPER_PREFIX):
+                continue
+            if column.name in by_name:
+                kind = "int" if by_name[column.name].kind == "count" else "float"
+                columns.append(ColumnInfo(name=column.name, type=kind, table=column.table))
+                columns.append(ColumnInfo(name=column.name + MARGIN_SUFFIX, type="float"))
+            else:
+                columns.append(column)
+        result.columns = columns
+
+        result.approximation = ApproximationInfo(
+            table=self.table,
+            sample_percent=self.sample_percent,
+            estimated_columns=[estimate.name for estimate in self.estimates],
+            refining=refining,
+        )
+        return result
+
+
+def _number(value: Any) -> float | None:
+    if value is None:
+        return None
+    return float(value) if isinstance(value, int | float | Decimal) else None
+
+
+def _scale(
+    estimate: _Estimate, value: Any, row: dict[str, Any], q: float, fpc: float
+) -> tuple[Any, float | None]:
+    """Return (scaled estimate, 95% margin) for one aggregate cell."""
+    raw = _number(value)
+    if raw is None:
+        return value, None
+
+    if estimate.kind == "count":
+        return round(raw / q), Z_95 * math.sqrt(raw) * fpc / q
+
+    if estimate.kind == "sum":
+        squares = _number(row.get(estimate.helpers[0])) or 0.0
+        return raw / q, Z_95 * math.sqrt(squares) * fpc / q
+
+    # avg: standard error of the sample mean with finite population correction
+    stddev = _number(row.get(estimate.helpers[0]))
+    count = _number(row.get(estimate.helpers[1])) or 0.0
+    if stddev is None or count < 2:
+        return raw, None
+    return raw, Z_95 * stddev / math.sqrt(count) * fpc
+
+
+def _as_float(node: exp.Expression) -> exp.Expression:
+    return exp.cast(node.copy(), exp.DataType.build("double precision"))
+
+
+def rewrite_approximate(sql: str, sample_percent: float) -> ApproximatePlan | None:
+    """
+    Rewrite an aggregate query to read a TABLESAMPLE, if it is eligible.
+
+    Eligible queries select from exactly one base table (no joins, CTEs,
+    subqueries, DISTINCT, HAVING or window functions) and output only
+    grouping expressions and plain COUNT/SUM/AVG aggregates (no DISTINCT
+    inside). Helper aggregates are appended after the original outputs so
+    positional GROUP BY / ORDER BY references stay valid.
+
+    Args:
+    ----------
+        sql: Validated SELECT statement
+        sample_percent: TABLESAMPLE SYSTEM percentage
+
+    Returns:
+    ----------
+        ApproximatePlan, or None if the query is not eligible
+    """
+    try:
+        statement = sqlglot.parse_one(sql.strip().rstrip(";"), dialect="postgres")
+    except Exception:
+        return None
+
+    if not isinstance(statement, exp.Select):
+        return None
+    if any(statement.args.get(arg) for arg in ("with", "joins", "having", "distinct")):
+        return None
+    if statement.find(exp.Subquery, exp.Window) is not None:
+        return None
+    if any(select is not statement for select in statement.find_all(exp.Select)):
+        return None
+
+    from_ = statement.args.get("from")
+    table = from_.this if from_ is not None else None
+    if not isinstance(table, exp.Table) or table.args.get("sample") is not None:
+        return None
+
+    estimates: list[_Estimate] = []
+    helpers: list[exp.Expression] = []
+    for index, projection in enumerate(list(statement.expressions)):
+        node = projection.this if isinstance(projection, exp.Alias) else projection
+        if not isinstance(node, exp.Count | exp.Sum | exp.Avg):
+            if node.find(exp.AggFunc) is not None:
+                return None
+            continue
+        argument = node.this
+        if node.find(exp.Distinct) is not None:
+            return None
+
+        kind = node.key  # "count", "sum" or "avg" (PostgreSQL's default column name)
+        if isinstance(projection, exp.Alias):
+            name = projection.alias
+        else:
+            name = kind
+            projection.replace(exp.alias_(node.copy(), kind))
+
+        names: tuple[str, ...] = ()
+        if kind == "sum":
+            names = (f"{_HELPER_PREFIX}{index}_ss",)
+            square = exp.Mul(this=_as_float(argument), expression=_as_float(argument))
+            helpers.append(exp.alias_(exp.Sum(this=square), names[0]))
+        elif kind == "avg":
+            names = (f"{_HELPER_PREFIX}{index}_sd", f"{_HELPER_PREFIX}{index}_n")
+            helpers.append(exp.alias_(exp.StddevSamp(this=_as_float(argument)), names[0]))
+            helpers.append(exp.alias_(exp.Count(this=argument.copy()), names[1]))
+        estimates.append(_Estimate(name=name, kind=kind, helpers=names))
+
+    if not estimates:
+        return None
+
+    table_name = table.copy()
+    table_name.set("alias", None)
+    table.set(
+        "sample",
+        exp.TableSample(method=exp.var("SYSTEM"), percent=exp.Literal.number(sample_percent)),
+    )
+    statement.set("expressions", [*statement.expressions, *helpers])
+
+    return ApproximatePlan(
+        sql=statement.sql(dialect="postgres"),
+        table=table_name.sql(dialect="postgres"),
+        sample_percent=sample_percent,
+        estimates=tuple(estimates),
+    )
+
+
+def refinement_percents(sample_percent: float) -> list[float]:
+    """Larger samples to try before the exact query (x10 steps below the cap)."""
+    percents = []
+    percent = sample_percent * 10
+    while percent <= MAX_SAMPLE_PERCENT:
+        percents.append(round(percent, 4))
+        percent *= 10
+    return percents
+
+
+class Approximator:
+    """
+    Plans sampled executions and refines them in the background.
+
+    Args:
+    ----------
+        target_sample_rows: Rows the sample should contain (sets p).
+        min_table_rows: Tables with fewer estimated rows run exactly.
+        refine: Whether to compute better answers in the background.
+        max_concurrent_refinements: Background refinements running at once.
+        results_size: Refined answers kept for later calls.
+        results_ttl_seconds: Lifetime of refined answers.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+
+    Example:
+    ----------
+        >>> approximator = Approximator(target_sample_rows=100_000)
+        >>> plan = await approximator.plan(sql, connection)
+        >>> if plan:
+        ...     result = plan.finalize(await runner.execute(plan.sql, connection))
+    """
+
+    def __init__(
+        self,
+        target_sample_rows: int = 100_000,
+        min_table_rows: int = 1_000_000,
+        refine: bool = True,
+        max_concurrent_refinements: int = 2,
+        results_size: int = 256,
+        results_ttl_seconds: float = 300.0,
+    ) -> None:
+        self._target_rows = target_sample_rows
+        self._min_table_rows = min_table_rows
+        self.refine_enabled = refine
+        self._semaphore = asyncio.Semaphore(max_concurrent_refinements)
+        self._results_size = results_size
+        self._results_ttl = results_ttl_seconds
+        self._results: OrderedDict[ApproximateKey, tuple[float, QueryResult]] = OrderedDict()
+        self._tasks: dict[ApproximateKey, asyncio.Task[None]] = {}
+
+    @staticmethod
+    def key(database: str, sql: str, limit: int) -> ApproximateKey:
+        """Key identifying a query for refined-answer lookups."""
+        return (database, fingerprint(sql), limit)
+
+    async def plan(self, sql: str, connection: asyncpg.Connection) -> ApproximatePlan | None:
+        """
+        Build a sampled plan sized from the table's planner row estimate.
+
+        Args:
+        ----------
+            sql: Validated SELECT statement
+            connection: Active asyncpg connection
+
+        Returns:
+        ----------
+            ApproximatePlan, or None if the query is ineligible or the table
+            is small enough to aggregate exactly
+        """
+        probe = rewrite_approximate(sql, MIN_SAMPLE_PERCENT)
+        if probe is None:
+            return None
+        reltuples = await connection.fetchval(RELTUPLES_SQL, probe.table)
+        if not reltuples or reltuples < self._min_table_rows:
+            return None
+        percent = max(MIN_SAMPLE_PERCENT, 100.0 * self._target_rows / reltuples)
+        if percent > MAX_SAMPLE_PERCENT:
+            return None
+        return rewrite_approximate(sql, float(f"{percent:.2g}"))
+
+    def refined(self, key: ApproximateKey) -> QueryResult | None:
+        """Return a copy of the best background answer for a query, if any."""
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self._results_ttl:
+            del self._results[key]
+            return None
+        self._results.move_to_end(key)
+        result = entry[1]
+        copy = result.model_copy(update={"errors": list(result.errors)})
+        if copy.approximation is not None:
+            copy.approximation = copy.approximation.model_copy(
+                update={"refining": key in self._tasks}
+            )
+        return copy
+
+    def schedule(
+        self,
+        key: ApproximateKey,
+        plan: ApproximatePlan,
+        exact_sql: str,
+        run: Callable[[str], Awaitable[QueryResult]],
+    ) -> bool:
+        """
+        Start refining a query in the background (once per key).
+
+        Args:
+        ----------
+            key: Key from key()
+            plan: Plan whose answer is being refined
+            exact_sql: Original (unsampled) SQL
+            run: Coroutine function executing SQL and returning its result
+
+        Returns:
+        ----------
+            True if refinement is running for the key
+        """
+        if not self.refine_enabled:
+            return False
+        if key not in self._tasks:
+            task = asyncio.create_task(self._refine(key, plan, exact_sql, run))
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return True
+
+    async def close(self) -> None:
+        """Cancel background refinements."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _refine(
+        self,
+        key: ApproximateKey,
+        plan: ApproximatePlan,
+        exact_sql: str,
+        run: Callable[[str], Awaitable[QueryResult]],
+    ) -> None:
+        async with self._semaphore:
+            try:
+                for percent in refinement_percents(plan.sample_percent):
+                    step = rewrite_approximate(exact_sql, percent)
+                    if step is None:
+                        break
+                    self._store(key, step.finalize(await run(step.sql), refining=True))
+
+                start = time.perf_counter()
+                exact = await run(exact_sql)
+                exact.errors.append(
+                    "ℹ️ Exact answer computed by background refinement of an approximate query"
+                )
+                self._store(key, exact)
+                logger.info(
+                    "approximate_refined",
+                    table=plan.table,
+                    sample_percent=plan.sample_percent,
+                    exact_ms=round((time.perf_counter() - start) * 1000, 2),
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("approximate_refinement_failed", table=plan.table, error=str(e))
+
+    def _store(self, key: ApproximateKey, result: QueryResult) -> None:
+        self._results[key] = (time.monotonic(), result)
+        self._results.move_to_end(key)
+        while len(self._results) > self._results_size:
+            self._results.popitem(last=False)
@@ -0,0 +1,464 @@
+"""
+EXPLAIN-based cost guard for generated SQL.
+
+Before a generated query runs, CostGuard asks the planner for its estimate
+with ``EXPLAIN (FORMAT JSON)`` (no ANALYZE, so nothing is executed) and
+compares total cost and row estimates with the database's budget. Queries
+over budget are either rejected or rewritten with a pushed-down LIMIT and
+re-checked. Reject mode always estimates the statement with the caller's row
+limit pushed down, since that is all the runner returns. Plan summaries are
+cached by SQL fingerprint.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+import asyncpg
+import sqlglot
+import structlog
+from sqlglot import exp
+
+if TYPE_CHECKING:
+    from postgres_mcp.config import QueryConfig
+    from postgres_mcp.models.connection import DatabaseConnection
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL_SECONDS = 300.0
+
+
+class CostGuardError(Exception):
+    """
+    Raised when a query exceeds its cost budget and cannot be rewritten.
+
+    Args:
+    ----------
+        message: Error message.
+        summary: Plan summary of the rejected query.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    def __init__(self, message: str, summary: PlanSummary | None = None) -> None:
+        super().__init__(message)
+        self.summary = summary
+
+
+class CostGuardAction(str, Enum):
+    """What to do with queries over budget."""
+
+    REJECT = "reject"
+    LIMIT = "limit"
+
+
+@dataclass(frozen=True)
+class CostBudget:
+    """
+    Per-database planner budget.
+
+    Args:
+    ----------
+        max_cost: Maximum estimated total cost (None disables the check).
+        max_rows: Maximum estimated rows returned by the query.
+        action: Whether to reject or LIMIT-rewrite queries over budget.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    max_cost: float | None = None
+    max_rows: int | None = None
+    action: CostGuardAction = CostGuardAction.LIMIT
+
+    def violations(self, summary: PlanSummary) -> list[str]:
+        """
+        List the budget limits a plan exceeds.
+
+        Args:
+        ----------
+            summary: Plan summary
+
+        Returns:
+        ----------
+            Human-readable violations (empty when within budget)
+        """
+        problems = []
+        if self.max_cost is not None and summary.total_cost > self.max_cost:
+            problems.append(f"estimated cost {summary.total_cost:,.0f} > {self.max_cost:,.0f}")
+        if self.max_rows is not None and summary.plan_rows > self.max_rows:
+            problems.append(f"estimated rows {summary.plan_rows:,} > {self.max_rows:,}")
+        return problems
+
+
+@dataclass(frozen=True)
+class PlanSummary:
+    """
+    Condensed EXPLAIN output.
+
+    Args:
+    ----------
+        node_type: Root plan node type.
+        total_cost: Estimated total cost of the root node.
+        plan_rows: Estimated rows returned by the root node.
+        seq_scans: (relation, estimated rows) for every sequential scan.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    node_type: str
+    total_cost: float
+    plan_rows: int
+    seq_scans: tuple[tuple[str, int], ...] = field(default_factory=tuple)
+
+    @classmethod
+    def from_explain(cls, explain: Any) -> PlanSummary:
+        """
+        Build a summary from ``EXPLAIN (FORMAT JSON)`` output.
+
+        Args:
+        ----------
+            explain: JSON text or decoded list returned by PostgreSQL
+
+        Returns:
+        ----------
+            PlanSummary
+        """
+        data = json.loads(explain) if isinstance(explain, str | bytes) else explain
+        root = data[0]["Plan"]
+
+        seq_scans: list[tuple[str, int]] = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.get("Node Type") == "Seq Scan":
+                seq_scans.append((node.get("Relation Name", "?"), int(node.get("Plan Rows", 0))))
+            stack.extend(node.get("Plans", ()))
+
+        return cls(
+            node_type=root.get("Node Type", "?"),
+            total_cost=float(root.get("Total Cost", 0.0)),
+            plan_rows=int(root.get("Plan Rows", 0)),
+            seq_scans=tuple(seq_scans),
+        )
+
+    def to_text(self) -> str:
+        """Render a one-line summary for responses and logs."""
+        text = f"{self.node_type}: cost={self.total_cost:,.0f}, rows={self.plan_rows:,}"
+        if self.seq_scans:
+            scans = ", ".join(f"{name} (~{rows:,} rows)" for name, rows in self.seq_scans)
+            text += f"; seq scans: {scans}"
+        return text
+
+
+@dataclass(frozen=True)
+class CostGuardDecision:
+    """
+    Outcome of a cost check.
+
+    Args:
+    ----------
+        sql: SQL to execute (rewritten if a LIMIT was pushed down).
+        summary: Plan summary of the SQL to execute.
+        rewritten: Whether the SQL was rewritten.
+        original_summary: Plan summary before rewriting (if rewritten).
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    sql: str
+    summary: PlanSummary
+    rewritten: bool = False
+    original_summary: PlanSummary | None = None
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Fingerprint SQL for plan caching.
+
+    Whitespace and a trailing semicolon are normalized; literals are kept
+    because they change the planner's estimates.
+
+    Args:
+    ----------
+        sql: SQL text
+
+    Returns:
+    ----------
+        Hex digest
+    """
+    normalized = " ".join(sql.split()).rstrip(";").strip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def push_down_limit(sql: str, limit: int) -> str:
+    """
+    Add (or tighten) a LIMIT on a SELECT.
+
+    Plain SELECTs get the LIMIT on the statement itself; set operations are
+    wrapped in a subquery.
+
+    Args:
+    ----------
+        sql: Validated SELECT statement
+        limit: Row limit
+
+    Returns:
+    ----------
+        Rewritten SQL
+
+    Raises:
+    ----------
+        ValueError: If the SQL is not a query
+    """
+    statement = sqlglot.parse_one(sql.strip().rstrip(";"), dialect="postgres")
+    if isinstance(statement, exp.Select):
+        existing = statement.args.get("limit")
+        current = existing.expression if existing is not None else None
+        if isinstance(current, exp.Literal) and current.is_int and int(current.this) <= limit:
+            return statement.sql(dialect="postgres")
+        return statement.limit(limit).sql(dialect="postgres")
+    if not isinstance(statement, exp.Query):
+        raise ValueError(f"Cannot apply a row limit to {statement.key.upper()}")
+    wrapped = exp.select("*").from_(statement.subquery("_guarded")).limit(limit)
+    return wrapped.sql(dialect="postgres")
+
+
+class CostGuard:
+    """
+    Pre-flight planner check against per-database budgets.
+
+    Args:
+    ----------
+        default_budget: Budget for databases without an override.
+        budgets: Per-database budget overrides.
+        cache_size: Maximum cached plan summaries.
+        cache_ttl_seconds: Lifetime of cached plan summaries.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+
+    Example:
+    ----------
+        >>> guard = CostGuard(CostBudget(max_cost=1e6, max_rows=5_000_000))
+        >>> decision = await guard.check(sql, "main", connection, limit=1000)
+        >>> print(decision.summary.to_text())
+    """
+
+    def __init__(
+        self,
+        default_budget: CostBudget,
+        budgets: dict[str, CostBudget] | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._default_budget = default_budget
+        self._budgets = dict(budgets or {})
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl_seconds
+        self._cache: OrderedDict[tuple[str, str], tuple[float, PlanSummary]] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def budget_for(self, database: str) -> CostBudget:
+        """Return the budget applying to a database."""
+        return self._budgets.get(database, self._default_budget)
+
+    async def explain(self, sql: str, database: str, connection: asyncpg.Connection) -> PlanSummary:
+        """
+        Get the plan summary for SQL, using the fingerprint cache.
+
+        Args:
+        ----------
+            sql: SQL to explain
+            database: Database name (part of the cache key)
+            connection: Active asyncpg connection
+
+        Returns:
+        ----------
+            PlanSummary
+        """
+        key = (database, fingerprint(sql))
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None and now - cached[0] < self._cache_ttl:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached[1]
+
+        self.cache_misses += 1
+        explain = await connection.fetchval(f"EXPLAIN (FORMAT JSON) {sql.strip().rstrip(';')}")
+        summary = PlanSummary.from_explain(explain)
+
+        self._cache[key] = (now, summary)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return summary
+
+    async def check(
+        self, sql: str, database: str, connection: asyncpg.Connection, limit: int
+    ) -> CostGuardDecision:
+        """
+        Check SQL against the database budget, rewriting or rejecting it.
+
+        In reject mode the caller's row limit is pushed down before the plan
+        is estimated, so unbounded SELECTs are only rejected when they stay
+        over budget with the LIMIT the runner would apply anyway.
+
+        Args:
+        ----------
+            sql: Validated SELECT statement
+            database: Database name
+            connection: Active asyncpg connection
+            limit: Rows the caller will return (LIMIT pushed down as limit + 1
+                so truncation can still be detected)
+
+        Returns:
+        ----------
+            CostGuardDecision with the SQL to execute
+
+        Raises:
+        ----------
+            CostGuardError: If the query is over budget and cannot be rewritten
+        """
+        budget = self.budget_for(database)
+        if budget.action == CostGuardAction.REJECT:
+            sql = push_down_limit(sql, limit + 1)
+        summary = await self.explain(sql, database, connection)
+        problems = budget.violations(summary)
+        if not problems:
+            return CostGuardDecision(sql=sql, summary=summary)
+
+        if budget.action == CostGuardAction.LIMIT:
+            rewritten = push_down_limit(sql, limit + 1)
+            rewritten_summary = await self.explain(rewritten, database, connection)
+            if not budget.violations(rewritten_summary):
+                logger.info(
+                    "cost_guard_limit_pushed_down",
+                    database=database,
+                    original=summary.to_text(),
+                    rewritten=rewritten_summary.to_text(),
+                )
+                return CostGuardDecision(
+                    sql=rewritten,
+                    summary=rewritten_summary,
+                    rewritten=True,
+                    original_summary=summary,
+                )
+            summary = rewritten_summary
+            problems = budget.violations(rewritten_summary)
+
+        logger.warning(
+            "cost_guard_rejected", database=database, plan=summary.to_text(), problems=problems
+        )
+        raise CostGuardError(
+            f"Query exceeds the cost budget for '{database}' ({'; '.join(problems)}). "
+            f"Plan: {summary.to_text()}",
+            summary=summary,
+        )
+
+    async def check_export(
+        self, sql: str, database: str, connection: asyncpg.Connection
+    ) -> PlanSummary:
+        """
+        Check an unbounded export query against the database cost budget.
+
+        Exports return every row by design, so only the cost budget applies:
+        the row budget is not enforced and no LIMIT is pushed down.
+
+        Args:
+        ----------
+            sql: Validated SELECT statement
+            database: Database name
+            connection: Active asyncpg connection
+
+        Returns:
+        ----------
+            PlanSummary of the export query
+
+        Raises:
+        ----------
+            CostGuardError: If the estimated cost exceeds the budget
+        """
+        summary = await self.explain(sql, database, connection)
+        problems = CostBudget(max_cost=self.budget_for(database).max_cost).violations(summary)
+        if problems:
+            logger.warning(
+                "cost_guard_export_rejected",
+                database=database,
+                plan=summary.to_text(),
+                problems=problems,
+            )
+            raise CostGuardError(
+                f"Export exceeds the cost budget for '{database}' ({'; '.join(problems)}). "
+                f"Plan: {summary.to_text()}",
+                summary=summary,
+            )
+        return summary
+
+
+def build_cost_guard(query_config: QueryConfig, databases: list[DatabaseConnection]) -> CostGuard:
+    """
+    Build a CostGuard from query config defaults and per-database overrides.
+
+    Args:
+    ----------
+        query_config: Query configuration (default budget and action)
+        databases: Database connections (optional per-database budgets)
+
+    Returns:
+    ----------
+        CostGuard instance
+    """
+    action = CostGuardAction(query_config.cost_guard_action)
+    default_budget = CostBudget(
+        max_cost=query_config.max_plan_cost,
+        max_rows=query_config.max_plan_rows,
+        action=action,
+    )
+    budgets = {
+        db.name: CostBudget(
+            max_cost=db.max_plan_cost if db.max_plan_cost is not None else default_budget.max_cost,
+            max_rows=db.max_plan_rows if db.max_plan_rows is not None else default_budget.max_rows,
+            action=action,
+        )
+        for db in databases
+        if db.max_plan_cost is not None or db.max_plan_rows is not None
+    }
+    return CostGuard(default_budget, budgets)
@@ -6,18 +6,33 @@ Supports optional result validation for quality and semantic relevance checking.
 
 from __future__ import annotations
 
+import asyncio
 import time
 import uuid
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any
 
 import structlog
 
+from postgres_mcp.core.approximate import Approximator
+from postgres_mcp.core.cost_guard import CostGuard, CostGuardError
+from postgres_mcp.core.result_cache import ResultCache
 from postgres_mcp.core.result_validator import ResultValidator
 from postgres_mcp.core.sql_generator import SQLGenerator
 from postgres_mcp.db.connection_pool import PoolManager
 from postgres_mcp.db.query_runner import QueryRunner
+from postgres_mcp.db.result_exporter import (
+    ExportCompression,
+    ExportFormat,
+    ExportStats,
+    ResultExporter,
+)
 from postgres_mcp.models.log_entry import LogStatus, QueryLogEntry
-from postgres_mcp.models.result import QueryResult
+from postgres_mcp.models.result import BatchItemResult, QueryResult
 from postgres_mcp.models.validation import ValidationLevel
+from postgres_mcp.utils.client_accounting import current_client_id
 from postgres_mcp.utils.jsonl_writer import JSONLWriter
 
 logger = structlog.get_logger(__name__)
@@ -76,6 +91,10 @@ class QueryExecutor:
         jsonl_writer: JSONLWriter | None = None,
         result_validator: ResultValidator | None = None,
         enable_validation: bool = False,
+        result_exporter: ResultExporter | None = None,
+        cost_guard: CostGuard | None = None,
+        result_cache: ResultCache | None = None,
+        approximator: Approximator | None = None,
     ) -> None:
         """
         Initialize query executor.
@@ -87,6 +106,10 @@ class QueryExecutor:
             jsonl_writer: Optional JSONL writer for logging.
             result_validator: Optional result validator (for US5).
             enable_validation: Enable result validation by default.
+            result_exporter: Optional streaming exporter for export().
+            cost_guard: Optional EXPLAIN pre-flight run before execute().
+            result_cache: Optional result cache consulted by execute().
+            approximator: Optional sampler used by execute(approximate=True).
         """
         self._sql_generator = sql_generator
         self._pool_manager = pool_manager
@@ -94,6 +117,15 @@ class QueryExecutor:
         self._jsonl_writer = jsonl_writer
         self._result_validator = result_validator
         self._enable_validation = enable_validation
+        self._result_exporter = result_exporter or ResultExporter()
+        self._cost_guard = cost_guard
+        self._result_cache = result_cache
+        self._approximator = approximator
+
+    async def close(self) -> None:
+        """Cancel background work (approximate-answer refinements)."""
+        if self._approximator is not None:
+            await self._approximator.close()
 
     async def execute(
         self,
@@ -102,6 +134,7 @@ class QueryExecutor:
         limit: int = 1000,
         validate_result: bool | None = None,
         validation_level: ValidationLevel = ValidationLevel.AUTO,
+        approximate: bool = False,
     ) -> QueryResult:
         """
         Execute a natural language query and return results.
@@ -112,6 +145,8 @@ class QueryExecutor:
             limit: Maximum rows to return (default: 1000).
             validate_result: Override default validation setting (None uses default).
             validation_level: Validation level (BASIC, SEMANTIC, AUTO).
+            approximate: Answer eligible aggregates from a TABLESAMPLE and
+                refine to the exact answer in the background.
 
         Returns:
             QueryResult with SQL, columns, rows, and metadata.
@@ -136,10 +171,13 @@ class QueryExecutor:
         error_message: str | None = None
         row_count: int | None = None
         generation_method: str | None = None
+        generation_time_ms: float | None = None
+        query_time_ms: float | None = None
 
         try:
             # Step 1: Generate SQL
             generated_query = await self._sql_generator.generate(natural_language, database)
+            generation_time_ms = (time.perf_counter() - start_time) * 1000
             generated_sql = generated_query.sql
             generation_method = generated_query.generation_method
 
@@ -151,15 +189,83 @@ class QueryExecutor:
                 )
                 raise QueryExecutionError(error_message)
 
-            # Step 3: Get database connection
-            async with self._pool_manager.get_connection(database) as connection:
-                # Step 4: Execute query
-                query_result = await self._query_runner.execute(
-                    sql=generated_query.sql, connection=connection, limit=limit
-                )
+            # Step 3: Serve repeated queries from the result cache
+            cache_key = None
+            cache_snapshot = None
+            query_result = None
+            if self._result_cache is not None:
+                cache_key = self._result_cache.make_key(database, generated_query.sql, limit)
+                query_result = self._result_cache.get(cache_key)
+                cache_snapshot = self._result_cache.snapshot(cache_key)
+                if query_result is not None:
+                    query_result.cache_status = "hit"
+
+            # Step 3b: Approximate mode serves the best refined answer so far
+            approximator = self._approximator if approximate else None
+            approximate_key = None
+            if approximator is not None:
+                approximate_key = approximator.key(database, generated_query.sql, limit)
+                if query_result is None:
+                    query_result = approximator.refined(approximate_key)
+
+            if query_result is not None:
+                generated_sql = query_result.sql
+            else:
+                # Step 4: Get database connection
+                async with self._pool_manager.get_connection(database) as connection:
+                    # Step 4a: Rewrite eligible aggregates to read a TABLESAMPLE
+                    sql_to_run = generated_query.sql
+                    plan = None
+                    if approximator is not None:
+                        plan = await approximator.plan(sql_to_run, connection)
+                        if plan is not None:
+                            sql_to_run = plan.sql
+                            generated_sql = sql_to_run
+
+                    # Step 4b: Cost guard pre-flight (may push down a LIMIT), then execute.
+                    # Rejections are raised after the connection is released so the
+                    # pool does not report them as connection errors.
+                    guard_error = None
+                    executed = None
+                    query_start = time.perf_counter()
+                    try:
+                        executed = await self._run_guarded(sql_to_run, database, connection, limit)
+                    except CostGuardError as exc:
+                        guard_error = exc
+                    query_time_ms = (time.perf_counter() - query_start) * 1000
+
+                if executed is None:
+                    status = LogStatus.COST_REJECTED
+                    error_message = str(guard_error)
+                    raise QueryExecutionError(error_message) from guard_error
+                query_result = executed
+                generated_sql = query_result.sql
+
+                # Step 5: Finalize approximate answers, then cache exact ones
+                if plan is not None:
+                    # A plan only exists when approximate mode resolved a key
+                    assert approximator is not None and approximate_key is not None
+                    refining = approximator.schedule(
+                        approximate_key,
+                        plan,
+                        generated_query.sql,
+                        lambda sql: self._run_refinement(sql, database, limit),
+                    )
+                    plan.finalize(query_result, refining=refining)
+                    if self._result_cache is not None:
+                        query_result.cache_status = "bypass"
+                else:
+                    if self._result_cache is not None:
+                        query_result.cache_status = "miss" if cache_key is not None else "bypass"
+                        self._result_cache.put(cache_key, query_result, cache_snapshot)
+                    # After put: the cache key has no approximate flag, so the note must
+                    # not reach exact callers served from the cache
+                    if approximate:
+                        query_result.errors.append(
+                            "ℹ️ Approximate mode not applicable (query shape or table size); "
+                            "exact result returned"
+                        )
 
-            # Step 5: Add SQL to result
-            query_result.sql = generated_query.sql
             row_count = query_result.row_count
 
             # Step 6: Validate result quality (if enabled) - US5
@@ -173,6 +279,7 @@ class QueryExecutor:
                         result=query_result,
                         natural_language=natural_language,
                         level=validation_level,
+                        database=database,
                     )
 
                     # Add validation suggestions to result errors
@@ -231,6 +338,282 @@ class QueryExecutor:
                 log_entry = QueryLogEntry(
                     request_id=request_id,
                     database=database,
+                    user_id=current_client_id.get(),
+                    natural_language=natural_language,
+                    sql=generated_sql,
+                    status=status,
+                    execution_time_ms=execution_time_ms,
+                    generation_time_ms=generation_time_ms,
+                    query_time_ms=query_time_ms,
+                    row_count=row_count,
+                    error_message=error_message,
+                    generation_method=generation_method,
+                )
+                await self._jsonl_writer.write(log_entry)
+
+    async def execute_batch(
+        self,
+        queries: list[tuple[str, str]],
+        limit: int = 1000,
+        llm_concurrency: int = 4,
+    ) -> AsyncIterator[BatchItemResult]:
+        """
+        Execute several natural language queries, yielding results as they complete.
+
+        SQL generation runs concurrently (at most llm_concurrency LLM calls at
+        once). Each generated query is executed as soon as it is ready on a
+        single connection per database, held for the whole batch, so
+        execution of early items overlaps generation of later ones. Failures
+        are reported per item and never abort the batch.
+
+        Args:
+            queries: (natural_language, database) pairs.
+            limit: Maximum rows to return per query.
+            llm_concurrency: Maximum concurrent SQL generations.
+
+        Yields:
+            BatchItemResult per query, in completion order.
+
+        Example:
+            >>> async for item in executor.execute_batch([("count users", "main")]):
+            ...     print(item.index, item.total_ms, item.error or item.result.row_count)
+        """
+        batch_start = time.perf_counter()
+        llm_slots = asyncio.Semaphore(max(1, llm_concurrency))
+        lanes = {database: asyncio.Lock() for _, database in queries}
+        connections: dict[str, Any] = {}
+
+        async with AsyncExitStack() as stack:
+
+            async def run_item(index: int, natural_language: str, database: str) -> BatchItemResult:
+                item = BatchItemResult(
+                    index=index, natural_language=natural_language, database=database
+                )
+                start = time.perf_counter()
+                status = LogStatus.SUCCESS
+                sql: str | None = None
+                generation_method: str | None = None
+                exec_ran = False
+                try:
+                    async with llm_slots:
+                        generated = await self._sql_generator.generate(natural_language, database)
+                    item.generation_ms = (time.perf_counter() - start) * 1000
+                    sql = generated.sql
+                    generation_method = generated.generation_method
+                    if not generated.validated:
+                        status = LogStatus.VALIDATION_FAILED
+                        raise QueryExecutionError(
+                            f"Generated SQL failed validation: {', '.join(generated.warnings)}"
+                        )
+
+                    cache_key = None
+                    cache_snapshot = None
+                    result = None
+                    if self._result_cache is not None:
+                        cache_key = self._result_cache.make_key(database, generated.sql, limit)
+                        result = self._result_cache.get(cache_key)
+                        cache_snapshot = self._result_cache.snapshot(cache_key)
+                        if result is not None:
+                            result.cache_status = "hit"
+
+                    if result is None:
+                        wait_start = time.perf_counter()
+                        async with lanes[database]:
+                            if database not in connections:
+                                connections[database] = await stack.enter_async_context(
+                                    self._pool_manager.get_connection(database)
+                                )
+                            exec_start = time.perf_counter()
+                            item.queue_ms = (exec_start - wait_start) * 1000
+                            try:
+                                result = await self._run_guarded(
+                                    generated.sql, database, connections[database], limit
+                                )
+                            except CostGuardError:
+                                status = LogStatus.COST_REJECTED
+                                raise
+                            item.execution_ms = (time.perf_counter() - exec_start) * 1000
+                            exec_ran = True
+                        sql = result.sql
+                        if self._result_cache is not None:
+                            result.cache_status = "miss" if cache_key is not None else "bypass"
+                            self._result_cache.put(cache_key, result, cache_snapshot)
+
+                    item.result = result
+                except Exception as exc:
+                    if status == LogStatus.SUCCESS:
+                        status = LogStatus.EXECUTION_FAILED
+                    item.error = str(exc)
+                finally:
+                    item.total_ms = (time.perf_counter() - batch_start) * 1000
+                    await self._write_log(
+                        database=database,
+                        natural_language=natural_language,
+                        sql=sql,
+                        status=status,
+                        execution_time_ms=(time.perf_counter() - start) * 1000,
+                        generation_time_ms=item.generation_ms if sql is not None else None,
+                        query_time_ms=item.execution_ms if exec_ran else None,
+                        row_count=item.result.row_count if item.result else None,
+                        error_message=item.error,
+                        generation_method=generation_method,
+                    )
+                return item
+
+            tasks = [
+                asyncio.create_task(run_item(index, natural_language, database))
+                for index, (natural_language, database) in enumerate(queries)
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _write_log(self, **fields: Any) -> None:
+        """Write a query history entry if a JSONL writer is configured."""
+        if self._jsonl_writer:
+            await self._jsonl_writer.write(
+                QueryLogEntry(
+                    request_id=str(uuid.uuid4()),
+                    user_id=current_client_id.get(),
+                    **fields,
+                )
+            )
+
+    async def _run_guarded(
+        self, sql: str, database: str, connection: Any, limit: int
+    ) -> QueryResult:
+        """
+        Run SQL behind the cost guard and attach the SQL and plan summary.
+
+        Raises:
+            CostGuardError: If the cost guard rejects the query.
+        """
+        decision = None
+        if self._cost_guard is not None:
+            decision = await self._cost_guard.check(sql, database, connection, limit)
+            sql = decision.sql
+
+        result = await self._query_runner.execute(sql=sql, connection=connection, limit=limit)
+        result.sql = sql
+        if decision is not None:
+            result.plan_summary = decision.summary.to_text()
+            if decision.rewritten and decision.original_summary is not None:
+                result.errors.append(
+                    "⚠️ LIMIT pushed down by the cost guard; original plan: "
+                    f"{decision.original_summary.to_text()}"
+                )
+        return result
+
+    async def _run_refinement(self, sql: str, database: str, limit: int) -> QueryResult:
+        """Run one background refinement step, honouring the cost guard."""
+        async with self._pool_manager.get_connection(database) as connection:
+            return await self._run_guarded(sql, database, connection, limit)
+
+    async def export(
+        self,
+        natural_language: str,
+        database: str,
+        path: Path | str,
+        fmt: ExportFormat = ExportFormat.CSV,
+        compression: ExportCompression = ExportCompression.NONE,
+        chunk_size: int | None = None,
+        overwrite: bool = False,
+    ) -> ExportStats:
+        """
+        Generate SQL and stream its full result set to a local file.
+
+        Unlike execute(), no row limit is applied: rows are streamed from a
+        server-side cursor in chunks so memory use stays constant. The cost
+        guard (if enabled) checks the estimated cost before the export starts.
+
+        Args:
+            natural_language: User's natural language query.
+            database: Target database name.
+            path: Destination file path.
+            fmt: Export format (csv, ndjson, parquet).
+            compression: Compression codec.
+            chunk_size: Optional rows per chunk override.
+            overwrite: Whether an existing file may be replaced.
+
+        Returns:
+            ExportStats with row count, file size and throughput.
+
+        Raises:
+            QueryExecutionError: If generation, validation or export fails.
+
+        Example:
+            >>> stats = await executor.export("All orders in 2025", "erp", "orders.csv.gz",
+            ...                               compression=ExportCompression.GZIP)
+            >>> print(f"{stats.row_count} rows -> {stats.path}")
+        """
+        request_id = str(uuid.uuid4())
+        start_time = time.perf_counter()
+        generated_sql: str | None = None
+        status = LogStatus.SUCCESS
+        error_message: str | None = None
+        row_count: int | None = None
+        generation_method: str | None = None
+        generation_time_ms: float | None = None
+        query_time_ms: float | None = None
+
+        try:
+            generated_query = await self._sql_generator.generate(natural_language, database)
+            generation_time_ms = (time.perf_counter() - start_time) * 1000
+            generated_sql = generated_query.sql
+            generation_method = generated_query.generation_method
+
+            if not generated_query.validated:
+                status = LogStatus.VALIDATION_FAILED
+                error_message = (
+                    f"Generated SQL failed validation: {', '.join(generated_query.warnings)}"
+                )
+                raise QueryExecutionError(error_message)
+
+            async with self._pool_manager.get_connection(database) as connection:
+                if self._cost_guard is not None:
+                    try:
+                        await self._cost_guard.check_export(
+                            generated_query.sql, database, connection
+                        )
+                    except CostGuardError as exc:
+                        status = LogStatus.COST_REJECTED
+                        error_message = str(exc)
+                        raise QueryExecutionError(error_message) from exc
+                query_start = time.perf_counter()
+                stats = await self._result_exporter.export(
+                    sql=generated_query.sql,
+                    connection=connection,
+                    path=path,
+                    fmt=fmt,
+                    compression=compression,
+                    chunk_size=chunk_size,
+                    overwrite=overwrite,
+                )
+                query_time_ms = (time.perf_counter() - query_start) * 1000
+
+            row_count = stats.row_count
+            return stats
+
+        except QueryExecutionError:
+            raise
+
+        except Exception as exc:
+            status = LogStatus.EXECUTION_FAILED
+            error_message = f"Query export failed: {exc}"
+            raise QueryExecutionError(error_message) from exc
+
+        finally:
+            execution_time_ms = (time.perf_counter() - start_time) * 1000
+
+            if self._jsonl_writer:
+                log_entry = QueryLogEntry(
+                    request_id=request_id,
+                    database=database,
+                    user_id=current_client_id.get(),
                     natural_language=natural_language,
                     sql=generated_sql,
                     status=status,
@@ -238,5 +621,7 @@ class QueryExecutor:
                     row_count=row_count,
                     error_message=error_message,
                     generation_method=generation_method,
+                    generation_time_ms=generation_time_ms,
+                    query_time_ms=query_time_ms,
                 )
                 await self._jsonl_writer.write(log_entry)
@@ -0,0 +1,477 @@
+"""
+Query result cache with table-level invalidation.
+
+Results are cached per (database, normalized SQL, params, limit) in a
+memory-bounded LRU with a TTL. Each entry records the tables its SQL reads
+(extracted with sqlglot); a background poller compares the write counters
+in ``pg_stat_user_tables`` between polls and drops entries for tables that
+changed. Queries calling volatile functions, or reading relations the
+poller cannot observe (views, catalogs, foreign tables), are never cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+import sqlglot
+import structlog
+from sqlglot import exp
+
+from postgres_mcp.models.result import QueryResult
+
+if TYPE_CHECKING:
+    from postgres_mcp.db.connection_pool import PoolManager
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_SCHEMA = "public"
+
+# Write counters per table; any change invalidates dependent entries.
+TABLE_COUNTERS_SQL = """
+SELECT schemaname, relname,
+       n_tup_ins, n_tup_upd, n_tup_del, n_tup_hot_upd,
+       vacuum_count, autovacuum_count, analyze_count
+FROM pg_stat_user_tables
+"""
+
+_VOLATILE_FUNCTIONS = frozenset(
+    {
+        "CURRENT_TIMESTAMP",
+        "CURRENT_TIME",
+        "CURRENT_DATE",
+        "LOCALTIMESTAMP",
+        "LOCALTIME",
+        "RAND",
+        "UUID",
+    }
+)
+_VOLATILE_ANONYMOUS = frozenset(
+    {
+        "now",
+        "random",
+        "clock_timestamp",
+        "statement_timestamp",
+        "transaction_timestamp",
+        "timeofday",
+        "nextval",
+        "currval",
+        "setval",
+        "txid_current",
+        "pg_current_xact_id",
+        "gen_random_uuid",
+        "uuid_generate_v4",
+    }
+)
+
+CacheKey = tuple[str, str, tuple[Any, ...], int]
+# Invalidation generations (global, database, per table) seen before a query ran
+CacheSnapshot = tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class SQLAnalysis:
+    """
+    Cache-relevant facts about a SQL statement.
+
+    Args:
+    ----------
+        normalized_sql: Canonical SQL text used in cache keys.
+        tables: Referenced tables as "schema.table".
+        cacheable: False for volatile or unparseable SQL.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    normalized_sql: str
+    tables: frozenset[str]
+    cacheable: bool
+
+
+@lru_cache(maxsize=2048)
+def analyze_sql(sql: str) -> SQLAnalysis:
+    """
+    Normalize SQL and extract the tables it reads.
+
+    Args:
+    ----------
+        sql: SQL statement
+
+    Returns:
+    ----------
+        SQLAnalysis (cacheable=False when parsing fails or the SQL is volatile)
+    """
+    try:
+        statement = sqlglot.parse_one(sql.strip().rstrip(";"), dialect="postgres")
+    except Exception:
+        return SQLAnalysis(
+            normalized_sql=" ".join(sql.split()), tables=frozenset(), cacheable=False
+        )
+
+    volatile = any(
+        (isinstance(func, exp.Anonymous) and func.name.lower() in _VOLATILE_ANONYMOUS)
+        or func.sql_name() in _VOLATILE_FUNCTIONS
+        for func in statement.find_all(exp.Func)
+    )
+
+    cte_names = {cte.alias_or_name.lower() for cte in statement.find_all(exp.CTE)}
+    tables = frozenset(
+        f"{(table.db or DEFAULT_SCHEMA).lower()}.{table.name.lower()}"
+        for table in statement.find_all(exp.Table)
+        if table.name and not (not table.db and table.name.lower() in cte_names)
+    )
+
+    return SQLAnalysis(
+        normalized_sql=statement.sql(dialect="postgres"),
+        tables=tables,
+        cacheable=not volatile and bool(tables),
+    )
+
+
+def estimate_result_bytes(result: QueryResult) -> int:
+    """
+    Roughly estimate the memory held by a result.
+
+    Args:
+    ----------
+        result: Query result
+
+    Returns:
+    ----------
+        Estimated size in bytes
+    """
+    size = 256 + 64 * len(result.columns)
+    for row in result.rows:
+        size += 64
+        for value in row.values():
+            size += 16 + (len(value) if isinstance(value, str | bytes) else 8)
+    return size
+
+
+@dataclass
+class _Entry:
+    result: QueryResult
+    database: str
+    tables: frozenset[str]
+    size: int
+    created_at: float
+
+
+class ResultCache:
+    """
+    Memory-bounded LRU + TTL cache of query results.
+
+    Args:
+    ----------
+        pool_manager: Pool manager used by the counter poller.
+        max_bytes: Memory budget for cached results.
+        ttl_seconds: Maximum entry age.
+        poll_interval_seconds: pg_stat_user_tables polling interval.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        ValueError: If max_bytes or ttl_seconds is not positive.
+
+    Example:
+    ----------
+        >>> cache = ResultCache(pool_manager, max_bytes=64 * 1024 * 1024)
+        >>> cache.start()
+        >>> key = cache.make_key("main", sql, limit=1000)
+        >>> result = cache.get(key)
+    """
+
+    def __init__(
+        self,
+        pool_manager: PoolManager,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 300.0,
+        poll_interval_seconds: float = 5.0,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+        self._pool_manager = pool_manager
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._poll_interval = poll_interval_seconds
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._by_table: dict[tuple[str, str], set[CacheKey]] = {}
+        self._counters: dict[str, dict[str, tuple[int, ...]]] = {}
+        # Bumped on every invalidation, even when no entry was removed, so a
+        # query that overlapped the write cannot cache its (stale) result.
+        self._generation = 0
+        self._database_generations: dict[str, int] = {}
+        self._table_generations: dict[tuple[str, str], int] = {}
+        self._bytes = 0
+        self._poll_task: asyncio.Task[None] | None = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated bytes held by cached results."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def make_key(
+        self, database: str, sql: str, limit: int, params: tuple[Any, ...] = ()
+    ) -> CacheKey | None:
+        """
+        Build the cache key for a query, or None if it must not be cached.
+
+        Args:
+        ----------
+            database: Database name
+            sql: SQL statement
+            limit: Row limit applied by the caller
+            params: Bind parameters
+
+        Returns:
+        ----------
+            Cache key, or None for volatile/unparseable SQL
+        """
+        analysis = analyze_sql(sql)
+        if not analysis.cacheable:
+            return None
+        return (database, analysis.normalized_sql, params, limit)
+
+    def get(self, key: CacheKey | None) -> QueryResult | None:
+        """
+        Return a copy of a cached result if present and fresh.
+
+        Args:
+        ----------
+            key: Cache key from make_key()
+
+        Returns:
+        ----------
+            Cached result copy (with its own errors list) or None
+        """
+        if key is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if time.monotonic() - entry.created_at > self._ttl:
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.result.model_copy(update={"errors": list(entry.result.errors)})
+
+    def snapshot(self, key: CacheKey | None) -> CacheSnapshot | None:
+        """
+        Capture the invalidation state of a query's tables before it runs.
+
+        Args:
+        ----------
+            key: Cache key from make_key()
+
+        Returns:
+        ----------
+            Snapshot to pass to put(), or None for uncacheable queries
+        """
+        if key is None:
+            return None
+        database = key[0]
+        tables = sorted(analyze_sql(key[1]).tables)
+        return (
+            self._generation,
+            self._database_generations.get(database, 0),
+            *(self._table_generations.get((database, table), 0) for table in tables),
+        )
+
+    def put(
+        self,
+        key: CacheKey | None,
+        result: QueryResult,
+        snapshot: CacheSnapshot | None = None,
+    ) -> bool:
+        """
+        Cache a result if all of its tables are observable by the poller.
+
+        The first query against a database starts counter polling for it and
+        is not cached; later ones are. A result is also dropped when any of
+        its tables was invalidated after ``snapshot`` was taken.
+
+        Args:
+        ----------
+            key: Cache key from make_key()
+            result: Result to cache
+            snapshot: snapshot(key) taken before the query was executed
+
+        Returns:
+        ----------
+            True if the result was cached
+        """
+        if key is None:
+            return False
+        if snapshot is not None and snapshot != self.snapshot(key):
+            return False
+        database, normalized_sql = key[0], key[1]
+        counters = self._counters.get(database)
+        if counters is None:
+            self._counters[database] = {}
+            self.start()
+            return False
+
+        tables = analyze_sql(normalized_sql).tables
+        if not tables <= counters.keys():
+            return False
+
+        size = estimate_result_bytes(result)
+        if size > self._max_bytes // 4:
+            return False
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(
+            result=result.model_copy(update={"errors": list(result.errors)}),
+            database=database,
+            tables=tables,
+            size=size,
+            created_at=time.monotonic(),
+        )
+        self._bytes += size
+        for table in tables:
+            self._by_table.setdefault((database, table), set()).add(key)
+
+        while self._bytes > self._max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+        return True
+
+    def invalidate_tables(self, database: str, tables: set[str]) -> int:
+        """
+        Drop every entry reading any of the given tables.
+
+        Args:
+        ----------
+            database: Database name
+            tables: Tables as "schema.table"
+
+        Returns:
+        ----------
+            Number of entries removed
+        """
+        removed = 0
+        for table in tables:
+            generation_key = (database, table)
+            self._table_generations[generation_key] = (
+                self._table_generations.get(generation_key, 0) + 1
+            )
+            for key in list(self._by_table.get(generation_key, ())):
+                if key in self._entries:
+                    self._remove(key)
+                    removed += 1
+        self.invalidations += removed
+        return removed
+
+    def clear(self, database: str | None = None) -> None:
+        """Drop all entries (optionally for one database)."""
+        if database is None:
+            self._generation += 1
+        else:
+            self._database_generations[database] = self._database_generations.get(database, 0) + 1
+        for key in [k for k in self._entries if database is None or k[0] == database]:
+            self._remove(key)
+
+    def start(self) -> None:
+        """Start the counter poller if it is not running."""
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.create_task(self._poll_loop())
+
+    async def close(self) -> None:
+        """Stop the counter poller."""
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            await asyncio.gather(self._poll_task, return_exceptions=True)
+            self._poll_task = None
+
+    async def poll(self, database: str) -> set[str]:
+        """
+        Read write counters for a database and invalidate changed tables.
+
+        Args:
+        ----------
+            database: Database name
+
+        Returns:
+        ----------
+            Tables whose counters changed since the previous poll
+        """
+        async with self._pool_manager.get_connection(database) as connection:
+            records = await connection.fetch(TABLE_COUNTERS_SQL)
+
+        current = {
+            f"{r['schemaname'].lower()}.{r['relname'].lower()}": tuple(
+                int(r[name] or 0)
+                for name in (
+                    "n_tup_ins",
+                    "n_tup_upd",
+                    "n_tup_del",
+                    "n_tup_hot_upd",
+                    "vacuum_count",
+                    "autovacuum_count",
+                    "analyze_count",
+                )
+            )
+            for r in records
+        }
+        previous = self._counters.get(database) or {}
+        changed = {
+            table
+            for table in previous.keys() | current.keys()
+            if previous.get(table) != current.get(table)
+        }
+        if previous and changed:
+            removed = self.invalidate_tables(database, changed)
+            if removed:
+                logger.info(
+                    "result_cache_invalidated",
+                    database=database,
+                    tables=sorted(changed),
+                    entries=removed,
+                )
+        self._counters[database] = current
+        return changed if previous else set()
+
+    async def _poll_loop(self) -> None:
+        while True:
+            for database in list(self._counters):
+                try:
+                    await self.poll(database)
+                except Exception as e:
+                    # Without fresh counters nothing can be trusted.
+                    logger.warning("result_cache_poll_failed", database=database, error=str(e))
+                    self.clear(database)
+            await asyncio.sleep(self._poll_interval)
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get((entry.database, table))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[(entry.database, table)]
@@ -8,10 +8,14 @@ Provides two-tier validation:
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import difflib
+from typing import TYPE_CHECKING, Any
 
+import sqlglot
 import structlog
+from sqlglot import exp
 
+from postgres_mcp.db.schema_inspector import MAX_STAT_VALUE_CHARS
 from postgres_mcp.models.result import QueryResult
 from postgres_mcp.models.validation import (
     ValidationIssue,
@@ -23,6 +27,7 @@ from postgres_mcp.models.validation import (
 
 if TYPE_CHECKING:
     from postgres_mcp.ai.openai_client import OpenAIClient
+    from postgres_mcp.models.schema import DatabaseSchema, TableSchema
 
 logger = structlog.get_logger(__name__)
 
@@ -42,6 +47,7 @@ class ResultValidator:
         min_expected_rows: int = 1,
         max_expected_rows: int = 10000,
         semantic_threshold: float = 0.7,
+        schema_cache: Any | None = None,
     ) -> None:
         """
         Initialize result validator.
@@ -51,17 +57,21 @@ class ResultValidator:
             min_expected_rows: Minimum expected rows (triggers warning if less).
             max_expected_rows: Maximum reasonable rows (triggers warning if more).
             semantic_threshold: Minimum AI match score to pass semantic validation.
+            schema_cache: Optional schema cache; its column statistics are used
+                to explain empty results without querying the database.
         """
         self._openai_client = openai_client
         self._min_expected_rows = min_expected_rows
         self._max_expected_rows = max_expected_rows
         self._semantic_threshold = semantic_threshold
+        self._schema_cache = schema_cache
 
     async def validate(
         self,
         result: QueryResult,
         natural_language: str,
         level: ValidationLevel = ValidationLevel.AUTO,
+        database: str | None = None,
     ) -> ValidationResult:
         """
         Validate query result.
@@ -70,6 +80,7 @@ class ResultValidator:
             result: Query result to validate.
             natural_language: Original natural language query.
             level: Validation level (BASIC, SEMANTIC, AUTO).
+            database: Database the query ran on (enables statistics checks).
 
         Returns:
             ValidationResult with issues and suggestions.
@@ -80,8 +91,12 @@ class ResultValidator:
             level=level.value,
         )
 
+        schema = None
+        if self._schema_cache is not None and database and result.row_count == 0:
+            schema = await self._schema_cache.get_schema(database)
+
         # Step 1: Always perform basic validation
-        validation = await self._basic_validation(result, natural_language)
+        validation = await self._basic_validation(result, natural_language, schema)
 
         # Step 2: Determine if semantic validation is needed
         should_use_semantic = self._should_use_semantic_validation(
@@ -176,12 +191,22 @@ class ResultValidator:
         return False
 
     async def _basic_validation(
-        self, result: QueryResult, natural_language: str
+        self,
+        result: QueryResult,
+        natural_language: str,
+        schema: DatabaseSchema | None = None,
     ) -> ValidationResult:
         """基础验证 (本地, 无 AI 调用)."""
         issues: list[ValidationIssue] = []
         suggestions: list[ValidationSuggestion] = []
 
+        # 检查 0: 空结果时, 用缓存的列统计检查过滤值是否存在
+        if result.row_count == 0 and schema is not None and result.sql:
+            value_suggestions = self._value_mismatch_suggestions(result.sql, schema)
+            if value_suggestions:
+                issues.append(ValidationIssue.VALUE_MISMATCH)
+                suggestions.extend(value_suggestions)
+
         # 检查 1: 空结果
         if result.row_count == 0:
             issues.append(ValidationIssue.EMPTY_RESULT)
@@ -339,6 +364,88 @@ class ResultValidator:
                 details={"ai_validation_error": str(e)},
             )
 
+    def _value_mismatch_suggestions(
+        self, sql: str, schema: DatabaseSchema
+    ) -> list[ValidationSuggestion]:
+        """
+        找出与列的已知取值 (pg_stats 常见值完整覆盖时) 不匹配的等值过滤.
+
+        列按表名/别名限定符解析, 未限定的列只在恰好一个表有该列时检查.
+        pg_stats 来自 ANALYZE 抽样, 可能漏掉稀有值, 因此只给出 WARNING;
+        超过 MAX_STAT_VALUE_CHARS 的字面量无法与截断的常见值比较, 直接跳过.
+
+        Args:
+            sql: 执行的 SQL.
+            schema: 带列统计的缓存 schema.
+
+        Returns:
+            每个不匹配过滤条件一条建议 (可能附带修正后的 SQL).
+        """
+        try:
+            statement = sqlglot.parse_one(sql, dialect="postgres")
+        except Exception:
+            return []
+
+        # 别名 (无别名时为表名) -> 表结构
+        tables: dict[str, TableSchema] = {}
+        for table in statement.find_all(exp.Table):
+            if table.name in schema.tables:
+                tables[table.alias_or_name] = schema.tables[table.name]
+        suggestions = []
+        for comparison in list(statement.find_all(exp.EQ, exp.In)):
+            column = comparison.this
+            if isinstance(comparison, exp.EQ):
+                literals = [comparison.expression]
+            else:
+                literals = list(comparison.expressions)
+            if not isinstance(column, exp.Column):
+                continue
+
+            if column.table:
+                owner = tables.get(column.table)
+            else:
+                matches = {
+                    table.name: table
+                    for table in tables.values()
+                    if any(col.name == column.name for col in table.columns)
+                }
+                owner = next(iter(matches.values())) if len(matches) == 1 else None
+            if owner is None:
+                continue
+            table_name = owner.name
+            stats = next((col.stats for col in owner.columns if col.name == column.name), None)
+            if stats is None or not stats.values_complete:
+                continue
+
+            for literal in literals:
+                if not (isinstance(literal, exp.Literal) and literal.is_string):
+                    continue
+                value = literal.this
+                if len(value) > MAX_STAT_VALUE_CHARS or value in stats.most_common_vals:
+                    continue
+                known = ", ".join(f"'{v}'" for v in stats.most_common_vals[:10])
+                close = [v for v in stats.most_common_vals if v.lower() == value.lower()]
+                close = close or difflib.get_close_matches(value, stats.most_common_vals, n=1)
+                suggested_query = None
+                message = (
+                    f"列 {table_name}.{column.name} 的统计信息中没有值 '{value}' "
+                    f"(已知取值: {known}; 统计为抽样, 可能遗漏稀有值)。"
+                )
+                if close:
+                    message += f" 是否指 '{close[0]}'?"
+                    literal.replace(exp.Literal.string(close[0]))
+                    suggested_query = statement.sql(dialect="postgres")
+                suggestions.append(
+                    ValidationSuggestion(
+                        issue=ValidationIssue.VALUE_MISMATCH,
+                        severity=ValidationSeverity.WARNING,
+                        message=message,
+                        suggested_query=suggested_query,
+                        confidence=0.85 if close else 0.7,
+                    )
+                )
+        return suggestions
+
     def _extract_keywords(self, text: str) -> list[str]:
         """
         从自然语言中提取关键词.
@@ -5,6 +5,8 @@ In-memory caching of database schemas with thread-safe access.
 """
 
 import asyncio
+import inspect
+from collections.abc import Awaitable, Callable
 
 import structlog
 
@@ -20,6 +22,10 @@ class SchemaCacheError(Exception):
     pass
 
 
+# Called with (database, schema, version) after a schema is (re)loaded.
+RefreshListener = Callable[[str, DatabaseSchema, int], Awaitable[None] | None]
+
+
 class SchemaCache:
     """
     Thread-safe in-memory cache for database schemas.
@@ -46,6 +52,8 @@ class SchemaCache:
         self._auto_refresh_interval = auto_refresh_interval
         self._refresh_task: asyncio.Task | None = None
         self._shutdown = False
+        self._versions: dict[str, int] = {db: 0 for db in databases}
+        self._listeners: list[RefreshListener] = []
 
     async def initialize(self) -> None:
         """
@@ -64,7 +72,7 @@ class SchemaCache:
 
                 # Load initial schema
                 schema = await inspector.inspect_schema()
-                self._cache[db_name] = schema
+                self._store(db_name, schema)
 
                 logger.info(
                     "schema_cached",
@@ -72,6 +80,8 @@ class SchemaCache:
                     table_count=len(schema.tables),
                 )
 
+            await self._notify_listeners(db_name, schema)
+
         # Start auto-refresh task if enabled
         if self._auto_refresh_interval > 0:
             self._refresh_task = asyncio.create_task(self._auto_refresh_loop())
@@ -138,7 +148,7 @@ class SchemaCache:
         async with self._locks[database]:
             inspector = self._databases[database]
             schema = await inspector.inspect_schema()
-            self._cache[database] = schema
+            self._store(database, schema)
 
             logger.info(
                 "schema_refreshed",
@@ -146,6 +156,8 @@ class SchemaCache:
                 table_count=len(schema.tables),
             )
 
+        await self._notify_listeners(database, schema)
+
     async def refresh_all_schemas(self) -> None:
         """
         Refresh schemas for all databases.
@@ -162,6 +174,56 @@ class SchemaCache:
                     error=str(e),
                 )
 
+    def get_version(self, database: str) -> int:
+        """
+        Get the schema version for a database.
+
+        The version increases every time the schema is (re)loaded, so derived
+        data (rendered resources, prompts) can be keyed by it.
+
+        Args:
+        ----------
+            database: Database name
+
+        Returns:
+        ----------
+            Current schema version (0 if never loaded)
+        """
+        return self._versions.get(database, 0)
+
+    def add_refresh_listener(self, listener: RefreshListener) -> None:
+        """
+        Register a callback invoked after a schema is loaded or refreshed.
+
+        Listeners run outside the per-database lock; failures are logged and
+        never abort the refresh.
+
+        Args:
+        ----------
+            listener: Sync or async callable taking (database, schema, version)
+        """
+        self._listeners.append(listener)
+
+    def _store(self, database: str, schema: DatabaseSchema) -> None:
+        """Store a schema and bump its version (caller must hold the lock)."""
+        self._cache[database] = schema
+        self._versions[database] = self._versions.get(database, 0) + 1
+
+    async def _notify_listeners(self, database: str, schema: DatabaseSchema) -> None:
+        """Invoke refresh listeners for a database."""
+        version = self._versions.get(database, 0)
+        for listener in self._listeners:
+            try:
+                result = listener(database, schema, version)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(
+                    "schema_refresh_listener_failed",
+                    database=database,
+                    error=str(e),
+                )
+
     def list_databases(self) -> list[str]:
         """
         Get list of all configured databases.
@@ -9,9 +9,11 @@ import structlog
 
 from postgres_mcp.ai.openai_client import AIServiceUnavailableError, OpenAIClient
 from postgres_mcp.ai.prompt_builder import PromptBuilder
-from postgres_mcp.core.sql_validator import SQLValidator
+from postgres_mcp.core.sql_validator import SQLValidator, ValidationResult, validate_sql
+from postgres_mcp.core.template_library import TemplateLibrary
 from postgres_mcp.core.template_matcher import TemplateMatcher
 from postgres_mcp.models.query import GeneratedQuery, GenerationMethod
+from postgres_mcp.utils.cpu_offload import CPUOffloader
 
 logger = structlog.get_logger(__name__)
 
@@ -36,7 +38,8 @@ class SQLGenerator:
         openai_client: OpenAIClient,
         sql_validator: SQLValidator,
         prompt_builder: PromptBuilder | None = None,
-        template_matcher: TemplateMatcher | None = None,
+        template_matcher: TemplateMatcher | TemplateLibrary | None = None,
+        offloader: CPUOffloader | None = None,
     ):
         """
         Initialize SQL Generator.
@@ -47,13 +50,16 @@ class SQLGenerator:
             openai_client: OpenAI client instance
             sql_validator: SQL validator instance
             prompt_builder: Prompt builder (optional)
-            template_matcher: Template matcher for fallback (optional)
+            template_matcher: Template matcher or hot-reloading library for fallback
+                (optional)
+            offloader: Process-pool offload for validating long SQL (optional)
         """
         self._schema_cache = schema_cache
         self._openai_client = openai_client
         self._sql_validator = sql_validator
         self._prompt_builder = prompt_builder or PromptBuilder()
         self._template_matcher = template_matcher
+        self._offloader = offloader
 
     async def generate(
         self,
@@ -117,7 +123,7 @@ class SQLGenerator:
                 )
 
                 # Validate generated SQL
-                validation = self._sql_validator.validate(ai_response.sql)
+                validation = await self._validate(ai_response.sql)
 
                 if validation.valid:
                     # Validation passed - return successful query
@@ -197,6 +203,27 @@ class SQLGenerator:
         # Should not reach here, but just in case
         raise SQLGenerationError(f"Failed to generate valid SQL after {max_retries} attempts")
 
+    async def _validate(self, sql: str) -> ValidationResult:
+        """
+        Validate SQL, in a worker process when it is long enough to pay off.
+
+        Args:
+        ----------
+            sql: SQL to validate
+
+        Returns:
+        ----------
+            ValidationResult
+        """
+        offloader = self._offloader
+        if offloader is not None and offloader.should_offload(
+            len(sql), offloader.config.min_sql_chars
+        ):
+            return await offloader.run(
+                validate_sql, sql, size=len(sql), threshold=offloader.config.min_sql_chars
+            )
+        return self._sql_validator.validate(sql)
+
     async def _generate_from_template(
         self,
         natural_language: str,
@@ -236,7 +263,7 @@ class SQLGenerator:
             sql, params = match["template"].generate_sql(match["entities"])
 
             # Validate generated SQL
-            validation = self._sql_validator.validate(sql)
+            validation = await self._validate(sql)
 
             if not validation.valid:
                 error_summary = "; ".join(validation.errors[:3])
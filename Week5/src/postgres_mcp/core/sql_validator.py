@@ -303,3 +303,28 @@ class SQLValidator:
                 )
 
         return warnings
+
+
+# Per-process validator used by validate_sql(); SQLValidator is stateless.
+_worker_validator: SQLValidator | None = None
+
+
+def validate_sql(sql: str) -> ValidationResult:
+    """
+    Validate SQL with a process-wide SQLValidator.
+
+    Module-level (and therefore picklable) entry point for running
+    validation in a CPUOffloader worker process.
+
+    Args:
+    ----------
+        sql: SQL query to validate
+
+    Returns:
+    ----------
+        ValidationResult with validation status and messages
+    """
+    global _worker_validator
+    if _worker_validator is None:
+        _worker_validator = SQLValidator()
+    return _worker_validator.validate(sql)
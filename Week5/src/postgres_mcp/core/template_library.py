@@ -0,0 +1,217 @@
+"""
+Hot-reloadable template library.
+
+Holds the TemplateMatcher used for template fallback and rebuilds it when
+the template directory changes. A background poller compares file
+fingerprints (mtime, size); on a change, only the modified files are
+re-parsed, the full set is validated and a fresh compiled matcher is built
+in a worker thread, then swapped in with a single attribute assignment.
+Matches in flight keep using the matcher they started with, and a broken
+edit leaves the previous matcher serving until the files are fixed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from postgres_mcp.core.template_matcher import MatchResult, TemplateMatcher
+from postgres_mcp.models.schema import TableSchema
+from postgres_mcp.models.template import QueryTemplate
+from postgres_mcp.utils.template_loader import TemplateLoader, TemplateLoadError
+
+logger = structlog.get_logger(__name__)
+
+# (mtime_ns, size) per template file
+FileStamp = tuple[int, int]
+
+
+class TemplateLibrary:
+    """
+    Owns the current TemplateMatcher and reloads it from disk.
+
+    Exposes match() / match_all() so it can be passed to SQLGenerator in
+    place of a TemplateMatcher.
+
+    Args:
+    ----------
+        loader: Template loader for the template directory.
+        poll_interval_seconds: Interval between directory scans.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+
+    Example:
+    ----------
+        >>> library = TemplateLibrary(TemplateLoader(Path("templates/queries")))
+        >>> await library.load()
+        >>> library.start()
+        >>> match = library.match("显示所有用户", schema)
+    """
+
+    def __init__(self, loader: TemplateLoader, poll_interval_seconds: float = 2.0) -> None:
+        self._loader = loader
+        self._poll_interval = poll_interval_seconds
+        self._matcher = TemplateMatcher([])
+        self._parsed: dict[Path, tuple[FileStamp, QueryTemplate]] = {}
+        self._fingerprint: dict[Path, FileStamp] | None = None
+        self._reload_lock = asyncio.Lock()
+        self._poll_task: asyncio.Task[None] | None = None
+        self.version = 0
+        self.last_error: str | None = None
+        self.last_reload_ms: float | None = None
+
+    @property
+    def matcher(self) -> TemplateMatcher:
+        """The matcher currently serving matches."""
+        return self._matcher
+
+    @property
+    def templates(self) -> list[QueryTemplate]:
+        return self._matcher.templates
+
+    def match(
+        self,
+        query: str,
+        schema: dict[str, TableSchema],
+        threshold: float = 5.0,
+    ) -> MatchResult | None:
+        """Match against the current matcher snapshot (see TemplateMatcher.match)."""
+        return self._matcher.match(query, schema, threshold)
+
+    def match_all(
+        self,
+        query: str,
+        schema: dict[str, TableSchema],
+        threshold: float = 5.0,
+        top_k: int = 3,
+    ) -> list[MatchResult]:
+        """Match against the current matcher snapshot (see TemplateMatcher.match_all)."""
+        return self._matcher.match_all(query, schema, threshold, top_k)
+
+    async def load(self) -> None:
+        """
+        Load the templates for the first time.
+
+        Raises:
+        ----------
+            TemplateLoadError: If any template fails to load or validate
+        """
+        if not await self.reload():
+            raise TemplateLoadError(self.last_error or "template load failed")
+
+    async def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild the matcher if the template files changed.
+
+        Parsing, validation and index compilation run in a worker thread.
+        On failure the current matcher is kept and the error is recorded in
+        ``last_error``; the same broken state is not retried until the
+        files change again.
+
+        Args:
+        ----------
+            force: Rebuild even if no file changed.
+
+        Returns:
+        ----------
+            False if the reload failed, True otherwise (including no change).
+        """
+        async with self._reload_lock:
+            fingerprint = await asyncio.to_thread(self._scan)
+            if not force and fingerprint == self._fingerprint:
+                return True
+            self._fingerprint = fingerprint
+
+            start = time.perf_counter()
+            try:
+                parsed, matcher = await asyncio.to_thread(self._build, fingerprint)
+            except TemplateLoadError as e:
+                self.last_error = str(e)
+                logger.error("template_reload_failed", error=str(e), version=self.version)
+                return False
+
+            self._parsed = parsed
+            self._matcher = matcher
+            self.version += 1
+            self.last_error = None
+            self.last_reload_ms = round((time.perf_counter() - start) * 1000, 2)
+            logger.info(
+                "templates_reloaded",
+                version=self.version,
+                count=len(matcher.templates),
+                duration_ms=self.last_reload_ms,
+            )
+            return True
+
+    def start(self) -> None:
+        """Start the directory poller if it is not running."""
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.create_task(self._poll_loop())
+
+    async def close(self) -> None:
+        """Stop the directory poller."""
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            await asyncio.gather(self._poll_task, return_exceptions=True)
+            self._poll_task = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "templates": len(self._matcher.templates),
+            "last_error": self.last_error,
+            "last_reload_ms": self.last_reload_ms,
+        }
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                # e.g. the template directory was removed; keep serving
+                logger.warning("template_poll_failed", error=str(e))
+
+    def _scan(self) -> dict[Path, FileStamp]:
+        fingerprint = {}
+        for path in self._loader.template_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            fingerprint[path] = (stat.st_mtime_ns, stat.st_size)
+        return fingerprint
+
+    def _build(
+        self, fingerprint: dict[Path, FileStamp]
+    ) -> tuple[dict[Path, tuple[FileStamp, QueryTemplate]], TemplateMatcher]:
+        """Parse changed files, validate the set and compile a new matcher."""
+        parsed: dict[Path, tuple[FileStamp, QueryTemplate]] = {}
+        for path, stamp in fingerprint.items():
+            cached = self._parsed.get(path)
+            if cached is not None and cached[0] == stamp:
+                parsed[path] = cached
+                continue
+            try:
+                parsed[path] = (stamp, self._loader.load_file(path))
+            except TemplateLoadError as e:
+                raise TemplateLoadError(f"failed to load template from {path.name}: {e}") from e
+
+        templates = [template for _, template in parsed.values()]
+        duplicates = sorted(name for name, n in Counter(t.name for t in templates).items() if n > 1)
+        if duplicates:
+            raise TemplateLoadError(f"duplicate template names: {', '.join(duplicates)}")
+
+        templates.sort(key=lambda t: t.priority, reverse=True)
+        return parsed, TemplateMatcher(templates)
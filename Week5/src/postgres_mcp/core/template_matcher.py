@@ -8,7 +8,7 @@ predefined templates using keyword matching, regex patterns, and entity extracti
 from __future__ import annotations
 
 import re
-from typing import TypedDict
+from typing import NamedTuple, TypedDict
 
 import structlog
 
@@ -29,6 +29,29 @@ class MatchResult(TypedDict):
     entities: dict[str, str]
 
 
+class _CompiledTemplate(NamedTuple):
+    """Lowercased keywords and compiled regex patterns of one template."""
+
+    keywords: tuple[str, ...]
+    patterns: tuple[re.Pattern[str], ...]
+
+
+def _compile_template(template: QueryTemplate) -> _CompiledTemplate:
+    """Precompute matching data once per template; invalid patterns are skipped."""
+    patterns = []
+    for pattern in template.patterns:
+        try:
+            patterns.append(re.compile(pattern, re.IGNORECASE))
+        except re.error as e:
+            logger.warning(
+                "invalid_regex_pattern", template=template.name, pattern=pattern, error=str(e)
+            )
+    return _CompiledTemplate(
+        keywords=tuple(keyword.lower() for keyword in template.keywords),
+        patterns=tuple(patterns),
+    )
+
+
 class TemplateMatcher:
     """
     Match natural language queries to SQL templates.
@@ -56,10 +79,17 @@ class TemplateMatcher:
     """
 
     def __init__(self, templates: list[QueryTemplate]) -> None:
-        """Initialize template matcher with templates."""
+        """Initialize template matcher and compile its keyword/pattern index."""
         self.templates = templates
+        self._index: dict[int, _CompiledTemplate] = {
+            id(template): _compile_template(template) for template in templates
+        }
         logger.info("template_matcher_initialized", template_count=len(templates))
 
+    def _compiled(self, template: QueryTemplate) -> _CompiledTemplate:
+        compiled = self._index.get(id(template))
+        return compiled if compiled is not None else _compile_template(template)
+
     def match(
         self,
         query: str,
@@ -181,11 +211,10 @@ class TemplateMatcher:
             Number of keyword matches.
         """
         matches = 0
-        for keyword in template.keywords:
-            keyword_lower = keyword.lower()
+        for keyword_lower in self._compiled(template).keywords:
             if keyword_lower in query_lower:
                 matches += 1
-                logger.debug("keyword_matched", keyword=keyword, query=query_lower)
+                logger.debug("keyword_matched", keyword=keyword_lower, query=query_lower)
 
         return matches
 
@@ -203,13 +232,10 @@ class TemplateMatcher:
             Number of pattern matches.
         """
         matches = 0
-        for pattern in template.patterns:
-            try:
-                if re.search(pattern, query, re.IGNORECASE):
-                    matches += 1
-                    logger.debug("pattern_matched", pattern=pattern, query=query)
-            except re.error as e:
-                logger.warning("invalid_regex_pattern", pattern=pattern, error=str(e))
+        for pattern in self._compiled(template).patterns:
+            if pattern.search(query):
+                matches += 1
+                logger.debug("pattern_matched", pattern=pattern.pattern, query=query)
 
         return matches
 
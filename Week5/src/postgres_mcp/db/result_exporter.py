@@ -0,0 +1,614 @@
+"""
+Streaming result exporter for large query results.
+
+Streams rows from an asyncpg server-side cursor into CSV, NDJSON, or
+Parquet files in fixed-size chunks, so memory use stays constant no
+matter how many rows the query returns.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import csv
+import gzip
+import io
+import json
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+import asyncpg
+import structlog
+
+from postgres_mcp.models.result import ColumnInfo
+
+if TYPE_CHECKING:
+    from postgres_mcp.utils.cpu_offload import CPUOffloader
+
+logger = structlog.get_logger(__name__)
+
+
+class ExportError(Exception):
+    """
+    Raised when a result export fails.
+
+    Args:
+    ----------
+        message: Error message.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+
+class ExportFormat(str, Enum):
+    """Supported export file formats."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+class ExportCompression(str, Enum):
+    """Supported export compression codecs."""
+
+    NONE = "none"
+    GZIP = "gzip"
+    SNAPPY = "snappy"
+    ZSTD = "zstd"
+
+
+# Codecs each format can apply; text formats only support stream-level gzip.
+_SUPPORTED_COMPRESSION: dict[ExportFormat, set[ExportCompression]] = {
+    ExportFormat.CSV: {ExportCompression.NONE, ExportCompression.GZIP},
+    ExportFormat.NDJSON: {ExportCompression.NONE, ExportCompression.GZIP},
+    ExportFormat.PARQUET: {
+        ExportCompression.NONE,
+        ExportCompression.GZIP,
+        ExportCompression.SNAPPY,
+        ExportCompression.ZSTD,
+    },
+}
+
+
+@dataclass(frozen=True)
+class ExportStats:
+    """
+    Summary of a completed export.
+
+    Args:
+    ----------
+        path: Output file path.
+        format: Export format used.
+        compression: Compression codec used.
+        row_count: Number of rows written.
+        chunk_count: Number of chunks written.
+        bytes_written: Size of the output file in bytes.
+        elapsed_ms: Total export duration in milliseconds.
+        columns: Exported column metadata.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    path: Path
+    format: ExportFormat
+    compression: ExportCompression
+    row_count: int
+    chunk_count: int
+    bytes_written: int
+    elapsed_ms: float
+    columns: tuple[ColumnInfo, ...]
+
+    @property
+    def rows_per_second(self) -> float:
+        """
+        Compute export throughput.
+
+        Returns:
+        ----------
+            Rows written per second (0.0 for instant exports).
+        """
+        if self.elapsed_ms <= 0:
+            return 0.0
+        return self.row_count / (self.elapsed_ms / 1000)
+
+
+class _ChunkWriter(abc.ABC):
+    """
+    Base class for chunked file writers.
+
+    Writers receive row tuples in column order and are always driven from a
+    worker thread, so they may block on file I/O.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        columns: Sequence[ColumnInfo],
+        compression: ExportCompression,
+        compression_level: int,
+    ) -> None:
+        self._path = path
+        self._columns = list(columns)
+        self._names = [col.name for col in columns]
+
+    @abc.abstractmethod
+    def write_chunk(self, rows: Sequence[Sequence[Any]]) -> None:
+        """Write one chunk of rows."""
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """Flush and close the output file."""
+
+
+_NDJSON_ENCODER = json.JSONEncoder(ensure_ascii=False, default=str)
+
+
+def encode_csv_rows(rows: Sequence[Sequence[Any]]) -> bytes:
+    """
+    Encode rows as UTF-8 CSV (CPUOffloader worker entry point).
+
+    Args:
+    ----------
+        rows: Row tuples in column order.
+
+    Returns:
+    ----------
+        Encoded CSV lines.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson_rows(names: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    """
+    Encode rows as UTF-8 NDJSON (CPUOffloader worker entry point).
+
+    Args:
+    ----------
+        names: Column names.
+        rows: Row tuples in column order.
+
+    Returns:
+    ----------
+        One JSON object per line, newline-terminated.
+    """
+    encode = _NDJSON_ENCODER.encode
+    lines = [encode(dict(zip(names, row, strict=True))) for row in rows]
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+class _TextChunkWriter(_ChunkWriter):
+    """
+    Shared file handling for line-oriented text formats.
+
+    Encoding is split from writing so that large chunks can be encoded in a
+    worker process (see ResultExporter) and written here.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        columns: Sequence[ColumnInfo],
+        compression: ExportCompression,
+        compression_level: int,
+    ) -> None:
+        super().__init__(path, columns, compression, compression_level)
+        raw: BinaryIO
+        if compression == ExportCompression.GZIP:
+            raw = gzip.open(path, "wb", compresslevel=compression_level)  # type: ignore[assignment]
+        else:
+            raw = path.open("wb")
+        self._raw = raw
+
+    @abc.abstractmethod
+    def encoder(self) -> tuple[Callable[..., bytes], tuple[Any, ...]]:
+        """Return a picklable encode function and its leading arguments."""
+
+    def write_encoded(self, data: bytes) -> None:
+        self._raw.write(data)
+
+    def write_chunk(self, rows: Sequence[Sequence[Any]]) -> None:
+        func, args = self.encoder()
+        self.write_encoded(func(*args, rows))
+
+    def close(self) -> None:
+        self._raw.close()
+
+
+class _CSVChunkWriter(_TextChunkWriter):
+    """Encode each chunk to CSV in memory, then write it in one call."""
+
+    def __init__(
+        self,
+        path: Path,
+        columns: Sequence[ColumnInfo],
+        compression: ExportCompression,
+        compression_level: int,
+    ) -> None:
+        super().__init__(path, columns, compression, compression_level)
+        self.write_encoded(encode_csv_rows([self._names]))
+
+    def encoder(self) -> tuple[Callable[..., bytes], tuple[Any, ...]]:
+        return encode_csv_rows, ()
+
+
+class _NDJSONChunkWriter(_TextChunkWriter):
+    """Encode each row as one JSON object per line."""
+
+    def encoder(self) -> tuple[Callable[..., bytes], tuple[Any, ...]]:
+        return encode_ndjson_rows, (self._names,)
+
+
+class _ParquetChunkWriter(_ChunkWriter):
+    """
+    Write each chunk as a Parquet row group via pyarrow.
+
+    The Arrow schema is derived from the PostgreSQL column types up front so
+    every row group shares it. Types without a lossless Arrow mapping
+    (numeric, uuid, json, ...) are written as strings.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        columns: Sequence[ColumnInfo],
+        compression: ExportCompression,
+        compression_level: int,
+    ) -> None:
+        super().__init__(path, columns, compression, compression_level)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ExportError(
+                "parquet export requires pyarrow (install postgres-mcp[export])"
+            ) from exc
+
+        native_types = {
+            "int2": pa.int16(),
+            "int4": pa.int32(),
+            "int8": pa.int64(),
+            "float4": pa.float32(),
+            "float8": pa.float64(),
+            "bool": pa.bool_(),
+            "text": pa.string(),
+            "varchar": pa.string(),
+            "bpchar": pa.string(),
+            "name": pa.string(),
+            "date": pa.date32(),
+            "timestamp": pa.timestamp("us"),
+            "timestamptz": pa.timestamp("us", tz="UTC"),
+        }
+        fields = []
+        self._stringify: list[bool] = []
+        for col in self._columns:
+            arrow_type = native_types.get(col.type)
+            self._stringify.append(arrow_type is None)
+            fields.append(pa.field(col.name, arrow_type or pa.string()))
+
+        self._pa = pa
+        self._schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(
+            str(path),
+            self._schema,
+            compression=None if compression == ExportCompression.NONE else compression.value,
+            compression_level=compression_level if compression == ExportCompression.GZIP else None,
+        )
+
+    def write_chunk(self, rows: Sequence[Sequence[Any]]) -> None:
+        pa = self._pa
+        # Transpose once per chunk so pyarrow converts whole columns at a time.
+        arrays = []
+        for values, field, stringify in zip(
+            zip(*rows, strict=True), self._schema, self._stringify, strict=True
+        ):
+            if stringify:
+                values = [None if value is None else str(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+_WRITERS: dict[ExportFormat, type[_ChunkWriter]] = {
+    ExportFormat.CSV: _CSVChunkWriter,
+    ExportFormat.NDJSON: _NDJSONChunkWriter,
+    ExportFormat.PARQUET: _ParquetChunkWriter,
+}
+
+
+class ResultExporter:
+    """
+    Stream query results to local files in bounded memory.
+
+    Rows are fetched from a server-side cursor ``chunk_size`` at a time,
+    encoded per chunk, and written from a worker thread so the event loop
+    never blocks on disk I/O.
+
+    Args:
+    ----------
+        chunk_size: Rows fetched and encoded per chunk.
+        compression_level: gzip compression level (1-9).
+        offloader: Process-pool offload for encoding large CSV/NDJSON chunks.
+        export_root: Directory exports are confined to. Relative paths are
+            resolved inside it; paths escaping it (``..`` or symlinks) are
+            rejected. None allows any path.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        ValueError: If chunk_size or compression_level are out of range.
+
+    Example:
+    ----------
+        >>> exporter = ResultExporter(chunk_size=10_000)
+        >>> async with pool_manager.get_connection("main") as conn:
+        ...     stats = await exporter.export(
+        ...         "SELECT * FROM orders", conn, Path("orders.csv.gz"),
+        ...         fmt=ExportFormat.CSV, compression=ExportCompression.GZIP,
+        ...     )
+        >>> print(f"{stats.row_count} rows at {stats.rows_per_second:.0f} rows/s")
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 10_000,
+        compression_level: int = 6,
+        offloader: CPUOffloader | None = None,
+        export_root: Path | str | None = None,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        if not 1 <= compression_level <= 9:
+            raise ValueError("compression_level must be between 1 and 9")
+        self._chunk_size = chunk_size
+        self._compression_level = compression_level
+        self._offloader = offloader
+        self._export_root = Path(export_root).expanduser() if export_root is not None else None
+
+    async def export(
+        self,
+        sql: str,
+        connection: asyncpg.Connection,
+        path: Path | str,
+        fmt: ExportFormat = ExportFormat.CSV,
+        compression: ExportCompression = ExportCompression.NONE,
+        chunk_size: int | None = None,
+        overwrite: bool = False,
+    ) -> ExportStats:
+        """
+        Execute a query with a server-side cursor and stream it to a file.
+
+        Args:
+        ----------
+            sql: Validated read-only SQL to execute.
+            connection: Active asyncpg connection.
+            path: Destination file path.
+            fmt: Export format.
+            compression: Compression codec.
+            chunk_size: Optional per-call chunk size override.
+            overwrite: Whether an existing file may be replaced.
+
+        Returns:
+        ----------
+            ExportStats describing the written file.
+
+        Raises:
+        ----------
+            ExportError: If the query or the file write fails.
+        """
+        size = chunk_size or self._chunk_size
+        try:
+            # Server-side cursors only live inside a transaction.
+            async with connection.transaction(readonly=True):
+                statement = await connection.prepare(sql)
+                columns = [
+                    ColumnInfo(name=attr.name, type=attr.type.name)
+                    for attr in statement.get_attributes()
+                ]
+                cursor = await statement.cursor()
+                return await self.export_chunks(
+                    _iter_cursor(cursor, size),
+                    columns,
+                    path,
+                    fmt=fmt,
+                    compression=compression,
+                    overwrite=overwrite,
+                )
+        except ExportError:
+            raise
+        except asyncpg.PostgresError as exc:
+            raise ExportError(f"Database error during export: {exc}") from exc
+
+    async def export_chunks(
+        self,
+        chunks: AsyncIterator[Sequence[Sequence[Any]]],
+        columns: Sequence[ColumnInfo],
+        path: Path | str,
+        fmt: ExportFormat = ExportFormat.CSV,
+        compression: ExportCompression = ExportCompression.NONE,
+        overwrite: bool = False,
+    ) -> ExportStats:
+        """
+        Write pre-fetched row chunks to a file.
+
+        Args:
+        ----------
+            chunks: Async iterator of row chunks in column order.
+            columns: Column metadata for the rows.
+            path: Destination file path.
+            fmt: Export format.
+            compression: Compression codec.
+            overwrite: Whether an existing file may be replaced.
+
+        Returns:
+        ----------
+            ExportStats describing the written file.
+
+        Raises:
+        ----------
+            ExportError: If the options are invalid or the write fails.
+        """
+        fmt = ExportFormat(fmt)
+        compression = ExportCompression(compression)
+        if compression not in _SUPPORTED_COMPRESSION[fmt]:
+            raise ExportError(
+                f"compression '{compression.value}' is not supported for {fmt.value} export"
+            )
+
+        target = self._resolve_target(path)
+        if target.exists() and not overwrite:
+            raise ExportError(f"export target already exists: {target}")
+        if not target.parent.exists():
+            raise ExportError(f"export directory does not exist: {target.parent}")
+
+        start_time = time.perf_counter()
+        row_count = 0
+        chunk_count = 0
+
+        writer = await asyncio.to_thread(
+            _WRITERS[fmt], target, columns, compression, self._compression_level
+        )
+        try:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                await self._write_chunk(writer, chunk, len(columns))
+                row_count += len(chunk)
+                chunk_count += 1
+        except Exception as exc:
+            await asyncio.to_thread(writer.close)
+            target.unlink(missing_ok=True)
+            if isinstance(exc, ExportError):
+                raise
+            raise ExportError(f"Export failed after {row_count} rows: {exc}") from exc
+
+        await asyncio.to_thread(writer.close)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        stats = ExportStats(
+            path=target,
+            format=fmt,
+            compression=compression,
+            row_count=row_count,
+            chunk_count=chunk_count,
+            bytes_written=target.stat().st_size,
+            elapsed_ms=elapsed_ms,
+            columns=tuple(columns),
+        )
+
+        logger.info(
+            "result_export_complete",
+            path=str(target),
+            format=fmt.value,
+            compression=compression.value,
+            row_count=row_count,
+            chunk_count=chunk_count,
+            bytes_written=stats.bytes_written,
+            elapsed_ms=round(elapsed_ms, 2),
+        )
+        return stats
+
+    def _resolve_target(self, path: Path | str) -> Path:
+        """
+        Resolve an export path, confining it to the export root if one is set.
+
+        Args:
+        ----------
+            path: Requested destination path.
+
+        Returns:
+        ----------
+            Destination path (fully resolved when confined).
+
+        Raises:
+        ----------
+            ExportError: If the path resolves outside the export root.
+        """
+        target = Path(path).expanduser()
+        if self._export_root is None:
+            return target
+
+        self._export_root.mkdir(parents=True, exist_ok=True)
+        root = self._export_root.resolve()
+        # resolve() follows symlinks, so links pointing outside the root are caught too
+        resolved = (root / target).resolve()
+        if resolved == root or not resolved.is_relative_to(root):
+            raise ExportError(f"export path must be a file inside {root}: {path}")
+        return resolved
+
+    async def _write_chunk(
+        self, writer: _ChunkWriter, chunk: Sequence[Sequence[Any]], column_count: int
+    ) -> None:
+        """Write one chunk, encoding large text chunks in a worker process."""
+        offloader = self._offloader
+        cells = len(chunk) * column_count
+        if (
+            offloader is not None
+            and isinstance(writer, _TextChunkWriter)
+            and offloader.should_offload(cells, offloader.config.min_cells)
+        ):
+            func, args = writer.encoder()
+            # asyncpg Records do not pickle; plain tuples do.
+            rows = [tuple(row) for row in chunk]
+            data = await offloader.run(
+                func, *args, rows, size=cells, threshold=offloader.config.min_cells
+            )
+            await asyncio.to_thread(writer.write_encoded, data)
+        else:
+            await asyncio.to_thread(writer.write_chunk, chunk)
+
+
+async def _iter_cursor(cursor: Any, chunk_size: int) -> AsyncIterator[Sequence[Sequence[Any]]]:
+    """
+    Yield fixed-size record chunks from an asyncpg cursor.
+
+    Args:
+    ----------
+        cursor: asyncpg cursor opened inside a transaction.
+        chunk_size: Rows fetched per round trip.
+
+    Returns:
+    ----------
+        Async iterator of record chunks (asyncpg Records behave as tuples).
+    """
+    while True:
+        records = await cursor.fetch(chunk_size)
+        if not records:
+            return
+        yield records
+        if len(records) < chunk_size:
+            return
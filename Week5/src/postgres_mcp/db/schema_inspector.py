@@ -2,6 +2,10 @@
 PostgreSQL Schema Inspector.
 
 Extracts database schema information using asyncpg.
+
+Column statistics (pg_stats) and row estimates (pg_class.reltuples) are
+loaded in bulk for all tables. On later inspections only tables whose
+ANALYZE counters moved have their pg_stats reloaded.
 """
 
 import asyncpg
@@ -9,6 +13,7 @@ import structlog
 
 from postgres_mcp.models.schema import (
     ColumnSchema,
+    ColumnStats,
     DatabaseSchema,
     ForeignKeySchema,
     IndexSchema,
@@ -17,6 +22,29 @@ from postgres_mcp.models.schema import (
 
 logger = structlog.get_logger(__name__)
 
+# Row estimates and ANALYZE counters for every table, in one query.
+TABLE_STATS_SQL = """
+    SELECT c.relname AS table_name,
+           c.reltuples::bigint AS reltuples,
+           COALESCE(s.analyze_count + s.autoanalyze_count, 0) AS analyze_count
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    WHERE n.nspname = 'public'
+      AND c.relkind IN ('r', 'p');
+"""
+
+# Column statistics for a set of tables, in one query.
+COLUMN_STATS_SQL = """
+    SELECT tablename, attname, null_frac, n_distinct,
+           (most_common_vals::text::text[])[1:$2] AS most_common_vals
+    FROM pg_stats
+    WHERE schemaname = 'public'
+      AND tablename = ANY($1::text[]);
+"""
+
+MAX_STAT_VALUE_CHARS = 64
+
 
 class SchemaInspector:
     """
@@ -33,6 +61,8 @@ class SchemaInspector:
         user: str,
         password: str,
         database: str,
+        load_stats: bool = True,
+        max_common_values: int = 20,
     ):
         """
         Initialize schema inspector.
@@ -44,6 +74,8 @@ class SchemaInspector:
             user: Database user
             password: Database password
             database: Database name
+            load_stats: Load pg_stats column statistics and row estimates
+            max_common_values: Most common values kept per column
         """
         self._host = host
         self._port = port
@@ -51,6 +83,10 @@ class SchemaInspector:
         self._password = password
         self._database = database
         self._pool: asyncpg.Pool | None = None
+        self._load_stats = load_stats
+        self._max_common_values = max_common_values
+        self._analyze_counts: dict[str, int] = {}
+        self._column_stats: dict[str, dict[str, ColumnStats]] = {}
 
     async def connect(self) -> None:
         """
@@ -139,6 +175,9 @@ class SchemaInspector:
                     foreign_keys=foreign_keys,
                 )
 
+            if self._load_stats:
+                tables = await self._apply_stats(conn, tables)
+
             logger.info(
                 "schema_inspection_complete",
                 database=self._database,
@@ -147,6 +186,76 @@ class SchemaInspector:
 
             return DatabaseSchema(database_name=self._database, tables=tables)
 
+    async def _apply_stats(
+        self, conn: asyncpg.Connection, tables: dict[str, TableSchema]
+    ) -> dict[str, TableSchema]:
+        """
+        Attach row estimates and column statistics to tables.
+
+        Row estimates are read for every table on each call; pg_stats is
+        only re-read for tables analyzed since the previous call.
+
+        Args:
+        ----------
+            conn: Active connection
+            tables: Tables without statistics
+
+        Returns:
+        ----------
+            Tables with row_count_estimate and column stats filled in
+        """
+        row_estimates: dict[str, int | None] = {}
+        changed: list[str] = []
+        for row in await conn.fetch(TABLE_STATS_SQL):
+            name = row["table_name"]
+            if name not in tables:
+                continue
+            # reltuples is -1 (PG14+) or 0 before the first ANALYZE
+            row_estimates[name] = row["reltuples"] if row["reltuples"] > 0 else None
+            analyze_count = row["analyze_count"]
+            if self._analyze_counts.get(name) != analyze_count or name not in self._column_stats:
+                changed.append(name)
+            self._analyze_counts[name] = analyze_count
+
+        if changed:
+            for name in changed:
+                self._column_stats[name] = {}
+            for row in await conn.fetch(COLUMN_STATS_SQL, changed, self._max_common_values):
+                self._column_stats[row["tablename"]][row["attname"]] = ColumnStats(
+                    null_frac=row["null_frac"] or 0.0,
+                    n_distinct=row["n_distinct"],
+                    most_common_vals=[
+                        value[:MAX_STAT_VALUE_CHARS]
+                        for value in row["most_common_vals"] or ()
+                        if value is not None
+                    ],
+                )
+
+        for name in set(self._column_stats) - tables.keys():
+            del self._column_stats[name]
+            self._analyze_counts.pop(name, None)
+
+        logger.info(
+            "schema_stats_loaded",
+            database=self._database,
+            tables_reanalyzed=len(changed),
+            table_count=len(tables),
+        )
+
+        result: dict[str, TableSchema] = {}
+        for name, table in tables.items():
+            stats = self._column_stats.get(name, {})
+            result[name] = table.model_copy(
+                update={
+                    "row_count_estimate": row_estimates.get(name),
+                    "columns": [
+                        column.model_copy(update={"stats": stats.get(column.name)})
+                        for column in table.columns
+                    ],
+                }
+            )
+        return result
+
     async def _get_table_columns(self, table_name: str, pk_columns: set[str]) -> list[ColumnSchema]:
         """
         Get columns for a specific table.
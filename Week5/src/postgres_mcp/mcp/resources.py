@@ -1,15 +1,413 @@
 """
 MCP resources implementation.
 
-Implements schema resources for database metadata access.
+Implements schema resources for database metadata access. Rendered resource
+bodies are cached per schema version and dropped on SchemaCache refresh
+events; large schemas are additionally exposed as paginated table listings
+(``schema://{database}/tables?page=N``).
+
+The live query feed is exposed as ``history://tail`` (the calling
+session's recent history entries) and ``stats://queries`` (rolling-window
+metrics); both support
+``resources/subscribe`` and receive coalesced ``resources/updated``
+notifications as entries arrive.
 """
 
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs
+
 import structlog
 from mcp.server import Server
 from mcp.types import Resource
+from pydantic import AnyUrl
+
+from postgres_mcp.models.schema import DatabaseSchema, TableSchema
+from postgres_mcp.utils.client_accounting import client_identity
+
+if TYPE_CHECKING:
+    from postgres_mcp.core.schema_cache import SchemaCache
+    from postgres_mcp.utils.cpu_offload import CPUOffloader
+    from postgres_mcp.utils.query_feed import QueryFeed
 
 logger = structlog.get_logger(__name__)
 
+# Tables per page for paginated schema resources. Databases with more tables
+# than this get an index body for schema://{database} instead of full DDL.
+DEFAULT_PAGE_SIZE = 50
+CLIENT_STATS_URI = "stats://clients"
+QUERY_STATS_URI = "stats://queries"
+HISTORY_TAIL_URI = "history://tail"
+FEED_URIS = (HISTORY_TAIL_URI, QUERY_STATS_URI)
+
+# Entries returned by history://tail when no limit is given.
+DEFAULT_TAIL_LIMIT = 100
+
+_DATABASE_KEY = "database"
+_TABLE_KEY = "table:"
+_PAGE_KEY = "page:"
+
+
+class SchemaResourceCache:
+    """
+    Cache of rendered schema resource bodies.
+
+    Bodies are stored per database together with the schema version they
+    were rendered from; a version mismatch on read re-renders lazily, and
+    SchemaCache refresh events drop and re-render them in the background.
+
+    Args:
+    ----------
+        schema_cache: Schema cache providing schemas and versions.
+        page_size: Tables per paginated resource page.
+        offloader: Process-pool offload used to precompute large schemas.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        ValueError: If page_size is less than 1.
+
+    Example:
+    ----------
+        >>> resources = SchemaResourceCache(schema_cache)
+        >>> resources.start_precompute()
+        >>> body = await resources.get("mydb", "database")
+    """
+
+    def __init__(
+        self,
+        schema_cache: SchemaCache,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        offloader: CPUOffloader | None = None,
+    ) -> None:
+        if page_size < 1:
+            raise ValueError("page_size must be >= 1")
+        self._schema_cache = schema_cache
+        self._page_size = page_size
+        self._offloader = offloader
+        self._bodies: dict[str, tuple[int, dict[str, str]]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        schema_cache.add_refresh_listener(self._on_schema_refreshed)
+
+    @property
+    def page_size(self) -> int:
+        """Tables per paginated resource page."""
+        return self._page_size
+
+    def page_count(self, schema: DatabaseSchema) -> int:
+        """
+        Compute the number of table pages for a schema.
+
+        Args:
+        ----------
+            schema: Database schema
+
+        Returns:
+        ----------
+            Page count (at least 1)
+        """
+        return max(1, math.ceil(len(schema.tables) / self._page_size))
+
+    async def get(self, database: str, key: str) -> str | None:
+        """
+        Get a rendered resource body, rendering it if not cached.
+
+        Args:
+        ----------
+            database: Database name
+            key: Resource key ("database", "table:{name}" or "page:{n}")
+
+        Returns:
+        ----------
+            Rendered body, or None if the database schema is not loaded
+        """
+        schema = await self._schema_cache.get_schema(database)
+        if schema is None:
+            return None
+        bodies = self._bodies_for(database, self._schema_cache.get_version(database))
+        body = bodies.get(key)
+        if body is None:
+            body = self._render(database, schema, key)
+            bodies[key] = body
+        return body
+
+    def invalidate(self, database: str | None = None) -> None:
+        """
+        Drop cached bodies for one database or all databases.
+
+        Args:
+        ----------
+            database: Database name (None drops everything)
+        """
+        if database is None:
+            self._bodies.clear()
+        else:
+            self._bodies.pop(database, None)
+
+    async def precompute(self, database: str) -> None:
+        """
+        Render every resource body for a database ahead of time.
+
+        Yields to the event loop between tables so requests are not blocked.
+
+        Args:
+        ----------
+            database: Database name
+        """
+        schema = await self._schema_cache.get_schema(database)
+        if schema is None:
+            return
+        version = self._schema_cache.get_version(database)
+
+        keys = [_DATABASE_KEY]
+        keys.extend(f"{_PAGE_KEY}{page}" for page in range(1, self.page_count(schema) + 1))
+        keys.extend(f"{_TABLE_KEY}{name}" for name in schema.tables)
+
+        offloader = self._offloader
+        if offloader is not None and offloader.should_offload(
+            len(schema.tables), offloader.config.min_tables
+        ):
+            # Render everything in one worker call; the schema is pickled once.
+            rendered = await offloader.run(
+                render_resource_bodies,
+                database,
+                schema,
+                keys,
+                self._page_size,
+                size=len(schema.tables),
+                threshold=offloader.config.min_tables,
+            )
+            if self._schema_cache.get_version(database) != version:
+                return
+            bodies = self._bodies_for(database, version)
+            for key, body in rendered.items():
+                bodies.setdefault(key, body)
+            keys = []
+
+        for key in keys:
+            # Stop if a refresh landed mid-way; the listener re-schedules us.
+            if self._schema_cache.get_version(database) != version:
+                return
+            bodies = self._bodies_for(database, version)
+            if key not in bodies:
+                bodies[key] = self._render(database, schema, key)
+            await asyncio.sleep(0)
+
+        logger.info(
+            "schema_resources_precomputed",
+            database=database,
+            version=version,
+            resource_count=len(keys),
+        )
+
+    async def precompute_all(self) -> None:
+        """Render resource bodies for every configured database."""
+        for database in self._schema_cache.list_databases():
+            try:
+                await self.precompute(database)
+            except Exception as e:
+                logger.warning("schema_resource_precompute_failed", database=database, error=str(e))
+
+    def start_precompute(self, database: str | None = None) -> None:
+        """
+        Schedule background precomputation.
+
+        Args:
+        ----------
+            database: Database name (None precomputes all databases)
+        """
+        coro = self.precompute_all() if database is None else self.precompute(database)
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        """Cancel pending precompute tasks."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def _bodies_for(self, database: str, version: int) -> dict[str, str]:
+        entry = self._bodies.get(database)
+        if entry is None or entry[0] != version:
+            entry = (version, {})
+            self._bodies[database] = entry
+        return entry[1]
+
+    def _render(self, database: str, schema: DatabaseSchema, key: str) -> str:
+        return render_resource_body(database, schema, key, self._page_size)
+
+    def _on_schema_refreshed(self, database: str, schema: DatabaseSchema, version: int) -> None:
+        self.invalidate(database)
+        try:
+            self.start_precompute(database)
+        except RuntimeError:
+            # No running loop (e.g. synchronous refresh in tests); render lazily.
+            pass
+
+
+class ResourceSubscriptions:
+    """
+    Client sessions subscribed to resources, with coalesced notifications.
+
+    notify() only marks a URI dirty; one background flush per interval sends
+    ``resources/updated`` to every subscribed session, so a burst of query
+    log entries costs one notification per session and URI. Sessions whose
+    notification fails are dropped.
+
+    Args:
+    ----------
+        min_interval_seconds: Minimum delay between notifications for a URI.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+
+    Example:
+    ----------
+        >>> subscriptions = ResourceSubscriptions()
+        >>> subscriptions.subscribe("stats://queries", session)
+        >>> subscriptions.notify("stats://queries")
+    """
+
+    def __init__(self, min_interval_seconds: float = 1.0) -> None:
+        self._interval = min_interval_seconds
+        self._sessions: dict[str, set[Any]] = {}
+        self._dirty: set[str] = set()
+        self._flush_task: asyncio.Task[None] | None = None
+
+    def subscribe(self, uri: str, session: Any) -> None:
+        """Subscribe a session to a resource URI (query string ignored)."""
+        self._sessions.setdefault(_base_uri(uri), set()).add(session)
+
+    def unsubscribe(self, uri: str, session: Any) -> None:
+        """Remove a session's subscription to a resource URI."""
+        sessions = self._sessions.get(_base_uri(uri))
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del self._sessions[_base_uri(uri)]
+
+    def subscriber_count(self, uri: str) -> int:
+        """Number of sessions subscribed to a URI."""
+        return len(self._sessions.get(_base_uri(uri), ()))
+
+    def notify(self, *uris: str) -> None:
+        """
+        Mark resources as updated and schedule a notification flush.
+
+        Args:
+        ----------
+            uris: Updated resource URIs
+        """
+        dirty = {uri for uri in uris if uri in self._sessions}
+        if not dirty:
+            return
+        self._dirty |= dirty
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self._flush())
+            except RuntimeError:
+                # No running loop: nothing can be sent anyway.
+                self._dirty.clear()
+
+    async def close(self) -> None:
+        """Cancel a pending notification flush."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self._interval)
+        dirty, self._dirty = self._dirty, set()
+        for uri in dirty:
+            for session in list(self._sessions.get(uri, ())):
+                try:
+                    await session.send_resource_updated(AnyUrl(uri))
+                except Exception as e:
+                    logger.info("resource_subscriber_dropped", uri=uri, error=str(e))
+                    self.unsubscribe(uri, session)
+
+
+def _base_uri(uri: str) -> str:
+    return str(uri).partition("?")[0]
+
+
+def read_history_tail(feed: QueryFeed, query: str = "", client_id: str | None = None) -> str:
+    """
+    Render recent query history entries of one client as JSON.
+
+    Args:
+    ----------
+        feed: Live query feed
+        query: URI query string; ``after`` returns only entries with a larger
+            sequence number, ``limit`` caps the number of entries
+        client_id: Session whose entries are returned (other clients'
+            queries are never shown)
+
+    Returns:
+    ----------
+        JSON body with last_sequence and entries (oldest first)
+
+    Raises:
+    ----------
+        ValueError: If after or limit is not an integer
+    """
+    params = parse_qs(query)
+    after = int(params.get("after", ["0"])[0])
+    limit = int(params.get("limit", [str(DEFAULT_TAIL_LIMIT)])[0])
+    own = [
+        (sequence, entry)
+        for sequence, entry in feed.recent(after=after)
+        if entry.user_id == client_id
+    ]
+    entries = [
+        {"sequence": sequence, **entry.model_dump(mode="json", exclude_none=True)}
+        for sequence, entry in (own[-limit:] if limit > 0 else [])
+    ]
+    return json.dumps({"last_sequence": feed.last_sequence, "entries": entries}, indent=2)
+
+
+def read_query_stats(feed: QueryFeed) -> str:
+    """
+    Render rolling-window query metrics as JSON.
+
+    Args:
+    ----------
+        feed: Live query feed
+
+    Returns:
+    ----------
+        JSON body from RollingMetrics.snapshot()
+    """
+    return json.dumps(feed.metrics.snapshot(), indent=2)
+
+
+def _enable_subscribe_capability(server: Server) -> None:
+    """Advertise resources.subscribe (the lowlevel server hardcodes False)."""
+    get_capabilities = server.get_capabilities
+
+    def capabilities(*args: Any, **kwargs: Any) -> Any:
+        result = get_capabilities(*args, **kwargs)
+        if result.resources is not None:
+            result.resources.subscribe = True
+        return result
+
+    server.get_capabilities = capabilities  # type: ignore[method-assign]
+
 
 def register_resources(server: Server) -> None:
     """
@@ -32,7 +430,31 @@ def register_resources(server: Server) -> None:
         from postgres_mcp.server import get_context
 
         ctx = get_context()
-        resources: list[Resource] = []
+        await ctx.ensure_database_services()
+        resources: list[Resource] = [
+            Resource(
+                uri=CLIENT_STATS_URI,
+                name="Client usage",
+                description="Per-client tool call counters for this server (client ids hashed)",
+                mimeType="application/json",
+            ),
+            Resource(
+                uri=HISTORY_TAIL_URI,
+                name="Query history tail",
+                description="Your recent query history (?after=SEQ&limit=N); subscribable",
+                mimeType="application/json",
+            ),
+            Resource(
+                uri=QUERY_STATS_URI,
+                name="Query metrics",
+                description=(
+                    "Rolling-window QPS, error rate and p50/p95/p99 latency per stage "
+                    "and database; subscribable"
+                ),
+                mimeType="application/json",
+            ),
+        ]
+        page_size = ctx.schema_resources.page_size if ctx.schema_resources else DEFAULT_PAGE_SIZE
 
         # Get all databases
         databases = ctx.schema_cache.list_databases()
@@ -51,6 +473,21 @@ def register_resources(server: Server) -> None:
             # Get schema to list tables
             schema = await ctx.schema_cache.get_schema(db_name)
             if schema:
+                if len(schema.tables) > page_size:
+                    page_count = math.ceil(len(schema.tables) / page_size)
+                    for page in range(1, page_count + 1):
+                        resources.append(
+                            Resource(
+                                uri=f"schema://{db_name}/tables?page={page}",
+                                name=f"Tables {db_name} (page {page}/{page_count})",
+                                description=(
+                                    f"Table schemas for database {db_name}, "
+                                    f"page {page} of {page_count}"
+                                ),
+                                mimeType="text/plain",
+                            )
+                        )
+
                 for table_name in schema.tables.keys():
                     resources.append(
                         Resource(
@@ -64,13 +501,14 @@ def register_resources(server: Server) -> None:
         return resources
 
     @server.read_resource()
-    async def read_resource(uri: str) -> str:
+    async def read_resource(uri: Any) -> str:
         """
         Read resource content by URI.
 
         Args:
         ----------
-            uri: Resource URI (schema://{database} or schema://{database}/{table})
+            uri: Resource URI (schema://{database}, schema://{database}/{table}
+                or schema://{database}/tables?page={n})
 
         Returns:
         ----------
@@ -79,18 +517,42 @@ def register_resources(server: Server) -> None:
         from postgres_mcp.server import get_context
 
         ctx = get_context()
+        uri = str(uri)
+
+        client_id, _ = client_identity(server)
 
         try:
-            # Parse URI: schema://{database}/{table?}
+            if uri == CLIENT_STATS_URI:
+                return json.dumps({"clients": ctx.clients.snapshot(client_id)}, indent=2)
+
+            await ctx.ensure_database_services()
+
+            base_uri, _, feed_query = uri.partition("?")
+            if base_uri in FEED_URIS:
+                if ctx.query_feed is None:
+                    return "Query feed is not available"
+                if base_uri == QUERY_STATS_URI:
+                    return read_query_stats(ctx.query_feed)
+                return read_history_tail(ctx.query_feed, feed_query, client_id)
+
+            # Parse URI: schema://{database}/{table?}[?page=N]
             if not uri.startswith("schema://"):
                 return f"Invalid URI scheme: {uri}"
 
-            path = uri[9:]  # Remove "schema://"
+            path, _, query = uri[9:].partition("?")  # Remove "schema://"
             parts = path.split("/")
 
             if len(parts) == 1:
                 # Database-level resource
                 return await read_database_schema(parts[0], ctx)
+            elif len(parts) == 2 and parts[1] == "tables" and query:
+                # Paginated table listing
+                page_values = parse_qs(query).get("page", ["1"])
+                try:
+                    page = int(page_values[0])
+                except ValueError:
+                    return f"Invalid page number in URI: {uri}"
+                return await read_tables_page(parts[0], page, ctx)
             elif len(parts) == 2:
                 # Table-level resource
                 return await read_table_schema(parts[0], parts[1], ctx)
@@ -101,6 +563,36 @@ def register_resources(server: Server) -> None:
             logger.error("resource_read_failed", uri=uri, error=str(e))
             return f"Error reading resource: {str(e)}"
 
+    @server.subscribe_resource()
+    async def subscribe_resource(uri: Any) -> None:
+        """
+        Subscribe the calling session to resource update notifications.
+
+        Args:
+        ----------
+            uri: Resource URI (history://tail and stats://queries are updated
+                as queries are logged)
+        """
+        from postgres_mcp.server import get_context
+
+        get_context().subscriptions.subscribe(str(uri), server.request_context.session)
+        logger.info("resource_subscribed", uri=str(uri))
+
+    @server.unsubscribe_resource()
+    async def unsubscribe_resource(uri: Any) -> None:
+        """
+        Unsubscribe the calling session from resource update notifications.
+
+        Args:
+        ----------
+            uri: Resource URI
+        """
+        from postgres_mcp.server import get_context
+
+        get_context().subscriptions.unsubscribe(str(uri), server.request_context.session)
+
+    _enable_subscribe_capability(server)
+
 
 async def read_database_schema(database: str, ctx) -> str:
     """
@@ -117,11 +609,144 @@ async def read_database_schema(database: str, ctx) -> str:
     """
     logger.info("read_database_schema", database=database)
 
+    if ctx.schema_resources:
+        body = await ctx.schema_resources.get(database, _DATABASE_KEY)
+        return body if body is not None else f"Database not found: {database}"
+
     schema = await ctx.schema_cache.get_schema(database)
     if not schema:
         return f"Database not found: {database}"
+    return render_database_schema(database, schema, DEFAULT_PAGE_SIZE)
+
+
+async def read_table_schema(database: str, table: str, ctx) -> str:
+    """
+    Read specific table schema.
+
+    Args:
+    ----------
+        database: Database name
+        table: Table name
+        ctx: Server context
+
+    Returns:
+    ----------
+        Formatted table schema
+    """
+    logger.info("read_table_schema", database=database, table=table)
+
+    schema = await ctx.schema_cache.get_schema(database)
+    if not schema:
+        return f"Database not found: {database}"
+
+    if table not in schema.tables:
+        return f"Table not found: {database}.{table}"
 
-    # Format schema as DDL
+    if ctx.schema_resources:
+        body = await ctx.schema_resources.get(database, f"{_TABLE_KEY}{table}")
+        if body is not None:
+            return body
+    return render_table_schema(database, table, schema)
+
+
+async def read_tables_page(database: str, page: int, ctx) -> str:
+    """
+    Read one page of table schemas.
+
+    Args:
+    ----------
+        database: Database name
+        page: 1-based page number
+        ctx: Server context
+
+    Returns:
+    ----------
+        Formatted table schemas for the page
+    """
+    logger.info("read_tables_page", database=database, page=page)
+
+    schema = await ctx.schema_cache.get_schema(database)
+    if not schema:
+        return f"Database not found: {database}"
+
+    page_size = ctx.schema_resources.page_size if ctx.schema_resources else DEFAULT_PAGE_SIZE
+    page_count = max(1, math.ceil(len(schema.tables) / page_size))
+    if page < 1 or page > page_count:
+        return f"Page out of range: {page} (database {database} has {page_count} pages)"
+
+    if ctx.schema_resources:
+        body = await ctx.schema_resources.get(database, f"{_PAGE_KEY}{page}")
+        if body is not None:
+            return body
+    return render_tables_page(database, schema, page, page_size)
+
+
+def render_resource_body(database: str, schema: DatabaseSchema, key: str, page_size: int) -> str:
+    """
+    Render one resource body by cache key.
+
+    Args:
+    ----------
+        database: Database name
+        schema: Database schema
+        key: Resource key ("database", "table:{name}" or "page:{n}")
+        page_size: Tables per page
+
+    Returns:
+    ----------
+        Rendered body
+
+    Raises:
+    ----------
+        ValueError: If the key is unknown
+    """
+    if key == _DATABASE_KEY:
+        return render_database_schema(database, schema, page_size)
+    if key.startswith(_PAGE_KEY):
+        page = int(key[len(_PAGE_KEY) :])
+        return render_tables_page(database, schema, page, page_size)
+    if key.startswith(_TABLE_KEY):
+        return render_table_schema(database, key[len(_TABLE_KEY) :], schema)
+    raise ValueError(f"unknown resource key: {key}")
+
+
+def render_resource_bodies(
+    database: str, schema: DatabaseSchema, keys: list[str], page_size: int
+) -> dict[str, str]:
+    """
+    Render several resource bodies in one call (CPUOffloader worker entry point).
+
+    Args:
+    ----------
+        database: Database name
+        schema: Database schema
+        keys: Resource keys to render
+        page_size: Tables per page
+
+    Returns:
+    ----------
+        Mapping of key to rendered body
+    """
+    return {key: render_resource_body(database, schema, key, page_size) for key in keys}
+
+
+def render_database_schema(database: str, schema: DatabaseSchema, page_size: int) -> str:
+    """
+    Render the database-level schema resource.
+
+    Schemas with more than ``page_size`` tables render an index of table
+    pages instead of inlining every table.
+
+    Args:
+    ----------
+        database: Database name
+        schema: Database schema
+        page_size: Tables per page
+
+    Returns:
+    ----------
+        Formatted database schema
+    """
     lines = [
         f"# Database Schema: {database}",
         f"\n**Last Updated**: {schema.last_updated.strftime('%Y-%m-%d %H:%M:%S')}",
@@ -129,62 +754,70 @@ async def read_database_schema(database: str, ctx) -> str:
         "\n---\n",
     ]
 
+    if len(schema.tables) > page_size:
+        table_names = list(schema.tables)
+        page_count = math.ceil(len(table_names) / page_size)
+        lines.append(f"Schema is split into {page_count} pages of {page_size} tables.\n")
+        for page in range(1, page_count + 1):
+            chunk = table_names[(page - 1) * page_size : page * page_size]
+            lines.append(f"- `schema://{database}/tables?page={page}`: {chunk[0]} … {chunk[-1]}")
+        return "\n".join(lines)
+
     # Add each table
     for table_name, table in schema.tables.items():
-        lines.append(f"\n## Table: {table_name}\n")
-        lines.append("### Columns\n")
-
-        for col in table.columns:
-            col_info = f"- `{col.name}` {col.data_type}"
-            if col.primary_key:
-                col_info += " **[PK]**"
-            if not col.nullable:
-                col_info += " NOT NULL"
-            if col.default:
-                col_info += f" DEFAULT {col.default}"
-            lines.append(col_info)
-
-        # Indexes
-        if table.indexes:
-            lines.append("\n### Indexes\n")
-            for idx in table.indexes:
-                idx_type = "UNIQUE" if idx.unique else "INDEX"
-                lines.append(f"- {idx_type}: `{idx.name}` on {', '.join(idx.columns)}")
-
-        # Foreign keys
-        if table.foreign_keys:
-            lines.append("\n### Foreign Keys\n")
-            for fk in table.foreign_keys:
-                lines.append(f"- `{fk.column}` → `{fk.foreign_table}.{fk.foreign_column}`")
-
-        lines.append("\n---\n")
+        lines.extend(_render_table_section(table_name, table))
 
     return "\n".join(lines)
 
 
-async def read_table_schema(database: str, table: str, ctx) -> str:
+def render_tables_page(database: str, schema: DatabaseSchema, page: int, page_size: int) -> str:
     """
-    Read specific table schema.
+    Render one page of the paginated table listing.
 
     Args:
     ----------
         database: Database name
-        table: Table name
-        ctx: Server context
+        schema: Database schema
+        page: 1-based page number
+        page_size: Tables per page
 
     Returns:
     ----------
-        Formatted table schema
+        Formatted table schemas for the page
     """
-    logger.info("read_table_schema", database=database, table=table)
+    table_names = list(schema.tables)
+    page_count = max(1, math.ceil(len(table_names) / page_size))
+    selected = table_names[(page - 1) * page_size : page * page_size]
 
-    schema = await ctx.schema_cache.get_schema(database)
-    if not schema:
-        return f"Database not found: {database}"
+    lines = [
+        f"# Database Schema: {database} (page {page}/{page_count})",
+        f"\n**Tables on page**: {len(selected)} of {len(table_names)}",
+    ]
+    if page < page_count:
+        lines.append(f"**Next page**: `schema://{database}/tables?page={page + 1}`")
+    lines.append("\n---\n")
 
-    table_schema = schema.tables.get(table)
-    if not table_schema:
-        return f"Table not found: {database}.{table}"
+    for table_name in selected:
+        lines.extend(_render_table_section(table_name, schema.tables[table_name]))
+
+    return "\n".join(lines)
+
+
+def render_table_schema(database: str, table: str, schema: DatabaseSchema) -> str:
+    """
+    Render the table-level schema resource.
+
+    Args:
+    ----------
+        database: Database name
+        table: Table name
+        schema: Database schema containing the table
+
+    Returns:
+    ----------
+        Formatted table schema
+    """
+    table_schema = schema.tables[table]
 
     # Format table schema
     lines = [
@@ -199,8 +832,8 @@ async def read_table_schema(database: str, table: str, ctx) -> str:
         lines.append(f"- **Nullable**: {'Yes' if col.nullable else 'No'}")
         if col.primary_key:
             lines.append("- **Primary Key**: Yes")
-        if col.default:
-            lines.append(f"- **Default**: {col.default}")
+        if col.default_value:
+            lines.append(f"- **Default**: {col.default_value}")
         lines.append("")
 
     # Indexes
@@ -229,3 +862,34 @@ async def read_table_schema(database: str, table: str, ctx) -> str:
     lines.append("```")
 
     return "\n".join(lines)
+
+
+def _render_table_section(table_name: str, table: TableSchema) -> list[str]:
+    """Render one table section used by database and page resources."""
+    lines = [f"\n## Table: {table_name}\n", "### Columns\n"]
+
+    for col in table.columns:
+        col_info = f"- `{col.name}` {col.data_type}"
+        if col.primary_key:
+            col_info += " **[PK]**"
+        if not col.nullable:
+            col_info += " NOT NULL"
+        if col.default_value:
+            col_info += f" DEFAULT {col.default_value}"
+        lines.append(col_info)
+
+    # Indexes
+    if table.indexes:
+        lines.append("\n### Indexes\n")
+        for idx in table.indexes:
+            idx_type = "UNIQUE" if idx.unique else "INDEX"
+            lines.append(f"- {idx_type}: `{idx.name}` on {', '.join(idx.columns)}")
+
+    # Foreign keys
+    if table.foreign_keys:
+        lines.append("\n### Foreign Keys\n")
+        for fk in table.foreign_keys:
+            lines.append(f"- `{fk.column}` → `{fk.foreign_table}.{fk.foreign_column}`")
+
+    lines.append("\n---\n")
+    return lines
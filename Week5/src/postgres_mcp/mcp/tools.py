@@ -5,14 +5,30 @@ Implements all MCP tools for PostgreSQL operations with robust error handling.
 """
 
 import asyncio
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import structlog
 from mcp.server import Server
 from mcp.types import TextContent, Tool
 
+from postgres_mcp.config import QueryConfig
+from postgres_mcp.models.result import ApproximationInfo, BatchItemResult, QueryResult
+from postgres_mcp.utils.client_accounting import client_identity, current_client_id
+from postgres_mcp.utils.cpu_offload import CPUOffloader
+from postgres_mcp.utils.result_renderer import RenderMode, RenderOptions, render_preview
+
 logger = structlog.get_logger(__name__)
 
+# Called with (completed, total, message) as batch items finish.
+ProgressCallback = Callable[[float, float, str], Awaitable[None]]
+
+# Tools needing the OpenAI client and SQL pipeline vs. database services only;
+# the matching services are initialized on the first call.
+AI_TOOLS = frozenset({"generate_sql", "execute_query", "execute_queries", "export_query"})
+DATABASE_TOOLS = frozenset({"list_databases", "refresh_schema", "query_history"})
+
 
 def register_tools(server: Server) -> None:
     """
@@ -85,10 +101,140 @@ def register_tools(server: Server) -> None:
                             "minimum": 1,
                             "maximum": 10000,
                         },
+                        "preview_rows": {
+                            "type": "integer",
+                            "description": "Rows to include in the response preview (default: 10)",
+                            "minimum": 0,
+                            "maximum": 1000,
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": ["markdown", "tsv"],
+                            "description": (
+                                "Preview format: aligned Markdown table or compact TSV "
+                                "(default: markdown)"
+                            ),
+                        },
+                        "approximate": {
+                            "type": "boolean",
+                            "description": (
+                                "Answer COUNT/SUM/AVG aggregates over large tables from a "
+                                "TABLESAMPLE with 95% margins; the exact answer is computed "
+                                "in the background and returned on re-run (default: false)"
+                            ),
+                        },
                     },
                     "required": ["natural_language"],
                 },
             ),
+            Tool(
+                name="execute_queries",
+                description=(
+                    "Generate and execute several natural language queries in one call. "
+                    "SQL is generated concurrently and executed as soon as it is ready; "
+                    "results are reported in completion order with per-query timing "
+                    "(and streamed as progress notifications when a progress token is sent)."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "queries": {
+                            "type": "array",
+                            "description": "Queries to run (max: query.batch_max_queries)",
+                            "minItems": 1,
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "natural_language": {
+                                        "type": "string",
+                                        "description": "Natural language description",
+                                    },
+                                    "database": {
+                                        "type": "string",
+                                        "description": (
+                                            "Target database name (optional, uses default)"
+                                        ),
+                                    },
+                                },
+                                "required": ["natural_language"],
+                            },
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum rows per query (default: 1000, max: 10000)",
+                            "minimum": 1,
+                            "maximum": 10000,
+                        },
+                        "preview_rows": {
+                            "type": "integer",
+                            "description": "Rows to preview per query (default: 5)",
+                            "minimum": 0,
+                            "maximum": 1000,
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": ["markdown", "tsv"],
+                            "description": "Preview format (default: markdown)",
+                        },
+                    },
+                    "required": ["queries"],
+                },
+            ),
+            Tool(
+                name="export_query",
+                description=(
+                    "Generate a PostgreSQL query from natural language and stream the full "
+                    "result set to a local file (CSV, NDJSON or Parquet). "
+                    "No row limit is applied; rows are written in chunks with constant memory."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "natural_language": {
+                            "type": "string",
+                            "description": "Natural language description of the query",
+                        },
+                        "path": {
+                            "type": "string",
+                            "description": (
+                                "File path to write the export to, relative to the "
+                                "server's export directory"
+                            ),
+                        },
+                        "database": {
+                            "type": "string",
+                            "description": (
+                                "Target database name "
+                                "(optional, uses default if not specified)"
+                            ),
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": ["csv", "ndjson", "parquet"],
+                            "description": "Export format (default: csv)",
+                        },
+                        "compression": {
+                            "type": "string",
+                            "enum": ["none", "gzip", "snappy", "zstd"],
+                            "description": (
+                                "Compression codec (default: none). "
+                                "csv/ndjson support gzip; parquet supports all codecs"
+                            ),
+                        },
+                        "chunk_size": {
+                            "type": "integer",
+                            "description": "Rows fetched per chunk (default: 10000)",
+                            "minimum": 100,
+                            "maximum": 100000,
+                        },
+                        "overwrite": {
+                            "type": "boolean",
+                            "description": "Replace the file if it already exists (default: false)",
+                        },
+                    },
+                    "required": ["natural_language", "path"],
+                },
+            ),
             Tool(
                 name="list_databases",
                 description="List all configured databases with their schema information.",
@@ -172,14 +318,29 @@ def register_tools(server: Server) -> None:
         from postgres_mcp.server import get_context
 
         ctx = get_context()
+        client_id, client_name = client_identity(server)
+        token = current_client_id.set(client_id)
+        start_time = time.perf_counter()
+        success = False
 
-        logger.info("tool_call_started", tool=name, args=arguments)
+        logger.info("tool_call_started", tool=name, client_id=client_id, args=arguments)
 
         try:
+            if name in AI_TOOLS:
+                await ctx.ensure_ai_services()
+            elif name in DATABASE_TOOLS:
+                await ctx.ensure_database_services()
+
             if name == "generate_sql":
                 result = await handle_generate_sql(arguments, ctx)
             elif name == "execute_query":
                 result = await handle_execute_query(arguments, ctx)
+            elif name == "execute_queries":
+                result = await handle_execute_queries(
+                    arguments, ctx, progress=_progress_reporter(server)
+                )
+            elif name == "export_query":
+                result = await handle_export_query(arguments, ctx)
             elif name == "list_databases":
                 result = await handle_list_databases(ctx)
             elif name == "refresh_schema":
@@ -195,7 +356,8 @@ def register_tools(server: Server) -> None:
                     )
                 ]
 
-            logger.info("tool_call_completed", tool=name, success=True)
+            success = not _is_error_response(result)
+            logger.info("tool_call_completed", tool=name, client_id=client_id, success=success)
             return result
 
         except Exception as e:
@@ -218,6 +380,109 @@ def register_tools(server: Server) -> None:
                 )
             ]
 
+        finally:
+            current_client_id.reset(token)
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            ctx.clients.record(client_id, name, duration_ms, success, client_name)
+
+
+def _progress_reporter(server: Server) -> ProgressCallback | None:
+    """
+    Build a progress callback for the current request, if the client asked for one.
+
+    Args:
+    ----------
+        server: MCP Server instance
+
+    Returns:
+    ----------
+        Callback sending progress notifications, or None without a progress token
+    """
+    try:
+        request_context = server.request_context
+    except LookupError:
+        return None
+    meta = request_context.meta
+    token = meta.progressToken if meta is not None else None
+    if token is None:
+        return None
+
+    async def report(completed: float, total: float, message: str) -> None:
+        await request_context.session.send_progress_notification(
+            token,
+            completed,
+            total=total,
+            message=message,
+            related_request_id=str(request_context.request_id),
+        )
+
+    return report
+
+
+def _is_error_response(result: list[TextContent]) -> bool:
+    """Handlers report failures as a single text block starting with ❌."""
+    return bool(result) and result[0].text.startswith("❌")
+
+
+def _build_render_options(arguments: dict[str, Any], ctx: Any) -> RenderOptions:
+    """
+    Build preview render options from tool arguments and query config.
+
+    Args:
+    ----------
+        arguments: Tool arguments
+        ctx: Server context
+
+    Returns:
+    ----------
+        RenderOptions for the response preview
+
+    Raises:
+    ----------
+        ValueError: If format or preview_rows are invalid
+    """
+    query_config = getattr(getattr(ctx, "config", None), "query", None)
+    if not isinstance(query_config, QueryConfig):
+        query_config = QueryConfig()
+    default_rows = query_config.preview_rows
+    max_cell_width = query_config.max_cell_width
+
+    return RenderOptions(
+        mode=RenderMode(arguments.get("format", RenderMode.MARKDOWN.value)),
+        preview_rows=min(int(arguments.get("preview_rows", default_rows)), 1000),
+        max_cell_width=max_cell_width,
+    )
+
+
+async def _render_preview(result: QueryResult, options: RenderOptions, ctx: Any) -> str:
+    """
+    Render the result preview, in a worker process for large previews.
+
+    Args:
+    ----------
+        result: Executed query result
+        options: Rendering options
+        ctx: Server context
+
+    Returns:
+    ----------
+        Preview section text
+    """
+    offloader = getattr(ctx, "offloader", None)
+    if not isinstance(offloader, CPUOffloader):
+        return render_preview(result, options)
+
+    shown = min(options.preview_rows, len(result.rows))
+    cells = shown * len(result.columns)
+    if not offloader.should_offload(cells, offloader.config.min_cells):
+        return render_preview(result, options)
+
+    # Only ship the rows that will be rendered to the worker.
+    preview = result.model_copy(update={"rows": result.rows[:shown]})
+    return await offloader.run(
+        render_preview, preview, options, size=cells, threshold=offloader.config.min_cells
+    )
+
 
 async def handle_generate_sql(arguments: dict[str, Any], ctx: Any) -> list[TextContent]:
     """
@@ -347,6 +612,11 @@ async def handle_execute_query(arguments: dict[str, Any], ctx: Any) -> list[Text
     if limit > 10000:
         limit = 10000
 
+    try:
+        render_options = _build_render_options(arguments, ctx)
+    except ValueError as e:
+        return [TextContent(type="text", text=f"❌ Error: {str(e)}")]
+
     logger.info(
         "execute_query_called",
         database=database,
@@ -361,6 +631,7 @@ async def handle_execute_query(arguments: dict[str, Any], ctx: Any) -> list[Text
                 natural_language=natural_language,
                 database=database,
                 limit=limit,
+                approximate=bool(arguments.get("approximate", False)),
             ),
             timeout=120.0,  # 120 second total timeout (generation + execution)
         )
@@ -380,27 +651,20 @@ async def handle_execute_query(arguments: dict[str, Any], ctx: Any) -> list[Text
             columns_text = ", ".join(f"`{col.name}` ({col.type})" for col in result.columns)
             response_parts.append(f"- Columns: {columns_text}")
 
-        # Format row data (limit to first 10 rows for display)
-        if result.rows:
-            response_parts.append("\n### Data Preview (first 10 rows)\n")
-            display_rows = result.rows[:10]
+        if result.plan_summary:
+            response_parts.append(f"- Plan: {result.plan_summary}")
+
+        if result.cache_status:
+            response_parts.append(f"- Cache: {result.cache_status}")
 
-            # Create markdown table
-            if display_rows and result.columns:
-                # Header
-                headers = [col.name for col in result.columns]
-                response_parts.append("| " + " | ".join(headers) + " |")
-                response_parts.append("| " + " | ".join(["---"] * len(headers)) + " |")
+        if isinstance(result.approximation, ApproximationInfo):
+            response_parts.append(f"- Approximate: {result.approximation.to_text()}")
 
-                # Rows
-                for row in display_rows:
-                    values = [str(row.get(col.name, "NULL")) for col in result.columns]
-                    response_parts.append("| " + " | ".join(values) + " |")
+        if result.errors:
+            response_parts.append("\n## Notes")
+            response_parts.extend(f"- {note}" for note in result.errors)
 
-                if result.row_count > 10:
-                    response_parts.append(f"\n*... and {result.row_count - 10} more rows*")
-        else:
-            response_parts.append("\n*No rows returned*")
+        response_parts.append(await _render_preview(result, render_options, ctx))
 
         logger.info(
             "execute_query_success",
@@ -436,6 +700,216 @@ async def handle_execute_query(arguments: dict[str, Any], ctx: Any) -> list[Text
         ]
 
 
+async def handle_execute_queries(
+    arguments: dict[str, Any], ctx: Any, progress: ProgressCallback | None = None
+) -> list[TextContent]:
+    """
+    Handle execute_queries (batch) tool call.
+
+    Args:
+    ----------
+        arguments: Tool arguments
+        ctx: Server context
+        progress: Optional callback receiving each item as it completes
+
+    Returns:
+    ----------
+        List of text content with per-query results in completion order
+    """
+    queries = arguments.get("queries")
+    if not isinstance(queries, list) or not queries:
+        return [TextContent(type="text", text="❌ Error: queries must be a non-empty list")]
+
+    query_config = getattr(getattr(ctx, "config", None), "query", None)
+    if not isinstance(query_config, QueryConfig):
+        query_config = QueryConfig()
+    if len(queries) > query_config.batch_max_queries:
+        return [
+            TextContent(
+                type="text",
+                text=(
+                    f"❌ Error: at most {query_config.batch_max_queries} queries per batch "
+                    f"({len(queries)} given)"
+                ),
+            )
+        ]
+
+    pairs: list[tuple[str, str]] = []
+    for i, query in enumerate(queries, 1):
+        natural_language = query.get("natural_language") if isinstance(query, dict) else None
+        if not natural_language:
+            error = f"❌ Error: queries[{i}].natural_language is required"
+            return [TextContent(type="text", text=error)]
+        pairs.append((natural_language, query.get("database") or ctx.config.default_database))
+
+    limit = min(int(arguments.get("limit", 1000)), 10000)
+    try:
+        render_options = _build_render_options({"preview_rows": 5, **arguments}, ctx)
+    except ValueError as e:
+        return [TextContent(type="text", text=f"❌ Error: {str(e)}")]
+
+    logger.info("execute_queries_called", query_count=len(pairs), limit=limit)
+
+    start = time.perf_counter()
+    sections: list[str] = []
+    succeeded = 0
+    batch = ctx.query_executor.execute_batch(
+        pairs, limit=limit, llm_concurrency=query_config.batch_llm_concurrency
+    )
+    try:
+        async for item in batch:
+            succeeded += item.success
+            sections.append(await _format_batch_item(item, render_options, ctx))
+            if progress is not None:
+                outcome = (
+                    f"{item.result.row_count} rows" if item.success else f"failed: {item.error}"
+                )
+                try:
+                    await progress(
+                        len(sections),
+                        len(pairs),
+                        f"[{item.index + 1}] {outcome} ({item.total_ms:.0f}ms)",
+                    )
+                except Exception as e:
+                    logger.warning("execute_queries_progress_failed", error=str(e))
+    finally:
+        await batch.aclose()
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(
+        "execute_queries_complete",
+        query_count=len(pairs),
+        succeeded=succeeded,
+        elapsed_ms=round(elapsed_ms, 2),
+    )
+    header = (
+        f"## Batch results\n- Queries: {len(pairs)} ({succeeded} succeeded)\n"
+        f"- Total time: {elapsed_ms:.2f}ms\n- Order: completion order"
+    )
+    return [TextContent(type="text", text="\n\n".join([header, *sections]))]
+
+
+async def _format_batch_item(item: BatchItemResult, options: RenderOptions, ctx: Any) -> str:
+    """Render one batch item with its timing breakdown and preview."""
+    title = f"### {'✅' if item.success else '❌'} [{item.index + 1}] {item.natural_language}"
+    timing = (
+        f"- Timing: generation {item.generation_ms:.0f}ms, "
+        f"connection wait {item.queue_ms:.0f}ms, execution {item.execution_ms:.0f}ms, "
+        f"completed at {item.total_ms:.0f}ms"
+    )
+    parts = [title, f"- Database: {item.database}"]
+    if not item.success or item.result is None:
+        parts.extend([f"- Error: {item.error}", timing])
+        return "\n".join(parts)
+
+    result = item.result
+    truncated = " (truncated)" if result.truncated else ""
+    parts.append(f"- Rows returned: {result.row_count}{truncated}")
+    if result.cache_status:
+        parts.append(f"- Cache: {result.cache_status}")
+    parts.append(timing)
+    parts.append(f"\n```sql\n{result.sql}\n```")
+    parts.extend(f"- {note}" for note in result.errors)
+    parts.append(await _render_preview(result, options, ctx))
+    return "\n".join(parts)
+
+
+async def handle_export_query(arguments: dict[str, Any], ctx: Any) -> list[TextContent]:
+    """
+    Handle export_query tool call with error recovery.
+
+    Args:
+    ----------
+        arguments: Tool arguments
+        ctx: Server context
+
+    Returns:
+    ----------
+        List of text content with export summary
+    """
+    from postgres_mcp.db.result_exporter import ExportCompression, ExportFormat
+
+    natural_language = arguments.get("natural_language")
+    path = arguments.get("path")
+    database = arguments.get("database")
+    chunk_size = arguments.get("chunk_size")
+    overwrite = bool(arguments.get("overwrite", False))
+
+    if not natural_language:
+        return [TextContent(type="text", text="❌ Error: natural_language is required")]
+    if not path:
+        return [TextContent(type="text", text="❌ Error: path is required")]
+
+    try:
+        fmt = ExportFormat(arguments.get("format", "csv"))
+        compression = ExportCompression(arguments.get("compression", "none"))
+    except ValueError as e:
+        return [TextContent(type="text", text=f"❌ Error: {str(e)}")]
+
+    # Use default database if not specified
+    if not database:
+        database = ctx.config.default_database
+        logger.info(
+            "using_default_database",
+            database=database,
+        )
+
+    logger.info(
+        "export_query_called",
+        database=database,
+        query_length=len(natural_language),
+        format=fmt.value,
+        compression=compression.value,
+    )
+
+    try:
+        stats = await ctx.query_executor.export(
+            natural_language=natural_language,
+            database=database,
+            path=path,
+            fmt=fmt,
+            compression=compression,
+            chunk_size=chunk_size,
+            overwrite=overwrite,
+        )
+
+        columns_text = ", ".join(f"`{col.name}` ({col.type})" for col in stats.columns)
+        response_parts = [
+            f"## Export Complete\n\n- File: `{stats.path}`",
+            f"- Format: {stats.format.value} (compression: {stats.compression.value})",
+            f"- Rows written: {stats.row_count}",
+            f"- File size: {stats.bytes_written} bytes",
+            f"- Elapsed: {stats.elapsed_ms:.2f}ms ({stats.rows_per_second:.0f} rows/s)",
+        ]
+        if columns_text:
+            response_parts.append(f"- Columns: {columns_text}")
+
+        logger.info(
+            "export_query_success",
+            database=database,
+            row_count=stats.row_count,
+            bytes_written=stats.bytes_written,
+        )
+
+        return [TextContent(type="text", text="\n".join(response_parts))]
+
+    except Exception as e:
+        error_type = type(e).__name__
+        logger.error(
+            "query_export_failed",
+            database=database,
+            error_type=error_type,
+            error=str(e),
+            exc_info=True,
+        )
+        return [
+            TextContent(
+                type="text",
+                text=f"❌ Query export failed ({error_type}): {str(e)}",
+            )
+        ]
+
+
 async def handle_list_databases(ctx: Any) -> list[TextContent]:
     """
     Handle list_databases tool call with error recovery.
@@ -44,6 +44,8 @@ class DatabaseConnection(BaseModel, frozen=True):
         min_pool_size: Minimum pool size.
         max_pool_size: Maximum pool size.
         connection_type: Connection type (preconfigured or dynamic).
+        max_plan_cost: Cost guard budget override for this database.
+        max_plan_rows: Cost guard row budget override for this database.
 
     Returns:
     ----------
@@ -64,6 +66,8 @@ class DatabaseConnection(BaseModel, frozen=True):
     min_pool_size: int = Field(5, ge=1, le=50)
     max_pool_size: int = Field(20, ge=1, le=100)
     connection_type: ConnectionType = ConnectionType.PRECONFIGURED
+    max_plan_cost: float | None = Field(None, gt=0)
+    max_plan_rows: int | None = Field(None, ge=1)
 
     @field_validator("name")
     @classmethod
@@ -21,6 +21,7 @@ class LogStatus(str, Enum):
     EXECUTION_FAILED = "execution_failed"
     AI_FAILED = "ai_failed"
     TEMPLATE_MATCHED = "template_matched"
+    COST_REJECTED = "cost_rejected"
 
 
 class QueryLogEntry(BaseModel):
@@ -35,7 +36,9 @@ class QueryLogEntry(BaseModel):
         natural_language: Original natural language query
         sql: Generated SQL statement
         status: Execution status
-        execution_time_ms: Query execution duration in milliseconds
+        execution_time_ms: Total request duration in milliseconds
+        generation_time_ms: SQL generation duration in milliseconds
+        query_time_ms: Database execution duration in milliseconds
         row_count: Number of rows returned
         error_message: Error message if failed
         generation_method: SQL generation method used
@@ -49,6 +52,8 @@ class QueryLogEntry(BaseModel):
     sql: str | None = None
     status: LogStatus
     execution_time_ms: float | None = Field(None, ge=0)
+    generation_time_ms: float | None = Field(None, ge=0)
+    query_time_ms: float | None = Field(None, ge=0)
     row_count: int | None = Field(None, ge=0)
     error_message: str | None = None
     generation_method: str | None = None
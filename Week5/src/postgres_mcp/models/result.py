@@ -46,6 +46,45 @@ class ColumnInfo(BaseModel, frozen=True):
     table: str | None = None
 
 
+class ApproximationInfo(BaseModel):
+    """
+    Describes an approximate (sampled) query result.
+
+    Args:
+    ----------
+        table: Sampled table.
+        sample_percent: TABLESAMPLE SYSTEM percentage.
+        confidence: Confidence level of the reported margins.
+        estimated_columns: Columns holding estimates; each has a
+            "<name>_margin" column with its margin of error.
+        refining: Whether a more accurate answer is being computed.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    table: str
+    sample_percent: float = Field(gt=0, le=100)
+    confidence: float = 0.95
+    estimated_columns: list[str] = Field(default_factory=list)
+    refining: bool = False
+
+    def to_text(self) -> str:
+        """Render a one-line description for responses."""
+        text = (
+            f"~{self.sample_percent:g}% sample of {self.table}; "
+            f"{self.confidence:.0%} margins in *_margin columns"
+        )
+        if self.refining:
+            text += "; exact answer computing in background (re-run to get it)"
+        return text
+
+
 class QueryResult(BaseModel):
     """
     Query execution result model.
@@ -59,6 +98,10 @@ class QueryResult(BaseModel):
         truncated: Whether results were truncated.
         sql: The SQL query that was executed (optional).
         errors: Error messages if any.
+        plan_summary: Cost guard plan summary (optional).
+        cache_status: Result cache status ("hit", "miss" or "bypass"; None
+            when caching is disabled).
+        approximation: Sampling details when the result is approximate.
 
     Returns:
     ----------
@@ -76,6 +119,9 @@ class QueryResult(BaseModel):
     truncated: bool = False
     sql: str | None = None
     errors: list[str] = Field(default_factory=list)
+    plan_summary: str | None = None
+    cache_status: str | None = None
+    approximation: ApproximationInfo | None = None
 
     @computed_field
     @property
@@ -118,8 +164,68 @@ class QueryResult(BaseModel):
         if not self.columns:
             return ""
 
+        names = [col.name for col in self.columns]
         output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=[col.name for col in self.columns])
-        writer.writeheader()
-        writer.writerows(self.rows)
+        writer = csv.writer(output)
+        writer.writerow(names)
+        # Plain tuples avoid DictWriter's per-row key validation.
+        writer.writerows([tuple(map(row.get, names)) for row in self.rows])
         return output.getvalue()
+
+
+class BatchItemResult(BaseModel):
+    """
+    Outcome of one query in a batch execution.
+
+    Args:
+    ----------
+        index: Position of the query in the batch (0-based).
+        natural_language: The query's natural language text.
+        database: Target database name.
+        result: Query result (None if the item failed).
+        error: Error message if the item failed.
+        generation_ms: Time spent generating SQL (including waiting for an
+            LLM slot).
+        queue_ms: Time spent waiting for the database connection.
+        execution_ms: Time spent executing on the database.
+        total_ms: Time from batch start until the item completed.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    index: int = Field(ge=0)
+    natural_language: str
+    database: str
+    result: QueryResult | None = None
+    error: str | None = None
+    generation_ms: float = 0.0
+    queue_ms: float = 0.0
+    execution_ms: float = 0.0
+    total_ms: float = 0.0
+
+    @computed_field
+    @property
+    def success(self) -> bool:
+        """
+        Indicate whether the item produced a result.
+
+        Args:
+        ----------
+            None
+
+        Returns:
+        ----------
+            True if the item has a result and no error.
+
+        Raises:
+        ----------
+            None
+        """
+
+        return self.result is not None and self.error is None
@@ -22,6 +22,60 @@ from typing import Any
 from pydantic import BaseModel, Field, computed_field
 
 
+class ColumnStats(BaseModel, frozen=True):
+    """
+    Planner statistics for a column (from ``pg_stats``).
+
+    Args:
+    ----------
+        null_frac: Fraction of NULL values.
+        n_distinct: Distinct values; negative values are a fraction of the
+            row count (-1 means unique), as in pg_stats.
+        most_common_vals: Most common values (text form), most frequent first.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    null_frac: float = 0.0
+    n_distinct: float | None = None
+    most_common_vals: list[str] = Field(default_factory=list)
+
+    @property
+    def values_complete(self) -> bool:
+        """Whether most_common_vals lists every non-NULL value of the column."""
+        return (
+            self.n_distinct is not None
+            and self.n_distinct > 0
+            and len(self.most_common_vals) >= self.n_distinct
+        )
+
+    def distinct_estimate(self, row_count: int | None) -> int | None:
+        """
+        Estimate the number of distinct values.
+
+        Args:
+        ----------
+            row_count: Estimated table row count (needed for negative n_distinct)
+
+        Returns:
+        ----------
+            Estimated distinct count, or None if unknown
+        """
+        if self.n_distinct is None:
+            return None
+        if self.n_distinct >= 0:
+            return int(self.n_distinct)
+        if row_count is None:
+            return None
+        return int(-self.n_distinct * row_count)
+
+
 class ColumnSchema(BaseModel, frozen=True):
     """
     Column schema details.
@@ -35,6 +89,8 @@ class ColumnSchema(BaseModel, frozen=True):
         foreign_key_table: Referenced table name if a foreign key.
         foreign_key_column: Referenced column name if a foreign key.
         default_value: Default value expression.
+        stats: Planner statistics (None until ANALYZE has run or when
+            statistics loading is disabled).
 
     Returns:
     ----------
@@ -52,6 +108,7 @@ class ColumnSchema(BaseModel, frozen=True):
     foreign_key_table: str | None = None
     foreign_key_column: str | None = None
     default_value: str | None = None
+    stats: ColumnStats | None = None
 
 
 class IndexSchema(BaseModel, frozen=True):
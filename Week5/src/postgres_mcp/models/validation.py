@@ -37,6 +37,7 @@ class ValidationIssue(str, Enum):
         COLUMN_MISMATCH: Column names don't match user request keywords.
         TYPE_MISMATCH: Data types inconsistent with expectations.
         SEMANTIC_MISMATCH: AI detected semantic mismatch with user intent.
+        VALUE_MISMATCH: Filter compares a column with a value it never holds.
     """
 
     EMPTY_RESULT = "empty_result"
@@ -45,6 +46,7 @@ class ValidationIssue(str, Enum):
     COLUMN_MISMATCH = "column_mismatch"
     TYPE_MISMATCH = "type_mismatch"
     SEMANTIC_MISMATCH = "semantic_mismatch"
+    VALUE_MISMATCH = "value_mismatch"
 
 
 class ValidationSeverity(str, Enum):
@@ -2,41 +2,75 @@
 FastMCP server implementation.
 
 Main entry point for the PostgreSQL MCP server with lifespan management.
+Serves a single client over stdio, or many clients over streamable HTTP
+sharing one set of pools, caches and OpenAI client.
+
+Heavy dependencies (openai, sqlglot, asyncpg, pybreaker) are not imported at
+module load. Services are built in two stages on first use: the database
+stage (pools, schema cache, query history) and the AI stage (OpenAI client,
+SQL validator/generator, query executor). ``--warm`` starts both stages in
+the background right after the MCP handshake.
 """
 
+from __future__ import annotations
+
+import argparse
 import asyncio
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import structlog
+from mcp import types
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 
-from postgres_mcp.ai.openai_client import OpenAIClient
 from postgres_mcp.config import Config
-from postgres_mcp.core.query_executor import QueryExecutor
-from postgres_mcp.core.schema_cache import SchemaCache
-from postgres_mcp.core.sql_generator import SQLGenerator
-from postgres_mcp.core.sql_validator import SQLValidator
-from postgres_mcp.db.connection_pool import PoolManager
-from postgres_mcp.db.query_runner import QueryRunner
-from postgres_mcp.db.schema_inspector import SchemaInspector
-from postgres_mcp.mcp.resources import register_resources
+from postgres_mcp.mcp.resources import FEED_URIS, ResourceSubscriptions, register_resources
 from postgres_mcp.mcp.tools import register_tools
-from postgres_mcp.utils.jsonl_writer import JSONLWriter
+from postgres_mcp.utils.client_accounting import ClientRegistry
+
+if TYPE_CHECKING:
+    from postgres_mcp.ai.openai_client import OpenAIClient
+    from postgres_mcp.core.query_executor import QueryExecutor
+    from postgres_mcp.core.result_cache import ResultCache
+    from postgres_mcp.core.schema_cache import SchemaCache
+    from postgres_mcp.core.sql_generator import SQLGenerator
+    from postgres_mcp.core.sql_validator import SQLValidator
+    from postgres_mcp.core.template_library import TemplateLibrary
+    from postgres_mcp.db.connection_pool import PoolManager
+    from postgres_mcp.db.query_runner import QueryRunner
+    from postgres_mcp.mcp.resources import SchemaResourceCache
+    from postgres_mcp.utils.cpu_offload import CPUOffloader
+    from postgres_mcp.utils.jsonl_writer import JSONLWriter
+    from postgres_mcp.utils.query_feed import QueryFeed
 
 logger = structlog.get_logger(__name__)
 
+# Modules imported by the lazy service stages, preloaded by --warm.
+WARM_MODULES = (
+    "asyncpg",
+    "pybreaker",
+    "sqlglot",
+    "openai",
+    "postgres_mcp.db.connection_pool",
+    "postgres_mcp.core.schema_cache",
+    "postgres_mcp.core.query_executor",
+)
+
 
 class ServerContext:
     """
     Shared server context for MCP tools and resources.
 
-    Holds all service instances needed for MCP operations.
+    Holds all service instances needed for MCP operations. Services are
+    created lazily by ensure_database_services() / ensure_ai_services().
     """
 
     def __init__(self):
         """Initialize empty context."""
+        self.config: Config | None = None
         self.schema_cache: SchemaCache | None = None
         self.sql_generator: SQLGenerator | None = None
         self.sql_validator: SQLValidator | None = None
@@ -45,6 +79,68 @@ class ServerContext:
         self.query_runner: QueryRunner | None = None
         self.query_executor: QueryExecutor | None = None
         self.jsonl_writer: JSONLWriter | None = None
+        self.schema_resources: SchemaResourceCache | None = None
+        self.clients = ClientRegistry()
+        self.subscriptions = ResourceSubscriptions()
+        self.query_feed: QueryFeed | None = None
+        self.offloader: CPUOffloader | None = None
+        self.result_cache: ResultCache | None = None
+        self.template_library: TemplateLibrary | None = None
+        self._database_ready = False
+        self._ai_ready = False
+        self._init_lock = asyncio.Lock()
+
+    async def ensure_database_services(self) -> None:
+        """
+        Initialize pools, schema cache and query history on first use.
+
+        Raises:
+        ----------
+            RuntimeError: If the configuration has not been loaded
+            Exception: When connection or schema inspection fails
+        """
+        if self._database_ready:
+            return
+        async with self._init_lock:
+            if not self._database_ready:
+                await _timed_stage(
+                    "database", _init_database_services, _cleanup_database_services, self
+                )
+                self._database_ready = True
+
+    async def ensure_ai_services(self) -> None:
+        """
+        Initialize the OpenAI client, SQL generation and execution on first use.
+
+        Raises:
+        ----------
+            RuntimeError: If the configuration has not been loaded
+            Exception: When service initialization fails
+        """
+        if self._ai_ready:
+            return
+        await self.ensure_database_services()
+        async with self._init_lock:
+            if not self._ai_ready:
+                await _timed_stage("ai", _init_ai_services, _cleanup_ai_services, self)
+                self._ai_ready = True
+
+    async def warm(self) -> None:
+        """
+        Preload heavy modules off the event loop, then build all services.
+
+        Failures are logged only; the next tool call retries initialization.
+        """
+        try:
+            start = time.perf_counter()
+            await asyncio.to_thread(_preload_modules)
+            logger.info(
+                "warm_modules_loaded",
+                elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+            )
+            await self.ensure_ai_services()
+        except Exception as e:
+            logger.warning("warm_start_failed", error_type=type(e).__name__, error=str(e))
 
 
 # Global server context
@@ -67,12 +163,352 @@ def get_context() -> ServerContext:
     return _context
 
 
+def _preload_modules() -> None:
+    """Import the modules used by the lazy service stages."""
+    import importlib
+
+    for module in WARM_MODULES:
+        importlib.import_module(module)
+
+
+async def _timed_stage(stage: str, init, cleanup, ctx: ServerContext) -> None:
+    """
+    Run a service initialization stage, logging its duration.
+
+    If the stage fails, only the services it creates are cleaned up (via the
+    stage's own cleanup) so that a later call can retry it. Services of the
+    earlier stage keep running; other clients may be using them.
+    """
+    if ctx.config is None:
+        raise RuntimeError("server configuration is not loaded")
+
+    start = time.perf_counter()
+    try:
+        await init(ctx, ctx.config)
+    except Exception as e:
+        logger.error("service_stage_failed", stage=stage, error=str(e))
+        cleanup_errors = await cleanup(ctx)
+        if cleanup_errors:
+            logger.warning("service_stage_cleanup_errors", stage=stage, errors=cleanup_errors)
+        raise
+    logger.info(
+        "service_stage_ready",
+        stage=stage,
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
+
+
+async def _init_database_services(ctx: ServerContext, config: Config) -> None:
+    """Create pools, query history writer, schema cache and schema resources."""
+    from postgres_mcp.core.schema_cache import SchemaCache
+    from postgres_mcp.db.connection_pool import PoolManager
+    from postgres_mcp.db.query_runner import QueryRunner
+    from postgres_mcp.db.schema_inspector import SchemaInspector
+    from postgres_mcp.mcp.resources import SchemaResourceCache
+    from postgres_mcp.utils.cpu_offload import CPUOffloader
+    from postgres_mcp.utils.jsonl_writer import JSONLWriter
+    from postgres_mcp.utils.query_feed import QueryFeed
+
+    # Process pool for CPU-bound stages (created on first offloaded call)
+    ctx.offloader = CPUOffloader(config.offload)
+    logger.info("cpu_offloader_initialized", enabled=config.offload.enabled)
+
+    # Initialize connection pool manager
+    ctx.pool_manager = PoolManager(db_configs=config.databases)
+    await ctx.pool_manager.initialize()
+    logger.info("pool_manager_initialized")
+
+    # Initialize query runner
+    ctx.query_runner = QueryRunner(timeout_seconds=30.0)
+    logger.info("query_runner_initialized")
+
+    # Live feed of query history entries (history://tail, stats://queries)
+    ctx.query_feed = QueryFeed(
+        capacity=config.logging.feed_size,
+        window_seconds=config.logging.metrics_window_seconds,
+    )
+    ctx.query_feed.add_listener(lambda sequence, entry: ctx.subscriptions.notify(*FEED_URIS))
+
+    # Initialize JSONL writer for query history
+    log_dir = Path(config.logging.directory)
+    ctx.jsonl_writer = JSONLWriter(
+        log_directory=log_dir,
+        buffer_size=config.logging.buffer_size,
+        flush_interval_seconds=config.logging.flush_interval_seconds,
+        max_file_size_mb=config.logging.max_file_size_mb,
+        retention_days=config.logging.retention_days,
+        feed=ctx.query_feed,
+    )
+    await ctx.jsonl_writer.start()
+    logger.info("jsonl_writer_initialized", log_directory=str(log_dir))
+
+    # Initialize schema inspectors for each database
+    inspectors = {}
+    for db_config in config.databases:
+        inspector = SchemaInspector(
+            host=db_config.host,
+            port=db_config.port,
+            user=db_config.user,
+            password=db_config.password,
+            database=db_config.database,
+            load_stats=config.schema_cache.load_sample_data,
+        )
+        inspectors[db_config.name] = inspector
+
+    # Initialize schema cache
+    ctx.schema_cache = SchemaCache(
+        databases=inspectors,
+        auto_refresh_interval=config.schema_cache.poll_interval_minutes * 60,
+    )
+    await ctx.schema_cache.initialize()
+    logger.info("schema_cache_initialized")
+
+    # Pre-render schema resources in the background; refreshes invalidate them
+    ctx.schema_resources = SchemaResourceCache(ctx.schema_cache, offloader=ctx.offloader)
+    ctx.schema_resources.start_precompute()
+    logger.info("schema_resources_precompute_started")
+
+
+async def _init_ai_services(ctx: ServerContext, config: Config) -> None:
+    """Create the OpenAI client, SQL validator, generator and query executor."""
+    from postgres_mcp.ai.openai_client import OpenAIClient
+    from postgres_mcp.ai.prompt_builder import PromptBuilder
+    from postgres_mcp.core.approximate import Approximator
+    from postgres_mcp.core.cost_guard import build_cost_guard
+    from postgres_mcp.core.query_executor import QueryExecutor
+    from postgres_mcp.core.result_cache import ResultCache
+    from postgres_mcp.core.result_validator import ResultValidator
+    from postgres_mcp.core.sql_generator import SQLGenerator
+    from postgres_mcp.core.sql_validator import SQLValidator
+    from postgres_mcp.core.template_library import TemplateLibrary
+    from postgres_mcp.db.result_exporter import ResultExporter
+    from postgres_mcp.utils.template_loader import TemplateLoader, TemplateLoadError
+
+    # Initialize OpenAI client
+    ctx.openai_client = OpenAIClient(
+        api_key=config.openai.resolved_api_key,
+        model=config.openai.model,
+        temperature=config.openai.temperature,
+        max_tokens=config.openai.max_tokens,
+        timeout=config.openai.timeout,
+        base_url=config.openai.base_url,
+    )
+    logger.info("openai_client_initialized")
+
+    # Initialize SQL validator
+    ctx.sql_validator = SQLValidator()
+    logger.info("sql_validator_initialized")
+
+    # Template fallback library, rebuilt in the background when files change
+    if config.templates.enabled:
+        try:
+            library = TemplateLibrary(
+                TemplateLoader(Path(config.templates.directory)),
+                poll_interval_seconds=config.templates.poll_interval_seconds,
+            )
+            await library.load()
+        except TemplateLoadError as e:
+            logger.warning("template_library_unavailable", error=str(e))
+        else:
+            if config.templates.hot_reload:
+                library.start()
+            ctx.template_library = library
+            logger.info(
+                "template_library_initialized",
+                templates=len(library.templates),
+                hot_reload=config.templates.hot_reload,
+            )
+
+    # Initialize SQL generator
+    max_sample_values = (
+        config.schema_cache.max_sample_rows if config.schema_cache.load_sample_data else 0
+    )
+    ctx.sql_generator = SQLGenerator(
+        schema_cache=ctx.schema_cache,
+        openai_client=ctx.openai_client,
+        sql_validator=ctx.sql_validator,
+        prompt_builder=PromptBuilder(max_sample_values=max_sample_values),
+        template_matcher=ctx.template_library,
+        offloader=ctx.offloader,
+    )
+    logger.info("sql_generator_initialized")
+
+    # EXPLAIN pre-flight against per-database budgets (optional)
+    cost_guard = None
+    if config.query.cost_guard_enabled:
+        cost_guard = build_cost_guard(config.query, config.databases)
+        logger.info("cost_guard_initialized", action=config.query.cost_guard_action)
+
+    # Result cache invalidated by table write counters and schema refreshes
+    result_cache = None
+    if config.result_cache.enabled:
+        result_cache = ResultCache(
+            ctx.pool_manager,
+            max_bytes=config.result_cache.max_memory_mb * 1024 * 1024,
+            ttl_seconds=config.result_cache.ttl_seconds,
+            poll_interval_seconds=config.result_cache.poll_interval_seconds,
+        )
+        ctx.result_cache = result_cache
+        logger.info("result_cache_initialized", max_memory_mb=config.result_cache.max_memory_mb)
+
+    # Sampled answers for execute_query(approximate=true)
+    approximator = Approximator(
+        target_sample_rows=config.query.approximate_target_rows,
+        min_table_rows=config.query.approximate_min_table_rows,
+        refine=config.query.approximate_refine,
+    )
+
+    # Initialize query executor
+    ctx.query_executor = QueryExecutor(
+        sql_generator=ctx.sql_generator,
+        pool_manager=ctx.pool_manager,
+        query_runner=ctx.query_runner,
+        jsonl_writer=ctx.jsonl_writer,
+        result_validator=ResultValidator(
+            openai_client=ctx.openai_client, schema_cache=ctx.schema_cache
+        ),
+        enable_validation=config.query.enable_result_validation,
+        result_exporter=ResultExporter(
+            offloader=ctx.offloader, export_root=config.query.export_directory
+        ),
+        cost_guard=cost_guard,
+        result_cache=ctx.result_cache,
+        approximator=approximator,
+    )
+    logger.info("query_executor_initialized")
+
+    # Registered last so a failed stage leaves no listener on the shared cache
+    if result_cache is not None:
+        ctx.schema_cache.add_refresh_listener(
+            lambda database, schema, version: result_cache.clear(database)
+        )
+
+
+async def _cleanup_ai_services(ctx: ServerContext) -> list[str]:
+    """
+    Stop and release the services created by the AI stage.
+
+    Returns:
+    ----------
+        List of cleanup error descriptions
+    """
+    cleanup_errors = []
+
+    # Cancel background approximate-answer refinements
+    if ctx.query_executor:
+        try:
+            await ctx.query_executor.close()
+        except Exception as e:
+            cleanup_errors.append(f"query_executor: {str(e)}")
+
+    # Stop result cache counter polling
+    if ctx.result_cache:
+        try:
+            await ctx.result_cache.close()
+        except Exception as e:
+            cleanup_errors.append(f"result_cache: {str(e)}")
+
+    # Stop watching the template directory
+    if ctx.template_library:
+        try:
+            await ctx.template_library.close()
+        except Exception as e:
+            cleanup_errors.append(f"template_library: {str(e)}")
+
+    ctx.openai_client = None
+    ctx.sql_validator = None
+    ctx.sql_generator = None
+    ctx.query_executor = None
+    ctx.result_cache = None
+    ctx.template_library = None
+    ctx._ai_ready = False
+    return cleanup_errors
+
+
+async def _cleanup_database_services(ctx: ServerContext) -> list[str]:
+    """
+    Stop and release the services created by the database stage.
+
+    Returns:
+    ----------
+        List of cleanup error descriptions
+    """
+    cleanup_errors = []
+
+    # Stop JSONL writer and flush remaining buffer
+    if ctx.jsonl_writer:
+        try:
+            await ctx.jsonl_writer.stop()
+        except Exception as e:
+            cleanup_errors.append(f"jsonl_writer: {str(e)}")
+
+    # Close connection pool manager
+    if ctx.pool_manager:
+        try:
+            await ctx.pool_manager.close_all()
+        except Exception as e:
+            cleanup_errors.append(f"pool_manager: {str(e)}")
+
+    # Cancel pending schema resource renders
+    if ctx.schema_resources:
+        try:
+            await ctx.schema_resources.close()
+        except Exception as e:
+            cleanup_errors.append(f"schema_resources: {str(e)}")
+
+    # Cleanup schema cache
+    if ctx.schema_cache:
+        try:
+            await ctx.schema_cache.cleanup()
+        except Exception as e:
+            cleanup_errors.append(f"schema_cache: {str(e)}")
+
+    # Stop offload worker processes
+    if ctx.offloader:
+        try:
+            ctx.offloader.shutdown()
+        except Exception as e:
+            cleanup_errors.append(f"offloader: {str(e)}")
+
+    ctx.jsonl_writer = None
+    ctx.query_feed = None
+    ctx.query_runner = None
+    ctx.offloader = None
+    ctx.pool_manager = None
+    ctx.schema_resources = None
+    ctx.schema_cache = None
+    ctx._database_ready = False
+    return cleanup_errors
+
+
+async def _cleanup_services(ctx: ServerContext) -> list[str]:
+    """
+    Stop and release every initialized service.
+
+    Returns:
+    ----------
+        List of cleanup error descriptions
+    """
+    # AI services depend on the database services, so they stop first
+    cleanup_errors = await _cleanup_ai_services(ctx)
+    cleanup_errors.extend(await _cleanup_database_services(ctx))
+
+    # Cancel a pending resource update notification
+    try:
+        await ctx.subscriptions.close()
+    except Exception as e:
+        cleanup_errors.append(f"subscriptions: {str(e)}")
+
+    return cleanup_errors
+
+
 @asynccontextmanager
 async def server_lifespan():
     """
     Server lifespan context manager.
 
-    Handles initialization and cleanup of all server resources.
+    Loads configuration eagerly (so configuration errors fail fast) and
+    cleans up whichever services were lazily initialized on exit.
 
     Yields:
     ----------
@@ -89,85 +525,13 @@ async def server_lifespan():
     try:
         # Load configuration
         config = Config.load()
+        _context.config = config
         logger.info(
             "config_loaded",
             database_count=len(config.databases),
             openai_model=config.openai.model,
         )
 
-        # Initialize OpenAI client
-        _context.openai_client = OpenAIClient(
-            api_key=config.openai.resolved_api_key,
-            model=config.openai.model,
-            temperature=config.openai.temperature,
-            max_tokens=config.openai.max_tokens,
-            timeout=config.openai.timeout,
-            base_url=config.openai.base_url,
-        )
-        logger.info("openai_client_initialized")
-
-        # Initialize SQL validator
-        _context.sql_validator = SQLValidator()
-        logger.info("sql_validator_initialized")
-
-        # Initialize connection pool manager
-        _context.pool_manager = PoolManager(db_configs=config.databases)
-        await _context.pool_manager.initialize()
-        logger.info("pool_manager_initialized")
-
-        # Initialize query runner
-        _context.query_runner = QueryRunner(timeout_seconds=30.0)
-        logger.info("query_runner_initialized")
-
-        # Initialize JSONL writer for query history
-        log_dir = Path(config.logging.directory)
-        _context.jsonl_writer = JSONLWriter(
-            log_directory=log_dir,
-            buffer_size=config.logging.buffer_size,
-            flush_interval_seconds=config.logging.flush_interval_seconds,
-            max_file_size_mb=config.logging.max_file_size_mb,
-            retention_days=config.logging.retention_days,
-        )
-        await _context.jsonl_writer.start()
-        logger.info("jsonl_writer_initialized", log_directory=str(log_dir))
-
-        # Initialize schema inspectors for each database
-        inspectors = {}
-        for db_config in config.databases:
-            inspector = SchemaInspector(
-                host=db_config.host,
-                port=db_config.port,
-                user=db_config.user,
-                password=db_config.password,
-                database=db_config.database,
-            )
-            inspectors[db_config.name] = inspector
-
-        # Initialize schema cache
-        _context.schema_cache = SchemaCache(
-            databases=inspectors,
-            auto_refresh_interval=300,  # 5 minutes
-        )
-        await _context.schema_cache.initialize()
-        logger.info("schema_cache_initialized")
-
-        # Initialize SQL generator
-        _context.sql_generator = SQLGenerator(
-            schema_cache=_context.schema_cache,
-            openai_client=_context.openai_client,
-            sql_validator=_context.sql_validator,
-        )
-        logger.info("sql_generator_initialized")
-
-        # Initialize query executor
-        _context.query_executor = QueryExecutor(
-            sql_generator=_context.sql_generator,
-            pool_manager=_context.pool_manager,
-            query_runner=_context.query_runner,
-            jsonl_writer=_context.jsonl_writer,
-        )
-        logger.info("query_executor_initialized")
-
         logger.info("postgres_mcp_server_ready")
 
         # Server is now running
@@ -180,29 +544,7 @@ async def server_lifespan():
     finally:
         # Comprehensive cleanup with error handling
         # Note: Only log if stdout is still available (not during forced termination)
-
-        cleanup_errors = []
-
-        # Stop JSONL writer and flush remaining buffer
-        if _context.jsonl_writer:
-            try:
-                await _context.jsonl_writer.stop()
-            except Exception as e:
-                cleanup_errors.append(f"jsonl_writer: {str(e)}")
-
-        # Close connection pool manager
-        if _context.pool_manager:
-            try:
-                await _context.pool_manager.close_all()
-            except Exception as e:
-                cleanup_errors.append(f"pool_manager: {str(e)}")
-
-        # Cleanup schema cache
-        if _context.schema_cache:
-            try:
-                await _context.schema_cache.cleanup()
-            except Exception as e:
-                cleanup_errors.append(f"schema_cache: {str(e)}")
+        cleanup_errors = await _cleanup_services(_context)
 
         # Try to log cleanup status if possible
         try:
@@ -219,12 +561,104 @@ async def server_lifespan():
             pass
 
 
-async def main():
+def register_warm_start(server: Server) -> None:
+    """
+    Warm services in the background once the client completes the handshake.
+
+    Args:
+    ----------
+        server: MCP Server instance
+    """
+    tasks: set[asyncio.Task[None]] = set()
+
+    async def on_initialized(notification: types.InitializedNotification) -> None:
+        task = asyncio.create_task(_context.warm())
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    server.notification_handlers[types.InitializedNotification] = on_initialized
+
+
+async def serve_http(
+    server: Server, host: str, port: int, path: str, auth_token: str | None
+) -> None:
+    """
+    Serve MCP over streamable HTTP (SSE-capable) until shutdown.
+
+    All client sessions run in this process and share the global
+    ServerContext: connection pools, schema cache and OpenAI client are
+    created once, and tool calls are accounted per session. Every request
+    must carry ``Authorization: Bearer <auth_token>``.
+
+    Args:
+    ----------
+        server: MCP Server instance with tools and resources registered
+        host: Bind address
+        port: Bind port
+        path: Endpoint path (e.g. "/mcp")
+        auth_token: Bearer token required from clients
+
+    Raises:
+    ----------
+        RuntimeError: If no auth token is configured
+    """
+    if not auth_token:
+        raise RuntimeError(
+            "HTTP transport requires a bearer token "
+            "(set server.auth_token or the server.auth_token_env_var variable)"
+        )
+
+    import uvicorn
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.routing import Route
+
+    from postgres_mcp.utils.http_auth import BearerAuthMiddleware
+
+    session_manager = StreamableHTTPSessionManager(app=server)
+
+    class _MCPEndpoint:
+        async def __call__(self, scope, receive, send) -> None:
+            await session_manager.handle_request(scope, receive, send)
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        async with session_manager.run():
+            yield
+
+    app = Starlette(
+        routes=[Route(path, endpoint=_MCPEndpoint(), methods=["GET", "POST", "DELETE"])],
+        middleware=[Middleware(BearerAuthMiddleware, token=auth_token)],
+        lifespan=lifespan,
+    )
+    http_server = uvicorn.Server(
+        uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on")
+    )
+    logger.info("mcp_server_started_http", host=host, port=port, path=path)
+    await http_server.serve()
+
+
+async def main(
+    warm: bool = False,
+    transport: str | None = None,
+    host: str | None = None,
+    port: int | None = None,
+):
     """
     Main entry point for the MCP server with comprehensive error handling.
 
-    Starts the server with stdio transport and registers all tools and resources.
+    Starts the server with the stdio or streamable HTTP transport and
+    registers all tools and resources.
     Handles all errors gracefully to prevent unexpected crashes.
+
+    Args:
+    ----------
+        warm: Preload modules and services in the background (after the
+            handshake for stdio, at startup for HTTP)
+        transport: "stdio" or "http" (defaults to server.transport in config)
+        host: HTTP bind address override
+        port: HTTP bind port override
     """
     try:
         # Create MCP server
@@ -234,17 +668,36 @@ async def main():
         register_tools(server)
         register_resources(server)
 
-        logger.info("mcp_tools_and_resources_registered")
+        logger.info("mcp_tools_and_resources_registered", warm=warm)
 
         # Run server with lifespan management
         async with server_lifespan():
-            async with stdio_server() as (read_stream, write_stream):
-                logger.info("mcp_server_started_stdio")
-                await server.run(
-                    read_stream,
-                    write_stream,
-                    server.create_initialization_options(),
-                )
+            server_config = _context.config.server
+            transport = transport or server_config.transport
+
+            if transport == "http":
+                warm_task = asyncio.create_task(_context.warm()) if warm else None
+                try:
+                    await serve_http(
+                        server,
+                        host or server_config.host,
+                        port or server_config.port,
+                        server_config.http_path,
+                        server_config.resolved_auth_token,
+                    )
+                finally:
+                    if warm_task and not warm_task.done():
+                        warm_task.cancel()
+            else:
+                if warm:
+                    register_warm_start(server)
+                async with stdio_server() as (read_stream, write_stream):
+                    logger.info("mcp_server_started_stdio")
+                    await server.run(
+                        read_stream,
+                        write_stream,
+                        server.create_initialization_options(),
+                    )
     except KeyboardInterrupt:
         # Silently handle Ctrl+C
         pass
@@ -262,15 +715,35 @@ async def main():
         raise
 
 
-def run():
+def run(argv: list[str] | None = None):
     """
     Synchronous entry point for the server with comprehensive error handling.
 
     Used by __main__.py and CLI commands.
     Ensures all errors are logged and handled gracefully.
+
+    Args:
+    ----------
+        argv: Command line arguments (defaults to sys.argv[1:])
     """
+    parser = argparse.ArgumentParser(prog="postgres_mcp", description="PostgreSQL MCP server")
+    parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="preload heavy modules and services in the background after the MCP handshake",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=("stdio", "http"),
+        default=None,
+        help="transport to serve (default: server.transport from config)",
+    )
+    parser.add_argument("--host", default=None, help="HTTP bind address")
+    parser.add_argument("--port", type=int, default=None, help="HTTP bind port")
+    args = parser.parse_args(argv)
+
     try:
-        asyncio.run(main())
+        asyncio.run(main(warm=args.warm, transport=args.transport, host=args.host, port=args.port))
     except KeyboardInterrupt:
         # Silently handle Ctrl+C
         pass
@@ -0,0 +1,230 @@
+"""
+Per-client accounting for MCP sessions.
+
+When one server process serves many MCP clients (HTTP transport), tool
+calls are attributed to the calling session so usage of the shared pools,
+schema cache and OpenAI client can be broken down per client. Session ids
+are credentials for the HTTP transport, so only short hashes of them are
+ever shown to clients.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_MAX_CLIENTS = 1000
+
+# Client of the tool call currently being handled; read by QueryExecutor
+# to tag query history entries.
+current_client_id: ContextVar[str | None] = ContextVar("postgres_mcp_client_id", default=None)
+
+
+def client_fingerprint(client_id: str) -> str:
+    """
+    Short, non-reversible label for a client id, safe to show to other clients.
+
+    Args:
+    ----------
+        client_id: Session identifier
+
+    Returns:
+    ----------
+        First 12 hex digits of the SHA-256 of the id
+    """
+    return hashlib.sha256(client_id.encode("utf-8")).hexdigest()[:12]
+
+
+def client_identity(server: Any) -> tuple[str, str | None]:
+    """
+    Identify the MCP client session issuing the current request.
+
+    HTTP clients are keyed by their mcp-session-id header; stdio (and
+    stateless HTTP) sessions fall back to the session object identity.
+
+    Args:
+    ----------
+        server: MCP Server instance
+
+    Returns:
+    ----------
+        Tuple of (client_id, client_name)
+    """
+    try:
+        request_ctx = server.request_context
+    except LookupError:
+        return "local", None
+
+    session_id = None
+    headers = getattr(request_ctx.request, "headers", None)
+    if headers is not None:
+        session_id = headers.get("mcp-session-id")
+
+    client_params = getattr(request_ctx.session, "client_params", None)
+    client_name = client_params.clientInfo.name if client_params else None
+    return session_id or f"session-{id(request_ctx.session):x}", client_name
+
+
+@dataclass
+class ClientStats:
+    """
+    Usage counters for one MCP client session.
+
+    Args:
+    ----------
+        client_id: Session identifier (mcp-session-id for HTTP clients).
+        client_name: Name reported by the client during initialization.
+        first_seen: Monotonic timestamp of the first tool call.
+        last_seen: Monotonic timestamp of the latest tool call.
+        tool_calls: Number of tool calls.
+        errors: Number of failed tool calls.
+        total_duration_ms: Summed tool call duration.
+        tools: Call count per tool name.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+
+    client_id: str
+    client_name: str | None
+    first_seen: float
+    last_seen: float
+    tool_calls: int = 0
+    errors: int = 0
+    total_duration_ms: float = 0.0
+    tools: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize counters for the stats resource (the id is hashed)."""
+        now = time.monotonic()
+        return {
+            "client": client_fingerprint(self.client_id),
+            "client_name": self.client_name,
+            "tool_calls": self.tool_calls,
+            "errors": self.errors,
+            "total_duration_ms": round(self.total_duration_ms, 2),
+            "avg_duration_ms": (
+                round(self.total_duration_ms / self.tool_calls, 2) if self.tool_calls else 0.0
+            ),
+            "tools": dict(self.tools),
+            "connected_seconds": round(now - self.first_seen, 1),
+            "idle_seconds": round(now - self.last_seen, 1),
+        }
+
+
+class ClientRegistry:
+    """
+    Bounded registry of per-client usage counters.
+
+    The least recently active client is dropped once max_clients is exceeded,
+    so abandoned HTTP sessions do not accumulate without bound.
+
+    Args:
+    ----------
+        max_clients: Maximum number of clients tracked at once.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        ValueError: If max_clients is not positive.
+    """
+
+    def __init__(self, max_clients: int = DEFAULT_MAX_CLIENTS) -> None:
+        if max_clients < 1:
+            raise ValueError("max_clients must be >= 1")
+        self._max_clients = max_clients
+        self._clients: OrderedDict[str, ClientStats] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, client_id: str) -> ClientStats | None:
+        """Return the counters for a client, if tracked."""
+        return self._clients.get(client_id)
+
+    def record(
+        self,
+        client_id: str,
+        tool: str,
+        duration_ms: float,
+        success: bool,
+        client_name: str | None = None,
+    ) -> ClientStats:
+        """
+        Record one tool call for a client.
+
+        Args:
+        ----------
+            client_id: Session identifier.
+            tool: Tool name.
+            duration_ms: Tool call duration.
+            success: Whether the call succeeded.
+            client_name: Client name from the initialize request.
+
+        Returns:
+        ----------
+            Updated counters for the client.
+        """
+        now = time.monotonic()
+        stats = self._clients.get(client_id)
+        if stats is None:
+            stats = ClientStats(
+                client_id=client_id, client_name=client_name, first_seen=now, last_seen=now
+            )
+            self._clients[client_id] = stats
+            while len(self._clients) > self._max_clients:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(client_id)
+            if client_name and not stats.client_name:
+                stats.client_name = client_name
+
+        stats.last_seen = now
+        stats.tool_calls += 1
+        stats.total_duration_ms += duration_ms
+        stats.tools[tool] = stats.tools.get(tool, 0) + 1
+        if not success:
+            stats.errors += 1
+        return stats
+
+    def snapshot(self, caller_id: str | None = None) -> list[dict[str, Any]]:
+        """
+        Return counters for all tracked clients, most recently active first.
+
+        Args:
+        ----------
+            caller_id: Session reading the snapshot; its entry is marked
+                with ``"you": true``
+
+        Returns:
+        ----------
+            Serialized counters with hashed client ids
+        """
+        return [
+            {**stats.to_dict(), "you": stats.client_id == caller_id}
+            for stats in reversed(self._clients.values())
+        ]
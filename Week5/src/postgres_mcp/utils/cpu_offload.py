@@ -0,0 +1,156 @@
+"""
+Optional process-pool offload for CPU-bound stages.
+
+SQL validation (sqlglot parsing), schema DDL rendering and CSV/Markdown
+encoding of large results are pure CPU work that would otherwise serialize
+every concurrent request on the event loop thread. CPUOffloader runs such
+work in worker processes when the payload is large enough to amortize the
+pickling round trip, and inline otherwise.
+
+Offloaded callables must be module-level functions whose arguments and
+return values are picklable.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import sys
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+import structlog
+
+from postgres_mcp.config import OffloadConfig
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def _init_worker() -> None:
+    """Keep worker output off stdout, which is the MCP stdio channel."""
+    sys.stdout = sys.stderr
+
+
+class CPUOffloader:
+    """
+    Runs pure-CPU callables in a process pool above a size threshold.
+
+    The pool is created on first use with the "spawn" start method, so
+    workers never inherit the event loop or open connections. A broken pool
+    (e.g. a worker killed by the OOM killer) is discarded and the call is
+    retried inline.
+
+    Args:
+    ----------
+        config: Offload configuration (thresholds and worker count).
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+
+    Example:
+    ----------
+        >>> offloader = CPUOffloader(OffloadConfig(enabled=True))
+        >>> result = await offloader.run(
+        ...     validate_sql, sql, size=len(sql), threshold=offloader.config.min_sql_chars
+        ... )
+    """
+
+    def __init__(self, config: OffloadConfig | None = None) -> None:
+        self.config = config or OffloadConfig()
+        self._executor: ProcessPoolExecutor | None = None
+        self.offloaded_calls = 0
+        self.inline_calls = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether large payloads are sent to worker processes."""
+        return self.config.enabled
+
+    def should_offload(self, size: int, threshold: int) -> bool:
+        """
+        Decide whether a payload is worth sending to a worker.
+
+        Args:
+        ----------
+            size: Payload size in the stage's unit (chars, cells, tables)
+            threshold: Minimum size for offloading
+
+        Returns:
+        ----------
+            True if the call should run in the process pool
+        """
+        return self.config.enabled and size >= threshold
+
+    async def run(self, func: Callable[..., T], *args: Any, size: int, threshold: int) -> T:
+        """
+        Run func(*args) in a worker process, or inline for small payloads.
+
+        Args:
+        ----------
+            func: Module-level callable (must be picklable)
+            *args: Picklable arguments
+            size: Payload size in the stage's unit
+            threshold: Minimum size for offloading
+
+        Returns:
+        ----------
+            Return value of func
+        """
+        if not self.should_offload(size, threshold):
+            self.inline_calls += 1
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._get_executor(), functools.partial(func, *args)
+            )
+        except BrokenProcessPool:
+            logger.warning("cpu_offload_pool_broken", func=func.__name__)
+            self._discard_executor()
+            self.inline_calls += 1
+            return func(*args)
+
+        self.offloaded_calls += 1
+        return result
+
+    def shutdown(self) -> None:
+        """Stop worker processes, cancelling queued work."""
+        self._discard_executor()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.config.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            logger.info("cpu_offload_pool_started", max_workers=self.config.max_workers)
+        return self._executor
+
+    def _discard_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
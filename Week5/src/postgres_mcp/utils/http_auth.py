@@ -0,0 +1,99 @@
+"""
+Bearer-token authentication for the streamable HTTP transport.
+
+The HTTP transport exposes every tool (including query execution and
+exports) to whoever can reach the port, so each request must carry
+``Authorization: Bearer <token>`` matching the configured server token.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import hmac
+from typing import Any
+
+import structlog
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+logger = structlog.get_logger(__name__)
+
+
+def bearer_token_matches(authorization: str | None, token: str) -> bool:
+    """
+    Check an Authorization header against the expected bearer token.
+
+    Args:
+    ----------
+        authorization: Authorization header value (None if missing)
+        token: Expected token
+
+    Returns:
+    ----------
+        True if the header carries the token (compared in constant time)
+    """
+    if not authorization:
+        return False
+    scheme, _, credentials = authorization.partition(" ")
+    if scheme.lower() != "bearer":
+        return False
+    return hmac.compare_digest(credentials.strip().encode(), token.encode())
+
+
+class BearerAuthMiddleware:
+    """
+    ASGI middleware rejecting HTTP requests without the bearer token.
+
+    Args:
+    ----------
+        app: Wrapped ASGI application.
+        token: Required bearer token.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        ValueError: If token is empty.
+
+    Example:
+    ----------
+        >>> app = Starlette(routes=routes, middleware=[Middleware(BearerAuthMiddleware, token=t)])
+    """
+
+    def __init__(self, app: Any, token: str) -> None:
+        if not token:
+            raise ValueError("token must not be empty")
+        self._app = app
+        self._token = token
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] == "http":
+            authorization = Headers(scope=scope).get("authorization")
+            if not bearer_token_matches(authorization, self._token):
+                client = scope.get("client")
+                logger.warning(
+                    "http_request_unauthorized",
+                    path=scope.get("path"),
+                    client=client[0] if client else None,
+                )
+                response = JSONResponse(
+                    {"error": "unauthorized"},
+                    status_code=401,
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+                await response(scope, receive, send)
+                return
+        await self._app(scope, receive, send)
@@ -8,6 +8,7 @@ execution history. It supports:
 - Log rotation based on file size
 - Automatic cleanup of old log files (default 30 days retention)
 - Thread-safe concurrent writes
+- Optional live feed (ring buffer, subscribers, rolling metrics)
 - Graceful shutdown
 
 Args:
@@ -34,6 +35,7 @@ import structlog
 
 if TYPE_CHECKING:
     from postgres_mcp.models.log_entry import QueryLogEntry
+    from postgres_mcp.utils.query_feed import QueryFeed
 
 logger = structlog.get_logger(__name__)
 
@@ -52,6 +54,7 @@ class JSONLWriter:
         flush_interval_seconds: Automatic flush interval in seconds (default 5.0)
         max_file_size_mb: Maximum log file size before rotation in MB (default 100)
         retention_days: Days to retain log files (default 30)
+        feed: Live feed every entry is published to before buffering
 
     Returns:
     ----------
@@ -76,6 +79,7 @@ class JSONLWriter:
         flush_interval_seconds: float = 5.0,
         max_file_size_mb: int = 100,
         retention_days: int = 30,
+        feed: QueryFeed | None = None,
     ) -> None:
         """
         Initialize JSONLWriter.
@@ -87,6 +91,7 @@ class JSONLWriter:
             flush_interval_seconds: Automatic flush interval in seconds
             max_file_size_mb: Maximum log file size before rotation in MB
             retention_days: Days to retain log files
+            feed: Live feed every entry is published to before buffering
 
         Returns:
         ----------
@@ -101,6 +106,7 @@ class JSONLWriter:
         self.flush_interval_seconds = flush_interval_seconds
         self.max_file_size_mb = max_file_size_mb
         self.retention_days = retention_days
+        self.feed = feed
 
         # Internal state
         self._buffer: list[QueryLogEntry] = []
@@ -198,6 +204,10 @@ class JSONLWriter:
         ----------
             None
         """
+        # Publish first so live readers never wait on disk flushes
+        if self.feed is not None:
+            self.feed.publish(entry)
+
         async with self._lock:
             self._buffer.append(entry)
 
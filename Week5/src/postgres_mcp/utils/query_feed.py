@@ -0,0 +1,482 @@
+"""
+Live query history feed and rolling-window metrics.
+
+JSONLWriter publishes every QueryLogEntry here before buffering it for
+disk. The feed keeps the most recent entries in a ring buffer, fans them
+out to subscribers (bounded queues and synchronous listeners) and folds
+them into rolling-window metrics, so operators can tail history and read
+QPS, error rate and latency percentiles without rescanning JSONL files.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any
+
+import structlog
+
+from postgres_mcp.models.log_entry import LogStatus, QueryLogEntry
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_FEED_SIZE = 1000
+DEFAULT_WINDOW_SECONDS = 60
+
+# Series key used for the all-databases aggregate.
+ALL_DATABASES = "*"
+
+STAGE_GENERATION = "generation"
+STAGE_EXECUTION = "execution"
+STAGE_TOTAL = "total"
+
+# Failed statuses and the stage they are charged to.
+_ERROR_STAGES = {
+    LogStatus.AI_FAILED: STAGE_GENERATION,
+    LogStatus.VALIDATION_FAILED: STAGE_GENERATION,
+    LogStatus.EXECUTION_FAILED: STAGE_EXECUTION,
+    LogStatus.COST_REJECTED: STAGE_EXECUTION,
+}
+
+# Log-scale latency histogram: 8 bins per doubling above 0.1 ms (~9% relative
+# error), capped at ~0.1 ms * 2**25 (about 56 minutes).
+_HISTOGRAM_BASE_MS = 0.1
+_BINS_PER_DOUBLING = 8
+_MAX_BIN = 25 * _BINS_PER_DOUBLING
+
+FeedListener = Callable[[int, QueryLogEntry], None]
+SeriesKey = tuple[str, str]
+
+
+def latency_bin(latency_ms: float) -> int:
+    """
+    Map a latency to its histogram bin.
+
+    Args:
+    ----------
+        latency_ms: Latency in milliseconds
+
+    Returns:
+    ----------
+        Bin index in [0, _MAX_BIN]
+    """
+    if latency_ms <= _HISTOGRAM_BASE_MS:
+        return 0
+    index = int(math.log2(latency_ms / _HISTOGRAM_BASE_MS) * _BINS_PER_DOUBLING) + 1
+    return min(index, _MAX_BIN)
+
+
+def bin_upper_ms(index: int) -> float:
+    """Upper latency bound of a histogram bin in milliseconds."""
+    return _HISTOGRAM_BASE_MS * 2 ** (index / _BINS_PER_DOUBLING)
+
+
+@dataclass
+class _Series:
+    """Counters for one (stage, database) series."""
+
+    count: int = 0
+    errors: int = 0
+    bins: dict[int, int] = field(default_factory=dict)
+    timed: int = 0
+
+    def add(self, latency_ms: float | None, error: bool, sign: int = 1) -> None:
+        self.count += sign
+        self.errors += sign * error
+        if latency_ms is not None:
+            index = latency_bin(latency_ms)
+            self.bins[index] = self.bins.get(index, 0) + sign
+            self.timed += sign
+
+    def subtract(self, other: _Series) -> None:
+        self.count -= other.count
+        self.errors -= other.errors
+        self.timed -= other.timed
+        for index, n in other.bins.items():
+            remaining = self.bins[index] - n
+            if remaining:
+                self.bins[index] = remaining
+            else:
+                del self.bins[index]
+
+    def percentile(self, quantile: float) -> float | None:
+        if self.timed <= 0:
+            return None
+        rank = max(1, math.ceil(quantile * self.timed))
+        seen = 0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen >= rank:
+                return bin_upper_ms(index)
+        return bin_upper_ms(_MAX_BIN)
+
+
+@dataclass
+class _Slot:
+    """One second of the rolling window."""
+
+    second: int
+    series: dict[SeriesKey, _Series] = field(default_factory=dict)
+
+
+def entry_stages(entry: QueryLogEntry) -> Iterator[tuple[str, float | None, bool]]:
+    """
+    Split a log entry into per-stage observations.
+
+    A stage is reported when it has a timing or when the entry failed in it.
+
+    Args:
+    ----------
+        entry: Query log entry
+
+    Yields:
+    ----------
+        (stage, latency_ms or None, failed) tuples
+    """
+    error_stage = _ERROR_STAGES.get(entry.status)
+    for stage, latency in (
+        (STAGE_GENERATION, entry.generation_time_ms),
+        (STAGE_EXECUTION, entry.query_time_ms),
+    ):
+        if latency is not None or error_stage == stage:
+            yield stage, latency, error_stage == stage
+    yield STAGE_TOTAL, entry.execution_time_ms, error_stage is not None
+
+
+class RollingMetrics:
+    """
+    Rolling-window QPS, error rate and latency percentiles.
+
+    The window is a ring of one-second slots. Recording an entry touches one
+    slot and the running totals of a constant number of series (stages x
+    {database, all}); expiring a slot subtracts its sparse histograms from
+    the totals once per second, not per entry. Percentiles come from
+    log-scale histograms and are accurate to about 9%.
+
+    Args:
+    ----------
+        window_seconds: Window length in seconds.
+        clock: Monotonic clock (injectable for tests).
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        ValueError: If window_seconds is less than 1.
+
+    Example:
+    ----------
+        >>> metrics = RollingMetrics(window_seconds=60)
+        >>> metrics.record(entry)
+        >>> metrics.snapshot()["databases"]["*"]["total"]["p95_ms"]
+    """
+
+    def __init__(
+        self,
+        window_seconds: int = DEFAULT_WINDOW_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if window_seconds < 1:
+            raise ValueError("window_seconds must be >= 1")
+        self._window = window_seconds
+        self._clock = clock
+        self._slots: list[_Slot | None] = [None] * window_seconds
+        self._totals: dict[SeriesKey, _Series] = {}
+        self._started = clock()
+        self._last_second = int(self._started)
+
+    @property
+    def window_seconds(self) -> int:
+        """Window length in seconds."""
+        return self._window
+
+    def record(self, entry: QueryLogEntry) -> None:
+        """
+        Fold one log entry into the window.
+
+        Args:
+        ----------
+            entry: Query log entry
+        """
+        second = int(self._clock())
+        self._advance(second)
+        index = second % self._window
+        slot = self._slots[index]
+        if slot is None or slot.second != second:
+            slot = _Slot(second)
+            self._slots[index] = slot
+
+        database = entry.database or "unknown"
+        for stage, latency, error in entry_stages(entry):
+            for key in ((stage, database), (stage, ALL_DATABASES)):
+                series = slot.series.get(key)
+                if series is None:
+                    series = slot.series[key] = _Series()
+                series.add(latency, error)
+                total = self._totals.get(key)
+                if total is None:
+                    total = self._totals[key] = _Series()
+                total.add(latency, error)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Summarize the current window.
+
+        Returns:
+        ----------
+            Dict with window_seconds and, per database (``*`` for all) and
+            stage: count, qps, error_rate and p50/p95/p99 latency in ms
+        """
+        now = self._clock()
+        self._advance(int(now))
+        elapsed = min(float(self._window), max(1.0, now - self._started))
+
+        databases: dict[str, dict[str, Any]] = {}
+        for (stage, database), series in sorted(self._totals.items()):
+            if series.count <= 0:
+                continue
+            p50, p95, p99 = (series.percentile(q) for q in (0.5, 0.95, 0.99))
+            databases.setdefault(database, {})[stage] = {
+                "count": series.count,
+                "qps": round(series.count / elapsed, 3),
+                "error_rate": round(series.errors / series.count, 4),
+                "p50_ms": _round(p50),
+                "p95_ms": _round(p95),
+                "p99_ms": _round(p99),
+            }
+        return {"window_seconds": self._window, "databases": databases}
+
+    def _advance(self, second: int) -> None:
+        """Expire slots that fell out of the window ending at ``second``."""
+        if second <= self._last_second:
+            return
+        # Only the slots between the previous and current second can expire;
+        # after a long idle gap that is at most the whole ring.
+        start = max(self._last_second + 1, second - self._window + 1)
+        for current in range(start, second + 1):
+            index = current % self._window
+            slot = self._slots[index]
+            if slot is not None and slot.second <= second - self._window:
+                self._expire(slot)
+                self._slots[index] = None
+        self._last_second = second
+
+    def _expire(self, slot: _Slot) -> None:
+        for key, series in slot.series.items():
+            total = self._totals[key]
+            total.subtract(series)
+            if total.count <= 0:
+                del self._totals[key]
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 2)
+
+
+class FeedSubscription:
+    """
+    Bounded queue of feed entries for one subscriber.
+
+    A subscriber that falls behind loses its oldest entries (counted in
+    ``dropped``) instead of slowing down the writer.
+
+    Args:
+    ----------
+        feed: Feed the subscription belongs to.
+        max_queue: Queue capacity.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+
+    Example:
+    ----------
+        >>> async with feed.subscribe() as subscription:
+        ...     async for sequence, entry in subscription:
+        ...         print(sequence, entry.status)
+    """
+
+    def __init__(self, feed: QueryFeed, max_queue: int) -> None:
+        self._feed = feed
+        self._queue: asyncio.Queue[tuple[int, QueryLogEntry]] = asyncio.Queue(max_queue)
+        self.dropped = 0
+
+    def push(self, sequence: int, entry: QueryLogEntry) -> None:
+        """Enqueue an entry, dropping the oldest one when full."""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait((sequence, entry))
+
+    async def get(self) -> tuple[int, QueryLogEntry]:
+        """Wait for the next (sequence, entry)."""
+        return await self._queue.get()
+
+    def close(self) -> None:
+        """Stop receiving entries."""
+        self._feed._subscriptions.discard(self)
+
+    def __aiter__(self) -> FeedSubscription:
+        return self
+
+    async def __anext__(self) -> tuple[int, QueryLogEntry]:
+        return await self.get()
+
+    async def __aenter__(self) -> FeedSubscription:
+        return self
+
+    async def __aexit__(self, exc_type: type, exc_val: Exception, exc_tb: object) -> None:
+        self.close()
+
+
+class QueryFeed:
+    """
+    In-memory ring buffer of recent query log entries with fan-out.
+
+    Entries get increasing sequence numbers so readers can tail the buffer
+    incrementally with ``recent(after=...)``.
+
+    Args:
+    ----------
+        capacity: Entries kept in the ring buffer.
+        window_seconds: Rolling metrics window in seconds.
+        clock: Monotonic clock passed to RollingMetrics.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        ValueError: If capacity is less than 1.
+
+    Example:
+    ----------
+        >>> feed = QueryFeed(capacity=1000)
+        >>> writer = JSONLWriter(log_directory=Path("logs"), feed=feed)
+        >>> feed.recent(after=42)
+        >>> feed.metrics.snapshot()
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_FEED_SIZE,
+        window_seconds: int = DEFAULT_WINDOW_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self._entries: deque[tuple[int, QueryLogEntry]] = deque(maxlen=capacity)
+        self._sequence = 0
+        self._subscriptions: set[FeedSubscription] = set()
+        self._listeners: list[FeedListener] = []
+        self.metrics = RollingMetrics(window_seconds=window_seconds, clock=clock)
+
+    @property
+    def last_sequence(self) -> int:
+        """Sequence number of the latest entry (0 if none)."""
+        return self._sequence
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def publish(self, entry: QueryLogEntry) -> int:
+        """
+        Append an entry, update metrics and notify subscribers.
+
+        Args:
+        ----------
+            entry: Query log entry
+
+        Returns:
+        ----------
+            Sequence number assigned to the entry
+        """
+        self._sequence += 1
+        sequence = self._sequence
+        self._entries.append((sequence, entry))
+        self.metrics.record(entry)
+
+        for subscription in list(self._subscriptions):
+            subscription.push(sequence, entry)
+        for listener in list(self._listeners):
+            try:
+                listener(sequence, entry)
+            except Exception as e:
+                logger.warning("query_feed_listener_failed", error=str(e))
+        return sequence
+
+    def recent(self, after: int = 0, limit: int | None = None) -> list[tuple[int, QueryLogEntry]]:
+        """
+        Return buffered entries newer than a sequence number.
+
+        Args:
+        ----------
+            after: Return entries with a sequence greater than this
+            limit: Return at most this many of the newest matching entries
+
+        Returns:
+        ----------
+            (sequence, entry) pairs, oldest first
+        """
+        if not self._entries:
+            return []
+        first = self._entries[0][0]
+        skip = max(0, after - first + 1)
+        if limit is not None:
+            skip = max(skip, len(self._entries) - limit)
+        return list(islice(self._entries, skip, None))
+
+    def subscribe(self, max_queue: int = DEFAULT_FEED_SIZE) -> FeedSubscription:
+        """
+        Create a queue-backed subscription to new entries.
+
+        Args:
+        ----------
+            max_queue: Entries buffered for the subscriber
+
+        Returns:
+        ----------
+            FeedSubscription (close it, or use it as an async context manager)
+        """
+        subscription = FeedSubscription(self, max_queue)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def add_listener(self, callback: FeedListener) -> None:
+        """
+        Register a synchronous callback invoked with (sequence, entry).
+
+        Args:
+        ----------
+            callback: Callable run on the event loop for every entry
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: FeedListener) -> None:
+        """Unregister a callback added with add_listener()."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
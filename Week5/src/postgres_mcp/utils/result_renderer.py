@@ -0,0 +1,268 @@
+"""
+Result preview renderer for MCP tool responses.
+
+Renders QueryResult rows as an aligned Markdown table or as compact TSV.
+Cells are formatted once per type, escaped and truncated, and column
+widths are computed in a single pass before any line is built.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+from postgres_mcp.models.result import ColumnInfo, QueryResult
+
+NULL_TEXT = "NULL"
+ELLIPSIS = "…"
+
+Formatter = Callable[[Any], str]
+
+
+class RenderMode(str, Enum):
+    """Preview output modes."""
+
+    MARKDOWN = "markdown"
+    TSV = "tsv"
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """
+    Preview rendering options.
+
+    Args:
+    ----------
+        mode: Output mode (markdown table or TSV).
+        preview_rows: Maximum number of rows to render.
+        max_cell_width: Maximum characters per cell before truncation.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        ValueError: If preview_rows or max_cell_width are out of range.
+    """
+
+    mode: RenderMode = RenderMode.MARKDOWN
+    preview_rows: int = 10
+    max_cell_width: int = 80
+
+    def __post_init__(self) -> None:
+        if self.preview_rows < 0:
+            raise ValueError("preview_rows must be >= 0")
+        if self.max_cell_width < 4:
+            raise ValueError("max_cell_width must be >= 4")
+
+
+def _format_datetime(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date | time):
+        return value.isoformat()
+    return str(value)
+
+
+def _format_decimal(value: Any) -> str:
+    # Fixed-point notation: str(Decimal("1E+3")) would render "1E+3".
+    if isinstance(value, Decimal):
+        return format(value, "f")
+    return str(value)
+
+
+def _format_float(value: Any) -> str:
+    if isinstance(value, float):
+        return format(value, ".10g")
+    return str(value)
+
+
+def _format_json(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _format_bool(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _format_bytes(value: Any) -> str:
+    if isinstance(value, bytes | bytearray | memoryview):
+        return "\\x" + bytes(value).hex()
+    return str(value)
+
+
+# ColumnInfo.type holds either a PostgreSQL type name (prepared statements)
+# or a Python type name (QueryRunner infers types from the first row).
+_FORMATTERS: dict[str, Formatter] = {
+    "datetime": _format_datetime,
+    "date": _format_datetime,
+    "time": _format_datetime,
+    "timestamp": _format_datetime,
+    "timestamptz": _format_datetime,
+    "timetz": _format_datetime,
+    "decimal": _format_decimal,
+    "numeric": _format_decimal,
+    "float": _format_float,
+    "float4": _format_float,
+    "float8": _format_float,
+    "dict": _format_json,
+    "list": _format_json,
+    "json": _format_json,
+    "jsonb": _format_json,
+    "bool": _format_bool,
+    "bytes": _format_bytes,
+    "bytea": _format_bytes,
+}
+
+
+def get_formatter(column_type: str) -> Formatter:
+    """
+    Resolve the cell formatter for a column type.
+
+    Args:
+    ----------
+        column_type: PostgreSQL or Python type name from ColumnInfo.type.
+
+    Returns:
+    ----------
+        Callable converting a non-NULL value to display text.
+    """
+    return _FORMATTERS.get(column_type.lower(), str)
+
+
+def _cell_text(value: Any, formatter: Formatter, max_width: int, separator: str) -> str:
+    """Format, flatten, escape and truncate a single cell."""
+    if value is None:
+        return NULL_TEXT
+
+    text = formatter(value)
+    if "\n" in text or "\r" in text or "\t" in text:
+        text = " ".join(text.split())
+    if len(text) > max_width:
+        text = text[: max_width - 1] + ELLIPSIS
+    if separator == "|" and "|" in text:
+        text = text.replace("|", "\\|")
+    return text
+
+
+def render_rows(
+    columns: Sequence[ColumnInfo],
+    rows: Sequence[dict[str, Any]],
+    options: RenderOptions | None = None,
+) -> str:
+    """
+    Render rows as an aligned Markdown table or TSV.
+
+    Args:
+    ----------
+        columns: Column metadata (drives ordering and per-type formatting).
+        rows: Rows to render; only the first ``preview_rows`` are used.
+        options: Rendering options.
+
+    Returns:
+    ----------
+        Rendered table text (empty string if there is nothing to render).
+
+    Example:
+    ----------
+        >>> render_rows(result.columns, result.rows, RenderOptions(preview_rows=5))
+        '| id  | name  |\\n| --- | ----- |\\n| 1   | Alice |'
+    """
+    opts = options or RenderOptions()
+    if not columns:
+        return ""
+
+    names = [col.name for col in columns]
+    formatters = [get_formatter(col.type) for col in columns]
+    max_width = opts.max_cell_width
+    preview = rows[: opts.preview_rows]
+
+    if opts.mode == RenderMode.TSV:
+        header = "\t".join(_cell_text(name, str, max_width, "\t") for name in names)
+        lines = [header]
+        for row in preview:
+            lines.append(
+                "\t".join(
+                    _cell_text(row.get(name), fmt, max_width, "\t")
+                    for name, fmt in zip(names, formatters, strict=True)
+                )
+            )
+        return "\n".join(lines)
+
+    header_cells = [_cell_text(name, str, max_width, "|") for name in names]
+    body = [
+        [
+            _cell_text(row.get(name), fmt, max_width, "|")
+            for name, fmt in zip(names, formatters, strict=True)
+        ]
+        for row in preview
+    ]
+
+    widths = [max(3, len(cell)) for cell in header_cells]
+    for cells in body:
+        for index, cell in enumerate(cells):
+            if len(cell) > widths[index]:
+                widths[index] = len(cell)
+
+    def line(cells: Sequence[str]) -> str:
+        return "| " + " | ".join(c.ljust(w) for c, w in zip(cells, widths, strict=True)) + " |"
+
+    lines = [line(header_cells), "| " + " | ".join("-" * w for w in widths) + " |"]
+    lines.extend(line(cells) for cells in body)
+    return "\n".join(lines)
+
+
+def render_preview(result: QueryResult, options: RenderOptions | None = None) -> str:
+    """
+    Render the data preview section for a query result.
+
+    Args:
+    ----------
+        result: Executed query result.
+        options: Rendering options.
+
+    Returns:
+    ----------
+        Preview section including heading and remaining-row note.
+    """
+    opts = options or RenderOptions()
+    if not result.rows:
+        return "\n*No rows returned*"
+    if opts.preview_rows == 0 or not result.columns:
+        return ""
+
+    shown = min(opts.preview_rows, len(result.rows))
+    label = "TSV" if opts.mode == RenderMode.TSV else "Data Preview"
+    parts = [f"\n### {label} (first {shown} rows)\n"]
+
+    table = render_rows(result.columns, result.rows, opts)
+    if opts.mode == RenderMode.TSV:
+        parts.append(f"```tsv\n{table}\n```")
+    else:
+        parts.append(table)
+
+    if result.row_count > shown:
+        parts.append(f"\n*... and {result.row_count - shown} more rows*")
+    return "\n".join(parts)
@@ -75,7 +75,7 @@ class TemplateLoader:
             ...     print(f"{template.name}: {template.priority}")
         """
         templates: list[QueryTemplate] = []
-        yaml_files = list(self.template_dir.glob("*.yaml")) + list(self.template_dir.glob("*.yml"))
+        yaml_files = self.template_files()
 
         if not yaml_files:
             logger.warning("no_template_files_found", template_dir=str(self.template_dir))
@@ -103,6 +103,34 @@ class TemplateLoader:
         logger.info("templates_loaded", count=len(templates))
         return templates
 
+    def template_files(self) -> list[Path]:
+        """
+        List template YAML files in the template directory.
+
+        Returns:
+        ----------
+            Paths of all *.yaml and *.yml files.
+        """
+        return list(self.template_dir.glob("*.yaml")) + list(self.template_dir.glob("*.yml"))
+
+    def load_file(self, yaml_file: Path) -> QueryTemplate:
+        """
+        Load and validate a single template file.
+
+        Args:
+        ----------
+            yaml_file: Path to YAML file.
+
+        Returns:
+        ----------
+            Parsed and validated QueryTemplate.
+
+        Raises:
+        ----------
+            TemplateLoadError: If YAML parsing or validation fails.
+        """
+        return self._load_template(yaml_file)
+
     def _load_template(self, yaml_file: Path) -> QueryTemplate:
         """
         Load a single template from a YAML file.
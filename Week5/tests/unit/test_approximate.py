@@ -0,0 +1,147 @@
+"""
+Unit tests for approximate (TABLESAMPLE) execution.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+from postgres_mcp.core.approximate import Approximator, refinement_percents, rewrite_approximate
+from postgres_mcp.core.query_executor import QueryExecutor
+from postgres_mcp.models.query import GeneratedQuery
+from postgres_mcp.models.result import ColumnInfo, QueryResult
+
+MONTHLY_SQL = (
+    "SELECT date_trunc('month', created_at) AS month, count(*), avg(amount) AS avg_amount "
+    "FROM sales.orders o WHERE status = 'paid' GROUP BY 1 ORDER BY 1"
+)
+
+
+def test_rewrite_adds_tablesample_and_helpers() -> None:
+    """Eligible aggregates get a sample, default aliases and helper columns."""
+    plan = rewrite_approximate(MONTHLY_SQL, 1.5)
+
+    assert plan is not None
+    assert plan.table == "sales.orders"
+    assert "FROM sales.orders AS o TABLESAMPLE SYSTEM (1.5)" in plan.sql
+    assert "COUNT(*) AS count" in plan.sql
+    assert [(e.name, e.kind) for e in plan.estimates] == [("count", "count"), ("avg_amount", "avg")]
+    assert plan.sql.index("__approx_") > plan.sql.index("avg_amount")
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT * FROM orders",
+        "SELECT count(DISTINCT customer_id) FROM orders",
+        "SELECT max(amount) FROM orders",
+        "SELECT round(avg(amount), 2) FROM orders",
+        "SELECT c.name, count(*) FROM orders o JOIN customers c ON c.id = o.customer_id GROUP BY 1",
+        "SELECT status, count(*) FROM orders GROUP BY status HAVING count(*) > 5",
+        "SELECT count(*) FROM (SELECT * FROM orders) AS t",
+    ],
+)
+def test_ineligible_queries_are_not_rewritten(sql: str) -> None:
+    """Only single-table COUNT/SUM/AVG queries are sampled."""
+    assert rewrite_approximate(sql, 1.0) is None
+
+
+def test_finalize_scales_counts_and_sums() -> None:
+    """Counts and sums are scaled by 100/p; margins replace helper columns."""
+    plan = rewrite_approximate(
+        "SELECT status, count(*), sum(amount) AS total FROM orders GROUP BY 1", 1.0
+    )
+    result = QueryResult(
+        columns=[
+            ColumnInfo(name="status", type="str"),
+            ColumnInfo(name="count", type="int"),
+            ColumnInfo(name="total", type="Decimal"),
+            ColumnInfo(name="__approx_2_ss", type="float"),
+        ],
+        rows=[
+            {"status": "paid", "count": 400, "total": Decimal("4000"), "__approx_2_ss": 160000.0}
+        ],
+        row_count=1,
+        execution_time_ms=1.0,
+    )
+
+    plan.finalize(result)
+
+    row = result.rows[0]
+    assert row["count"] == 40000
+    assert row["total"] == pytest.approx(400000.0)
+    assert row["count_margin"] == pytest.approx(1.96 * 20 * 0.99499 * 100, rel=1e-4)
+    assert "__approx_2_ss" not in row
+    assert [c.name for c in result.columns] == [
+        "status",
+        "count",
+        "count_margin",
+        "total",
+        "total_margin",
+    ]
+    assert result.approximation is not None and result.approximation.sample_percent == 1.0
+    assert refinement_percents(0.3) == [3.0]
+
+
+@pytest.mark.asyncio
+async def test_executor_returns_sample_then_refined_exact_answer() -> None:
+    """The first call is sampled; a later call gets the background exact answer."""
+    connection = AsyncMock()
+    connection.fetchval = AsyncMock(return_value=50_000_000)  # pg_class.reltuples
+
+    @asynccontextmanager
+    async def get_connection(database):
+        yield connection
+
+    pool_manager = AsyncMock()
+    pool_manager.get_connection = get_connection
+    generator = AsyncMock()
+    generator.generate.return_value = GeneratedQuery(
+        sql="SELECT count(*) FROM orders", validated=True, generation_method="ai_generated"
+    )
+
+    async def execute(sql, connection, limit):
+        count = 2000 if "TABLESAMPLE" in sql else 10_000_000
+        return QueryResult(
+            columns=[ColumnInfo(name="count", type="int")],
+            rows=[{"count": count}],
+            row_count=1,
+            execution_time_ms=1.0,
+        )
+
+    runner = AsyncMock()
+    runner.execute = AsyncMock(side_effect=execute)
+    approximator = Approximator(target_sample_rows=100_000)
+    executor = QueryExecutor(generator, pool_manager, runner, approximator=approximator)
+
+    try:
+        first = await executor.execute("how many orders", "db", approximate=True)
+        assert "TABLESAMPLE SYSTEM (0.2)" in first.sql
+        assert first.rows[0]["count"] == 1_000_000
+        assert first.approximation is not None and first.approximation.refining is True
+
+        await asyncio.gather(*approximator._tasks.values())
+        second = await executor.execute("how many orders", "db", approximate=True)
+        assert second.approximation is None
+        assert second.rows[0]["count"] == 10_000_000
+        # 0.2% sample, then a 2% and a 20% refinement, then the exact query
+        assert runner.execute.await_count == 4
+    finally:
+        await executor.close()
@@ -0,0 +1,130 @@
+"""
+Unit tests for batch query execution (execute_queries).
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from postgres_mcp.config import QueryConfig
+from postgres_mcp.core.query_executor import QueryExecutor
+from postgres_mcp.mcp.tools import handle_execute_queries
+from postgres_mcp.models.query import GeneratedQuery
+from postgres_mcp.models.result import BatchItemResult, ColumnInfo, QueryResult
+
+# Generation delay per query (seconds).
+DELAYS = {"slow": 0.05, "medium": 0.02, "fast": 0.0, "broken": 0.01}
+
+
+def _executor() -> tuple[QueryExecutor, dict]:
+    stats = {"active": 0, "max_active": 0, "connections": []}
+
+    async def generate(natural_language: str, database: str) -> GeneratedQuery:
+        stats["active"] += 1
+        stats["max_active"] = max(stats["max_active"], stats["active"])
+        await asyncio.sleep(DELAYS[natural_language])
+        stats["active"] -= 1
+        return GeneratedQuery(
+            sql=f"SELECT '{natural_language}' AS name",
+            validated=natural_language != "broken",
+            generation_method="ai_generated",
+            warnings=["bad SQL"] if natural_language == "broken" else [],
+        )
+
+    @asynccontextmanager
+    async def get_connection(database: str):
+        connection = MagicMock(name=f"connection-{database}")
+        stats["connections"].append(database)
+        yield connection
+
+    generator = AsyncMock()
+    generator.generate = AsyncMock(side_effect=generate)
+    pool_manager = AsyncMock()
+    pool_manager.get_connection = get_connection
+
+    async def execute(sql: str, connection, limit: int) -> QueryResult:
+        return QueryResult(
+            columns=[ColumnInfo(name="name", type="str")],
+            rows=[{"name": sql}],
+            row_count=1,
+            execution_time_ms=1.0,
+        )
+
+    runner = AsyncMock()
+    runner.execute = AsyncMock(side_effect=execute)
+    return QueryExecutor(generator, pool_manager, runner), stats
+
+
+@pytest.mark.asyncio
+async def test_batch_yields_in_completion_order_with_one_connection_per_database() -> None:
+    """Items complete independently; each database uses a single connection."""
+    executor, stats = _executor()
+    queries = [("slow", "a"), ("medium", "b"), ("fast", "a"), ("broken", "b")]
+
+    items = [item async for item in executor.execute_batch(queries, llm_concurrency=2)]
+
+    # Two LLM slots: slow+medium start first, fast and broken take medium's slot.
+    assert [item.natural_language for item in items] == ["medium", "fast", "broken", "slow"]
+    assert sorted(stats["connections"]) == ["a", "b"]
+    assert stats["max_active"] == 2
+    broken = next(item for item in items if item.natural_language == "broken")
+    assert broken.success is False and "failed validation" in broken.error
+    slow = next(item for item in items if item.natural_language == "slow")
+    assert slow.success is True and slow.index == 0
+    assert slow.generation_ms >= 40
+    assert slow.total_ms >= slow.generation_ms
+
+
+@pytest.mark.asyncio
+async def test_handler_reports_progress_per_item() -> None:
+    """execute_queries renders every item and reports progress as they finish."""
+
+    async def execute_batch(pairs, limit, llm_concurrency):
+        for index, (natural_language, database) in enumerate(pairs):
+            yield BatchItemResult(
+                index=index,
+                natural_language=natural_language,
+                database=database,
+                result=QueryResult(
+                    columns=[ColumnInfo(name="n", type="int")],
+                    rows=[{"n": index}],
+                    row_count=1,
+                    execution_time_ms=1.0,
+                    sql="SELECT 1 AS n",
+                ),
+                total_ms=10.0 * (index + 1),
+            )
+
+    ctx = MagicMock()
+    ctx.config.query = QueryConfig(batch_max_queries=3)
+    ctx.config.default_database = "main"
+    ctx.query_executor.execute_batch = execute_batch
+    progress = AsyncMock()
+    arguments = {"queries": [{"natural_language": "one"}, {"natural_language": "two"}]}
+
+    response = await handle_execute_queries(arguments, ctx, progress=progress)
+
+    text = response[0].text
+    assert "- Queries: 2 (2 succeeded)" in text
+    assert "### ✅ [1] one" in text and "### ✅ [2] two" in text
+    assert progress.await_args_list[-1].args == (2, 2, "[2] 1 rows (20ms)")
+
+    too_many = {"queries": [{"natural_language": "q"}] * 4}
+    response = await handle_execute_queries(too_many, ctx)
+    assert response[0].text.startswith("❌ Error: at most 3 queries")
@@ -0,0 +1,84 @@
+"""
+Unit tests for per-client accounting.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from postgres_mcp.utils.client_accounting import (
+    ClientRegistry,
+    client_fingerprint,
+    client_identity,
+)
+
+
+def test_record_accumulates_per_client() -> None:
+    """Calls are counted per client and per tool, failures counted as errors."""
+    registry = ClientRegistry()
+
+    registry.record("a", "execute_query", 10.0, True, client_name="alice")
+    registry.record("a", "execute_query", 30.0, False)
+    registry.record("b", "list_databases", 5.0, True)
+
+    alice = registry.get("a")
+    assert alice is not None
+    assert alice.client_name == "alice"
+    assert alice.tool_calls == 2
+    assert alice.errors == 1
+    assert alice.tools == {"execute_query": 2}
+    assert alice.to_dict()["avg_duration_ms"] == 20.0
+    snapshot = registry.snapshot(caller_id="a")
+    assert [c["client"] for c in snapshot] == [client_fingerprint("b"), client_fingerprint("a")]
+    assert [c["you"] for c in snapshot] == [False, True]
+    assert "a" not in {str(value) for c in snapshot for value in c.values()}
+
+
+def test_registry_evicts_least_recently_active() -> None:
+    """The least recently active client is dropped beyond max_clients."""
+    registry = ClientRegistry(max_clients=2)
+
+    registry.record("a", "t", 1.0, True)
+    registry.record("b", "t", 1.0, True)
+    registry.record("a", "t", 1.0, True)
+    registry.record("c", "t", 1.0, True)
+
+    assert len(registry) == 2
+    assert registry.get("b") is None
+    assert registry.get("a") is not None
+
+
+def test_registry_rejects_invalid_size() -> None:
+    """max_clients must be positive."""
+    with pytest.raises(ValueError):
+        ClientRegistry(max_clients=0)
+
+
+def test_client_identity_prefers_session_header() -> None:
+    """HTTP sessions are keyed by mcp-session-id; others by session object."""
+    session = SimpleNamespace(
+        client_params=SimpleNamespace(clientInfo=SimpleNamespace(name="alice"))
+    )
+    http_request = SimpleNamespace(headers={"mcp-session-id": "abc"})
+
+    http_server = SimpleNamespace(
+        request_context=SimpleNamespace(request=http_request, session=session)
+    )
+    stdio_server = SimpleNamespace(request_context=SimpleNamespace(request=None, session=session))
+
+    assert client_identity(http_server) == ("abc", "alice")
+    assert client_identity(stdio_server) == (f"session-{id(session):x}", "alice")
@@ -0,0 +1,245 @@
+"""
+Unit tests for the EXPLAIN cost guard.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import pytest
+
+from postgres_mcp.core.cost_guard import (
+    CostBudget,
+    CostGuard,
+    CostGuardAction,
+    CostGuardError,
+    PlanSummary,
+    fingerprint,
+    push_down_limit,
+)
+from postgres_mcp.core.query_executor import QueryExecutionError, QueryExecutor
+from postgres_mcp.models.query import GeneratedQuery
+from postgres_mcp.models.result import ColumnInfo, QueryResult
+
+SEQ_SCAN_PLAN = [
+    {
+        "Plan": {
+            "Node Type": "Seq Scan",
+            "Relation Name": "events",
+            "Total Cost": 250000.0,
+            "Plan Rows": 10000000,
+        }
+    }
+]
+LIMIT_PLAN = [
+    {
+        "Plan": {
+            "Node Type": "Limit",
+            "Total Cost": 25.0,
+            "Plan Rows": 1001,
+            "Plans": [
+                {
+                    "Node Type": "Seq Scan",
+                    "Relation Name": "events",
+                    "Total Cost": 250000.0,
+                    "Plan Rows": 10000000,
+                }
+            ],
+        }
+    }
+]
+SORT_LIMIT_PLAN = [
+    {
+        "Plan": {
+            "Node Type": "Limit",
+            "Total Cost": 400000.0,
+            "Plan Rows": 1001,
+            "Plans": [
+                {
+                    "Node Type": "Sort",
+                    "Total Cost": 450000.0,
+                    "Plan Rows": 10000000,
+                    "Plans": [
+                        {
+                            "Node Type": "Seq Scan",
+                            "Relation Name": "events",
+                            "Total Cost": 250000.0,
+                            "Plan Rows": 10000000,
+                        }
+                    ],
+                }
+            ],
+        }
+    }
+]
+
+
+def _connection(plans_by_sql: dict[str, list]) -> AsyncMock:
+    """asyncpg-like connection answering EXPLAIN with canned JSON text."""
+
+    async def fetchval(query: str):
+        sql = query.removeprefix("EXPLAIN (FORMAT JSON) ")
+        return json.dumps(plans_by_sql[sql])
+
+    connection = AsyncMock()
+    connection.fetchval = AsyncMock(side_effect=fetchval)
+    return connection
+
+
+def test_plan_summary_collects_seq_scans() -> None:
+    """The summary keeps root estimates and every sequential scan."""
+    summary = PlanSummary.from_explain(json.dumps(LIMIT_PLAN))
+
+    assert summary.node_type == "Limit"
+    assert summary.total_cost == 25.0
+    assert summary.plan_rows == 1001
+    assert summary.seq_scans == (("events", 10000000),)
+    assert "events (~10,000,000 rows)" in summary.to_text()
+
+
+def test_fingerprint_and_limit_rewrite() -> None:
+    """Whitespace does not change fingerprints; LIMIT is added or tightened."""
+    assert fingerprint("SELECT  *\nFROM t;") == fingerprint("SELECT * FROM t")
+    assert fingerprint("SELECT 1") != fingerprint("SELECT 2")
+    assert push_down_limit("SELECT * FROM t", 11) == "SELECT * FROM t LIMIT 11"
+    assert push_down_limit("SELECT * FROM t LIMIT 5", 11) == "SELECT * FROM t LIMIT 5"
+    assert push_down_limit("SELECT a FROM x UNION SELECT a FROM y", 3).endswith(
+        "AS _guarded LIMIT 3"
+    )
+
+
+@pytest.mark.asyncio
+async def test_check_pushes_down_limit() -> None:
+    """Over-budget queries are rewritten when the LIMIT brings them in budget."""
+    connection = _connection(
+        {"SELECT * FROM events": SEQ_SCAN_PLAN, "SELECT * FROM events LIMIT 1001": LIMIT_PLAN}
+    )
+    guard = CostGuard(CostBudget(max_cost=10_000, max_rows=100_000))
+
+    decision = await guard.check("SELECT * FROM events", "db", connection, limit=1000)
+
+    assert decision.rewritten is True
+    assert decision.sql == "SELECT * FROM events LIMIT 1001"
+    assert decision.original_summary is not None
+    assert decision.original_summary.total_cost == 250000.0
+
+
+@pytest.mark.asyncio
+async def test_check_rejects_and_uses_per_database_budget() -> None:
+    """Reject mode raises with the plan; other databases use their own budget."""
+    connection = _connection(
+        {
+            "SELECT * FROM events ORDER BY ts": SEQ_SCAN_PLAN,
+            "SELECT * FROM events ORDER BY ts LIMIT 1001": SORT_LIMIT_PLAN,
+        }
+    )
+    guard = CostGuard(
+        CostBudget(max_cost=10_000, action=CostGuardAction.REJECT),
+        budgets={"warehouse": CostBudget(max_cost=1e9)},
+    )
+
+    with pytest.raises(CostGuardError, match="estimated cost 400,000 > 10,000") as info:
+        await guard.check("SELECT * FROM events ORDER BY ts", "replica", connection, limit=1000)
+    assert info.value.summary is not None
+
+    decision = await guard.check(
+        "SELECT * FROM events ORDER BY ts", "warehouse", connection, limit=1000
+    )
+    assert decision.rewritten is False
+
+
+@pytest.mark.asyncio
+async def test_reject_mode_estimates_limited_statement() -> None:
+    """An unbounded SELECT is allowed when the row limit brings it in budget."""
+    connection = _connection(
+        {"SELECT * FROM events": SEQ_SCAN_PLAN, "SELECT * FROM events LIMIT 1001": LIMIT_PLAN}
+    )
+    guard = CostGuard(CostBudget(max_cost=10_000, action=CostGuardAction.REJECT))
+
+    decision = await guard.check("SELECT * FROM events", "db", connection, limit=1000)
+
+    assert decision.sql == "SELECT * FROM events LIMIT 1001"
+    assert decision.summary.total_cost == 25.0
+    connection.fetchval.assert_awaited_once_with(
+        "EXPLAIN (FORMAT JSON) SELECT * FROM events LIMIT 1001"
+    )
+
+
+@pytest.mark.asyncio
+async def test_plans_are_cached_by_fingerprint() -> None:
+    """Repeated checks of the same SQL reuse the cached plan."""
+    connection = _connection({"SELECT * FROM events": LIMIT_PLAN})
+    guard = CostGuard(CostBudget(max_cost=1e6))
+
+    await guard.check("SELECT * FROM events", "db", connection, limit=10)
+    await guard.check("SELECT *   FROM events;", "db", connection, limit=10)
+
+    assert connection.fetchval.await_count == 1
+    assert guard.cache_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_rewritten_sql_and_reports_plan() -> None:
+    """QueryExecutor executes the guarded SQL and attaches the plan summary."""
+    connection = _connection(
+        {"SELECT * FROM events": SEQ_SCAN_PLAN, "SELECT * FROM events LIMIT 1001": LIMIT_PLAN}
+    )
+
+    @asynccontextmanager
+    async def get_connection(database):
+        yield connection
+
+    pool_manager = AsyncMock()
+    pool_manager.get_connection = get_connection
+    generator = AsyncMock()
+    generator.generate.return_value = GeneratedQuery(
+        sql="SELECT * FROM events", validated=True, generation_method="ai_generated"
+    )
+    runner = AsyncMock()
+    runner.execute.return_value = QueryResult(
+        columns=[ColumnInfo(name="id", type="int")], rows=[], row_count=0, execution_time_ms=1.0
+    )
+    executor = QueryExecutor(
+        generator, pool_manager, runner, cost_guard=CostGuard(CostBudget(max_cost=10_000))
+    )
+
+    result = await executor.execute("all events", "db")
+
+    runner.execute.assert_awaited_once_with(
+        sql="SELECT * FROM events LIMIT 1001", connection=connection, limit=1000
+    )
+    assert result.sql == "SELECT * FROM events LIMIT 1001"
+    assert result.plan_summary is not None and result.plan_summary.startswith("Limit")
+    assert any("LIMIT pushed down" in note for note in result.errors)
+
+    executor._cost_guard = CostGuard(CostBudget(max_cost=1, action=CostGuardAction.REJECT))
+    with pytest.raises(QueryExecutionError, match="cost budget"):
+        await executor.execute("all events", "db")
+
+
+@pytest.mark.asyncio
+async def test_export_checks_cost_but_not_rows() -> None:
+    """Exports are rejected on cost only; a large row estimate is expected."""
+    connection = _connection({"SELECT * FROM events": SEQ_SCAN_PLAN})
+    guard = CostGuard(CostBudget(max_cost=1e6, max_rows=1000))
+
+    summary = await guard.check_export("SELECT * FROM events", "db", connection)
+    assert summary.plan_rows == 10000000
+
+    guard = CostGuard(CostBudget(max_cost=10_000))
+    with pytest.raises(CostGuardError, match="Export exceeds the cost budget"):
+        await guard.check_export("SELECT * FROM events", "db", connection)
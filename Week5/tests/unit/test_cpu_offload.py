@@ -0,0 +1,112 @@
+"""
+Unit tests for the CPU offload process pool.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import csv
+from collections.abc import Iterator
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from postgres_mcp.config import OffloadConfig
+from postgres_mcp.core.sql_validator import validate_sql
+from postgres_mcp.db.result_exporter import ExportFormat, ResultExporter
+from postgres_mcp.mcp.tools import _render_preview
+from postgres_mcp.models.result import ColumnInfo, QueryResult
+from postgres_mcp.utils.cpu_offload import CPUOffloader
+from postgres_mcp.utils.result_renderer import RenderOptions, render_preview
+
+COLUMNS = [ColumnInfo(name="id", type="int4"), ColumnInfo(name="name", type="text")]
+
+
+@pytest.fixture(scope="module")
+def offloader() -> Iterator[CPUOffloader]:
+    """One worker pool shared by the module; thresholds of zero force offload."""
+    pool = CPUOffloader(
+        OffloadConfig(enabled=True, max_workers=2, min_sql_chars=0, min_cells=0, min_tables=0)
+    )
+    yield pool
+    pool.shutdown()
+
+
+async def _chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+@pytest.mark.asyncio
+async def test_small_payloads_run_inline() -> None:
+    """Payloads below the threshold (or with offload disabled) never start a pool."""
+    enabled = CPUOffloader(OffloadConfig(enabled=True, min_sql_chars=1_000))
+    disabled = CPUOffloader(OffloadConfig(enabled=False, min_sql_chars=0))
+
+    result = await enabled.run(validate_sql, "SELECT 1", size=8, threshold=1_000)
+    await disabled.run(validate_sql, "SELECT 1", size=8, threshold=0)
+
+    assert result.valid is True
+    assert enabled.inline_calls == 1 and enabled.offloaded_calls == 0
+    assert disabled.inline_calls == 1
+    assert enabled._executor is None and disabled._executor is None
+
+
+@pytest.mark.asyncio
+async def test_validation_offloaded_matches_inline(offloader: CPUOffloader) -> None:
+    """Validation results round-trip through the worker unchanged."""
+    sql = "SELECT id FROM users; DROP TABLE users"
+
+    result = await offloader.run(validate_sql, sql, size=len(sql), threshold=0)
+
+    assert offloader.offloaded_calls >= 1
+    assert result == validate_sql(sql)
+    assert result.valid is False
+
+
+@pytest.mark.asyncio
+async def test_export_encodes_chunks_in_workers(tmp_path: Path, offloader: CPUOffloader) -> None:
+    """Offloaded CSV/NDJSON encoding produces the same files as inline encoding."""
+    rows = [(i, f"name {i}") for i in range(50)]
+    for fmt in (ExportFormat.CSV, ExportFormat.NDJSON):
+        inline = await ResultExporter().export_chunks(
+            _chunks(rows, 20), COLUMNS, tmp_path / f"inline.{fmt.value}", fmt=fmt
+        )
+        offloaded = await ResultExporter(offloader=offloader).export_chunks(
+            _chunks(rows, 20), COLUMNS, tmp_path / f"pool.{fmt.value}", fmt=fmt
+        )
+        assert offloaded.path.read_bytes() == inline.path.read_bytes()
+
+    with (tmp_path / "pool.csv").open(newline="") as f:
+        assert len(list(csv.reader(f))) == 51
+
+
+@pytest.mark.asyncio
+async def test_preview_rendered_in_worker(offloader: CPUOffloader) -> None:
+    """Large previews are rendered in a worker with only the preview rows shipped."""
+    result = QueryResult(
+        columns=COLUMNS,
+        rows=[{"id": i, "name": f"n{i}"} for i in range(30)],
+        row_count=30,
+        execution_time_ms=1.0,
+    )
+    options = RenderOptions(preview_rows=5)
+    before = offloader.offloaded_calls
+
+    text = await _render_preview(result, options, SimpleNamespace(offloader=offloader))
+
+    assert offloader.offloaded_calls == before + 1
+    assert text == render_preview(result, options)
+    assert "... and 25 more rows" in text
@@ -0,0 +1,81 @@
+"""
+Unit tests for HTTP bearer-token authentication.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from postgres_mcp.config import ServerConfig
+from postgres_mcp.utils.http_auth import BearerAuthMiddleware, bearer_token_matches
+
+
+async def _call(app: Any, headers: list[tuple[bytes, bytes]]) -> list[dict[str, Any]]:
+    """Send one HTTP request through an ASGI app and collect the sent messages."""
+    scope = {"type": "http", "method": "POST", "path": "/mcp", "headers": headers}
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+def test_bearer_token_matches() -> None:
+    """Only the Bearer scheme with the exact token is accepted."""
+    assert bearer_token_matches("Bearer s3cret", "s3cret")
+    assert bearer_token_matches("bearer s3cret", "s3cret")
+    assert not bearer_token_matches(None, "s3cret")
+    assert not bearer_token_matches("Bearer wrong", "s3cret")
+    assert not bearer_token_matches("Basic s3cret", "s3cret")
+
+
+@pytest.mark.asyncio
+async def test_middleware_rejects_missing_or_wrong_token() -> None:
+    """Unauthenticated requests get 401 and never reach the MCP endpoint."""
+    reached: list[dict[str, Any]] = []
+
+    async def endpoint(scope: Any, receive: Any, send: Any) -> None:
+        reached.append(scope)
+
+    app = BearerAuthMiddleware(endpoint, token="s3cret")
+
+    for headers in ([], [(b"authorization", b"Bearer nope")]):
+        sent = await _call(app, headers)
+        assert sent[0]["status"] == 401
+        assert (b"www-authenticate", b"Bearer") in sent[0]["headers"]
+    assert reached == []
+
+    await _call(app, [(b"authorization", b"Bearer s3cret")])
+    assert len(reached) == 1
+
+
+def test_resolved_auth_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A configured token wins over the environment variable."""
+    monkeypatch.setenv("MCP_AUTH_TOKEN", "from-env")
+    config = ServerConfig(name="postgres-mcp", version="0.1.0")
+    assert config.resolved_auth_token == "from-env"
+
+    config = ServerConfig(name="postgres-mcp", version="0.1.0", auth_token="direct")
+    assert config.resolved_auth_token == "direct"
+
+    monkeypatch.delenv("MCP_AUTH_TOKEN")
+    assert ServerConfig(name="postgres-mcp", version="0.1.0").resolved_auth_token is None
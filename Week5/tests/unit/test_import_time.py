@@ -0,0 +1,76 @@
+"""
+Cold-start import benchmark for the server module.
+
+Runs ``python -X importtime`` in a fresh interpreter and fails when heavy
+dependencies are imported eagerly again or when the server's own import
+overhead (on top of the mcp SDK) exceeds the budget. The budget can be
+raised on slow machines with POSTGRES_MCP_IMPORT_BUDGET_MS.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+DEFERRED_MODULES = ("openai", "sqlglot", "asyncpg", "pybreaker")
+DEFAULT_BUDGET_MS = 250.0
+
+
+def _import_profile(statement: str) -> dict[str, int]:
+    """Return cumulative import time in microseconds per module name."""
+    pythonpath = [str(SRC_DIR), os.environ.get("PYTHONPATH", "")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, pythonpath))}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    profile: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def test_server_import_defers_heavy_modules() -> None:
+    """Importing the server must not import openai, sqlglot, asyncpg or pybreaker."""
+    profile = _import_profile("import postgres_mcp.server")
+
+    assert "postgres_mcp.server" in profile
+    eager = [name for name in profile if name.split(".")[0] in DEFERRED_MODULES]
+    assert eager == []
+
+
+def test_server_import_overhead_within_budget() -> None:
+    """The server's own import cost (excluding the mcp SDK) stays within budget."""
+    budget_ms = float(os.environ.get("POSTGRES_MCP_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS))
+
+    # Best of three to dampen noise from a cold filesystem cache.
+    overhead_ms = min(
+        _import_profile("import mcp.server.stdio, structlog, postgres_mcp.server")[
+            "postgres_mcp.server"
+        ]
+        / 1000
+        for _ in range(3)
+    )
+
+    assert overhead_ms < budget_ms, f"postgres_mcp.server import took {overhead_ms:.1f}ms"
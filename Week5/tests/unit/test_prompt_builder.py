@@ -8,6 +8,7 @@ import pytest
 from postgres_mcp.ai.prompt_builder import PromptBuilder
 from postgres_mcp.models.schema import (
     ColumnSchema,
+    ColumnStats,
     DatabaseSchema,
     TableSchema,
 )
@@ -111,6 +112,38 @@ def test_schema_to_ddl_format(prompt_builder, sample_schema):
     assert "orders" not in ddl
 
 
+def test_schema_to_ddl_includes_statistics_hints():
+    """测试 DDL 中包含缓存的列统计提示 (行数、取值、NULL 比例)。"""
+    orders = TableSchema(
+        name="orders",
+        row_count_estimate=1_200_000,
+        columns=[
+            ColumnSchema(
+                name="id", data_type="INTEGER", primary_key=True, stats=ColumnStats(n_distinct=-1)
+            ),
+            ColumnSchema(
+                name="status",
+                data_type="TEXT",
+                stats=ColumnStats(n_distinct=2, most_common_vals=["paid", "pending"]),
+            ),
+            ColumnSchema(
+                name="note",
+                data_type="TEXT",
+                stats=ColumnStats(null_frac=0.4, n_distinct=-0.5, most_common_vals=["gift"]),
+            ),
+        ],
+    )
+    schema = DatabaseSchema(database_name="shop", tables={"orders": orders})
+
+    ddl = PromptBuilder(max_sample_values=3)._schema_to_ddl(schema, ["orders"])
+
+    assert ddl.startswith("-- ~1,200,000 rows\nCREATE TABLE orders (")
+    assert "id INTEGER PRIMARY KEY, -- unique" in ddl
+    assert "status TEXT, -- values: 'paid', 'pending'" in ddl
+    assert "note TEXT -- e.g. 'gift'; ~600,000 distinct; 40% NULL" in ddl
+    assert "'paid'" not in PromptBuilder(max_sample_values=0)._schema_to_ddl(schema, ["orders"])
+
+
 def test_build_retry_prompt(prompt_builder, sample_schema):
     """测试重试提示词生成（验证失败后）。"""
     original_prompt = prompt_builder.build_user_prompt(
@@ -336,3 +336,44 @@ async def test_execute_runner_error(
         await query_executor.execute("Show all users", "test_db")
 
     assert "query execution failed" in str(exc_info.value).lower()
+
+
+@pytest.mark.asyncio
+async def test_export_streams_generated_sql(
+    mock_sql_generator: AsyncMock,
+    mock_pool_manager: AsyncMock,
+    mock_query_runner: AsyncMock,
+) -> None:
+    """
+    Test export() hands the generated SQL to the result exporter.
+
+    Args:
+    ----------
+        mock_sql_generator: Mock SQL generator.
+        mock_pool_manager: Mock pool manager.
+        mock_query_runner: Mock query runner.
+
+    Returns:
+    ----------
+        None
+
+    Raises:
+    ----------
+        None
+    """
+    exporter = AsyncMock()
+    exporter.export.return_value = AsyncMock(row_count=42)
+    executor = QueryExecutor(
+        sql_generator=mock_sql_generator,
+        pool_manager=mock_pool_manager,
+        query_runner=mock_query_runner,
+        result_exporter=exporter,
+    )
+
+    stats = await executor.export("Show all users", "test_db", "/tmp/users.csv")
+
+    assert stats.row_count == 42
+    call_args = exporter.export.call_args
+    assert call_args.kwargs["sql"] == "SELECT * FROM users LIMIT 1000"
+    assert call_args.kwargs["path"] == "/tmp/users.csv"
+    mock_query_runner.execute.assert_not_called()
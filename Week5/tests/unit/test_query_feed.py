@@ -0,0 +1,177 @@
+"""
+Unit tests for the live query feed, rolling metrics and feed resources.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from postgres_mcp.mcp.resources import (
+    QUERY_STATS_URI,
+    ResourceSubscriptions,
+    read_history_tail,
+)
+from postgres_mcp.models.log_entry import LogStatus, QueryLogEntry
+from postgres_mcp.utils.jsonl_writer import JSONLWriter
+from postgres_mcp.utils.query_feed import (
+    QueryFeed,
+    RollingMetrics,
+    bin_upper_ms,
+    latency_bin,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _entry(
+    database: str = "main",
+    status: LogStatus = LogStatus.SUCCESS,
+    total: float = 100.0,
+    generation: float | None = 80.0,
+    query: float | None = 20.0,
+    user_id: str | None = None,
+) -> QueryLogEntry:
+    return QueryLogEntry(
+        request_id="r",
+        database=database,
+        user_id=user_id,
+        natural_language="q",
+        status=status,
+        execution_time_ms=total,
+        generation_time_ms=generation,
+        query_time_ms=query,
+    )
+
+
+def test_latency_bins_are_within_ten_percent() -> None:
+    """Bin upper bounds over-estimate latency by less than 10%."""
+    for latency in (0.5, 3.0, 47.0, 1234.0, 60_000.0):
+        upper = bin_upper_ms(latency_bin(latency))
+        assert latency <= upper < latency * 1.1
+
+
+def test_metrics_percentiles_error_rate_and_stages() -> None:
+    """Percentiles, QPS and error rate per stage and database."""
+    clock = FakeClock()
+    metrics = RollingMetrics(window_seconds=10, clock=clock)
+
+    for i in range(1, 101):
+        metrics.record(_entry(total=float(i)))
+    failed = _entry(database="other", status=LogStatus.AI_FAILED, generation=None, query=None)
+    metrics.record(failed)
+    clock.now += 5
+
+    snapshot = metrics.snapshot()
+    total = snapshot["databases"]["*"]["total"]
+    assert total["count"] == 101
+    assert total["qps"] == pytest.approx(101 / 5)
+    assert total["error_rate"] == pytest.approx(1 / 101, abs=1e-4)
+    assert 50 <= total["p50_ms"] < 55
+    assert 95 <= total["p95_ms"] < 105
+    assert snapshot["databases"]["main"]["execution"]["p99_ms"] == pytest.approx(
+        bin_upper_ms(latency_bin(20.0)), abs=0.01
+    )
+    # The AI failure is charged to the generation stage, which has no timing.
+    generation = snapshot["databases"]["other"]["generation"]
+    assert generation["count"] == 1 and generation["error_rate"] == 1.0
+    assert generation["p50_ms"] is None
+    assert "execution" not in snapshot["databases"]["other"]
+
+
+def test_metrics_expire_old_slots() -> None:
+    """Entries leave the window once their second is older than the window."""
+    clock = FakeClock()
+    metrics = RollingMetrics(window_seconds=5, clock=clock)
+    metrics.record(_entry(total=10.0))
+    clock.now += 3
+    metrics.record(_entry(total=500.0))
+
+    clock.now += 2  # first entry expires
+    total = metrics.snapshot()["databases"]["*"]["total"]
+    assert total["count"] == 1 and total["p50_ms"] >= 500
+
+    clock.now += 1000  # long idle gap expires everything
+    assert metrics.snapshot()["databases"] == {}
+
+
+@pytest.mark.asyncio
+async def test_feed_ring_buffer_and_subscribers(tmp_path) -> None:
+    """JSONLWriter publishes to the feed; slow subscribers lose oldest entries."""
+    feed = QueryFeed(capacity=3)
+    seen: list[int] = []
+    feed.add_listener(lambda sequence, entry: seen.append(sequence))
+    subscription = feed.subscribe(max_queue=2)
+    writer = JSONLWriter(log_directory=tmp_path, buffer_size=100, feed=feed)
+
+    for i in range(5):
+        await writer.write(_entry(total=float(i)))
+
+    assert seen == [1, 2, 3, 4, 5]
+    assert [sequence for sequence, _ in feed.recent()] == [3, 4, 5]
+    assert [sequence for sequence, _ in feed.recent(after=4)] == [5]
+    assert [sequence for sequence, _ in feed.recent(limit=1)] == [5]
+    assert subscription.dropped == 3
+    assert (await subscription.get())[0] == 4
+    subscription.close()
+    await writer.write(_entry(user_id="alice"))
+    assert (await subscription.get())[0] == 5
+
+    body = json.loads(read_history_tail(feed, "after=5", client_id="alice"))
+    assert body["last_sequence"] == 6
+    assert [e["sequence"] for e in body["entries"]] == [6]
+    assert body["entries"][0]["query_time_ms"] == 20.0
+
+
+def test_history_tail_only_shows_callers_entries() -> None:
+    """Clients only see their own queries; limit applies after filtering."""
+    feed = QueryFeed(capacity=10)
+    for user_id in ["alice", "bob", "alice", "bob", "bob"]:
+        feed.publish(_entry(user_id=user_id))
+
+    body = json.loads(read_history_tail(feed, "limit=1", client_id="alice"))
+    assert [e["sequence"] for e in body["entries"]] == [3]
+    body = json.loads(read_history_tail(feed, "", client_id="bob"))
+    assert [e["user_id"] for e in body["entries"]] == ["bob"] * 3
+    assert json.loads(read_history_tail(feed, "", client_id="carol"))["entries"] == []
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_coalesce_notifications() -> None:
+    """A burst of updates sends one notification per subscribed session."""
+    subscriptions = ResourceSubscriptions(min_interval_seconds=0.01)
+    healthy = AsyncMock()
+    broken = AsyncMock()
+    broken.send_resource_updated.side_effect = RuntimeError("closed")
+    subscriptions.subscribe(QUERY_STATS_URI, healthy)
+    subscriptions.subscribe(QUERY_STATS_URI, broken)
+
+    for _ in range(50):
+        subscriptions.notify(QUERY_STATS_URI, "history://tail")
+    await asyncio.sleep(0.05)
+
+    healthy.send_resource_updated.assert_awaited_once()
+    assert str(healthy.send_resource_updated.await_args.args[0]) == QUERY_STATS_URI
+    assert subscriptions.subscriber_count(QUERY_STATS_URI) == 1
+    await subscriptions.close()
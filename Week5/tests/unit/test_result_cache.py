@@ -0,0 +1,228 @@
+"""
+Unit tests for the query result cache.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from postgres_mcp.core.query_executor import QueryExecutor
+from postgres_mcp.core.result_cache import ResultCache, analyze_sql
+from postgres_mcp.models.query import GeneratedQuery
+from postgres_mcp.models.result import ColumnInfo, QueryResult
+
+
+def _counters(**tables: int) -> list[dict]:
+    """pg_stat_user_tables rows where the value is the insert counter."""
+    rows = []
+    for name, inserts in tables.items():
+        rows.append(
+            {
+                "schemaname": "public",
+                "relname": name,
+                "n_tup_ins": inserts,
+                "n_tup_upd": 0,
+                "n_tup_del": 0,
+                "n_tup_hot_upd": 0,
+                "vacuum_count": 0,
+                "autovacuum_count": 0,
+                "analyze_count": 0,
+            }
+        )
+    return rows
+
+
+def _pool_manager(connection: AsyncMock) -> AsyncMock:
+    @asynccontextmanager
+    async def get_connection(database):
+        yield connection
+
+    manager = AsyncMock()
+    manager.get_connection = get_connection
+    return manager
+
+
+def _result(rows: int = 2) -> QueryResult:
+    return QueryResult(
+        columns=[ColumnInfo(name="id", type="int")],
+        rows=[{"id": i} for i in range(rows)],
+        row_count=rows,
+        execution_time_ms=3.0,
+        sql="SELECT id FROM users",
+    )
+
+
+async def _primed_cache(connection: AsyncMock, **kwargs) -> ResultCache:
+    """Cache that has polled counters once for database 'db'."""
+    cache = ResultCache(_pool_manager(connection), poll_interval_seconds=3600, **kwargs)
+    cache._counters["db"] = {}
+    await cache.poll("db")
+    return cache
+
+
+def test_analyze_sql_extracts_tables_and_volatility() -> None:
+    """Tables are schema-qualified, CTE names skipped, volatile SQL uncacheable."""
+    analysis = analyze_sql("WITH x AS (SELECT * FROM sales.orders) SELECT * FROM x JOIN users u")
+
+    assert analysis.tables == frozenset({"sales.orders", "public.users"})
+    assert analysis.cacheable is True
+    assert analyze_sql("SELECT now(), id FROM users").cacheable is False
+    assert analyze_sql("SELECT 1").cacheable is False
+    assert (
+        analyze_sql("select   id\nfrom users;").normalized_sql
+        == analyze_sql("SELECT id FROM users").normalized_sql
+    )
+
+
+@pytest.mark.asyncio
+async def test_hit_returns_copy_until_table_changes() -> None:
+    """Cached results are served until the table's write counters move."""
+    connection = AsyncMock()
+    connection.fetch = AsyncMock(return_value=_counters(users=10, orders=5))
+    cache = await _primed_cache(connection)
+    key = cache.make_key("db", "SELECT id FROM users", limit=100)
+
+    assert cache.put(key, _result()) is True
+    hit = cache.get(key)
+    assert hit is not None and hit.row_count == 2
+    hit.errors.append("mutated")
+    assert cache.get(key).errors == []
+
+    connection.fetch.return_value = _counters(users=10, orders=6)
+    assert await cache.poll("db") == {"public.orders"}
+    assert cache.get(key) is not None
+
+    connection.fetch.return_value = _counters(users=11, orders=6)
+    await cache.poll("db")
+    assert cache.get(key) is None
+    assert cache.invalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_execution_skips_put() -> None:
+    """A result whose tables were invalidated while the query ran is not cached."""
+    connection = AsyncMock()
+    connection.fetch = AsyncMock(return_value=_counters(users=10, orders=5))
+    cache = await _primed_cache(connection)
+    key = cache.make_key("db", "SELECT id FROM users", limit=100)
+
+    snapshot = cache.snapshot(key)
+    # A write lands between execute and put; no entry existed to remove.
+    connection.fetch.return_value = _counters(users=11, orders=5)
+    assert await cache.poll("db") == {"public.users"}
+    assert cache.put(key, _result(), snapshot) is False
+    assert cache.get(key) is None
+
+    # Unrelated tables and a fresh snapshot do not block caching.
+    snapshot = cache.snapshot(key)
+    connection.fetch.return_value = _counters(users=11, orders=6)
+    await cache.poll("db")
+    assert cache.put(key, _result(), snapshot) is True
+
+    snapshot = cache.snapshot(key)
+    cache.clear("db")
+    assert cache.put(key, _result(), snapshot) is False
+
+
+@pytest.mark.asyncio
+async def test_unobservable_tables_and_first_query_are_not_cached() -> None:
+    """Views/unknown relations are never cached; the first query only starts polling."""
+    connection = AsyncMock()
+    connection.fetch = AsyncMock(return_value=_counters(users=1))
+    cache = ResultCache(_pool_manager(connection), poll_interval_seconds=3600)
+    key = cache.make_key("db", "SELECT id FROM users", limit=10)
+
+    try:
+        assert cache.put(key, _result()) is False  # no counters yet: starts poller
+        await cache.poll("db")
+        assert cache.put(key, _result()) is True
+        view_key = cache.make_key("db", "SELECT id FROM active_users_view", limit=10)
+        assert cache.put(view_key, _result()) is False
+    finally:
+        await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_bound_evicts_least_recently_used() -> None:
+    """Entries are evicted in LRU order once the byte budget is exceeded."""
+    connection = AsyncMock()
+    connection.fetch = AsyncMock(return_value=_counters(users=1))
+    cache = await _primed_cache(connection, max_bytes=16_000)
+    keys = [cache.make_key("db", "SELECT id FROM users", limit=n) for n in range(1, 6)]
+
+    for key in keys:
+        cache.put(key, _result(rows=40))
+        cache.get(keys[0])  # keep the first entry hot
+
+    assert cache.size_bytes <= 16_000
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+
+
+@pytest.mark.asyncio
+async def test_executor_reports_cache_status() -> None:
+    """QueryExecutor skips the database on hits and labels the result."""
+    connection = AsyncMock()
+    connection.fetch = AsyncMock(return_value=_counters(users=1))
+    cache = await _primed_cache(connection)
+    generator = AsyncMock()
+    generator.generate.return_value = GeneratedQuery(
+        sql="SELECT id FROM users", validated=True, generation_method="ai_generated"
+    )
+    runner = AsyncMock()
+    runner.execute.return_value = _result()
+    executor = QueryExecutor(generator, _pool_manager(connection), runner, result_cache=cache)
+
+    first = await executor.execute("users", "db", limit=10)
+    second = await executor.execute("users", "db", limit=10)
+
+    assert first.cache_status == "miss"
+    assert second.cache_status == "hit"
+    assert second.rows == first.rows
+    runner.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_approximate_not_applicable_note_is_not_cached() -> None:
+    """The approximate-mode note reaches the caller but never the cached copy."""
+    connection = AsyncMock()
+    connection.fetch = AsyncMock(return_value=_counters(users=1))
+    cache = await _primed_cache(connection)
+    generator = AsyncMock()
+    generator.generate.return_value = GeneratedQuery(
+        sql="SELECT id FROM users", validated=True, generation_method="ai_generated"
+    )
+    runner = AsyncMock()
+    runner.execute.return_value = _result()
+    approximator = MagicMock()
+    approximator.refined.return_value = None
+    approximator.plan = AsyncMock(return_value=None)  # table too small to sample
+    executor = QueryExecutor(
+        generator,
+        _pool_manager(connection),
+        runner,
+        result_cache=cache,
+        approximator=approximator,
+    )
+
+    approximate = await executor.execute("users", "db", limit=10, approximate=True)
+    exact = await executor.execute("users", "db", limit=10)
+
+    assert any("Approximate mode not applicable" in e for e in approximate.errors)
+    assert exact.cache_status == "hit"
+    assert exact.errors == []
@@ -0,0 +1,216 @@
+"""
+Unit tests for ResultExporter.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from postgres_mcp.db.result_exporter import (
+    ExportCompression,
+    ExportError,
+    ExportFormat,
+    ResultExporter,
+)
+from postgres_mcp.models.result import ColumnInfo, QueryResult
+
+COLUMNS = [ColumnInfo(name="id", type="int4"), ColumnInfo(name="name", type="text")]
+ROWS = [(1, "Alice"), (2, "Bob, Jr."), (3, None)]
+
+
+async def _chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _mock_connection(rows: list[tuple], chunk_size: int) -> MagicMock:
+    """Build an asyncpg-like connection exposing prepare() and a cursor."""
+    remaining = list(rows)
+
+    async def fetch(n):
+        batch = remaining[:n]
+        del remaining[:n]
+        return batch
+
+    cursor = SimpleNamespace(fetch=AsyncMock(side_effect=fetch))
+    statement = MagicMock()
+    statement.get_attributes.return_value = [
+        SimpleNamespace(name="id", type=SimpleNamespace(name="int4")),
+        SimpleNamespace(name="name", type=SimpleNamespace(name="text")),
+    ]
+    statement.cursor = AsyncMock(return_value=cursor)
+
+    @asynccontextmanager
+    async def transaction(readonly=False):
+        yield
+
+    connection = MagicMock()
+    connection.transaction = transaction
+    connection.prepare = AsyncMock(return_value=statement)
+    return connection
+
+
+@pytest.mark.asyncio
+async def test_export_csv_streams_all_chunks(tmp_path: Path) -> None:
+    """CSV export writes header plus every row across chunks."""
+    exporter = ResultExporter(chunk_size=2)
+    target = tmp_path / "out.csv"
+
+    stats = await exporter.export_chunks(_chunks(ROWS, 2), COLUMNS, target)
+
+    assert stats.row_count == 3
+    assert stats.chunk_count == 2
+    assert stats.bytes_written == target.stat().st_size
+    with target.open(newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows == [["id", "name"], ["1", "Alice"], ["2", "Bob, Jr."], ["3", ""]]
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_gzip(tmp_path: Path) -> None:
+    """NDJSON export with gzip produces one JSON object per line."""
+    exporter = ResultExporter()
+    target = tmp_path / "out.ndjson.gz"
+
+    await exporter.export_chunks(
+        _chunks(ROWS, 10),
+        COLUMNS,
+        target,
+        fmt=ExportFormat.NDJSON,
+        compression=ExportCompression.GZIP,
+    )
+
+    with gzip.open(target, "rt", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert lines[0] == {"id": 1, "name": "Alice"}
+    assert lines[2] == {"id": 3, "name": None}
+
+
+@pytest.mark.asyncio
+async def test_export_parquet_round_trip(tmp_path: Path) -> None:
+    """Parquet export keeps one schema across row groups."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    exporter = ResultExporter()
+    target = tmp_path / "out.parquet"
+
+    stats = await exporter.export_chunks(
+        _chunks(ROWS, 1),
+        COLUMNS,
+        target,
+        fmt=ExportFormat.PARQUET,
+        compression=ExportCompression.ZSTD,
+    )
+
+    table = pq.read_table(target)
+    assert stats.chunk_count == 3
+    assert table.column("id").to_pylist() == [1, 2, 3]
+    assert table.column("name").to_pylist() == ["Alice", "Bob, Jr.", None]
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_unsupported_compression(tmp_path: Path) -> None:
+    """Text formats only accept gzip compression."""
+    exporter = ResultExporter()
+
+    with pytest.raises(ExportError, match="not supported"):
+        await exporter.export_chunks(
+            _chunks(ROWS, 10),
+            COLUMNS,
+            tmp_path / "out.csv",
+            compression=ExportCompression.ZSTD,
+        )
+
+
+@pytest.mark.asyncio
+async def test_export_refuses_overwrite(tmp_path: Path) -> None:
+    """Existing files are only replaced when overwrite is set."""
+    exporter = ResultExporter()
+    target = tmp_path / "out.csv"
+    target.write_text("keep me")
+
+    with pytest.raises(ExportError, match="already exists"):
+        await exporter.export_chunks(_chunks(ROWS, 10), COLUMNS, target)
+    assert target.read_text() == "keep me"
+
+    stats = await exporter.export_chunks(_chunks(ROWS, 10), COLUMNS, target, overwrite=True)
+    assert stats.row_count == 3
+
+
+@pytest.mark.asyncio
+async def test_export_removes_partial_file_on_failure(tmp_path: Path) -> None:
+    """A failing source leaves no half-written file behind."""
+
+    async def failing_chunks():
+        yield ROWS[:1]
+        raise RuntimeError("cursor lost")
+
+    exporter = ResultExporter()
+    target = tmp_path / "out.csv"
+
+    with pytest.raises(ExportError, match="after 1 rows"):
+        await exporter.export_chunks(failing_chunks(), COLUMNS, target)
+    assert not target.exists()
+
+
+@pytest.mark.asyncio
+async def test_export_confined_to_export_root(tmp_path: Path) -> None:
+    """Relative paths land inside the export root; escapes are rejected."""
+    root = tmp_path / "exports"
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    exporter = ResultExporter(export_root=root)
+
+    stats = await exporter.export_chunks(_chunks(ROWS, 10), COLUMNS, "out.csv")
+    assert stats.path == (root / "out.csv").resolve()
+
+    (root / "link").symlink_to(outside, target_is_directory=True)
+    for path in ["../escape.csv", str(outside / "abs.csv"), "link/escape.csv"]:
+        with pytest.raises(ExportError, match="must be a file inside"):
+            await exporter.export_chunks(_chunks(ROWS, 10), COLUMNS, path)
+    assert list(outside.iterdir()) == []
+    assert not (tmp_path / "escape.csv").exists()
+
+
+@pytest.mark.asyncio
+async def test_export_uses_server_side_cursor(tmp_path: Path) -> None:
+    """export() reads column metadata from the prepared statement and pages the cursor."""
+    connection = _mock_connection(ROWS, chunk_size=2)
+    exporter = ResultExporter(chunk_size=2)
+
+    stats = await exporter.export("SELECT id, name FROM users", connection, tmp_path / "u.csv")
+
+    connection.prepare.assert_awaited_once_with("SELECT id, name FROM users")
+    assert [col.name for col in stats.columns] == ["id", "name"]
+    assert stats.row_count == 3
+
+
+def test_query_result_to_csv_handles_missing_keys() -> None:
+    """to_csv writes empty cells for NULLs and missing keys."""
+    result = QueryResult(
+        columns=COLUMNS,
+        rows=[{"id": 1, "name": "Alice"}, {"id": 2}],
+        row_count=2,
+        execution_time_ms=1.0,
+    )
+
+    assert result.to_csv().splitlines() == ["id,name", "1,Alice", "2,"]
@@ -0,0 +1,111 @@
+"""
+Unit tests for the result preview renderer.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import pytest
+
+from postgres_mcp.models.result import ColumnInfo, QueryResult
+from postgres_mcp.utils.result_renderer import (
+    RenderMode,
+    RenderOptions,
+    get_formatter,
+    render_preview,
+    render_rows,
+)
+
+
+def _result(rows: list[dict[str, object]], columns: list[ColumnInfo]) -> QueryResult:
+    return QueryResult(columns=columns, rows=rows, row_count=len(rows), execution_time_ms=1.0)
+
+
+def test_markdown_table_is_aligned() -> None:
+    """All lines of the Markdown table share the same column widths."""
+    columns = [ColumnInfo(name="id", type="int"), ColumnInfo(name="name", type="str")]
+    rows = [{"id": 1, "name": "Alice"}, {"id": 22, "name": None}]
+
+    lines = render_rows(columns, rows).splitlines()
+
+    assert lines[0] == "| id  | name  |"
+    assert lines[1] == "| --- | ----- |"
+    assert lines[2] == "| 1   | Alice |"
+    assert lines[3] == "| 22  | NULL  |"
+    assert len({len(line) for line in lines}) == 1
+
+
+def test_cells_are_escaped_and_truncated() -> None:
+    """Pipes are escaped, newlines flattened and wide cells truncated."""
+    columns = [ColumnInfo(name="note", type="text")]
+    rows = [{"note": "a|b\nc"}, {"note": "x" * 50}]
+
+    table = render_rows(columns, rows, RenderOptions(max_cell_width=10))
+
+    assert "a\\|b c" in table
+    assert "xxxxxxxxx…" in table
+    assert "x" * 11 not in table
+
+
+def test_type_formatters() -> None:
+    """Dates, decimals and JSON values use type-specific formatting."""
+    assert get_formatter("datetime")(datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC)) == (
+        "2025-01-02 03:04:05+00:00"
+    )
+    assert get_formatter("date")(date(2025, 1, 2)) == "2025-01-02"
+    assert get_formatter("numeric")(Decimal("1E+3")) == "1000"
+    assert get_formatter("jsonb")({"a": [1, 2]}) == '{"a":[1,2]}'
+    assert get_formatter("bool")(True) == "true"
+    assert get_formatter("unknown_type")(42) == "42"
+
+
+def test_tsv_mode() -> None:
+    """TSV mode emits a header line and tab-separated rows without padding."""
+    columns = [ColumnInfo(name="id", type="int"), ColumnInfo(name="tags", type="list")]
+    rows = [{"id": 1, "tags": ["a", "b"]}]
+
+    table = render_rows(columns, rows, RenderOptions(mode=RenderMode.TSV))
+
+    assert table == 'id\ttags\n1\t["a","b"]'
+
+
+def test_render_preview_respects_preview_rows() -> None:
+    """Only preview_rows rows are rendered and the remainder is summarised."""
+    columns = [ColumnInfo(name="id", type="int")]
+    result = _result([{"id": i} for i in range(25)], columns)
+
+    preview = render_preview(result, RenderOptions(preview_rows=5))
+
+    assert "first 5 rows" in preview
+    assert "| 4   |" in preview
+    assert "| 5   |" not in preview
+    assert "... and 20 more rows" in preview
+
+
+def test_render_preview_empty_result() -> None:
+    """Empty results render the no-rows note."""
+    result = _result([], [ColumnInfo(name="id", type="int")])
+
+    assert render_preview(result) == "\n*No rows returned*"
+
+
+def test_render_options_validation() -> None:
+    """Invalid options are rejected."""
+    with pytest.raises(ValueError):
+        RenderOptions(preview_rows=-1)
+    with pytest.raises(ValueError):
+        RenderOptions(max_cell_width=2)
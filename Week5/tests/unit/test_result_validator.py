@@ -12,6 +12,7 @@ import pytest
 
 from postgres_mcp.core.result_validator import ResultValidator
 from postgres_mcp.models.result import ColumnInfo, QueryResult
+from postgres_mcp.models.schema import ColumnSchema, ColumnStats, DatabaseSchema, TableSchema
 from postgres_mcp.models.validation import (
     AIValidationResponse,
     ValidationIssue,
@@ -438,3 +439,101 @@ class TestEdgeCases:
         # 基础验证应该通过（非空结果）
         # 或者至少不应该有严重错误阻止查询
         assert validation.valid or len([s for s in validation.suggestions if s.severity == ValidationSeverity.ERROR]) == 0
+
+
+class TestStatisticsValidation:
+    """Test checks based on cached column statistics."""
+
+    @pytest.mark.asyncio
+    async def test_empty_result_suggests_known_value(self):
+        """空结果时, 过滤值不在列的完整常见值中应给出修正建议"""
+        schema = DatabaseSchema(
+            database_name="shop",
+            tables={
+                "orders": TableSchema(
+                    name="orders",
+                    columns=[
+                        ColumnSchema(
+                            name="status",
+                            data_type="text",
+                            stats=ColumnStats(
+                                n_distinct=3, most_common_vals=["paid", "pending", "refunded"]
+                            ),
+                        )
+                    ],
+                )
+            },
+        )
+        schema_cache = AsyncMock()
+        schema_cache.get_schema.return_value = schema
+        validator = ResultValidator(schema_cache=schema_cache)
+        result = QueryResult(
+            columns=[],
+            row_count=0,
+            execution_time_ms=1.0,
+            sql="SELECT count(*) FROM orders WHERE status = 'PAID'",
+        )
+
+        validation = await validator.validate(
+            result=result, natural_language="paid orders", database="shop"
+        )
+
+        assert ValidationIssue.VALUE_MISMATCH in validation.issues
+        suggestion = next(
+            s for s in validation.suggestions if s.issue == ValidationIssue.VALUE_MISMATCH
+        )
+        assert "'paid'" in suggestion.message
+        assert suggestion.severity == ValidationSeverity.WARNING
+        assert suggestion.suggested_query == "SELECT COUNT(*) FROM orders WHERE status = 'paid'"
+        schema_cache.get_schema.assert_awaited_once_with("shop")
+
+    def test_value_check_resolves_column_qualifier(self):
+        """过滤列按别名解析到所属表, 不误报其他表的同名列"""
+        status = ColumnStats(n_distinct=2, most_common_vals=["paid", "pending"])
+        schema = DatabaseSchema(
+            database_name="shop",
+            tables={
+                "orders": TableSchema(
+                    name="orders",
+                    columns=[ColumnSchema(name="status", data_type="text", stats=status)],
+                ),
+                "shipments": TableSchema(
+                    name="shipments",
+                    columns=[ColumnSchema(name="status", data_type="text")],
+                ),
+            },
+        )
+        validator = ResultValidator()
+        sql = (
+            "SELECT o.id FROM orders o JOIN shipments s ON s.order_id = o.id "
+            "WHERE {column} = 'delivered'"
+        )
+
+        assert validator._value_mismatch_suggestions(sql.format(column="s.status"), schema) == []
+        # 未限定且两个表都有该列: 无法确定所属表, 不检查
+        assert validator._value_mismatch_suggestions(sql.format(column="status"), schema) == []
+        suggestions = validator._value_mismatch_suggestions(sql.format(column="o.status"), schema)
+        assert len(suggestions) == 1
+        assert "orders.status" in suggestions[0].message
+
+    def test_value_check_skips_literals_longer_than_stored_values(self):
+        """常见值在统计中被截断, 更长的字面量不做比较"""
+        long_value = "x" * 80
+        schema = DatabaseSchema(
+            database_name="shop",
+            tables={
+                "notes": TableSchema(
+                    name="notes",
+                    columns=[
+                        ColumnSchema(
+                            name="body",
+                            data_type="text",
+                            stats=ColumnStats(n_distinct=1, most_common_vals=[long_value[:64]]),
+                        )
+                    ],
+                )
+            },
+        )
+        sql = f"SELECT * FROM notes WHERE body = '{long_value}'"
+
+        assert ResultValidator()._value_mismatch_suggestions(sql, schema) == []
@@ -246,3 +246,26 @@ async def test_cache_inspector_error_handling():
     # Initialization should handle error gracefully
     with pytest.raises(Exception, match="DB Connection failed"):
         await cache.initialize()
+
+
+@pytest.mark.asyncio
+async def test_refresh_bumps_version_and_notifies_listeners(mock_inspector, sample_schema):
+    """Test that each (re)load bumps the version and notifies listeners."""
+    cache = SchemaCache(databases={"test_db": mock_inspector}, auto_refresh_interval=0)
+    events: list[tuple[str, int]] = []
+
+    async def async_listener(database, schema, version):
+        events.append((database, version))
+
+    def failing_listener(database, schema, version):
+        raise RuntimeError("listener boom")
+
+    cache.add_refresh_listener(failing_listener)
+    cache.add_refresh_listener(async_listener)
+
+    assert cache.get_version("test_db") == 0
+    await cache.initialize()
+    await cache.refresh_schema("test_db")
+
+    assert cache.get_version("test_db") == 2
+    assert events == [("test_db", 1), ("test_db", 2)]
@@ -10,7 +10,9 @@ import pytest
 
 from postgres_mcp.db.schema_inspector import SchemaInspector
 from postgres_mcp.models.schema import (
+    ColumnSchema,
     DatabaseSchema,
+    TableSchema,
 )
 
 
@@ -331,3 +333,43 @@ async def test_get_foreign_keys(schema_inspector):
     assert fks[0].column == "user_id"
     assert fks[0].foreign_table == "users"
     assert fks[0].foreign_column == "id"
+
+
+@pytest.mark.asyncio
+async def test_apply_stats_reloads_only_reanalyzed_tables(schema_inspector):
+    """Test bulk statistics loading and incremental refresh."""
+    tables = {
+        name: TableSchema(name=name, columns=[ColumnSchema(name="status", data_type="text")])
+        for name in ("orders", "users")
+    }
+    table_stats = [
+        {"table_name": "orders", "reltuples": 5000, "analyze_count": 1},
+        {"table_name": "users", "reltuples": -1, "analyze_count": 0},
+    ]
+    column_stats = [
+        {
+            "tablename": "orders",
+            "attname": "status",
+            "null_frac": 0.0,
+            "n_distinct": 2.0,
+            "most_common_vals": ["paid", "pending"],
+        }
+    ]
+    mock_conn = AsyncMock()
+    mock_conn.fetch = AsyncMock(side_effect=[table_stats, column_stats])
+
+    result = await schema_inspector._apply_stats(mock_conn, tables)
+
+    assert result["orders"].row_count_estimate == 5000
+    assert result["users"].row_count_estimate is None
+    assert result["orders"].columns[0].stats.most_common_vals == ["paid", "pending"]
+    assert result["users"].columns[0].stats is None
+    assert mock_conn.fetch.await_args_list[1].args[1] == ["orders", "users"]
+
+    # Second pass: only orders was analyzed again
+    table_stats[0]["analyze_count"] = 2
+    mock_conn.fetch = AsyncMock(side_effect=[table_stats, column_stats])
+
+    await schema_inspector._apply_stats(mock_conn, tables)
+
+    assert mock_conn.fetch.await_args_list[1].args[1] == ["orders"]
@@ -0,0 +1,169 @@
+"""
+Unit tests for cached schema resources.
+
+Tests rendering, version-based caching, refresh invalidation and pagination.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from postgres_mcp.core.schema_cache import SchemaCache
+from postgres_mcp.mcp.resources import (
+    SchemaResourceCache,
+    read_database_schema,
+    read_table_schema,
+    read_tables_page,
+)
+from postgres_mcp.models.schema import ColumnSchema, DatabaseSchema, TableSchema
+
+
+def _schema(table_count: int, extra_column: str | None = None) -> DatabaseSchema:
+    columns = [
+        ColumnSchema(name="id", data_type="integer", primary_key=True, nullable=False),
+        ColumnSchema(name="status", data_type="text", default_value="'new'"),
+    ]
+    if extra_column:
+        columns.append(ColumnSchema(name=extra_column, data_type="text"))
+    tables = {
+        f"table_{i:03d}": TableSchema(name=f"table_{i:03d}", columns=columns)
+        for i in range(table_count)
+    }
+    return DatabaseSchema(database_name="test_db", tables=tables)
+
+
+@pytest.fixture
+def mock_inspector():
+    """Create mock SchemaInspector returning a 3-table schema."""
+    inspector = MagicMock()
+    inspector.inspect_schema = AsyncMock(return_value=_schema(3))
+    inspector.connect = AsyncMock()
+    inspector.disconnect = AsyncMock()
+    return inspector
+
+
+@pytest.fixture
+async def ctx(mock_inspector):
+    """Create a server-context-like object with schema cache and resources."""
+    cache = SchemaCache(databases={"test_db": mock_inspector}, auto_refresh_interval=0)
+    await cache.initialize()
+    resources = SchemaResourceCache(cache, page_size=2)
+    yield SimpleNamespace(schema_cache=cache, schema_resources=resources)
+    await resources.close()
+
+
+@pytest.mark.asyncio
+async def test_table_resource_renders_columns_and_ddl(ctx):
+    """Test table resource includes defaults and DDL."""
+    body = await read_table_schema("test_db", "table_000", ctx)
+
+    assert "# Table: test_db.table_000" in body
+    assert "- **Default**: 'new'" in body
+    assert "CREATE TABLE table_000" in body
+
+
+@pytest.mark.asyncio
+async def test_bodies_are_cached_per_version(ctx, monkeypatch):
+    """Test repeated reads reuse the rendered body until the schema changes."""
+    import postgres_mcp.mcp.resources as resources_module
+
+    calls = []
+    original = resources_module.render_table_schema
+
+    def counting(*args):
+        calls.append(args[1])
+        return original(*args)
+
+    monkeypatch.setattr(resources_module, "render_table_schema", counting)
+
+    first = await read_table_schema("test_db", "table_001", ctx)
+    second = await read_table_schema("test_db", "table_001", ctx)
+
+    assert first is second
+    assert calls == ["table_001"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_invalidates_rendered_bodies(ctx, mock_inspector):
+    """Test SchemaCache refresh events replace stale bodies."""
+    before = await read_table_schema("test_db", "table_000", ctx)
+    assert "email" not in before
+
+    mock_inspector.inspect_schema.return_value = _schema(3, extra_column="email")
+    await ctx.schema_cache.refresh_schema("test_db")
+
+    after = await read_table_schema("test_db", "table_000", ctx)
+    assert "### email" in after
+
+
+@pytest.mark.asyncio
+async def test_large_schema_is_paginated(ctx):
+    """Test databases above page size get an index and page resources."""
+    index = await read_database_schema("test_db", ctx)
+    assert "schema://test_db/tables?page=1" in index
+    assert "schema://test_db/tables?page=2" in index
+    assert "## Table:" not in index
+
+    page_one = await read_tables_page("test_db", 1, ctx)
+    assert "## Table: table_000" in page_one
+    assert "## Table: table_001" in page_one
+    assert "table_002" not in page_one.split("**Next page**")[0]
+
+    page_two = await read_tables_page("test_db", 2, ctx)
+    assert "## Table: table_002" in page_two
+
+    assert "Page out of range" in await read_tables_page("test_db", 3, ctx)
+
+
+@pytest.mark.asyncio
+async def test_precompute_renders_all_bodies(ctx, monkeypatch):
+    """Test background precompute fills the cache before any read."""
+    ctx.schema_resources.start_precompute()
+    await asyncio.sleep(0.05)
+
+    import postgres_mcp.mcp.resources as resources_module
+
+    def fail(*args):
+        raise AssertionError("should have been precomputed")
+
+    monkeypatch.setattr(resources_module, "render_table_schema", fail)
+    monkeypatch.setattr(resources_module, "render_tables_page", fail)
+    monkeypatch.setattr(resources_module, "render_database_schema", fail)
+
+    assert "table_002" in await read_table_schema("test_db", "table_002", ctx)
+    assert "page 2/2" in await read_tables_page("test_db", 2, ctx)
+    await read_database_schema("test_db", ctx)
+
+
+@pytest.mark.asyncio
+async def test_unknown_database(ctx):
+    """Test reads for unknown databases report not found."""
+    assert await read_database_schema("missing", ctx) == "Database not found: missing"
+
+
+@pytest.mark.asyncio
+async def test_precompute_offloads_large_schemas(mock_inspector):
+    """Test large schemas are rendered in one worker call with identical bodies."""
+    from postgres_mcp.config import OffloadConfig
+    from postgres_mcp.mcp.resources import render_resource_body
+    from postgres_mcp.utils.cpu_offload import CPUOffloader
+
+    mock_inspector.inspect_schema = AsyncMock(return_value=_schema(5))
+    cache = SchemaCache(databases={"test_db": mock_inspector}, auto_refresh_interval=0)
+    await cache.initialize()
+    offloader = CPUOffloader(OffloadConfig(enabled=True, max_workers=1, min_tables=5))
+    resources = SchemaResourceCache(cache, page_size=2, offloader=offloader)
+
+    try:
+        await resources.precompute("test_db")
+        schema = await cache.get_schema("test_db")
+
+        assert offloader.offloaded_calls == 1
+        assert await resources.get("test_db", "page:3") == render_resource_body(
+            "test_db", schema, "page:3", 2
+        )
+    finally:
+        await resources.close()
+        offloader.shutdown()
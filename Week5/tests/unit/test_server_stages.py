@@ -0,0 +1,54 @@
+"""
+Unit tests for the lazily initialized server service stages.
+
+Args:
+----------
+    None
+
+Returns:
+----------
+    None
+
+Raises:
+----------
+    None
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from postgres_mcp import server
+
+
+@pytest.mark.asyncio
+async def test_failed_ai_stage_keeps_database_services(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An AI stage failure only releases AI services; shared pools stay open."""
+    pool_manager = AsyncMock()
+    schema_cache = AsyncMock()
+    result_cache = AsyncMock()
+
+    async def init_database(ctx: server.ServerContext, config: object) -> None:
+        ctx.pool_manager = pool_manager
+        ctx.schema_cache = schema_cache
+
+    async def init_ai(ctx: server.ServerContext, config: object) -> None:
+        ctx.result_cache = result_cache
+        raise RuntimeError("openai unavailable")
+
+    monkeypatch.setattr(server, "_init_database_services", init_database)
+    monkeypatch.setattr(server, "_init_ai_services", init_ai)
+    ctx = server.ServerContext()
+    ctx.config = MagicMock()
+
+    with pytest.raises(RuntimeError, match="openai unavailable"):
+        await ctx.ensure_ai_services()
+
+    result_cache.close.assert_awaited_once()
+    assert ctx.result_cache is None
+    pool_manager.close_all.assert_not_awaited()
+    schema_cache.cleanup.assert_not_awaited()
+    assert ctx.pool_manager is pool_manager
+    assert ctx._database_ready and not ctx._ai_ready
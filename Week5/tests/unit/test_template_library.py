@@ -0,0 +1,136 @@
+"""
+Unit tests for the hot-reloadable template library.
+
+Tests fingerprint-based reloads, the atomic matcher swap, keeping the
+previous matcher on broken edits, and the background poller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+
+from postgres_mcp.core.template_library import TemplateLibrary
+from postgres_mcp.utils.template_loader import TemplateLoader, TemplateLoadError
+
+
+def _template(name: str, keywords: list[str], priority: int = 50) -> dict[str, Any]:
+    return {
+        "name": name,
+        "description": f"{name} template",
+        "priority": priority,
+        "keywords": keywords,
+        "patterns": [],
+        "parameters": [
+            {"name": "table", "type": "identifier", "description": "Table name"},
+        ],
+        "sql_template": "SELECT * FROM {table} LIMIT 1000",
+    }
+
+
+def _write(path: Path, data: Any, bump: int = 0) -> None:
+    path.write_text(yaml.safe_dump(data, allow_unicode=True), encoding="utf-8")
+    # Filesystems with coarse mtimes could hide quick successive edits
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump * 1_000_000_000))
+
+
+@pytest.fixture
+def template_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    _write(directory / "list_rows.yaml", _template("list_rows", ["list", "rows"]))
+    _write(directory / "count_rows.yaml", _template("count_rows", ["count", "rows"]))
+    return directory
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_matcher_and_reparses_only_changed_files(
+    template_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    loader = TemplateLoader(template_dir)
+    library = TemplateLibrary(loader)
+    await library.load()
+    assert library.version == 1
+    assert {t.name for t in library.templates} == {"list_rows", "count_rows"}
+    assert library.match("list rows please", {})["template"].name == "list_rows"
+
+    # No change: no rebuild
+    assert await library.reload() is True
+    assert library.version == 1
+
+    parsed: list[str] = []
+    load_file = loader.load_file
+    monkeypatch.setattr(
+        loader, "load_file", lambda path: parsed.append(path.name) or load_file(path)
+    )
+
+    in_flight = library.matcher
+    _write(template_dir / "list_rows.yaml", _template("list_rows", ["show", "everything"]), 1)
+    assert await library.reload() is True
+
+    assert parsed == ["list_rows.yaml"]
+    assert library.version == 2
+    assert library.matcher is not in_flight
+    assert library.match("list rows please", {})["template"].name == "count_rows"
+    assert library.match("show everything", {})["template"].name == "list_rows"
+    # A match that captured the old matcher still sees the old index
+    assert in_flight.match("list rows please", {})["template"].name == "list_rows"
+
+    (template_dir / "count_rows.yaml").unlink()
+    assert await library.reload() is True
+    assert [t.name for t in library.templates] == ["list_rows"]
+
+
+@pytest.mark.asyncio
+async def test_broken_edit_keeps_previous_matcher(template_dir: Path) -> None:
+    library = TemplateLibrary(TemplateLoader(template_dir))
+    await library.load()
+    serving = library.matcher
+
+    (template_dir / "count_rows.yaml").write_text("name: [unclosed", encoding="utf-8")
+    assert await library.reload() is False
+    assert library.matcher is serving
+    assert "count_rows.yaml" in library.last_error
+    # The same broken state is not retried on every poll
+    assert await library.reload() is True
+    assert library.matcher is serving
+
+    _write(template_dir / "count_rows.yaml", _template("list_rows", ["count"]), 2)
+    assert await library.reload() is False
+    assert "duplicate template names: list_rows" in library.last_error
+
+    _write(template_dir / "count_rows.yaml", _template("count_rows", ["count"]), 3)
+    assert await library.reload() is True
+    assert library.last_error is None
+    assert library.version == 2
+
+
+@pytest.mark.asyncio
+async def test_initial_load_failure_raises(template_dir: Path) -> None:
+    (template_dir / "bad.yaml").write_text("- not a mapping\n", encoding="utf-8")
+    library = TemplateLibrary(TemplateLoader(template_dir))
+    with pytest.raises(TemplateLoadError, match="bad.yaml"):
+        await library.load()
+    assert library.templates == []
+
+
+@pytest.mark.asyncio
+async def test_poller_picks_up_new_templates(template_dir: Path) -> None:
+    library = TemplateLibrary(TemplateLoader(template_dir), poll_interval_seconds=0.01)
+    await library.load()
+    library.start()
+    try:
+        _write(template_dir / "top_rows.yml", _template("top_rows", ["top", "first"]))
+        for _ in range(200):
+            if library.version > 1:
+                break
+            await asyncio.sleep(0.01)
+        assert library.match("first top rows", {})["template"].name == "top_rows"
+    finally:
+        await library.close()